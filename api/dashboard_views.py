@@ -44,7 +44,9 @@ class DashboardModuleDataView(LoginRequiredAPIMixin, View):
         if mod['requires_premium'] and not is_premium:
             return JsonResponse({'error': 'Premium required.'}, status=403)
 
-        if mod['load_strategy'] != 'lazy':
+        # Server modules are accepted too: get_server_module_data hands a
+        # provider that overran its time budget to the client as a lazy module.
+        if mod['load_strategy'] not in ('lazy', 'server'):
             return JsonResponse({'error': 'Module is not lazy-loaded.'}, status=400)
 
         # Resolve effective size
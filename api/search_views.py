@@ -0,0 +1,40 @@
+"""
+Site search typeahead API view.
+
+Returns ranked game, trophy and profile suggestions for the site-wide search
+bar. Matching and ranking live in trophies/services/search_service.py.
+"""
+import logging
+
+from django.utils.decorators import method_decorator
+from django_ratelimit.decorators import ratelimit
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.utils import safe_int
+from trophies.services.search_service import SUGGEST_LIMIT, suggest
+
+logger = logging.getLogger('psn_api')
+
+MAX_LIMIT = 10
+
+
+class SearchSuggestView(APIView):
+    """Typeahead suggestions across games, trophies and profiles."""
+    authentication_classes = []
+    permission_classes = []
+
+    @method_decorator(ratelimit(key='ip', rate='120/m', method='GET', block=True))
+    def get(self, request):
+        """
+        GET /api/v1/search/suggest/?q=<query>&limit=5
+        Returns {'games': [...], 'trophies': [...], 'profiles': [...]}.
+        """
+        query = (request.query_params.get('q') or '').strip()
+        limit = max(1, min(safe_int(request.query_params.get('limit', SUGGEST_LIMIT), SUGGEST_LIMIT), MAX_LIMIT))
+        try:
+            return Response(suggest(query[:100], limit))
+        except Exception as e:
+            logger.exception(f"Search suggest error: {e}")
+            return Response({'error': 'Internal error.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -19,6 +19,7 @@ from .recap_views import (
     RecapShareImagePNGView, RecapSlidePartialView
 )
 from .tracking_views import TrackSiteEventView
+from .search_views import SearchSuggestView
 from .easter_egg_views import RollEasterEggView, ClaimEasterEggView
 from .share_temp_views import serve_share_temp_image
 from .game_list_views import (
@@ -210,6 +211,9 @@ urlpatterns = [
     # Game search (for list typeahead)
     path('games/search/', GameSearchView.as_view(), name='game-search'),
 
+    # Site search typeahead
+    path('search/suggest/', SearchSuggestView.as_view(), name='search-suggest'),
+
     # Game players
     path('games/<str:np_communication_id>/players/', GamePlayersAPIView.as_view(), name='game-players'),
 
@@ -0,0 +1,36 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.sitemap_shards import BATCH_SIZE, SHARD_SIZE, build_sitemaps
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Build gzipped Game/Profile sitemap shards and the sitemap index into storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shard-size', type=int, default=SHARD_SIZE,
+                            help=f'Max URLs per shard file (default: {SHARD_SIZE})')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f'Rows fetched per keyset query (default: {BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        try:
+            manifest = build_sitemaps(
+                shard_size=options['shard_size'], batch_size=options['batch_size'],
+            )
+        except Exception as e:
+            logger.exception("Sitemap build failed")
+            self.stdout.write(self.style.ERROR(f"Sitemap build failed: {e}"))
+            raise
+
+        shards = manifest['shards']
+        total = sum(s['urls'] for s in shards.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Sitemap build {manifest['build']}: {len(shards)} shards, {total} URLs "
+            f"in {time.monotonic() - start:.1f}s"
+        ))
@@ -20,6 +20,8 @@ from django.core.management.base import BaseCommand
 from django.db.models import Count, Q, Avg
 
 from trophies.models import Game, Trophy, ProfileGame, EarnedTrophy
+from trophies.services.trophy_list_service import invalidate_trophy_list_cache
+from trophies.util_modules.cache_invalidation import invalidation_batch
 
 
 class Command(BaseCommand):
@@ -169,5 +171,8 @@ class Command(BaseCommand):
                 ])
             if trophy_updates:
                 Trophy.objects.bulk_update(trophy_updates, ['earned_count', 'earn_rate'])
+                with invalidation_batch():
+                    for game_id in {t.game_id for t in trophy_updates}:
+                        invalidate_trophy_list_cache(game_id)
 
         return len(game_updates), len(trophy_updates)
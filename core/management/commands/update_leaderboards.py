@@ -1,11 +1,14 @@
 import logging
+import time
 
 from django.core.management.base import BaseCommand
 from trophies.models import Badge
 from trophies.services.redis_leaderboard_service import (
     rebuild_xp_leaderboard,
     rebuild_global_progress_leaderboard,
-    rebuild_series_leaderboards,
+    rebuild_earners_leaderboard,
+    rebuild_progress_leaderboard,
+    rebuild_community_xp,
     rebuild_country_xp_leaderboard,
     rebuild_country_xp_leaderboards,
 )
@@ -41,9 +44,9 @@ class Command(BaseCommand):
     def _rebuild_single_country(self, country_code):
         """Rebuild country XP leaderboard for a single country."""
         try:
-            count = rebuild_country_xp_leaderboard(country_code)
+            count, elapsed = _timed(rebuild_country_xp_leaderboard, country_code)
             self.stdout.write(self.style.SUCCESS(
-                f"Rebuilt country XP leaderboard for {country_code}: {count} entries"
+                f"Rebuilt country XP leaderboard for {country_code}: {count} entries in {elapsed:.2f}s"
             ))
         except Exception as e:
             logger.exception(f"Failed rebuilding country XP leaderboard for {country_code}")
@@ -54,11 +57,7 @@ class Command(BaseCommand):
     def _rebuild_single_series(self, slug):
         """Rebuild all leaderboards for a single series."""
         try:
-            earners_count, progress_count = rebuild_series_leaderboards(slug)
-            self.stdout.write(
-                f"Rebuilt sorted sets for {slug}: "
-                f"{earners_count} earners, {progress_count} progress"
-            )
+            self._rebuild_series(slug)
             self.stdout.write(self.style.SUCCESS(f"Rebuilt leaderboards for series: {slug}"))
         except Exception as e:
             logger.exception(f"Failed rebuilding sorted sets for {slug}")
@@ -75,26 +74,26 @@ class Command(BaseCommand):
 
         # Global leaderboards
         try:
-            count = rebuild_xp_leaderboard()
-            self.stdout.write(f"Rebuilt XP sorted set: {count} entries")
+            count, elapsed = _timed(rebuild_xp_leaderboard)
+            self.stdout.write(f"Rebuilt XP sorted set: {count} entries in {elapsed:.2f}s")
         except Exception as e:
             logger.exception("Failed rebuilding XP sorted set")
             self.stdout.write(self.style.ERROR(f"Failed rebuilding XP sorted set: {e}"))
 
         try:
-            count = rebuild_global_progress_leaderboard()
-            self.stdout.write(f"Rebuilt global progress sorted set: {count} entries")
+            count, elapsed = _timed(rebuild_global_progress_leaderboard)
+            self.stdout.write(f"Rebuilt global progress sorted set: {count} entries in {elapsed:.2f}s")
         except Exception as e:
             logger.exception("Failed rebuilding global progress sorted set")
             self.stdout.write(self.style.ERROR(f"Failed rebuilding global progress sorted set: {e}"))
 
         # Country XP leaderboards
         try:
-            country_results = rebuild_country_xp_leaderboards()
+            country_results, elapsed = _timed(rebuild_country_xp_leaderboards)
             total_entries = sum(country_results.values())
             self.stdout.write(
                 f"Rebuilt country XP sorted sets: "
-                f"{len(country_results)} countries, {total_entries} total entries"
+                f"{len(country_results)} countries, {total_entries} total entries in {elapsed:.2f}s"
             )
         except Exception as e:
             logger.exception("Failed rebuilding country XP sorted sets")
@@ -104,11 +103,7 @@ class Command(BaseCommand):
         success_count = 0
         for slug in unique_slugs:
             try:
-                earners_count, progress_count = rebuild_series_leaderboards(slug)
-                self.stdout.write(
-                    f"Rebuilt sorted sets for {slug}: "
-                    f"{earners_count} earners, {progress_count} progress"
-                )
+                self._rebuild_series(slug)
                 success_count += 1
             except Exception as e:
                 logger.exception(f"Failed rebuilding sorted sets for {slug}")
@@ -116,3 +111,21 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(
             f"Processed {len(unique_slugs)} series ({success_count} fully successful)."
         ))
+
+    def _rebuild_series(self, slug):
+        """Rebuild one series' boards (earners + progress + community XP), reporting each."""
+        earners_count, earners_elapsed = _timed(rebuild_earners_leaderboard, slug)
+        progress_count, progress_elapsed = _timed(rebuild_progress_leaderboard, slug)
+        rebuild_community_xp(slug)
+        self.stdout.write(
+            f"Rebuilt sorted sets for {slug}: "
+            f"{earners_count} earners in {earners_elapsed:.2f}s, "
+            f"{progress_count} progress in {progress_elapsed:.2f}s"
+        )
+
+
+def _timed(fn, *args):
+    """Run fn(*args); return (result, elapsed seconds)."""
+    start = time.monotonic()
+    result = fn(*args)
+    return result, time.monotonic() - start
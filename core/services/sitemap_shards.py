@@ -0,0 +1,317 @@
+"""
+Sitemap shards: pre-built, gzipped sitemap files for the Game and Profile sections.
+
+The live GameSitemap/ProfileSitemap pages are Django paginator pages over the
+whole table, so every crawler fetch of `/sitemap-profiles.xml?p=40` ran a
+COUNT(*) plus an OFFSET 195000 scan. Crawlers walk those pages constantly.
+
+The build_sitemaps cron instead walks each table once in id order with
+keyset iteration (`id > last_id ORDER BY id LIMIT n`, served by the primary
+key), streams the URLs into gzipped shards of SHARD_SIZE URLs, and writes the
+shards plus a sitemap index to default storage under a per-build directory:
+
+    sitemaps/<build>/games-1.xml.gz, games-2.xml.gz, ..., profiles-1.xml.gz, ...
+    sitemaps/<build>/index.xml
+    sitemaps/manifest.json   <- written last; the switch to the new build
+
+The index still lists the small sections (badges, lists, ...) as their live
+`/sitemap-<section>.xml` pages; only the big tables are sharded. Shards are
+ordered by ascending id, so old shards rarely change between builds.
+
+lastmod comes from the fields that move when the page content does:
+Profile.last_synced, and for games the newer of Game.created_at and the
+latest TrophyGroup.created_at (a DLC pack landing changes the trophy list).
+
+core/views.py serves `/sitemap.xml` and `/sitemap-<section>-<n>.xml.gz` from
+the current manifest, falling back to the live Django sitemaps when no build
+exists yet. Once a build exists, the old live pages for the sharded sections
+(`/sitemap-games.xml?p=N`, which crawlers remember from earlier indexes)
+answer 410 Gone instead of running the COUNT + OFFSET scan. Each build keeps
+the previous build's files so crawlers mid-walk never hit a 404, and prunes
+anything older.
+"""
+import gzip
+import io
+import json
+import logging
+from datetime import timezone as dt_timezone
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import DateTimeField, OuterRef, Subquery
+from django.db.models.functions import Greatest
+from django.urls import reverse
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_PREFIX = 'sitemaps'
+MANIFEST_PATH = f'{SITEMAP_PREFIX}/manifest.json'
+MANIFEST_CACHE_KEY = 'sitemap:manifest'
+MANIFEST_CACHE_TTL = 6 * 3600
+INDEX_CACHE_KEY = 'sitemap:index:{build}'
+SHARD_SIZE = 50000   # sitemap-protocol cap per file
+BATCH_SIZE = 5000
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def _game_rows(last_id, batch_size):
+    from trophies.models import Game, TrophyGroup
+
+    latest_group = (
+        TrophyGroup.objects.filter(game=OuterRef('pk'))
+        .order_by('-created_at')
+        .values('created_at')[:1]
+    )
+    return (
+        Game.objects.filter(np_communication_id__isnull=False, id__gt=last_id)
+        .annotate(lastmod=Greatest(
+            'created_at', Subquery(latest_group, output_field=DateTimeField()),
+        ))
+        .order_by('id')
+        .values_list('id', 'np_communication_id', 'lastmod')[:batch_size]
+    )
+
+
+def _profile_rows(last_id, batch_size):
+    from trophies.models import Profile
+
+    return (
+        Profile.objects.filter(psn_username__isnull=False, id__gt=last_id)
+        .order_by('id')
+        .values_list('id', 'psn_username', 'last_synced')[:batch_size]
+    )
+
+
+# section -> (row fetcher, URL name, URL kwarg). The section names match the
+# keys of core.sitemaps.SITEMAPS so changefreq/priority come from the
+# existing Sitemap classes.
+SHARDED_SECTIONS = {
+    'games': (_game_rows, 'game_detail', 'np_communication_id'),
+    'profiles': (_profile_rows, 'profile_detail', 'psn_username'),
+}
+
+
+def shard_url_path(name):
+    """Public path a shard is served from, e.g. 'games-3' -> '/sitemap-games-3.xml.gz'."""
+    section, page = name.rsplit('-', 1)
+    return reverse('sitemap_shard', kwargs={'section': section, 'page': int(page)})
+
+
+def _w3c(dt):
+    return dt.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S+00:00')
+
+
+def _iter_rows(fetch, batch_size):
+    """Yield every row of a sharded section in id order, one keyset batch at a time."""
+    last_id = 0
+    while True:
+        rows = list(fetch(last_id, batch_size))
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1][0]
+
+
+class _ShardWriter:
+    """Accumulates one gzipped <urlset> in memory; a full shard is ~1-2 MB compressed."""
+
+    def __init__(self, changefreq, priority):
+        self.changefreq = changefreq
+        self.priority = priority
+        self.buffer = io.BytesIO()
+        # mtime=0 keeps identical content byte-identical across builds.
+        self.gz = gzip.GzipFile(fileobj=self.buffer, mode='wb', mtime=0)
+        self.gz.write(
+            f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n'.encode()
+        )
+        self.count = 0
+        self.lastmod = None
+
+    def add(self, loc, lastmod):
+        entry = f'<url><loc>{escape(loc)}</loc>'
+        if lastmod:
+            entry += f'<lastmod>{_w3c(lastmod)}</lastmod>'
+            if self.lastmod is None or lastmod > self.lastmod:
+                self.lastmod = lastmod
+        entry += f'<changefreq>{self.changefreq}</changefreq><priority>{self.priority}</priority></url>\n'
+        self.gz.write(entry.encode())
+        self.count += 1
+
+    def close(self):
+        self.gz.write(b'</urlset>\n')
+        self.gz.close()
+        return self.buffer.getvalue()
+
+
+def _save(storage, path, content):
+    # FileSystemStorage never overwrites (it renames), so clear the name first.
+    if storage.exists(path):
+        storage.delete(path)
+    return storage.save(path, ContentFile(content))
+
+
+def _write_section(storage, build_dir, section, sitemap, shard_size, batch_size):
+    fetch, url_name, url_kwarg = SHARDED_SECTIONS[section]
+    base = settings.SITE_URL
+    shards = {}
+    writer = None
+
+    def flush():
+        name = f'{section}-{len(shards) + 1}'
+        path = _save(storage, f'{build_dir}/{name}.xml.gz', writer.close())
+        shards[name] = {
+            'path': path,
+            'urls': writer.count,
+            'lastmod': _w3c(writer.lastmod) if writer.lastmod else None,
+        }
+
+    for _, key, lastmod in _iter_rows(fetch, batch_size):
+        if writer is None:
+            writer = _ShardWriter(sitemap.changefreq, sitemap.priority)
+        writer.add(base + reverse(url_name, kwargs={url_kwarg: key}), lastmod)
+        if writer.count >= shard_size:
+            flush()
+            writer = None
+    if writer is not None:
+        flush()
+    return shards
+
+
+def _index_entries(sitemaps, shards):
+    """(loc, lastmod) for every index entry: pre-built shards plus live section pages."""
+    base = settings.SITE_URL
+    entries = []
+    for section, sitemap_class in sitemaps.items():
+        if section in SHARDED_SECTIONS:
+            for name, shard in shards.items():
+                if name.rsplit('-', 1)[0] == section:
+                    entries.append((base + shard_url_path(name), shard['lastmod']))
+            continue
+        sitemap = sitemap_class()
+        latest = sitemap.get_latest_lastmod()
+        section_url = base + reverse('sitemap_section', kwargs={'section': section})
+        for page in range(1, sitemap.paginator.num_pages + 1):
+            loc = section_url if page == 1 else f'{section_url}?p={page}'
+            entries.append((loc, _w3c(latest) if latest else None))
+    return entries
+
+
+def _render_index(entries):
+    lines = [f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">']
+    for loc, lastmod in entries:
+        lastmod_tag = f'<lastmod>{lastmod}</lastmod>' if lastmod else ''
+        lines.append(f'<sitemap><loc>{escape(loc)}</loc>{lastmod_tag}</sitemap>')
+    lines.append('</sitemapindex>\n')
+    return '\n'.join(lines)
+
+
+def get_manifest(storage=None):
+    """
+    The current build's manifest, or None if no build exists yet.
+
+    Cached so index and shard requests don't read storage for it on every hit.
+    """
+    manifest = cache.get(MANIFEST_CACHE_KEY)
+    if manifest is not None:
+        return manifest or None
+    storage = storage or default_storage
+    try:
+        with storage.open(MANIFEST_PATH) as f:
+            manifest = json.loads(f.read())
+    except (FileNotFoundError, OSError, ValueError):
+        manifest = {}
+    except Exception:
+        # S3 raises botocore errors for missing keys; treat as "no build".
+        logger.exception("Failed to read sitemap manifest")
+        manifest = {}
+    # Remember "no build" briefly too, so a fresh deploy doesn't read storage per hit.
+    cache.set(MANIFEST_CACHE_KEY, manifest, MANIFEST_CACHE_TTL if manifest else 300)
+    return manifest or None
+
+
+def get_index(manifest, storage=None):
+    """
+    The sitemap index XML for `manifest`'s build, cached by build id.
+
+    Raises whatever the storage backend raises if the file is missing.
+    """
+    cache_key = INDEX_CACHE_KEY.format(build=manifest['build'])
+    content = cache.get(cache_key)
+    if content is None:
+        storage = storage or default_storage
+        with storage.open(manifest['index']) as f:
+            content = f.read()
+        content = content.decode() if isinstance(content, bytes) else content
+        cache.set(cache_key, content, MANIFEST_CACHE_TTL)
+    return content
+
+
+def _prune(storage, keep):
+    """Delete build directories other than `keep`."""
+    try:
+        dirs, _ = storage.listdir(SITEMAP_PREFIX)
+    except (FileNotFoundError, OSError):
+        return 0
+    pruned = 0
+    for build in dirs:
+        if build in keep:
+            continue
+        _, files = storage.listdir(f'{SITEMAP_PREFIX}/{build}')
+        for name in files:
+            storage.delete(f'{SITEMAP_PREFIX}/{build}/{name}')
+        pruned += 1
+    return pruned
+
+
+def build_sitemaps(storage=None, shard_size=SHARD_SIZE, batch_size=BATCH_SIZE):
+    """
+    Build a full set of sitemap shards and an index, then switch to them.
+
+    Args:
+        storage: Storage backend to write to (default_storage if None).
+        shard_size: Max URLs per shard file.
+        batch_size: Rows fetched per keyset query.
+
+    Returns:
+        dict: The new manifest.
+    """
+    from core.sitemaps import SITEMAPS
+
+    storage = storage or default_storage
+    previous = get_manifest(storage)
+    now = timezone.now()
+    build = now.strftime('%Y%m%dT%H%M%S')
+    build_dir = f'{SITEMAP_PREFIX}/{build}'
+
+    shards = {}
+    for section in SHARDED_SECTIONS:
+        shards.update(_write_section(
+            storage, build_dir, section, SITEMAPS[section](), shard_size, batch_size,
+        ))
+
+    index = _render_index(_index_entries(SITEMAPS, shards))
+    index_path = _save(storage, f'{build_dir}/index.xml', index.encode())
+    manifest = {
+        'build': build,
+        'generated_at': now.isoformat(),
+        'index': index_path,
+        'shards': shards,
+    }
+    _save(storage, MANIFEST_PATH, json.dumps(manifest).encode())
+    cache.set(INDEX_CACHE_KEY.format(build=build), index, MANIFEST_CACHE_TTL)
+    cache.set(MANIFEST_CACHE_KEY, manifest, MANIFEST_CACHE_TTL)
+
+    keep = {build}
+    if previous:
+        keep.add(previous['build'])
+    pruned = _prune(storage, keep)
+    logger.info(
+        f"Sitemap build {build}: {len(shards)} shards, "
+        f"{sum(s['urls'] for s in shards.values())} URLs, pruned {pruned} old builds"
+    )
+    return manifest
@@ -265,3 +265,18 @@ class ChallengeSitemap(Sitemap):
             .values_list('updated_at', flat=True)
             .first()
         )
+
+
+# Section registry for the /sitemap.xml index (plat_pursuit/urls.py). The
+# 'games' and 'profiles' sections are also pre-built into gzipped shards by
+# the build_sitemaps cron (core/services/sitemap_shards.py); the live classes
+# above stay as the fallback until the first build exists.
+SITEMAPS = {
+    'static': StaticViewSitemap,
+    'games': GameSitemap,
+    'profiles': ProfileSitemap,
+    'badges': BadgeSitemap,
+    'roadmaps': RoadmapSitemap,
+    'lists': GameListSitemap,
+    'challenges': ChallengeSitemap,
+}
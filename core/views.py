@@ -3,9 +3,11 @@ import logging
 import random
 import time
 
+from django.contrib.sitemaps.views import index as live_sitemap_index, sitemap as live_sitemap
 from django.contrib.staticfiles.finders import find
+from django.core.files.storage import default_storage
 from django.templatetags.static import static as static_url
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from django.shortcuts import redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse_lazy
@@ -15,6 +17,8 @@ from django.views.generic import TemplateView, View
 
 from core.services.analytics_service import get_dashboard_data as get_analytics_dashboard_data
 from core.services.community_hub_service import build_community_hub_context
+from core.services.sitemap_shards import SHARDED_SECTIONS, get_index, get_manifest
+from core.sitemaps import SITEMAPS
 from trophies.mixins import ProfileHotbarMixin, StaffRequiredMixin
 from trophies.util_modules.cache import redis_client
 from trophies.views.dashboard_views import build_dashboard_context, _get_site_heartbeat
@@ -77,6 +81,56 @@ class RobotsTxtView(View):
             return HttpResponse("robots.txt not found", status=404)
 
 
+class SitemapIndexView(View):
+    """
+    /sitemap.xml: the index written by the build_sitemaps cron, or Django's
+    live index until the first build exists.
+    """
+    def get(self, request):
+        manifest = get_manifest()
+        if manifest is None:
+            return live_sitemap_index(request, sitemaps=SITEMAPS, sitemap_url_name='sitemap_section')
+        try:
+            content = get_index(manifest)
+        except Exception as e:
+            logger.error(f"Error serving sitemap index {manifest['index']}: {e}")
+            return live_sitemap_index(request, sitemaps=SITEMAPS, sitemap_url_name='sitemap_section')
+        response = HttpResponse(content, content_type='application/xml')
+        response['Cache-Control'] = 'public, max-age=3600'
+        return response
+
+
+class SitemapSectionView(View):
+    """
+    /sitemap-<section>.xml: Django's live section sitemap.
+
+    Sharded sections (games, profiles) only fall back to it until the first
+    build exists; afterwards the built index no longer lists them and the
+    old URLs answer 410 so crawlers drop them instead of paging the table.
+    """
+    def get(self, request, section):
+        if section in SHARDED_SECTIONS and get_manifest() is not None:
+            return HttpResponse("sitemap section moved to /sitemap.xml shards", status=410)
+        return live_sitemap(request, sitemaps=SITEMAPS, section=section)
+
+
+class SitemapShardView(View):
+    """/sitemap-<section>-<n>.xml.gz: one pre-built gzipped shard, streamed from storage."""
+    def get(self, request, section, page):
+        manifest = get_manifest()
+        shard = (manifest or {}).get('shards', {}).get(f'{section}-{page}')
+        if shard is None:
+            return HttpResponse("sitemap shard not found", status=404)
+        try:
+            f = default_storage.open(shard['path'])
+        except Exception as e:
+            logger.error(f"Error serving sitemap shard {shard['path']}: {e}")
+            return HttpResponse("sitemap shard not found", status=404)
+        response = FileResponse(f, content_type='application/gzip')
+        response['Cache-Control'] = 'public, max-age=3600'
+        return response
+
+
 class PrivacyPolicyView(TemplateView):
     template_name = 'pages/privacy.html'
 
@@ -219,6 +219,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.humanize",
+    "django.contrib.postgres",  # OpClass index wrappers (search trigram indexes), trigram lookups
     'django.contrib.sites',
     'django.contrib.sitemaps',
     "users",
@@ -19,24 +19,9 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.views import LogoutView
-from django.contrib.sitemaps.views import sitemap, index as sitemap_index
 from django.urls import path, include
 from django.views.generic import RedirectView, TemplateView
-from core.views import AdsTxtView, RobotsTxtView, PrivacyPolicyView, TermsOfServiceView, AboutView, ContactView, HomeView, CommunityHubView, AnalyticsDashboardView, AnalyticsReportView, FrameComponentTestView, BinderPreviewView, BadgeCollectionListView, PursuerCardPreviewView, PursuerCardCustomizationPreviewView, csp_report_ingest, CspViolationsView, CspViolationsClearView
-from core.sitemaps import (
-    StaticViewSitemap, GameSitemap, ProfileSitemap,
-    BadgeSitemap, GameListSitemap, ChallengeSitemap, RoadmapSitemap,
-)
-
-sitemaps = {
-    'static': StaticViewSitemap,
-    'games': GameSitemap,
-    'profiles': ProfileSitemap,
-    'badges': BadgeSitemap,
-    'roadmaps': RoadmapSitemap,
-    'lists': GameListSitemap,
-    'challenges': ChallengeSitemap,
-}
+from core.views import AdsTxtView, RobotsTxtView, SitemapIndexView, SitemapSectionView, SitemapShardView, PrivacyPolicyView, TermsOfServiceView, AboutView, ContactView, HomeView, CommunityHubView, AnalyticsDashboardView, AnalyticsReportView, FrameComponentTestView, BinderPreviewView, BadgeCollectionListView, PursuerCardPreviewView, PursuerCardCustomizationPreviewView, csp_report_ingest, CspViolationsView, CspViolationsClearView
 from trophies.views import GamesListView, GameDetailView, RandomGameView, TrophiesListView, ProfilesListView, SearchView, ProfileDetailView, ProfileEditorView, TrophyCaseView, ToggleSelectionView, BadgeListView, BadgeDetailView, ProfileSyncStatusView, TriggerSyncView, SearchSyncProfileView, AddSyncStatusView, LinkPSNView, ProfileVerifyView, TokenMonitoringView, BadgeCreationView, BadgeLeaderboardsView, OverallBadgeLeaderboardsView, MilestoneListView, CommentModerationView, ModerationActionView, ModerationLogView, BrowseListsView, GameListDetailView, GameListEditView, GameListCreateView, MyListsView, ChallengeHubView, MyChallengesView, AZChallengeCreateView, AZChallengeSetupView, AZChallengeDetailView, AZChallengeEditView, CalendarChallengeCreateView, CalendarChallengeDetailView, GenreChallengeCreateView, GenreChallengeSetupView, GenreChallengeDetailView, GenreChallengeEditView, GameFamilyManagementView, ReviewModerationView, ReviewModerationActionView, ReviewModerationLogView, MyTitlesView, ReviewHubLandingView, RateMyGamesView, ReviewHubDetailView, ReviewsArchivedView, PlatinumGridView, RoadmapDetailView, RoadmapEditorView, MyShareablesView, MyPlatinumSharesView, MyChallengeSharesView, MyProfileCardView, MyStatsView, FlaggedGamesView, RecentlyAddedView, CompanyListView, CompanyDetailView, FranchiseListView, FranchiseDetailView, GenreThemeListView, GenreDetailView, ThemeDetailView, EngineListView, EngineDetailView, LegacyChecklistListView, LegacyChecklistDetailView
 from trophies.recap_views import RecapIndexView, RecapSlideView
 from users.views import CustomConfirmEmailView, stripe_webhook, paypal_webhook
@@ -340,18 +325,17 @@ urlpatterns = [
     # for sites with tens of thousands of URLs. (Bots that hit /sitemap.xml
     # directly used to materialize every Game/Profile row at once for an
     # ~160 MB allocation per fetch — the May 2026 OOM contributor.)
+    # Games and profiles are served from gzipped shards pre-built by the
+    # build_sitemaps cron (core/services/sitemap_shards.py) instead of
+    # OFFSET-paginated live pages; the index and the games/profiles section
+    # pages fall back to Django's live ones until the first build exists.
+    path('sitemap.xml', SitemapIndexView.as_view(), name='sitemap'),
     path(
-        'sitemap.xml',
-        sitemap_index,
-        {'sitemaps': sitemaps, 'sitemap_url_name': 'sitemap_section'},
-        name='sitemap',
-    ),
-    path(
-        'sitemap-<section>.xml',
-        sitemap,
-        {'sitemaps': sitemaps},
-        name='sitemap_section',
+        'sitemap-<slug:section>-<int:page>.xml.gz',
+        SitemapShardView.as_view(),
+        name='sitemap_shard',
     ),
+    path('sitemap-<section>.xml', SitemapSectionView.as_view(), name='sitemap_section'),
 
     path('privacy/', PrivacyPolicyView.as_view(), name='privacy'),
     path('terms/', TermsOfServiceView.as_view(), name='terms'),
@@ -716,6 +716,10 @@ const InfiniteScroller = {
      * @param {string} [config.cardSelector='.card'] - CSS selector for cards in fetched HTML
      * @param {Function} [config.onTabChange] - Callback for tab change behavior
      * @returns {Object} Controller with destroy() method
+     *
+     * Cursor mode: when the grid contains a [data-next-cursor] marker (keyset-paginated
+     * lists), the next request is ?cursor=<value> taken from the marker in the last
+     * response instead of ?page=N, and a response without a marker ends the list.
      */
     create(config) {
         const grid = document.getElementById(config.gridId);
@@ -728,7 +732,15 @@ const InfiniteScroller = {
         const baseUrl = window.location.pathname;
         const queryParams = new URLSearchParams(window.location.search);
         queryParams.delete('page');
-        let nextPageUrl = `${baseUrl}?page=${page}&${queryParams.toString()}`;
+        queryParams.delete('cursor');
+        const cursorUrl = (marker) => marker
+            ? `${baseUrl}?cursor=${encodeURIComponent(marker.dataset.nextCursor)}&${queryParams.toString()}`
+            : null;
+        const initialCursor = grid.querySelector('[data-next-cursor]');
+        const cursorMode = initialCursor !== null;
+        let nextPageUrl = cursorMode
+            ? cursorUrl(initialCursor)
+            : `${baseUrl}?page=${page}&${queryParams.toString()}`;
         let isLoading = false;
 
         const loadMore = async () => {
@@ -755,7 +767,9 @@ const InfiniteScroller = {
                 } else {
                     newCards.forEach(card => grid.appendChild(card.cloneNode(true)));
                     page++;
-                    nextPageUrl = `${baseUrl}?page=${page}&${queryParams.toString()}`;
+                    nextPageUrl = cursorMode
+                        ? cursorUrl(doc.querySelector('[data-next-cursor]'))
+                        : `${baseUrl}?page=${page}&${queryParams.toString()}`;
                 }
             } catch (error) {
                 nextPageUrl = null;
@@ -775,7 +789,8 @@ const InfiniteScroller = {
                     }
                     page = 2;
                     queryParams.delete('page');
-                    nextPageUrl = `${baseUrl}?page=${page}&${queryParams.toString()}`;
+                    // Cursor lists are re-rendered with a fresh marker; a new scroller takes over.
+                    nextPageUrl = cursorMode ? null : `${baseUrl}?page=${page}&${queryParams.toString()}`;
                     if (!config.scrollKey) {
                         grid.innerHTML = '';
                     }
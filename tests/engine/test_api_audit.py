@@ -0,0 +1,85 @@
+"""Tests for the buffered PSN API audit pipeline (trophies/util_modules/api_audit.py).
+
+`log_api_call` only enqueues; the flusher writes APIAuditLog rows in bulk. The
+background thread is disabled here (it would write on its own DB connection,
+outside the test transaction) and flush() is driven directly.
+"""
+import hashlib
+
+import pytest
+import responses
+
+from trophies.models import APIAuditLog
+from trophies.util_modules import api_audit
+from trophies.util_modules.api_audit import APIAuditBuffer
+from tests.factories import ProfileFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def buffer(monkeypatch, fake_redis):
+    monkeypatch.setattr("trophies.util_modules.cache.redis_client", fake_redis)
+    buf = APIAuditBuffer(max_size=3, flush_batch=2, flush_interval=60)
+    monkeypatch.setattr(buf, "ensure_started", lambda: None)
+    return buf
+
+
+def _entry(**overrides):
+    data = dict(
+        endpoint="trophies", token="tok", profile_id=None, status_code=200,
+        response_time=0.2, error_message="", ip_used="1.2.3.4",
+    )
+    data.update(overrides)
+    return data
+
+
+def test_flush_bulk_writes_rows_and_nulls_missing_profiles(buffer):
+    profile = ProfileFactory()
+    buffer.record(**_entry(profile_id=profile.id))
+    buffer.record(**_entry(profile_id=profile.id + 999, status_code=500, error_message="boom"))
+    buffer.record(**_entry(endpoint="trophy_summary"))
+
+    assert APIAuditLog.objects.count() == 0  # nothing written on the hot path
+    assert buffer.flush() == 3
+
+    rows = list(APIAuditLog.objects.order_by("id"))
+    assert [r.profile_id for r in rows] == [profile.id, None, None]
+    assert rows[0].token_id == hashlib.sha256(b"tok").hexdigest()[:64]
+    assert rows[0].ip_used == "1.2.3.4"
+    assert rows[1].error_message == "boom"
+    assert buffer.counters["profiles_nulled"] == 1
+    assert buffer.stats()["pending"] == 0
+
+
+def test_full_buffer_drops_and_counts(buffer):
+    for _ in range(3):
+        assert buffer.record(**_entry()) is True
+
+    assert buffer.record(**_entry()) is False
+
+    assert buffer.counters["dropped"] == 1
+    assert buffer.flush() == 3
+
+
+def test_calls_remaining_is_taken_at_call_time(buffer, fake_redis):
+    buffer.record(**_entry(calls_remaining=120))
+    buffer.record(**_entry(calls_remaining=119))
+    buffer.record(**_entry(token="other"))  # no call-time value: flush-time fallback
+    fake_redis.zadd("token:tok:default:timestamps", {f"m{i}": i for i in range(250)})
+    fake_redis.zadd("token:other:default:timestamps", {"m": 1})
+
+    buffer.flush()
+
+    assert list(APIAuditLog.objects.order_by("id").values_list("calls_remaining", flat=True)) == [120, 119, 299]
+
+
+@responses.activate
+def test_resolve_egress_ip_is_cached_per_proxy(monkeypatch):
+    monkeypatch.setattr(api_audit, "_egress_ip_cache", {})
+    responses.add(responses.GET, "https://api.ipify.org", body="9.9.9.9")
+
+    assert api_audit.resolve_egress_ip(None) == "9.9.9.9"
+    assert api_audit.resolve_egress_ip(None) == "9.9.9.9"
+
+    assert len(responses.calls) == 1
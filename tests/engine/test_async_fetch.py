@@ -0,0 +1,78 @@
+"""Tests for the asyncio slow-path fetch engine (trophies/async_fetch.py).
+
+The fetch callables here are plain functions standing in for
+`_execute_api_call`; the engine only schedules them, so no PSN or DB access
+is needed.
+"""
+import threading
+import time
+
+import pytest
+
+from trophies.async_fetch import AsyncFetchEngine
+
+
+@pytest.fixture
+def engine():
+    eng = AsyncFetchEngine(max_concurrency=4, db_workers=2)
+    yield eng
+    eng.shutdown()
+
+
+def test_fetch_all_preserves_input_order(engine):
+    def fetch(offset):
+        time.sleep(0.05 if offset == 0 else 0)  # first item finishes last
+        return [offset]
+
+    assert engine.fetch_all(fetch, [0, 20, 40, 60]) == [[0], [20], [40], [60]]
+    assert engine.stats()["fetches"] == 4
+
+
+def test_fetch_all_bounds_in_flight_calls(engine):
+    lock = threading.Lock()
+    in_flight = {"now": 0, "peak": 0}
+
+    def fetch(item):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        time.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+        return item
+
+    engine.fetch_all(fetch, range(12), concurrency=2)
+
+    assert in_flight["peak"] == 2
+
+
+def test_fetch_all_runs_concurrently(engine):
+    start = time.monotonic()
+    engine.fetch_all(lambda item: time.sleep(0.1), range(4))
+
+    # Four 100ms calls with 4 in flight: well under the 400ms sequential cost.
+    assert time.monotonic() - start < 0.3
+
+
+def test_fetch_all_propagates_first_error(engine):
+    def fetch(item):
+        if item == 2:
+            raise RuntimeError("PSN 500")
+        return item
+
+    with pytest.raises(RuntimeError, match="PSN 500"):
+        engine.fetch_all(fetch, range(5), concurrency=1)
+
+    assert engine.stats()["fetch_errors"] == 1
+
+
+def test_db_map_runs_on_pool_in_order(engine):
+    threads = set()
+
+    def apply(item):
+        threads.add(threading.current_thread().name)
+        return item * 2
+
+    assert engine.db_map(apply, [1, 2, 3]) == [2, 4, 6]
+    assert all(name.startswith("tk-async-db") for name in threads)
+    assert engine.stats()["db_tasks"] == 3
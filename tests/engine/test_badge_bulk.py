@@ -0,0 +1,150 @@
+"""Tests for bulk badge evaluation (trophies/services/badge_bulk_service.py).
+
+evaluate_badges_bulk must land every profile in exactly the state the
+per-profile path (initial_badge_check -> handle_badge) would: same badges,
+same progress counts, same stage completion events. The parity test runs the
+per-profile path inside a rolled-back transaction, then the bulk path on the
+same data, and compares.
+"""
+import pytest
+from django.db import transaction
+
+from tests.factories import (
+    BadgeFactory,
+    ConceptBundleFactory,
+    ConceptFactory,
+    GameFactory,
+    ProfileFactory,
+    ProfileGameFactory,
+    StageFactory,
+    UserBadgeFactory,
+    UserBadgeProgressFactory,
+)
+from trophies.models import Badge, StageCompletionEvent, UserBadge, UserBadgeProgress
+from trophies.services import redis_leaderboard_service
+from trophies.services.badge_bulk_service import evaluate_badges_bulk
+from trophies.services.badge_service import initial_badge_check
+from trophies.services.badge_topology import invalidate_badge_topology
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def isolated(fake_redis, monkeypatch):
+    monkeypatch.setattr("trophies.util_modules.cache.redis_client", fake_redis)
+    monkeypatch.setattr(redis_leaderboard_service, "redis_client", fake_redis)
+    invalidate_badge_topology()
+
+
+def _stage_game(slug, number, required_tiers=None):
+    concept = ConceptFactory()
+    game = GameFactory(concept=concept)
+    StageFactory(series_slug=slug, stage_number=number, required_tiers=required_tiers or []).concepts.add(concept)
+    return game
+
+
+@pytest.fixture
+def world():
+    """Two series (one with a bundle stage) and a spread of profiles."""
+    g1, g2 = _stage_game("bulk-a", 1), _stage_game("bulk-a", 2, required_tiers=[1, 2])
+    optional = _stage_game("bulk-a", 0)
+    bundle_stage = StageFactory(series_slug="bulk-a", stage_number=3)
+    members = [ConceptFactory(), ConceptFactory()]
+    bundle = ConceptBundleFactory(stage=bundle_stage)
+    bundle.concepts.add(*members)
+    member_games = [GameFactory(concept=concept) for concept in members]
+    b1 = _stage_game("bulk-b", 1)
+
+    badges = [BadgeFactory(series_slug="bulk-a", tier=tier, is_live=True) for tier in (1, 2, 3, 4)]
+    badges.append(BadgeFactory(series_slug="bulk-b", tier=1, is_live=True))
+
+    everything = ProfileFactory()
+    for game in (g1, g2, optional, b1, *member_games):
+        ProfileGameFactory(profile=everything, game=game, has_plat=True, progress=100)
+
+    plats_only = ProfileFactory()
+    for game in (g1, g2, member_games[0]):
+        ProfileGameFactory(profile=plats_only, game=game, has_plat=True, progress=90)
+    UserBadgeProgressFactory(profile=plats_only, badge=badges[1], completed_concepts=3)  # stale
+
+    lapsed = ProfileFactory()  # holds a badge it no longer qualifies for
+    ProfileGameFactory(profile=lapsed, game=g1, has_plat=False, progress=40)
+    UserBadgeFactory(profile=lapsed, badge=badges[0])
+
+    bystander = ProfileFactory()
+    ProfileGameFactory(profile=bystander)  # no staged games at all
+
+    return [everything, plats_only, lapsed, bystander], badges
+
+
+def _snapshot(profiles):
+    ids = [profile.id for profile in profiles]
+    return (
+        sorted(UserBadge.objects.filter(profile_id__in=ids).values_list("profile_id", "badge_id")),
+        sorted(
+            UserBadgeProgress.objects.filter(profile_id__in=ids)
+            .values_list("profile_id", "badge_id", "completed_concepts")
+        ),
+        sorted(
+            StageCompletionEvent.objects.filter(profile_id__in=ids)
+            .values_list("profile_id", "badge_id", "stage_id", "concept_id", "completed_at")
+        ),
+        sorted(Badge.objects.values_list("id", "earned_count")),
+    )
+
+
+def test_bulk_matches_per_profile_evaluation(world):
+    profiles, badges = world
+
+    with transaction.atomic():
+        for profile in profiles:
+            initial_badge_check(profile, discord_notify=False)
+        expected = _snapshot(profiles)
+        transaction.set_rollback(True)
+
+    result = evaluate_badges_bulk([p.id for p in profiles], badges, chunk_size=3)
+
+    assert _snapshot(profiles) == expected
+    everything, _, lapsed, _ = profiles
+    assert sorted(result.awarded[everything.id]) == sorted(b.id for b in badges)
+    assert result.revoked == {lapsed.id: [badges[0].id]}
+    assert result.profiles == 4
+
+
+def test_bulk_keeps_earner_leaderboards_current(world):
+    profiles, badges = world
+    everything, plats_only, lapsed, _ = profiles
+    for profile in profiles:
+        profile.is_linked = True
+        profile.save(update_fields=["is_linked"])
+    redis_leaderboard_service.update_earner_leaderboards_for_profile(lapsed)
+    assert redis_leaderboard_service.get_earners_rank("bulk-a", lapsed.id) == 1
+
+    evaluate_badges_bulk([p.id for p in profiles], badges)
+
+    assert redis_leaderboard_service.get_earners_rank("bulk-a", lapsed.id) is None
+    assert redis_leaderboard_service.get_earners_rank("bulk-b", everything.id) == 1
+    assert redis_leaderboard_service.get_earners_rank("bulk-a", everything.id) == 1
+    assert redis_leaderboard_service.get_earners_rank("bulk-a", plats_only.id) == 2
+    assert [e["highest_tier"] for e in redis_leaderboard_service.get_earners_page("bulk-a", 1)] == [4, 3]
+
+
+def test_dry_run_reports_without_writing(world):
+    profiles, badges = world
+    before = _snapshot(profiles)
+
+    result = evaluate_badges_bulk([p.id for p in profiles], badges, dry_run=True)
+
+    assert _snapshot(profiles) == before
+    assert result.profiles_changed == {p.id for p in profiles[:3]}  # not the bystander
+
+
+def test_query_count_does_not_grow_with_profiles(world, django_assert_max_num_queries):
+    profiles, badges = world
+    evaluate_badges_bulk([p.id for p in profiles], badges)  # settle: later runs have nothing to write
+    more = [ProfileFactory() for _ in range(20)]
+    for profile in more:
+        ProfileGameFactory(profile=profile, game=profiles[0].played_games.first().game, progress=10)
+
+    with django_assert_max_num_queries(12):
+        evaluate_badges_bulk([p.id for p in profiles + more], badges, dry_run=True)
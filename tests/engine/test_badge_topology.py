@@ -0,0 +1,177 @@
+"""Tests for the cached badge topology (trophies/services/badge_topology.py).
+
+The topology replaces per-call Stage prefetches in badge evaluation, so what
+matters is that it mirrors the graph and that the signals in
+trophies/signals.py retire it whenever the graph changes.
+"""
+import json
+
+import pytest
+
+from tests.factories import BadgeFactory, ConceptFactory, GameFactory, StageFactory
+from trophies.models import ConceptBundle, Game
+from trophies.services.badge_topology import (
+    BadgeTopology,
+    build_badge_topology,
+    get_badge_topology,
+    invalidate_badge_topology,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fresh_topology():
+    invalidate_badge_topology()
+
+
+def _staged_game(stage):
+    concept = ConceptFactory()
+    stage.concepts.add(concept)
+    return GameFactory(concept=concept)
+
+
+def test_build_maps_series_stages_bundles_and_badges():
+    stage_1 = StageFactory(series_slug="topo-a", stage_number=1, required_tiers=[1, 2])
+    stage_2 = StageFactory(series_slug="topo-a", stage_number=2)
+    game = _staged_game(stage_1)
+    member = ConceptFactory()
+    bundle = ConceptBundle.objects.create(stage=stage_2, label="Episodes")
+    bundle.concepts.add(member)
+    live = BadgeFactory(series_slug="topo-a", tier=1, is_live=True)
+    BadgeFactory(series_slug="topo-a", tier=2, is_live=False)
+
+    topology = build_badge_topology()
+
+    assert sorted(topology.stage_data["topo-a"]) == [
+        (1, (1, 2), frozenset({game.id}), ()),
+        (2, (), frozenset(), ((bundle.id, frozenset({member.id})),)),
+    ]
+    assert topology.series_for_games([game.id, 999_999_999]) == {"topo-a"}
+    assert topology.live_badge_ids(["topo-a"]) == [live.id]
+    assert topology.game_concepts[game.id] == game.concept_id
+
+
+def test_round_trips_through_json():
+    stage = StageFactory(series_slug="topo-json")
+    _staged_game(stage)
+    BadgeFactory(series_slug="topo-json")
+    topology = build_badge_topology(version=7)
+
+    assert BadgeTopology.from_dict(json.loads(json.dumps(topology.to_dict()))) == topology
+
+
+def test_cached_topology_costs_no_queries(django_assert_num_queries):
+    _staged_game(StageFactory(series_slug="topo-cached"))
+    first = get_badge_topology()
+
+    with django_assert_num_queries(0):
+        assert get_badge_topology() is first
+
+
+def test_stage_membership_change_invalidates():
+    stage = StageFactory(series_slug="topo-m2m")
+    before = get_badge_topology()
+
+    game = _staged_game(stage)
+
+    after = get_badge_topology()
+    assert after.version != before.version
+    assert after.series_for_games([game.id]) == {"topo-m2m"}
+
+
+def test_game_moving_into_a_staged_concept_invalidates():
+    stage = StageFactory(series_slug="topo-move")
+    staged = ConceptFactory()
+    stage.concepts.add(staged)
+    game = GameFactory()
+    assert get_badge_topology().series_for_games([game.id]) == set()
+
+    game.add_concept(staged)
+
+    assert get_badge_topology().series_for_games([game.id]) == {"topo-move"}
+
+
+def test_unrelated_game_save_keeps_topology():
+    _staged_game(StageFactory(series_slug="topo-keep"))
+    game = GameFactory()
+    before = get_badge_topology()
+
+    game.title_name = "Renamed"
+    game.save()
+
+    assert get_badge_topology() is before
+
+
+def test_sync_save_without_concept_change_skips_topology(monkeypatch):
+    stage = StageFactory(series_slug="topo-skip")
+    staged = ConceptFactory()
+    stage.concepts.add(staged)
+    game = Game.objects.get(pk=GameFactory().pk)
+    lookups = []
+    monkeypatch.setattr(
+        "trophies.services.badge_topology.get_badge_topology",
+        lambda: lookups.append(1) or get_badge_topology(),
+    )
+
+    game.title_name = "Renamed"
+    game.save()
+    assert lookups == []
+
+    game.concept = staged
+    game.save()
+    assert lookups == [1]
+    assert get_badge_topology().series_for_games([game.id]) == {"topo-skip"}
+
+
+def test_badge_going_live_invalidates():
+    stage = StageFactory(series_slug="topo-live")
+    _staged_game(stage)
+    badge = BadgeFactory(series_slug="topo-live", is_live=False)
+    assert get_badge_topology().live_badge_ids(["topo-live"]) == []
+
+    badge.is_live = True
+    badge.save()
+
+    assert get_badge_topology().live_badge_ids(["topo-live"]) == [badge.id]
+
+
+def _admin_request():
+    from django.contrib.messages.storage.fallback import FallbackStorage
+    from django.test import RequestFactory
+
+    request = RequestFactory().post('/admin/')
+    request.session = {}
+    request._messages = FallbackStorage(request)
+    return request
+
+
+def test_admin_series_live_actions_invalidate():
+    from django.contrib.admin.sites import AdminSite
+    from trophies.admin import BadgeAdmin
+    from trophies.models import Badge
+
+    _staged_game(StageFactory(series_slug="topo-admin"))
+    badge = BadgeFactory(series_slug="topo-admin", is_live=False)
+    badge_admin = BadgeAdmin(Badge, AdminSite())
+    assert get_badge_topology().live_badge_ids(["topo-admin"]) == []
+
+    badge_admin.mark_series_live(_admin_request(), Badge.objects.filter(pk=badge.pk))
+    assert get_badge_topology().live_badge_ids(["topo-admin"]) == [badge.id]
+
+    badge_admin.mark_series_not_live(_admin_request(), Badge.objects.filter(pk=badge.pk))
+    assert get_badge_topology().live_badge_ids(["topo-admin"]) == []
+
+
+def test_badge_load_rechecks_is_live_against_stale_topology():
+    from trophies.models import Badge
+    from trophies.services.badge_service import _live_badges_for_games
+
+    game = _staged_game(StageFactory(series_slug="topo-stale"))
+    badge = BadgeFactory(series_slug="topo-stale", is_live=True)
+    assert _live_badges_for_games([game.id]) == [badge]
+
+    Badge.objects.filter(pk=badge.pk).update(is_live=False)  # no signal, topology still lists it
+
+    assert get_badge_topology().live_badge_ids(["topo-stale"]) == [badge.id]
+    assert _live_badges_for_games([game.id]) == []
@@ -0,0 +1,123 @@
+"""Tests for the cache invalidation bus (trophies/util_modules/cache_invalidation.py).
+
+invalidate_dashboard_cache / invalidate_stats_cache / invalidate_timeline_cache
+route through the bus. Outside a batch they delete immediately; inside
+invalidation_batch() repeated calls collapse into one delete_many at the end,
+including calls made from stage_runner pool threads. Generational tags
+(the dashboard) bump a token instead of deleting anything.
+"""
+import pytest
+from django.core.cache import cache
+
+from trophies.services.dashboard_service import invalidate_dashboard_cache
+from trophies.services.stats_service import invalidate_stats_cache
+from trophies.services.timeline_service import invalidate_timeline_cache
+from trophies.util_modules import cache_invalidation
+from trophies.util_modules.cache_invalidation import (
+    cache_generation,
+    invalidate,
+    invalidation_batch,
+    register_invalidator,
+)
+from trophies.util_modules.stage_runner import Stage, run_stages
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def delete_calls(monkeypatch):
+    calls = []
+    real_delete_many = cache.delete_many
+
+    def recording_delete_many(keys, *args, **kwargs):
+        calls.append(list(keys))
+        return real_delete_many(keys, *args, **kwargs)
+
+    monkeypatch.setattr(cache, 'delete_many', recording_delete_many)
+    return calls
+
+
+def test_outside_a_batch_invalidation_is_immediate(delete_calls):
+    cache.set('stats_page:7:0:1', 'stale')
+    cache.set('profile:timeline:7', 'stale')
+
+    invalidate_stats_cache(7)
+    invalidate_timeline_cache(7)
+
+    assert cache.get('stats_page:7:0:1') is None
+    assert cache.get('profile:timeline:7') is None
+    assert len(delete_calls) == 2
+
+
+def test_batch_dedupes_and_flushes_once(delete_calls):
+    cache.set('stats_page:7:0:1', 'stale')
+    cache.set('stats_page:8:1:1', 'stale')
+    generation = cache_generation('dashboard', 7)
+
+    with invalidation_batch():
+        for _ in range(3):
+            invalidate_stats_cache(7)
+            invalidate_dashboard_cache(7)
+        invalidate_stats_cache(8)
+        with invalidation_batch():  # nested batches join the outer one
+            invalidate_stats_cache(7)
+        assert cache.get('stats_page:7:0:1') == 'stale'
+        assert cache_generation('dashboard', 7) == generation
+        assert delete_calls == []
+
+    assert len(delete_calls) == 1
+    assert sorted(delete_calls[0]) == sorted(
+        f'stats_page:{pid}:{sw}:{hid}' for pid in (7, 8) for sw in (0, 1) for hid in (0, 1)
+    )
+    assert cache.get('stats_page:7:0:1') is None
+    assert cache.get('stats_page:8:1:1') is None
+    assert cache_generation('dashboard', 7) != generation
+
+
+def test_batch_flushes_even_when_the_block_raises(delete_calls):
+    cache.set('profile:timeline:9', 'stale')
+
+    with pytest.raises(RuntimeError):
+        with invalidation_batch():
+            invalidate_timeline_cache(9)
+            raise RuntimeError('stage failed')
+
+    assert cache.get('profile:timeline:9') is None
+
+
+def test_stage_runner_threads_share_the_callers_batch(delete_calls):
+    for pid in (1, 2, 3):
+        cache.set(f'profile:timeline:{pid}', 'stale')
+
+    with invalidation_batch():
+        run_stages([Stage(f's{pid}', lambda pid=pid: invalidate_timeline_cache(pid)) for pid in (1, 2, 3)])
+        assert delete_calls == []
+
+    assert delete_calls == [sorted(f'profile:timeline:{pid}' for pid in (1, 2, 3))]
+
+
+def test_generational_tag_bumps_token_instead_of_deleting(monkeypatch, delete_calls):
+    monkeypatch.setattr(cache_invalidation, '_INVALIDATORS', dict(cache_invalidation._INVALIDATORS))
+    register_invalidator('widgets', generational=True)
+
+    first = cache_generation('widgets', 5)
+    assert cache_generation('widgets', 5) == first
+    other = cache_generation('widgets', 6)
+
+    with invalidation_batch():
+        invalidate('widgets', 5)
+        invalidate('widgets', 5)
+
+    assert cache_generation('widgets', 5) != first
+    assert cache_generation('widgets', 6) == other
+    assert delete_calls == []
+
+
+def test_unknown_tag_is_rejected():
+    with pytest.raises(KeyError):
+        invalidate('no-such-cache', 1)
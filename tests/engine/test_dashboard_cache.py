@@ -0,0 +1,118 @@
+"""Tests for dashboard module loading (dashboard_service).
+
+get_lazy_module_data keys entries under the profile's dashboard generation;
+invalidate_dashboard_cache only replaces that generation, so the next load
+misses without any key being deleted. Lookups are counted per module slug.
+
+get_server_module_data runs server providers concurrently; one that overruns
+its budget is handed to the client as a lazy module instead of holding the
+page, and every run lands in the per-slug latency histogram.
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+
+from trophies.services import dashboard_service
+from trophies.services.dashboard_service import (
+    dashboard_cache_hit_rates,
+    dashboard_provider_latency,
+    get_lazy_module_data,
+    get_server_module_data,
+    invalidate_dashboard_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated(fake_redis, monkeypatch):
+    monkeypatch.setattr("trophies.util_modules.cache.redis_client", fake_redis)
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def fake_module(monkeypatch):
+    calls = []
+
+    def provider(profile):
+        calls.append(profile.id)
+        return {'n': len(calls)}
+
+    mod = {'slug': 'fake_mod', 'provider': provider, 'cache_ttl': 300}
+    monkeypatch.setattr(dashboard_service, '_MODULE_LOOKUP', {'fake_mod': mod})
+    return calls
+
+
+def test_invalidation_orphans_cached_entries_without_deleting(fake_module, monkeypatch):
+    profile, other = SimpleNamespace(id=1), SimpleNamespace(id=2)
+    deleted = []
+    monkeypatch.setattr(cache, 'delete_many', lambda keys, *a, **kw: deleted.extend(keys))
+
+    assert get_lazy_module_data(profile, 'fake_mod') == {'n': 1}
+    assert get_lazy_module_data(profile, 'fake_mod') == {'n': 1}  # cached
+    get_lazy_module_data(other, 'fake_mod')
+
+    invalidate_dashboard_cache(profile.id)
+
+    assert get_lazy_module_data(profile, 'fake_mod') == {'n': 3}
+    assert get_lazy_module_data(other, 'fake_mod') == {'n': 2}  # untouched
+    assert fake_module == [1, 2, 1]
+    assert deleted == []
+
+
+def test_hit_rates_are_reported_per_slug(fake_module):
+    profile = SimpleNamespace(id=1)
+    for _ in range(4):
+        get_lazy_module_data(profile, 'fake_mod')
+
+    assert dashboard_cache_hit_rates() == {'fake_mod': {'hits': 3, 'misses': 1, 'hit_rate': 0.75}}
+
+
+def _server_mod(slug, provider, **extra):
+    return {'slug': slug, 'provider': provider, 'load_strategy': 'server', **extra}
+
+
+def test_server_providers_run_concurrently():
+    both_running = threading.Barrier(2, timeout=5)
+
+    def provider(profile):
+        both_running.wait()  # times out unless the two overlap
+        return {'ok': True}
+
+    modules = [_server_mod('a', provider), _server_mod('b', provider), {'slug': 'c', 'load_strategy': 'lazy'}]
+    data = get_server_module_data(SimpleNamespace(id=1), modules)
+
+    assert data == {'a': {'ok': True}, 'b': {'ok': True}}
+
+
+def test_overrunning_provider_degrades_to_lazy_load():
+    release = threading.Event()
+
+    def slow(profile):
+        release.wait(5)
+        return {'late': True}
+
+    def broken(profile):
+        raise RuntimeError('boom')
+
+    modules = [
+        _server_mod('fast', lambda profile: {'ok': True}),
+        _server_mod('slow', slow, time_budget=0.05),
+        _server_mod('broken', broken),
+    ]
+    started = time.monotonic()
+    try:
+        data = get_server_module_data(SimpleNamespace(id=1), modules)
+    finally:
+        release.set()
+
+    assert time.monotonic() - started < 2
+    assert data == {'fast': {'ok': True}, 'broken': {'error': True}}
+    assert [mod['load_strategy'] for mod in modules] == ['server', 'lazy', 'server']
+
+    histograms = dashboard_provider_latency()
+    assert histograms['slow']['overrun'] == 1
+    assert sum(histograms['fast'].values()) == 1 and histograms['fast']['overrun'] == 0
@@ -0,0 +1,68 @@
+"""Tests for the deferred Trophy.earn_rate refresher (trophies/services/earn_rate_service.py)."""
+import pytest
+
+from tests.factories import GameFactory, TrophyFactory
+from trophies.services import earn_rate_service
+from trophies.services.earn_rate_service import DIRTY_GAMES_KEY, mark_dirty, refresh_dirty_earn_rates
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def redis(fake_redis, monkeypatch):
+    monkeypatch.setattr(earn_rate_service, "redis_client", fake_redis)
+    return fake_redis
+
+
+def test_refresh_updates_only_changed_rows(django_assert_num_queries):
+    game = GameFactory(played_count=4)
+    stale = TrophyFactory(game=game, earned_count=1, earn_rate=0.0)
+    current = TrophyFactory(game=game, earned_count=2, earn_rate=0.5)
+    other_game = GameFactory(played_count=2)
+    untouched = TrophyFactory(game=other_game, earned_count=2, earn_rate=0.0)
+
+    mark_dirty([game.id])
+    with django_assert_num_queries(2):  # one read + one UPDATE ... FROM (VALUES ...)
+        assert refresh_dirty_earn_rates() == (1, 1)
+
+    stale.refresh_from_db()
+    current.refresh_from_db()
+    untouched.refresh_from_db()
+    assert stale.earn_rate == 0.25
+    assert current.earn_rate == 0.5
+    assert untouched.earn_rate == 0.0  # not dirty, left for the daily cron
+
+
+def test_refresh_drains_set_in_chunks(redis):
+    games = [GameFactory(played_count=1) for _ in range(3)]
+    for game in games:
+        TrophyFactory(game=game, earned_count=1, earn_rate=0.0)
+
+    mark_dirty([game.id for game in games])
+    assert refresh_dirty_earn_rates(chunk_size=2) == (3, 3)
+    assert redis.scard(DIRTY_GAMES_KEY) == 0
+
+
+def test_game_without_players_gets_zero_rate():
+    game = GameFactory(played_count=0)
+    trophy = TrophyFactory(game=game, earned_count=0, earn_rate=0.3)
+
+    mark_dirty([game.id])
+    refresh_dirty_earn_rates()
+
+    trophy.refresh_from_db()
+    assert trophy.earn_rate == 0.0
+
+
+def test_failed_chunk_is_requeued(redis, monkeypatch):
+    game = GameFactory()
+
+    def boom(game_ids):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(earn_rate_service, "_refresh_chunk", boom)
+    mark_dirty([game.id])
+
+    with pytest.raises(RuntimeError):
+        refresh_dirty_earn_rates()
+    assert redis.sismember(DIRTY_GAMES_KEY, game.id)
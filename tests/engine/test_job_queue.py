@@ -0,0 +1,237 @@
+"""Tests for the job queue backends (trophies/job_queue.py).
+
+Both backends run against fakeredis; the streams backend's Lua scripts need
+lupa (see requirements-dev.txt).
+"""
+import pytest
+
+from trophies.job_queue import ListJobQueue, StreamJobQueue
+
+
+def _payload(job_type="sync_trophies", profile_id=7):
+    return {"job_type": job_type, "args": ["NPWR1_00", "ps5"], "profile_id": profile_id}
+
+
+@pytest.fixture
+def streams(fake_redis):
+    return StreamJobQueue(fake_redis, machine_id="test", claim_idle=0, max_retries=1)
+
+
+def test_list_push_pop_complete_tracks_counter(fake_redis):
+    queue = ListJobQueue(fake_redis)
+    queue.push("low_priority", _payload())
+    queue.push("high_priority", _payload("profile_refresh"))
+
+    assert queue.profile_job_counts([7]) == {7: 1}
+    assert fake_redis.sismember("active_profiles", 7)
+
+    first = queue.pop(timeout=1)
+    assert first.queue_name == "high_priority" and not first.counted
+    queue.complete(first)
+    assert queue.profile_job_counts([7]) == {7: 1}
+
+    second = queue.pop(timeout=1)
+    assert second.job_type == "sync_trophies" and second.args == ["NPWR1_00", "ps5"]
+    queue.complete(second)
+    assert queue.profile_job_counts([7]) == {7: 0}
+    assert not fake_redis.exists("profile_jobs:7:low_priority")
+    assert not fake_redis.sismember("active_profiles", 7)
+
+
+def test_streams_pop_in_priority_order(streams):
+    streams.push("bulk_priority", _payload())
+    streams.push("low_priority", _payload())
+    streams.push("orchestrator", _payload("profile_refresh"))
+
+    popped = [streams.pop(timeout=0.1).queue_name for _ in range(3)]
+
+    assert popped == ["orchestrator", "low_priority", "bulk_priority"]
+    assert streams.pop(timeout=0.1) is None
+
+
+def test_streams_complete_acks_and_untracks(streams, fake_redis):
+    streams.push("low_priority", _payload())
+    streams.push("low_priority", _payload())
+    assert streams.profile_job_counts([7]) == {7: 2}
+
+    job = streams.pop(timeout=0.1)
+    streams.complete(job)
+
+    assert streams.profile_job_counts([7]) == {7: 1}
+    assert fake_redis.sismember("active_profiles", 7)
+    assert fake_redis.xpending("stream:low_priority_jobs", StreamJobQueue.GROUP)["pending"] == 0
+
+    streams.complete(streams.pop(timeout=0.1))
+    assert streams.profile_job_counts([7]) == {7: 0}
+    assert not fake_redis.sismember("active_profiles", 7)
+    assert fake_redis.xlen("stream:low_priority_jobs") == 0
+
+
+def test_streams_requeue_moves_tracking_to_new_entry(streams, fake_redis):
+    streams.push("medium_priority", _payload())
+    job = streams.pop(timeout=0.1)
+
+    new_id = streams.requeue(job)
+
+    assert new_id != job.entry_id
+    assert fake_redis.smembers("profile_job_ids:7:medium_priority") == {new_id.encode()}
+    retried = streams.pop(timeout=0.1)
+    assert retried.entry_id == new_id
+
+
+def test_streams_reclaim_requeues_then_dead_letters(streams, fake_redis):
+    streams.push("low_priority", _payload())
+    streams.pop(timeout=0.1)  # worker "dies" without acking
+
+    assert streams.reclaim() == (1, 0)
+    assert streams.profile_job_counts([7]) == {7: 1}
+    retried = streams.pop(timeout=0.1)
+    assert retried.payload["attempts"] == 1
+
+    # Stalls again: out of retries (max_retries=1)
+    assert streams.reclaim() == (0, 1)
+    assert streams.profile_job_counts([7]) == {7: 0}
+    assert fake_redis.xlen(StreamJobQueue.DEAD_LETTER_KEY) == 1
+    assert streams.stats()["dead_lettered"] == 1
+
+
+def test_streams_heartbeat_keeps_slow_jobs_from_being_reclaimed(fake_redis):
+    import time
+
+    worker = StreamJobQueue(fake_redis, machine_id="worker", claim_idle=0.2)
+    reclaimer = StreamJobQueue(fake_redis, machine_id="other", claim_idle=0.2)
+    worker.push("low_priority", _payload())
+    job = worker.pop(timeout=0.1)
+
+    time.sleep(0.3)  # job still running past claim_idle
+    assert worker.heartbeat() == 1
+    assert reclaimer.reclaim() == (0, 0)
+
+    worker.complete(job)
+    assert worker.heartbeat() == 0
+
+
+def test_streams_blocking_read_hands_back_extra_entries(streams, fake_redis, monkeypatch):
+    streams.push("low_priority", _payload())
+    streams.push("orchestrator", _payload("profile_refresh"))
+    read = fake_redis.xreadgroup
+
+    def multi_stream_read_only(*args, block=None, **kwargs):
+        # Skip the priority sweep so both entries arrive in the one
+        # multi-stream read (issued without BLOCK: fakeredis drops
+        # deliveries from blocking multi-stream reads).
+        return read(*args, **kwargs) if block is not None else []
+
+    with monkeypatch.context() as m:
+        m.setattr(fake_redis, "xreadgroup", multi_stream_read_only)
+        assert streams.pop(timeout=0.1).queue_name == "orchestrator"
+
+    assert fake_redis.xpending("stream:low_priority_jobs", StreamJobQueue.GROUP)["pending"] == 0
+    assert streams.profile_job_counts([7]) == {7: 1}
+    assert streams.pop(timeout=0.1).queue_name == "low_priority"
+
+
+@pytest.mark.parametrize("backend", ["list", "streams"])
+def test_coalesced_push_drops_waiting_duplicate_until_pickup(backend, fake_redis):
+    if backend == "list":
+        queue = ListJobQueue(fake_redis)
+    else:
+        queue = StreamJobQueue(fake_redis, machine_id="test")
+
+    assert queue.push("low_priority", _payload(), coalesce="NPWR1_00") is True
+    assert queue.push("low_priority", _payload(), coalesce="NPWR1_00") is False
+    assert queue.push("low_priority", _payload(), coalesce="NPWR2_00") is True
+    assert queue.profile_job_counts([7]) == {7: 2}
+    assert queue.stats()["coalesced"] == 1
+
+    job = queue.pop(timeout=0.1)
+    assert job.coalesce[1] == "NPWR1_00"
+    # Picked up: a new push for the same game is queued again.
+    assert queue.push("low_priority", _payload(), coalesce="NPWR1_00") is True
+    assert queue.profile_job_counts([7]) == {7: 3}
+
+
+def test_coalesce_ignores_stale_entries(fake_redis):
+    queue = ListJobQueue(fake_redis)
+    fake_redis.hset("coalesce:sync_trophies:7", "NPWR1_00", 1)  # lost job, ages ago
+
+    assert queue.push("low_priority", _payload(), coalesce="NPWR1_00") is True
+    assert queue.stats()["coalesced"] == 0
+
+
+def test_requeued_job_keeps_coalescing(fake_redis):
+    queue = ListJobQueue(fake_redis)
+    queue.push("low_priority", _payload(), coalesce="NPWR1_00")
+    job = queue.pop(timeout=1)
+
+    queue.requeue(job)
+
+    assert queue.push("low_priority", _payload(), coalesce="NPWR1_00") is False
+    assert queue.pop(timeout=1).coalesce == job.coalesce
+    assert not fake_redis.hexists("coalesce:sync_trophies:7", "NPWR1_00")
+
+
+PENDING = "pending_sync_complete:7"
+RUNNING = "sync_complete_in_progress:7"
+
+
+@pytest.mark.parametrize("backend", ["list", "streams"])
+def test_complete_claims_pending_payload_after_last_job(backend, fake_redis):
+    if backend == "list":
+        queue = ListJobQueue(fake_redis)
+    else:
+        queue = StreamJobQueue(fake_redis, machine_id="test")
+    queue.push("low_priority", _payload())
+    queue.push("medium_priority", _payload("sync_trophy_groups"))
+    fake_redis.set(PENDING, '{"touched_profilegame_ids": [1], "queue_name": "orchestrator"}')
+
+    first = queue.complete(queue.pop(timeout=0.1), pending_key=PENDING, running_key=RUNNING)
+    assert first.remaining == 1 and first.pending is None
+    assert fake_redis.exists(PENDING)
+
+    last = queue.complete(queue.pop(timeout=0.1), pending_key=PENDING, running_key=RUNNING)
+    assert last.remaining == 0
+    assert last.pending == '{"touched_profilegame_ids": [1], "queue_name": "orchestrator"}'
+    assert not fake_redis.exists(PENDING)
+    assert not fake_redis.sismember("active_profiles", 7)
+
+
+def test_complete_keeps_pending_while_sync_complete_runs(fake_redis):
+    queue = ListJobQueue(fake_redis)
+    queue.push("low_priority", _payload())
+    fake_redis.set(PENDING, "{}")
+    fake_redis.set(RUNNING, "1")
+
+    completion = queue.complete(queue.pop(timeout=1), pending_key=PENDING, running_key=RUNNING)
+
+    assert completion.sync_complete_running and completion.pending is None
+    assert fake_redis.exists(PENDING)
+
+
+def test_complete_skips_uncounted_jobs(fake_redis):
+    queue = ListJobQueue(fake_redis)
+    queue.push("orchestrator", _payload("profile_refresh"))
+    fake_redis.set(PENDING, "{}")
+
+    assert queue.complete(queue.pop(timeout=1), pending_key=PENDING, running_key=RUNNING) is None
+    assert fake_redis.exists(PENDING)
+
+
+def test_complete_is_one_round_trip(fake_redis, monkeypatch):
+    queue = ListJobQueue(fake_redis)
+    for _ in range(2):
+        queue.push("low_priority", _payload())
+    queue.complete(queue.pop(timeout=1), pending_key=PENDING, running_key=RUNNING)  # warm-up: SCRIPT LOAD
+    job = queue.pop(timeout=1)
+
+    commands = []
+    original = fake_redis.execute_command
+
+    def counting(*args, **kwargs):
+        commands.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(fake_redis, "execute_command", counting)
+    queue.complete(job, pending_key=PENDING, running_key=RUNNING)
+
+    assert commands == ["EVALSHA"]
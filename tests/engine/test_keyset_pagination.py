@@ -0,0 +1,114 @@
+"""Tests for keyset pagination of the profile trophy log (trophies/util_modules/keyset.py).
+
+Walking every page of each trophy log sort by cursor must visit each earned
+trophy exactly once, in the order the sort promises (undated trophies last,
+ties broken by id). Cursors are opaque and bound to their sort.
+"""
+from datetime import timedelta
+
+import pytest
+from django.test import RequestFactory
+from django.utils import timezone
+
+from tests.factories import EarnedTrophyFactory, GameFactory, ProfileFactory, TrophyFactory
+from trophies.models import EarnedTrophy
+from trophies.util_modules.keyset import InvalidCursor, approximate_count, keyset_paginate
+from trophies.views.profile_views import ProfileDetailView
+
+pytestmark = pytest.mark.django_db
+
+TYPE_RANK = {'platinum': 0, 'gold': 1, 'silver': 2, 'bronze': 3}
+
+
+@pytest.fixture
+def profile():
+    profile = ProfileFactory()
+    game = GameFactory()
+    now = timezone.now()
+    specs = [
+        # (type, name, psn rate, pp rate, earned days ago or None)
+        ('platinum', 'Zenith', 0.5, 0.02, 1),
+        ('gold', 'apex', 3.0, 0.10, 2),
+        ('gold', 'Apex', 3.0, 0.10, 2),
+        ('silver', 'middle', 12.0, 0.30, None),
+        ('bronze', 'basic', 60.0, 0.90, 5),
+        ('bronze', 'Basic', 60.0, 0.90, None),
+        ('bronze', 'common', 60.0, 0.85, 3),
+        ('silver', 'rare-ish', 7.5, 0.25, 4),
+        ('bronze', 'late', 45.0, 0.70, 0),
+    ]
+    for trophy_type, name, psn_rate, pp_rate, days in specs:
+        trophy = TrophyFactory(
+            game=game, trophy_type=trophy_type, trophy_name=name,
+            trophy_earn_rate=psn_rate, earn_rate=pp_rate,
+        )
+        EarnedTrophyFactory(
+            profile=profile, trophy=trophy,
+            earned_date_time=None if days is None else now - timedelta(days=days),
+        )
+    EarnedTrophyFactory(profile=profile, trophy=TrophyFactory(game=game), earned=False)
+    return profile
+
+
+def _recent(et):
+    return (et.earned_date_time is None, -(et.earned_date_time.timestamp() if et.earned_date_time else 0))
+
+
+EXPECTED = {
+    'recent': lambda et: (*_recent(et), -et.id),
+    'oldest': lambda et: (et.earned_date_time is None, et.earned_date_time or 0, et.id),
+    'alpha': lambda et: (et.trophy.trophy_name.lower(), et.id),
+    'rarest_psn': lambda et: (et.trophy.trophy_earn_rate, *_recent(et), -et.id),
+    'common_psn': lambda et: (-et.trophy.trophy_earn_rate, *_recent(et), -et.id),
+    'rarest_pp': lambda et: (et.trophy.earn_rate, *_recent(et), -et.id),
+    'common_pp': lambda et: (-et.trophy.earn_rate, *_recent(et), -et.id),
+    'type': lambda et: (TYPE_RANK[et.trophy.trophy_type], et.trophy.trophy_name.lower(), et.id),
+}
+
+
+def _tab(profile, sort, cursor=None, per_page=2, page=1):
+    params = {'tab': 'trophies', 'sort': sort, 'page': page}
+    if cursor:
+        params['cursor'] = cursor
+    view = ProfileDetailView()
+    view.request = RequestFactory().get('/', params)
+    return view._build_trophies_tab_context(profile, per_page, page)['trophy_log']
+
+
+@pytest.mark.parametrize('sort', sorted(EXPECTED))
+def test_cursor_walk_visits_every_trophy_once_in_sort_order(profile, sort):
+    earned = EarnedTrophy.objects.filter(profile=profile, earned=True).select_related('trophy')
+    expected = [et.id for et in sorted(earned, key=EXPECTED[sort])]
+
+    page = _tab(profile, sort)
+    assert page.count == len(expected) and not page.count_is_estimate
+    seen = [et.id for et in page]
+    while page.has_next:
+        page = _tab(profile, sort, page.next_cursor)
+        assert page.count is None  # later pages never count
+        seen.extend(et.id for et in page)
+
+    assert seen == expected
+
+
+def test_cursor_is_bound_to_its_sort(profile):
+    cursor = _tab(profile, 'recent').next_cursor
+
+    assert list(_tab(profile, 'alpha', cursor)) == []
+    assert list(_tab(profile, 'recent', cursor + 'x')) == []
+    with pytest.raises(InvalidCursor):
+        keyset_paginate(EarnedTrophy.objects.all(), 'alpha', [('id', False)], 2, cursor=cursor)
+
+
+def test_approximate_count_is_exact_for_small_results(profile):
+    qs = EarnedTrophy.objects.filter(profile=profile, earned=True)
+    assert approximate_count(qs) == (9, False)
+    count, is_estimate = approximate_count(qs, exact_below=0)
+    assert is_estimate and count >= 1
+
+
+def test_legacy_page_number_without_cursor_is_empty(profile):
+    # Old ?page=N links and stale scrollers must not get page 1 again.
+    page = _tab(profile, 'recent', page=2)
+    assert list(page) == [] and not page.has_next
+    assert len(_tab(profile, 'recent', page='bogus')) == 2
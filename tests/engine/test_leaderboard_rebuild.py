@@ -0,0 +1,72 @@
+"""Tests for full leaderboard rebuilds (redis_leaderboard_service._rebuild_leaderboard).
+
+Rebuilds stream into `:building` shadow keys and RENAME them over the live
+board at the end, so the live board is never empty or partial mid-rebuild.
+"""
+import json
+
+import pytest
+
+from trophies.services import redis_leaderboard_service as lb
+
+SCORES = "lb:test:scores"
+DATA = "lb:test:data"
+
+
+@pytest.fixture
+def redis(fake_redis, monkeypatch):
+    monkeypatch.setattr(lb, "redis_client", fake_redis)
+    return fake_redis
+
+
+def _entries(n):
+    for profile_id in range(1, n + 1):
+        yield profile_id, profile_id * 10, {"psn_username": f"hunter{profile_id}"}
+
+
+def test_rebuild_streams_chunks_then_swaps_in(redis):
+    redis.zadd(SCORES, {"999": 1})
+    redis.hset(DATA, "999", "{}")
+
+    count = lb._rebuild_leaderboard(SCORES, DATA, _entries(7), chunk_size=3)
+
+    assert count == 7
+    assert redis.zcard(SCORES) == 7 and redis.zscore(SCORES, "999") is None
+    assert json.loads(redis.hget(DATA, "7")) == {"psn_username": "hunter7"}
+    assert not redis.exists(f"{SCORES}:building", f"{DATA}:building")
+    assert redis.hexists("lb:meta:last_rebuild", SCORES)
+
+
+def test_live_board_is_untouched_while_building(redis):
+    redis.zadd(SCORES, {"999": 1})
+    redis.hset(DATA, "999", "{}")
+    seen_live = []
+
+    def entries():
+        for entry in _entries(4):
+            seen_live.append(redis.zrange(SCORES, 0, -1))
+            yield entry
+
+    lb._rebuild_leaderboard(SCORES, DATA, entries(), chunk_size=2)
+
+    assert all(live == [b"999"] for live in seen_live)
+    assert redis.zcard(SCORES) == 4
+
+
+def test_empty_rebuild_clears_the_board(redis):
+    redis.zadd(SCORES, {"999": 1})
+    redis.hset(DATA, "999", "{}")
+
+    assert lb._rebuild_leaderboard(SCORES, DATA, iter(())) == 0
+    assert not redis.exists(SCORES, DATA)
+
+
+def test_leftover_building_keys_do_not_leak_into_the_board(redis):
+    # A previous rebuild that died mid-stream.
+    redis.zadd(f"{SCORES}:building", {"555": 5})
+    redis.hset(f"{DATA}:building", "555", "{}")
+
+    lb._rebuild_leaderboard(SCORES, DATA, _entries(2))
+
+    assert redis.zscore(SCORES, "555") is None
+    assert not redis.hexists(DATA, "555")
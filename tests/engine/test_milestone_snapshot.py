@@ -0,0 +1,94 @@
+"""Tests for snapshot-based milestone evaluation.
+
+check_all_milestones_for_user seeds the handlers' _cache with
+build_milestone_snapshot() (trophies/milestone_handlers.py) and writes
+progress/awards in bulk. The snapshot must agree with what every handler
+computes on its own, and the sweep's query count must not grow with the
+number of milestones.
+"""
+from datetime import timedelta
+
+import pytest
+
+from trophies.milestone_handlers import MILESTONE_HANDLERS, _snapshot_metrics, build_milestone_snapshot
+from trophies.models import Challenge, Milestone, Review, Title, UserMilestone, UserMilestoneProgress, UserTitle
+from trophies.services import milestone_service
+from trophies.services.milestone_service import check_all_milestones_for_user
+from tests.factories import (
+    BadgeFactory,
+    ProfileFactory,
+    ProfileGameFactory,
+    ReviewFactory,
+    UserBadgeProgressFactory,
+    UserConceptRatingFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def _milestone(ctype, target, **kw):
+    return Milestone.objects.create(
+        name=f'{ctype} {target}', criteria_type=ctype, criteria_details={'target': target}, **kw,
+    )
+
+
+@pytest.fixture
+def busy_profile():
+    profile = ProfileFactory()
+    ProfileGameFactory(profile=profile, has_plat=True, play_duration=timedelta(hours=5))
+    ProfileGameFactory(profile=profile, has_plat=True, play_duration=timedelta(hours=7, minutes=30))
+    ProfileGameFactory(profile=profile, has_plat=False)
+    UserConceptRatingFactory(profile=profile)
+    long_review, short_review = ReviewFactory(profile=profile), ReviewFactory(profile=profile)
+    Review.objects.filter(pk=long_review.pk).update(word_count=200, helpful_count=4)
+    Review.objects.filter(pk=short_review.pk).update(word_count=20, helpful_count=1)
+    UserBadgeProgressFactory(profile=profile, badge=BadgeFactory(), completed_concepts=3)
+    Challenge.objects.create(profile=profile, challenge_type='az', name='A-Z', completed_count=6)
+    Challenge.objects.create(
+        profile=profile, challenge_type='genre', name='Genres', completed_count=2, platted_subgenre_count=9,
+    )
+    return profile
+
+
+def test_snapshot_matches_each_handler_on_its_own(busy_profile):
+    ctypes = [*_snapshot_metrics(), 'calendar_months_total', 'calendar_month_jan']
+    snapshot = build_milestone_snapshot(busy_profile, ctypes)
+
+    for ctype in ctypes:
+        milestone = _milestone(ctype, 1)
+        handler = MILESTONE_HANDLERS[ctype]
+        assert handler(busy_profile, milestone, _cache=dict(snapshot)) == handler(busy_profile, milestone), ctype
+
+
+def test_sweep_awards_tiers_and_notifies_highest_after_commit(
+    busy_profile, monkeypatch, django_capture_on_commit_callbacks
+):
+    notified = []
+    monkeypatch.setattr(milestone_service, '_notify_milestones', lambda ums: notified.extend(ums))
+    title = Title.objects.create(name='Platter')
+    low, high = _milestone('plat_count', 1, title=title), _milestone('plat_count', 2)
+    out_of_reach = _milestone('plat_count', 50)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        awarded, notified_ums = check_all_milestones_for_user(busy_profile, criteria_type='plat_count')
+
+    assert {m.id for m in awarded} == {low.id, high.id}
+    assert [um.milestone_id for um in notified] == [high.id] == [um.milestone_id for um in notified_ums]
+    assert UserTitle.objects.filter(profile=busy_profile, title=title, source_id=low.id).exists()
+    assert Milestone.objects.get(pk=low.pk).earned_count == 1
+    assert UserMilestoneProgress.objects.get(profile=busy_profile, milestone=out_of_reach).progress_value == 2
+    assert not UserMilestone.objects.filter(profile=busy_profile, milestone=out_of_reach).exists()
+
+    # A second sweep has nothing new to award or announce.
+    assert check_all_milestones_for_user(busy_profile, criteria_type='plat_count') == ([], [])
+
+
+def test_sweep_query_count_does_not_grow_with_milestones(busy_profile, django_assert_max_num_queries):
+    for ctype in _snapshot_metrics():
+        for target in (1, 10, 100):
+            _milestone(ctype, target)
+    check_all_milestones_for_user(busy_profile, notify_webapp=False)  # settle progress rows
+
+    # milestones, progress, earned ids, snapshot + savepoint/dashboard overhead
+    with django_assert_max_num_queries(8):
+        check_all_milestones_for_user(busy_profile, notify_webapp=False)
@@ -0,0 +1,139 @@
+"""Tests for the anonymous page cache (trophies/util_modules/page_cache.py).
+
+Anonymous GETs of canonical pages are rendered once and served from cache
+with the viewer's own CSRF token. Invalidation retires the entry but it is
+still served (stale-while-revalidate) while one request rebuilds it, and
+only responses that are safe to share are stored.
+"""
+import re
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import _does_token_match, get_token
+from django.test import RequestFactory
+
+from trophies.services.trophy_list_service import invalidate_trophy_list_cache
+from trophies.util_modules.cache_invalidation import cache_generation
+from trophies.util_modules.page_cache import (
+    CSRF_PLACEHOLDER,
+    _variant,
+    get_or_render,
+    invalidate_page_cache,
+    is_cacheable_request,
+    page_cache_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(fake_redis, monkeypatch):
+    monkeypatch.setattr("trophies.util_modules.cache.redis_client", fake_redis)
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _request(path='/games/NPWR00001_00/', query='', user=None):
+    request = RequestFactory().get(path + (f'?{query}' if query else ''))
+    request.user = user or AnonymousUser()
+    return request
+
+
+class Page:
+    """Render callable that counts renders and embeds the request's CSRF token."""
+
+    def __init__(self, status=200, cookie=None):
+        self.renders = 0
+        self.status = status
+        self.cookie = cookie
+
+    def __call__(self, request):
+        def render():
+            self.renders += 1
+            token = get_token(request)
+            response = HttpResponse(
+                f'<meta name="csrf-token" content="{token}">'
+                f'<input type="hidden" name="csrfmiddlewaretoken" value="{token}">'
+                f'<p>render {self.renders}</p>',
+                status=self.status,
+            )
+            if self.cookie:
+                response.set_cookie(self.cookie, '1')
+            return response
+        return render
+
+
+def _serve(page, request=None, hits=None):
+    request = request or _request()
+    on_hit = (lambda: hits.append(1)) if hits is not None else None
+    return get_or_render(request, 'game_page', 1, page(request), on_hit=on_hit), request
+
+
+def test_second_anonymous_view_is_served_from_cache_with_its_own_token():
+    page, hits = Page(), []
+
+    first, _ = _serve(page, hits=hits)
+    second, request = _serve(page, hits=hits)
+
+    assert page.renders == 1
+    assert first['X-Page-Cache'] == 'miss'
+    assert second['X-Page-Cache'] == 'hit'
+    assert hits == [1]
+    html = second.content.decode()
+    assert CSRF_PLACEHOLDER not in html and '<p>render 1</p>' in html
+    tokens = re.findall(r'(?:value|content)="([^"]+)"', html)
+    assert len(tokens) == 2
+    assert all(_does_token_match(t, request.META['CSRF_COOKIE']) for t in tokens)
+    assert 'Cookie' in second['Vary']
+
+
+def test_only_plain_anonymous_gets_are_eligible(django_user_model):
+    assert is_cacheable_request(_request())
+    assert not is_cacheable_request(_request(query='sort=alpha'))
+    assert not is_cacheable_request(RequestFactory().post('/games/NPWR00001_00/'))
+    assert not is_cacheable_request(_request(user=django_user_model(username='member')))
+    htmx = _request()
+    htmx.htmx = True
+    assert not is_cacheable_request(htmx)
+
+
+def test_invalidated_page_is_rebuilt_by_one_request_and_served_stale_to_the_rest():
+    page = Page()
+    _serve(page)
+    invalidate_page_cache('game_page', 1)
+
+    # Another request already holds the rebuild lock: serve the old page.
+    key = page_cache_key('game_page', 1, _variant(_request()))
+    cache.add(f'{key}:rebuild', 1, 30)
+    stale, _ = _serve(page)
+    assert stale['X-Page-Cache'] == 'stale'
+    assert page.renders == 1
+
+    cache.delete(f'{key}:rebuild')
+    rebuilt, _ = _serve(page)
+    assert rebuilt['X-Page-Cache'] == 'miss'
+    assert page.renders == 2
+    assert _serve(page)[0]['X-Page-Cache'] == 'hit'
+
+
+def test_site_banner_flags_vary_the_cached_page(fake_redis):
+    page = Page()
+    _serve(page)
+    fake_redis.set('site:psn_outage', '{"activated_at": 1}')
+
+    assert _serve(page)[0]['X-Page-Cache'] == 'miss'
+    assert page.renders == 2
+
+
+@pytest.mark.parametrize('page', [Page(status=404), Page(cookie='sessionid')])
+def test_unshareable_responses_are_not_stored(page):
+    _serve(page)
+    _serve(page)
+    assert page.renders == 2
+
+
+def test_trophy_list_invalidation_retires_the_game_page():
+    generation = cache_generation('game_page', 1)
+    invalidate_trophy_list_cache(1)
+    assert cache_generation('game_page', 1) != generation
@@ -0,0 +1,88 @@
+"""Tests for the single-pass progress leaderboard update (redis_leaderboard_service).
+
+update_progress_leaderboards_for_profile used to run an exists() plus an
+aggregate per series the profile touched. compute_profile_progress now answers
+every series and the global board from two queries; these pin its counts
+(a game reachable through several stages is counted once) and the query bound.
+"""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from tests.factories import (
+    ConceptFactory,
+    EarnedTrophyFactory,
+    GameFactory,
+    ProfileFactory,
+    ProfileGameFactory,
+    StageFactory,
+    TrophyFactory,
+)
+from trophies.services import redis_leaderboard_service as lb
+
+pytestmark = pytest.mark.django_db
+
+
+def _played_game(profile, *stages):
+    concept = ConceptFactory()
+    for stage in stages:
+        stage.concepts.add(concept)
+    game = GameFactory(concept=concept)
+    ProfileGameFactory(profile=profile, game=game)
+    return game
+
+
+def _earn(profile, game, trophy_type, when=None):
+    trophy = TrophyFactory(game=game, trophy_type=trophy_type)
+    return EarnedTrophyFactory(profile=profile, trophy=trophy, earned_date_time=when or timezone.now())
+
+
+def test_counts_per_series_and_global_without_double_counting():
+    profile = ProfileFactory()
+    alpha_1 = StageFactory(series_slug="alpha", stage_number=1)
+    alpha_2 = StageFactory(series_slug="alpha", stage_number=2)
+    beta = StageFactory(series_slug="beta")
+    shared = _played_game(profile, alpha_1, alpha_2, beta)  # two alpha stages + beta
+    beta_only = _played_game(profile, beta)
+    _played_game(profile, StageFactory(series_slug="gamma"))  # played, nothing earned
+
+    latest = timezone.now()
+    _earn(profile, shared, "platinum", latest - timedelta(days=2))
+    _earn(profile, shared, "gold", latest - timedelta(days=3))
+    _earn(profile, beta_only, "bronze", latest)
+    unearned = _earn(profile, beta_only, "silver")
+    unearned.earned = False
+    unearned.save()
+
+    series, total = lb.compute_profile_progress(profile)
+
+    assert series["alpha"] == (1, 1, 0, 0, latest - timedelta(days=2))
+    assert series["beta"] == (1, 1, 0, 1, latest)
+    assert series["gamma"] is None
+    assert total == (1, 1, 0, 1, latest)
+
+
+def test_profile_without_badge_games_has_no_progress():
+    profile = ProfileFactory()
+    ProfileGameFactory(profile=profile)  # game not in any stage
+
+    assert lb.compute_profile_progress(profile) == ({}, None)
+
+
+def test_update_writes_every_board_from_a_constant_number_of_queries(
+    fake_redis, monkeypatch, django_assert_num_queries
+):
+    monkeypatch.setattr(lb, "redis_client", fake_redis)
+    profile = ProfileFactory()
+    for slug in ("alpha", "beta", "gamma", "delta"):
+        _earn(profile, _played_game(profile, StageFactory(series_slug=slug)), "gold")
+
+    # mapping + per-game counts + displayed title
+    with django_assert_num_queries(3):
+        lb.update_progress_leaderboards_for_profile(profile)
+
+    for slug in ("alpha", "beta", "gamma", "delta"):
+        assert fake_redis.zscore(lb._progress_scores_key(slug), profile.id) == lb.compute_progress_score(0, 1, 0, 0)
+    assert fake_redis.zscore(lb._progress_scores_key(None), profile.id) == lb.compute_progress_score(0, 4, 0, 0)
+    assert fake_redis.hexists(lb._progress_data_key(None), profile.id)
@@ -0,0 +1,112 @@
+"""Tests for the atomic sliding-window rate limiter (trophies/util_modules/rate_limiter.py).
+
+Runs the Lua scripts on fakeredis (needs lupa, see requirements-dev.txt).
+The last test asserts Redis round trips per call for the limiter against the
+separate-command pattern it replaced.
+"""
+import time
+
+import pytest
+
+from trophies.util_modules.rate_limiter import SlidingWindowRateLimiter, window_counts
+
+
+@pytest.fixture
+def limiter(fake_redis):
+    return SlidingWindowRateLimiter(fake_redis, "rl:test", limit=2, window_seconds=10)
+
+
+def test_try_acquire_denies_when_full_and_reports_wait(limiter, fake_redis):
+    first = limiter.try_acquire()
+    second = limiter.try_acquire()
+    denied = limiter.try_acquire()
+
+    assert first.acquired and second.acquired
+    assert (first.count, second.count) == (1, 2)
+    assert not denied.acquired and denied.member is None
+    assert 9 < denied.retry_after <= 10
+    assert fake_redis.zcard("rl:test") == 2
+    assert 0 < fake_redis.pttl("rl:test") <= 10_000
+
+
+def test_expired_entries_free_slots(limiter, fake_redis):
+    old = time.time() - 11
+    fake_redis.zadd("rl:test", {"old-1": old, "old-2": old})
+
+    assert limiter.try_acquire().acquired
+    assert limiter.count() == 1
+
+
+def test_record_ignores_limit(limiter):
+    for _ in range(3):
+        assert limiter.record().acquired
+    assert limiter.count() == 3
+
+
+def test_rollback_removes_only_its_own_member(limiter, fake_redis):
+    mine = limiter.try_acquire().member
+    theirs = limiter.try_acquire().member  # newer entry from another worker
+
+    assert limiter.rollback(mine) is True
+    assert limiter.rollback(mine) is False
+    assert [m.decode() for m in fake_redis.zrange("rl:test", 0, -1)] == [theirs]
+
+
+def _age_entries(redis, key, seconds):
+    """Age every entry in `key` by `seconds` instead of really sleeping."""
+    for member, score in redis.zrange(key, 0, -1, withscores=True):
+        redis.zadd(key, {member: score - seconds - 0.001})
+
+
+def test_acquire_sleeps_for_reported_wait(fake_redis, monkeypatch):
+    limiter = SlidingWindowRateLimiter(fake_redis, "rl:short", limit=1, window_seconds=0.2)
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        _age_entries(fake_redis, "rl:short", seconds)
+
+    monkeypatch.setattr("trophies.util_modules.rate_limiter.time.sleep", fake_sleep)
+
+    assert limiter.acquire(max_wait=1).acquired
+    assert limiter.acquire(max_wait=1).acquired
+
+    assert len(sleeps) == 1 and 0 < sleeps[0] <= 0.2
+
+
+def test_window_counts_batches_keys(fake_redis):
+    fake_redis.zadd("a", {"x": time.time(), "y": time.time() - 100})
+
+    assert window_counts(fake_redis, ["a", "b"], 10) == [1, 0]
+    assert window_counts(fake_redis, [], 10) == []
+
+
+def test_round_trips_per_call(fake_redis, monkeypatch):
+    commands = []
+    original = fake_redis.execute_command
+
+    def counting(*args, **kwargs):
+        commands.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(fake_redis, "execute_command", counting)
+    calls = 200
+
+    # Previous pattern: prune + count, then record (+ pop-newest on rollback).
+    for i in range(calls):
+        now = time.time()
+        fake_redis.zremrangebyscore("legacy", 0, now - 10)
+        if fake_redis.zcard("legacy") < calls:
+            fake_redis.zadd("legacy", {f"{now}:{i}": now})
+    legacy_trips = len(commands)
+
+    limiter = SlidingWindowRateLimiter(fake_redis, "atomic", limit=calls + 1, window_seconds=10)
+    limiter.try_acquire()  # warm-up: the first call pays a NOSCRIPT miss + SCRIPT LOAD
+    commands.clear()
+    for _ in range(calls):
+        limiter.try_acquire()
+    atomic_trips = len(commands)
+
+    assert legacy_trips / calls == 3
+    assert atomic_trips / calls == 1
+    assert set(commands) == {"EVALSHA"}
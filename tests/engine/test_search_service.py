@@ -0,0 +1,67 @@
+"""Tests for site search (trophies/services/search_service.py, api/search_views.py).
+
+Name search must be served by the UPPER() trigram indexes from migration
+0262, match Roman-numeral variants, rank prefix matches and closer names
+first, and back a cached typeahead endpoint.
+"""
+import pytest
+from django.core.cache import cache
+from django.db import connection
+
+from tests.factories import GameFactory, ProfileFactory, TrophyFactory
+from trophies.models import Game
+from trophies.services.search_service import contains_any, search_games, search_profiles, suggest
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_numeral_variants_match_either_spelling():
+    xv = GameFactory(title_name='Final Fantasy XV')
+    seven = GameFactory(title_name='Final Fantasy 7 Remake')
+
+    assert [g.id for g in search_games('final fantasy 15')] == [xv.id]
+    assert [g.id for g in search_games('Final Fantasy VII')] == [seven.id]
+
+
+def test_prefix_and_similarity_outrank_popularity():
+    GameFactory(title_name='Lost Soulsmith Arena', played_count=900)
+    dark = GameFactory(title_name='Dark Souls', played_count=50)
+    prefix = GameFactory(title_name='Souls of Mistover', played_count=10)
+
+    ranked = [g.id for g in search_games('souls', limit=3)]
+    assert ranked[:2] == [prefix.id, dark.id]
+
+    # Too short for similarity: prefix first, then popularity.
+    big = ProfileFactory(psn_username='xyhunter', total_trophies=5000)
+    small = ProfileFactory(psn_username='hunterxy', total_trophies=10)
+    assert [p.id for p in search_profiles('hu', limit=2)] == [small.id, big.id]
+
+
+def test_icontains_search_uses_the_upper_trigram_index():
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')
+    plan = Game.objects.filter(contains_any('title_name', 'souls')).explain()
+    assert 'game_title_upper_trgm' in plan
+
+
+def test_suggest_endpoint_is_ranked_and_cached(client, django_assert_num_queries):
+    game = GameFactory(title_name='Bloodborne')
+    TrophyFactory(game=game, trophy_name='Blood Moon')
+    ProfileFactory(psn_username='bloodhunter', display_psn_username='BloodHunter')
+
+    data = client.get('/api/v1/search/suggest/', {'q': 'Blood'}).json()
+
+    assert [g['title'] for g in data['games']] == ['Bloodborne']
+    assert data['games'][0]['url'].endswith(f'/{game.np_communication_id}/')
+    assert [t['name'] for t in data['trophies']] == ['Blood Moon']
+    assert [p['username'] for p in data['profiles']] == ['BloodHunter']
+    with django_assert_num_queries(0):
+        assert suggest('  blood ') == data
+    assert client.get('/api/v1/search/suggest/', {'q': 'b'}).json()['games'] == []
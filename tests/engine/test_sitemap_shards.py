@@ -0,0 +1,104 @@
+"""Tests for pre-built sitemap shards (core/services/sitemap_shards.py, build_sitemaps).
+
+A build must cover every game and profile exactly once across gzipped
+shards, carry lastmod from the fields that move with the page, switch
+/sitemap.xml over to the built index (retiring the live games/profiles
+pages), and keep only the current and previous builds in storage.
+"""
+import gzip
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from core.services import sitemap_shards
+from core.services.sitemap_shards import SITEMAP_PREFIX, build_sitemaps
+from tests.factories import GameFactory, ProfileFactory
+from trophies.models import TrophyGroup
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    cache.clear()
+    yield tmp_path
+    cache.clear()
+
+
+def _locs(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    body = b''.join(response.streaming_content) if response.streaming else response.content
+    if path.endswith('.gz'):
+        assert response['Content-Type'] == 'application/gzip'
+        body = gzip.decompress(body)
+    return re.findall(r'<loc>([^<]+)</loc>', body.decode())
+
+
+def test_build_shards_every_game_and_profile_once(client):
+    games = [GameFactory() for _ in range(5)]
+    profiles = [ProfileFactory() for _ in range(3)]
+    assert 'sitemap-games.xml' in ''.join(_locs(client, '/sitemap.xml'))  # live fallback
+    assert client.get('/sitemap-games.xml').status_code == 200
+
+    manifest = build_sitemaps(shard_size=2, batch_size=3)
+
+    assert sorted(manifest['shards']) == ['games-1', 'games-2', 'games-3', 'profiles-1', 'profiles-2']
+    index = _locs(client, '/sitemap.xml')
+    assert 'https://platpursuit.com/sitemap-badges.xml' in index
+    assert not any('sitemap-games.xml' in loc for loc in index)
+    shard_urls = []
+    for loc in index:
+        if loc.endswith('.xml.gz'):
+            shard_urls.extend(_locs(client, loc.removeprefix('https://platpursuit.com')))
+    assert sorted(shard_urls) == sorted(
+        ['https://platpursuit.com' + reverse('game_detail', args=[g.np_communication_id]) for g in games]
+        + ['https://platpursuit.com' + reverse('profile_detail', args=[p.psn_username]) for p in profiles]
+    )
+    assert client.get('/sitemap-games-9.xml.gz').status_code == 404
+    # The old live pages of sharded sections are retired; small sections stay live.
+    assert client.get('/sitemap-games.xml', {'p': 2}).status_code == 410
+    assert client.get('/sitemap-profiles.xml').status_code == 410
+    assert client.get('/sitemap-badges.xml').status_code == 200
+
+
+def test_index_is_served_from_cache_not_storage(client, media_root):
+    GameFactory()
+    manifest = build_sitemaps()
+    (media_root / manifest['index']).unlink()
+
+    assert any(loc.endswith('.xml.gz') for loc in _locs(client, '/sitemap.xml'))
+
+
+def test_lastmod_follows_sync_and_new_trophy_groups():
+    now = timezone.now()
+    game = GameFactory()
+    TrophyGroup.objects.create(game=game, trophy_group_id='001', created_at=now + timedelta(days=3))
+    profile = ProfileFactory()
+    profile.__class__.objects.filter(pk=profile.pk).update(last_synced=now + timedelta(days=5))
+
+    shards = build_sitemaps()['shards']
+
+    assert shards['games-1']['lastmod'].startswith((now + timedelta(days=3)).strftime('%Y-%m-%dT'))
+    assert shards['profiles-1']['lastmod'].startswith((now + timedelta(days=5)).strftime('%Y-%m-%dT'))
+
+
+def test_rebuild_keeps_only_current_and_previous_builds(media_root, monkeypatch):
+    GameFactory()
+    builds = []
+    for stamp in ('20261001T000000', '20261002T000000', '20261003T000000'):
+        monkeypatch.setattr(
+            sitemap_shards.timezone, 'now',
+            lambda stamp=stamp: datetime.strptime(stamp, '%Y%m%dT%H%M%S').replace(tzinfo=dt_timezone.utc),
+        )
+        call_command('build_sitemaps', stdout=open('/dev/null', 'w'))
+        builds.append(stamp)
+
+    kept = sorted(p.name for p in (media_root / SITEMAP_PREFIX).iterdir() if p.is_dir() and any(p.iterdir()))
+    assert kept == builds[1:]
@@ -0,0 +1,81 @@
+"""Tests for the post-sync stage runner (trophies/util_modules/stage_runner.py).
+
+_job_sync_complete runs its post-processing as a DAG on a bounded thread pool.
+These pin the contract it relies on: dependencies are respected, independent
+stages overlap, a failure skips only its dependents and is re-raised after
+everything settles, and the phase callback only moves forward.
+"""
+import threading
+import time
+
+import pytest
+
+from trophies.util_modules.stage_runner import Stage, run_stages
+
+
+def test_dependencies_run_first_and_independent_stages_overlap():
+    order = []
+    both_running = threading.Barrier(2, timeout=5)
+
+    def step(name, rendezvous=False):
+        def run():
+            if rendezvous:
+                both_running.wait()  # deadlocks (times out) unless the two overlap
+            order.append(name)
+        return run
+
+    timings = run_stages([
+        Stage('stats', step('stats')),
+        Stage('badges', step('badges', rendezvous=True), after=('stats',)),
+        Stage('challenges', step('challenges', rendezvous=True), after=('stats',)),
+        Stage('milestones', step('milestones'), after=('badges',)),
+    ])
+
+    assert order[0] == 'stats'
+    assert order.index('milestones') > order.index('badges')
+    assert set(timings) == {'stats', 'badges', 'challenges', 'milestones'}
+
+
+def test_failure_skips_dependents_and_is_raised_after_the_rest_finish():
+    ran = []
+
+    def boom():
+        raise RuntimeError('badges broke')
+
+    def slow_challenge():
+        time.sleep(0.05)
+        ran.append('challenges')
+
+    with pytest.raises(RuntimeError, match='badges broke'):
+        run_stages([
+            Stage('badges', boom),
+            Stage('milestones', lambda: ran.append('milestones'), after=('badges',)),
+            Stage('challenges', slow_challenge),
+        ])
+
+    assert ran == ['challenges']
+
+
+def test_phase_follows_earliest_unfinished_stage():
+    phases, timings = [], []
+    release = threading.Event()
+
+    run_stages(
+        [
+            Stage('stats', lambda: None, phase='stats_badges'),
+            Stage('milestones', release.wait, after=('stats',), phase='milestones'),
+            Stage('challenges', release.set, after=('stats',), phase='challenges'),
+        ],
+        on_phase=phases.append,
+        on_timing=lambda name, seconds: timings.append(name),
+    )
+
+    assert phases == ['stats_badges', 'milestones']  # challenges finished first, so never shown
+    assert sorted(timings) == ['challenges', 'milestones', 'stats']
+
+
+def test_rejects_unknown_or_forward_dependencies():
+    with pytest.raises(ValueError):
+        run_stages([Stage('a', lambda: None, after=('missing',))])
+    with pytest.raises(ValueError):
+        run_stages([Stage('a', lambda: None, after=('b',)), Stage('b', lambda: None)])
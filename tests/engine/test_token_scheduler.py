@@ -0,0 +1,86 @@
+"""Tests for the event-driven token scheduler (trophies/token_scheduler.py).
+
+TokenKeeper itself builds its singleton at import time, so the scheduler is
+exercised directly with stand-in instances. The window-count script needs
+fakeredis' Lua support (lupa, see requirements-dev.txt).
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from trophies.token_scheduler import TokenScheduler
+
+
+def _inst(group_id, instance_id, token, **overrides):
+    data = dict(
+        group_id=group_id, instance_id=instance_id, token=token, client=object(),
+        is_busy=False, last_health=time.time(), job_start_time=0,
+    )
+    data.update(overrides)
+    return SimpleNamespace(**data)
+
+
+@pytest.fixture
+def scheduler(fake_redis):
+    return TokenScheduler(fake_redis, "m1", window_seconds=900, recheck_interval=5)
+
+
+def _add_calls(redis, token, n, age=0):
+    now = time.time()
+    redis.zadd(f"token:{token}:m1:timestamps", {f"{token}-{i}": now - age for i in range(n)})
+
+
+def test_window_counts_prunes_expired_entries_in_one_call(scheduler, fake_redis):
+    _add_calls(fake_redis, "a", 3)
+    _add_calls(fake_redis, "b", 2, age=1000)  # outside the window
+
+    assert scheduler.window_counts(["a", "b", "c"]) == [3, 0, 0]
+    assert fake_redis.zcard("token:b:m1:timestamps") == 0
+
+
+def test_acquire_picks_least_loaded_eligible_instance(scheduler, fake_redis):
+    busy = _inst(0, 0, "a", is_busy=True)
+    loaded = _inst(0, 1, "b")
+    light = _inst(0, 2, "c")
+    parked = _inst(1, 0, "d", last_health=0)
+    _add_calls(fake_redis, "b", 5)
+    _add_calls(fake_redis, "c", 1)
+
+    inst = scheduler.acquire([busy, loaded, light, parked], "sync_trophies", timeout=1)
+
+    assert inst is light
+    assert light.is_busy and light.job_start_time > 0
+    assert fake_redis.get("instance_lock:m1:0:2") == b"1"
+
+
+def test_release_wakes_waiting_worker(scheduler, fake_redis):
+    inst = _inst(0, 0, "a")
+    assert scheduler.acquire([inst], "held", timeout=1) is inst
+
+    result = {}
+    waiter = threading.Thread(target=lambda: result.update(inst=scheduler.acquire([inst], "sync_trophies", timeout=5)))
+    waiter.start()
+    time.sleep(0.1)
+    released_at = time.monotonic()
+    scheduler.release(inst)
+    waiter.join(timeout=2)
+
+    assert result["inst"] is inst
+    # Woken by the release, not by the 5s re-check.
+    assert time.monotonic() - released_at < 1
+    stats = scheduler.wait_stats()
+    assert stats["waiting"] == 0
+    assert stats["by_job_type"]["sync_trophies"]["acquired"] == 1
+    assert stats["by_job_type"]["sync_trophies"]["max_wait_ms"] >= 100
+
+
+def test_acquire_times_out_and_counts(scheduler, fake_redis):
+    fake_redis.set("instance_lock:m1:0:0", "1")  # held by a stale owner
+
+    assert scheduler.acquire([_inst(0, 0, "a")], "profile_refresh", timeout=0.05) is None
+
+    entry = scheduler.wait_stats()["by_job_type"]["profile_refresh"]
+    assert entry["timeouts"] == 1
+    assert entry["acquired"] == 0
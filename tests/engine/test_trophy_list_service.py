@@ -0,0 +1,123 @@
+"""Tests for the cached per-game trophy list (trophies/services/trophy_list_service.py).
+
+GameDetailView filters and sorts a pre-serialized trophy list instead of
+re-querying the game's trophies. select_trophies must give exactly what the
+old per-request filter/sort did, the cached list must be served without
+queries, and writers that change trophy rows must retire it.
+"""
+from datetime import datetime, timedelta
+from itertools import product
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from tests.factories import GameFactory, TrophyFactory
+from trophies.models import Trophy, TrophyGroup
+from trophies.services import earn_rate_service
+from trophies.services.earn_rate_service import mark_dirty, refresh_dirty_earn_rates
+from trophies.services.trophy_list_service import (
+    SORT_KEYS,
+    build_trophy_list,
+    get_trophy_list,
+    psn_rarity_bracket,
+    select_trophies,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def game():
+    game = GameFactory(played_count=10)
+    specs = [
+        ('platinum', 'Zenith', 'default', 0.5, 1),
+        ('gold', 'apex', 'default', 3.0, 4),
+        ('silver', 'Middle', '001', 12.0, 4),
+        ('bronze', 'Basic', 'default', 60.0, 9),
+        ('bronze', 'basic two', '001', 30.0, 7),
+    ]
+    for trophy_type, name, group, psn_rate, earned in specs:
+        TrophyFactory(
+            game=game, trophy_type=trophy_type, trophy_name=name, trophy_group_id=group,
+            trophy_earn_rate=psn_rate, earned_count=earned, earn_rate=earned / 10,
+        )
+    TrophyGroup.objects.create(game=game, trophy_group_id='001', trophy_group_name='DLC One')
+    return game
+
+
+def _legacy(trophies, profile_earned, earned, sort, types, brackets, dlc):
+    """The per-request filter/sort GameDetailView used before the cache."""
+    out = list(trophies)
+    if profile_earned:
+        if earned == 'unearned':
+            out = [t for t in out if not profile_earned.get(t['trophy_id'], {}).get('earned', False)]
+        elif earned == 'earned':
+            out = [t for t in out if profile_earned.get(t['trophy_id'], {}).get('earned', False)]
+    if types:
+        out = [t for t in out if t['trophy_type'] in types]
+    if brackets:
+        out = [t for t in out if psn_rarity_bracket(t['trophy_earn_rate']) in brackets]
+    if dlc == 'base':
+        out = [t for t in out if t['trophy_group_id'] == 'default']
+    elif dlc == 'dlc':
+        out = [t for t in out if t['trophy_group_id'] != 'default']
+    if sort in SORT_KEYS:
+        out.sort(key=SORT_KEYS[sort])
+    elif sort == 'earned_date':
+        floor = timezone.make_aware(datetime.min)
+        out.sort(key=lambda t: (
+            profile_earned.get(t['trophy_id'], {}).get('earned_date_time') is None,
+            profile_earned.get(t['trophy_id'], {}).get('earned_date_time') or floor,
+        ))
+    return out
+
+
+def test_select_matches_per_request_filtering(game):
+    trophy_list = build_trophy_list(game.id)
+    ids = [t['trophy_id'] for t in trophy_list['trophies']]
+    now = timezone.now()
+    profile_earned = {
+        ids[1]: {'earned': True, 'earned_date_time': now},
+        ids[3]: {'earned': True, 'earned_date_time': now - timedelta(days=1)},
+        ids[4]: {'earned': False, 'earned_date_time': None},
+    }
+
+    for earned, sort, types, brackets, dlc in product(
+        ('default', 'earned', 'unearned'),
+        ('default', 'earned_date', *SORT_KEYS),
+        ([], ['bronze'], ['gold', 'silver']),
+        ([], ['common', 'ultra_rare']),
+        ('', 'base', 'dlc'),
+    ):
+        expected = _legacy(trophy_list['trophies'], profile_earned, earned, sort, types, brackets, dlc)
+        got = select_trophies(
+            trophy_list, profile_earned, earned=earned, sort=sort,
+            trophy_types=types, rarity_brackets=brackets, dlc_filter=dlc,
+        )
+        assert got == expected, (earned, sort, types, brackets, dlc)
+
+
+def test_cached_list_is_served_without_queries(game, django_assert_num_queries):
+    first = get_trophy_list(game.id)
+    assert first['groups']['001']['trophy_group_name'] == 'DLC One'
+    with django_assert_num_queries(0):
+        assert get_trophy_list(game.id) == first
+
+
+def test_earn_rate_refresh_retires_the_cached_list(game, fake_redis, monkeypatch):
+    monkeypatch.setattr(earn_rate_service, "redis_client", fake_redis)
+    Trophy.objects.filter(game=game).update(earn_rate=0.0)
+    assert {t['earn_rate'] for t in get_trophy_list(game.id)['trophies']} == {0.0}
+
+    mark_dirty([game.id])
+    refresh_dirty_earn_rates()
+
+    assert {t['earn_rate'] for t in get_trophy_list(game.id)['trophies']} == {0.1, 0.4, 0.9, 0.7}
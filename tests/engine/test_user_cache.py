@@ -0,0 +1,56 @@
+"""Tests for the shared PSN user-handle cache (trophies/user_cache.py)."""
+import time
+
+import pytest
+
+from trophies.user_cache import UserHandle, UserHandleCache
+
+HANDLE = UserHandle(account_id="111", online_id="Hunter")
+
+
+@pytest.fixture
+def cache(fake_redis):
+    return UserHandleCache(fake_redis, max_size=2, ttl=60)
+
+
+def test_put_caches_under_every_lookup_key(cache):
+    assert cache.get("Hunter") is None
+
+    cache.put(HANDLE, "Hunter", "111")
+
+    assert cache.get("Hunter") == HANDLE
+    assert cache.get("111") == HANDLE
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_redis_copy_survives_a_new_process(cache, fake_redis):
+    cache.put(HANDLE, "111")
+    restarted = UserHandleCache(fake_redis, max_size=2, ttl=60)
+
+    assert restarted.get("111") == HANDLE
+    assert restarted.stats()["redis_hits"] == 1
+    assert restarted.get("111") == HANDLE  # now served in-process
+    assert restarted.stats()["hits"] == 1
+    assert 0 < fake_redis.ttl("psn_user_handle:111") <= 60
+
+
+def test_lru_eviction_keeps_recently_used(cache, fake_redis):
+    cache.put(UserHandle("1", "a"), "1")
+    cache.put(UserHandle("2", "b"), "2")
+    cache.get("1")
+    cache.put(UserHandle("3", "c"), "3")
+    fake_redis.flushall()  # only the in-process copies are left
+
+    assert cache.get("1") is not None
+    assert cache.get("2") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_miss_and_prune(cache, fake_redis, monkeypatch):
+    cache.put(HANDLE, "111")
+    fake_redis.flushall()
+    later = time.time() + 61
+    monkeypatch.setattr("trophies.user_cache.time.time", lambda: later)
+
+    assert cache.prune() == 1
+    assert cache.get("111") is None
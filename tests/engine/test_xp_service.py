@@ -11,6 +11,7 @@ deliberately alongside those changes.
 """
 
 import pytest
+from hypothesis import HealthCheck, given, settings, strategies as st
 
 from trophies.models import ProfileGamification
 from trophies.services.xp_service import (
@@ -103,3 +104,92 @@ def test_saving_progress_auto_updates_gamification_via_signal():
 
     gam = ProfileGamification.objects.get(profile=profile)
     assert gam.total_badge_xp == 3 * BRONZE_STAGE_XP
+
+
+# --- Incremental recalculation -------------------------------------------------
+#
+# update_profile_gamification(profile, series_slugs=...) rebuilds only the
+# series that changed on top of the stored breakdown. Its contract is that it
+# always lands on exactly what the full calculate_total_xp() would.
+
+
+@pytest.fixture
+def xp_badges(db, fake_redis, monkeypatch):
+    monkeypatch.setattr("trophies.util_modules.cache.redis_client", fake_redis)
+    monkeypatch.setattr("trophies.services.redis_leaderboard_service.redis_client", fake_redis)
+    return [
+        BadgeFactory(series_slug="xp-alpha", tier=1),
+        BadgeFactory(series_slug="xp-alpha", tier=3),
+        BadgeFactory(series_slug="xp-beta", tier=2),
+        BadgeFactory(series_slug=None, tier=4),
+    ]
+
+
+def _stored(profile):
+    gam = ProfileGamification.objects.get(profile=profile)
+    return gam.total_badge_xp, gam.series_badge_xp, gam.total_badges_earned, gam.unique_badges_earned
+
+
+def _apply(profile, badge, op, concepts):
+    from trophies.models import UserBadge, UserBadgeProgress
+
+    if op == "progress":
+        UserBadgeProgress.objects.update_or_create(
+            profile=profile, badge=badge, defaults={"completed_concepts": concepts}
+        )
+    elif op == "earn":
+        UserBadge.objects.get_or_create(profile=profile, badge=badge)
+    else:
+        UserBadge.objects.filter(profile=profile, badge=badge).delete()
+
+
+def test_bulk_update_only_recalculates_changed_series(xp_badges):
+    from trophies.services.xp_service import bulk_gamification_update
+
+    profile = ProfileFactory()
+    alpha, _, beta, _ = xp_badges
+    UserBadgeProgressFactory(profile=profile, badge=beta, completed_concepts=1)
+    # Drift in an untouched series survives until a full recalculation...
+    ProfileGamification.objects.filter(profile=profile).update(series_badge_xp={"xp-beta": 1})
+
+    with bulk_gamification_update():
+        UserBadgeProgressFactory(profile=profile, badge=alpha, completed_concepts=2)
+
+    total, series, _, _ = _stored(profile)
+    assert series == {"xp-alpha": 2 * BRONZE_STAGE_XP, "xp-beta": 1}
+    assert total == 2 * BRONZE_STAGE_XP + 1
+
+    # ...which puts it right.
+    update_profile_gamification(profile)
+    assert _stored(profile) == calculate_total_xp(profile)
+
+
+op_strategy = st.tuples(
+    st.integers(min_value=0, max_value=3),              # badge index
+    st.sampled_from(["progress", "earn", "revoke"]),
+    st.integers(min_value=0, max_value=6),              # completed concepts
+)
+
+
+@settings(max_examples=40, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(batches=st.lists(
+    st.tuples(st.booleans(), st.lists(op_strategy, min_size=1, max_size=5)),
+    min_size=1, max_size=4,
+))
+def test_incremental_matches_full_recalculation(xp_badges, batches):
+    from trophies.services.xp_service import bulk_gamification_update
+
+    profile = ProfileFactory()
+    update_profile_gamification(profile)
+
+    for in_bulk, ops in batches:
+        if in_bulk:
+            with bulk_gamification_update():
+                for index, op, concepts in ops:
+                    _apply(profile, xp_badges[index], op, concepts)
+        else:
+            # Outside a bulk context each change updates through its signal.
+            for index, op, concepts in ops:
+                _apply(profile, xp_badges[index], op, concepts)
+
+        assert _stored(profile) == calculate_total_xp(profile)
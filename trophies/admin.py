@@ -181,9 +181,17 @@ class ProfileAdmin(admin.ModelAdmin):
         """Move all queued sync jobs for selected profiles to the target priority queue."""
         import json
         import logging
+        from trophies.job_queue import job_queue
         from trophies.util_modules.cache import redis_client
 
         logger = logging.getLogger("psn_api")
+        if job_queue.name != "list":
+            self.message_user(
+                request,
+                f"Moving queued jobs is only supported by the list job queue backend (active: {job_queue.name}).",
+                messages.WARNING,
+            )
+            return
         target_queue_key = f"{target_queue}_jobs"
         source_queues = ['high_priority', 'medium_priority', 'low_priority', 'bulk_priority']
         profile_ids = {str(p.id) for p in queryset}
@@ -1339,14 +1347,22 @@ class BadgeAdmin(admin.ModelAdmin):
     actions = ['mark_series_live', 'mark_series_not_live', 'assign_set_numbers']
 
     def mark_series_live(self, request, queryset):
+        from trophies.services.badge_topology import invalidate_badge_topology
+
         series_slugs = set(queryset.values_list('series_slug', flat=True))
         updated = Badge.objects.filter(series_slug__in=series_slugs).update(is_live=True)
+        # .update() fires no post_save; the cached topology lists live badges.
+        invalidate_badge_topology()
         self.message_user(request, f"Marked {updated} badges across {len(series_slugs)} series as live.")
     mark_series_live.short_description = "Mark series live (all tiers)"
 
     def mark_series_not_live(self, request, queryset):
+        from trophies.services.badge_topology import invalidate_badge_topology
+
         series_slugs = set(queryset.values_list('series_slug', flat=True))
         updated = Badge.objects.filter(series_slug__in=series_slugs).update(is_live=False)
+        # .update() fires no post_save; the cached topology lists live badges.
+        invalidate_badge_topology()
         self.message_user(request, f"Marked {updated} badges across {len(series_slugs)} series as not live.")
     mark_series_not_live.short_description = "Mark series not live (all tiers)"
 
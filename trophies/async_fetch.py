@@ -0,0 +1,125 @@
+"""
+Asyncio fetch engine for the profile_refresh slow path (`start_token_keeper --async`).
+
+The slow path walks a profile's trophy_titles and title_stats pages and
+resolves unmatched title_ids, one blocking PSN call after another on the
+worker thread that picked up the orchestrator job. On a 2,000-game initial
+sync the 20-entry title_stats pages alone are ~100 sequential round trips,
+with every ProfileGame playtime update interleaved between them.
+
+With the engine enabled, those fetches for one profile are issued
+concurrently from an event loop running on its own thread. psnawp is
+synchronous (requests sessions, pooled per token instance), so each call
+still runs on a thread from a fetch executor; the loop only schedules them
+and bounds how many are in flight. TokenKeeper sizes that bound from the
+number of instances with window headroom, and every call still goes
+through `_get_instance_for_job`, so at most one request is in flight per
+token and per-token window accounting is unchanged.
+
+Independent per-row DB writes (e.g. ProfileGame playtime updates) are
+handed to a bounded thread pool instead of running one after another on
+the worker. Per-game work is still queued as Redis jobs, so cross-machine
+distribution is untouched.
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+logger = logging.getLogger("psn_api")
+
+
+def _with_fresh_connection(fn, item):
+    # Pool threads are long-lived: recycle stale connections like a request would.
+    close_old_connections()
+    return fn(item)
+
+
+class AsyncFetchEngine:
+    """Event loop + fetch/DB executors shared by all slow-path walks."""
+
+    def __init__(self, max_concurrency=6, db_workers=4):
+        self.max_concurrency = max_concurrency
+        self.db_workers = db_workers
+        self._fetch_pool = ThreadPoolExecutor(max_workers=max_concurrency * 2, thread_name_prefix="tk-async-fetch")
+        self._db_pool = ThreadPoolExecutor(max_workers=db_workers, thread_name_prefix="tk-async-db")
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self.counters = {
+            'batches': 0,
+            'fetches': 0,
+            'fetch_errors': 0,
+            'db_tasks': 0,
+        }
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, daemon=True, name="tk-async-loop")
+            self._thread.start()
+
+    def shutdown(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+        self._db_pool.shutdown(wait=True)
+
+    def _count(self, key, n=1):
+        with self._counter_lock:
+            self.counters[key] += n
+
+    def fetch_all(self, fetch, items, concurrency=None) -> list:
+        """Call `fetch(item)` for every item concurrently; results in input order.
+
+        At most `concurrency` fetches are in flight. The first exception
+        propagates (like `executor.map`); fetches not yet started are
+        cancelled.
+        """
+        if not items:
+            return []
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(
+            self._gather(fetch, list(items), concurrency or self.max_concurrency),
+            self._loop,
+        )
+        return future.result()
+
+    async def _gather(self, fetch, items, concurrency):
+        self._count('batches')
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        tasks = [asyncio.ensure_future(self._fetch_one(semaphore, fetch, item)) for item in items]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def _fetch_one(self, semaphore, fetch, item):
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            try:
+                result = await loop.run_in_executor(self._fetch_pool, _with_fresh_connection, fetch, item)
+            except Exception:
+                self._count('fetch_errors')
+                raise
+            self._count('fetches')
+        return result
+
+    def db_map(self, fn, items) -> list:
+        """Run `fn(item)` for every item on the bounded DB pool; results in input order."""
+        items = list(items)
+        self._count('db_tasks', len(items))
+        return list(self._db_pool.map(lambda item: _with_fresh_connection(fn, item), items))
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            return {**self.counters, 'max_concurrency': self.max_concurrency, 'db_workers': self.db_workers}
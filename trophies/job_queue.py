@@ -0,0 +1,675 @@
+"""
+Job queue backends for PSNManager / TokenKeeper.
+
+Two interchangeable backends, selected with JOB_QUEUE_BACKEND:
+
+- `list` (default): the original design. Jobs are LPUSHed onto
+  `{queue}_jobs` lists and BRPOPed by workers; per-profile progress is
+  tracked with INCR/DECR counters (`profile_jobs:{pid}:{queue}`). A job
+  popped by a worker that then dies is gone, and its counter never comes
+  back down, which is what `_check_stuck_syncing_profiles` papers over.
+
+- `streams`: each queue is a Redis stream (`stream:{queue}_jobs`) read
+  through one consumer group. A delivered job stays in the group's
+  pending-entries list (PEL) until the worker acks it, so a crash leaves
+  it recoverable: the health loop XAUTOCLAIMs entries idle longer than
+  JOB_STREAM_CLAIM_IDLE and re-queues them, up to JOB_STREAM_MAX_RETRIES
+  attempts, after which they go to the `stream:dead_jobs` dead-letter
+  stream. Acked entries are deleted, so XLEN is backlog plus in-flight.
+  A job that is merely slow must not look stalled, so the health loop
+  calls `heartbeat()` first: it XCLAIMs (JUSTID, min-idle 0) every entry
+  this process's workers are running, resetting their idle time without
+  bumping the delivery count. Only entries whose process stopped
+  heartbeating (crashed) age past JOB_STREAM_CLAIM_IDLE.
+
+  Per-profile completion tracking follows the entries themselves: each
+  counted job's entry id is kept in `profile_job_ids:{pid}:{queue}` from
+  XADD until ack or dead-letter (the PEL can't be filtered by profile
+  without scanning it). Set membership is idempotent, so a retried or
+  re-claimed job can't push the count below zero or leave it stuck above.
+
+Both backends can coalesce pushes (`push(..., coalesce=member)`): the
+member is recorded in a per-profile hash (`coalesce:{job_type}:{pid}`)
+in the same script that pushes the job, and a second push of the same
+member while the first copy is still waiting is dropped and counted in
+`job_queue:coalesced`. The worker releases the member when it pops the
+job, so a push made while the job is running queues a fresh copy.
+Entries older than COALESCE_STALE_AFTER are ignored, so a job lost by
+the list backend can't block its member for good.
+
+Every backend call that must be atomic (push + track, ack + untrack,
+requeue, dead-letter, coalesced push) is a single Lua script. Completing
+a counted job is one script too: it untracks the job, totals what the
+profile has left across COUNTED_QUEUES and, when that reaches zero,
+claims the profile's pending sync_complete payload (GET + DEL), so when
+two workers finish a profile's last jobs together only one of them
+gets it.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from trophies.util_modules.cache import redis_client
+
+logger = logging.getLogger("psn_api")
+
+
+# Highest priority first; workers always drain earlier queues first.
+QUEUE_NAMES = ("orchestrator", "high_priority", "medium_priority", "low_priority", "bulk_priority")
+# Queues that track per-profile jobs for sync completion detection
+COUNTED_QUEUES = ("low_priority", "medium_priority", "bulk_priority")
+
+COALESCED_COUNTER_KEY = "job_queue:coalesced"
+# Pending members older than this are treated as lost jobs (seconds)
+COALESCE_STALE_AFTER = 7200
+
+# Prefix for coalesced pushes. Returns 0 (before pushing) when the member is
+# already pending, otherwise records it and falls through to the push.
+# KEYS[1]: coalesce hash, KEYS[2]: coalesced counter
+# ARGV[1]: member, ARGV[2]: now, ARGV[3]: stale after
+COALESCE_CHECK_LUA = """
+local queued_at = redis.call('HGET', KEYS[1], ARGV[1])
+if queued_at and tonumber(ARGV[2]) - tonumber(queued_at) < tonumber(ARGV[3]) then
+    redis.call('INCR', KEYS[2])
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+"""
+
+# Tail of the complete scripts. Expects `total` (jobs the profile has left).
+# KEYS[n-2]: active_profiles, KEYS[n-1]: pending payload, KEYS[n]: running guard
+# ARGV[1]: profile_id
+# Returns {total, state[, pending payload]}; state 0 = nothing pending,
+# 1 = pending but its sync_complete is running (kept), 2 = pending claimed.
+COMPLETE_DECIDE_LUA = """
+local n = #KEYS
+if total > 0 then
+    return {total, 0}
+end
+redis.call('SREM', KEYS[n - 2], ARGV[1])
+local pending = redis.call('GET', KEYS[n - 1])
+if not pending then
+    return {0, 0}
+end
+if redis.call('EXISTS', KEYS[n]) == 1 then
+    return {0, 1}
+end
+redis.call('DEL', KEYS[n - 1])
+return {0, 2, pending}
+"""
+
+# KEYS[1]: this job's counter, KEYS[2..n-3]: the profile's counters for COUNTED_QUEUES
+LIST_COMPLETE_SCRIPT = """
+if redis.call('DECR', KEYS[1]) <= 0 then
+    redis.call('DEL', KEYS[1])
+end
+local total = 0
+for i = 2, #KEYS - 3 do
+    total = total + math.max(tonumber(redis.call('GET', KEYS[i]) or '0'), 0)
+end
+""" + COMPLETE_DECIDE_LUA
+
+# Drop the member only if it still belongs to this job (not a newer copy).
+# KEYS: coalesce hash; ARGV: member, queued_at
+RELEASE_COALESCED_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+    return redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+# KEYS[3]: queue list, KEYS[4]: profile counter, KEYS[5]: active_profiles
+# ARGV[4]: payload, ARGV[5]: profile_id, ARGV[6]: track ('1'/'0')
+LIST_COALESCED_PUSH_SCRIPT = COALESCE_CHECK_LUA + """
+if ARGV[6] == '1' then
+    redis.call('INCR', KEYS[4])
+    redis.call('SADD', KEYS[5], ARGV[5])
+end
+redis.call('LPUSH', KEYS[3], ARGV[4])
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class Completion:
+    """Outcome of completing a counted job."""
+    remaining: int
+    pending: str | None = None  # claimed pending_sync_complete payload (deleted from Redis)
+    sync_complete_running: bool = False  # pending payload kept: its sync_complete is running
+
+    @classmethod
+    def from_script(cls, result) -> "Completion":
+        remaining, state = int(result[0]), int(result[1])
+        return cls(
+            remaining=remaining,
+            pending=_decode(result[2]) if state == 2 else None,
+            sync_complete_running=state == 1,
+        )
+
+
+@dataclass
+class Job:
+    queue_name: str
+    payload: dict
+    raw: str
+    entry_id: str | None = None  # stream entry id (streams backend only)
+
+    @property
+    def job_type(self):
+        return self.payload['job_type']
+
+    @property
+    def args(self):
+        return self.payload['args']
+
+    @property
+    def profile_id(self):
+        return self.payload['profile_id']
+
+    @property
+    def counted(self) -> bool:
+        return self.queue_name in COUNTED_QUEUES
+
+    @property
+    def coalesce(self):
+        """(hash key, member, queued_at) for coalesced pushes, else None."""
+        return self.payload.get('coalesce')
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def coalesce_key(job_type, profile_id) -> str:
+    return f"coalesce:{job_type}:{profile_id}"
+
+
+class _Coalescing:
+    """Coalesced-push bookkeeping shared by both backends."""
+
+    def _init_coalescing(self, push_script):
+        self._coalesced_push = self.redis.register_script(push_script)
+        self._release_coalesced = self.redis.register_script(RELEASE_COALESCED_SCRIPT)
+
+    def _coalesced_payload(self, payload, member):
+        key = coalesce_key(payload['job_type'], payload['profile_id'])
+        return key, {**payload, 'coalesce': [key, member, int(time.time())]}
+
+    def release(self, job: Job):
+        """Let new pushes of a coalesced job through once a worker has it."""
+        if job.coalesce:
+            key, member, queued_at = job.coalesce
+            self._release_coalesced(keys=[key], args=[member, queued_at])
+
+    def _restore_coalesced(self, job: Job):
+        # A requeued job is waiting again; keep newer copies coalescing into it.
+        if job.coalesce:
+            key, member, queued_at = job.coalesce
+            self.redis.hsetnx(key, member, queued_at)
+
+    def coalesced_count(self) -> int:
+        return int(self.redis.get(COALESCED_COUNTER_KEY) or 0)
+
+
+class ListJobQueue(_Coalescing):
+    """LPUSH/BRPOP lists with INCR/DECR per-profile counters."""
+
+    name = "list"
+
+    def __init__(self, redis):
+        self.redis = redis
+        self._init_coalescing(LIST_COALESCED_PUSH_SCRIPT)
+        self._complete = redis.register_script(LIST_COMPLETE_SCRIPT)
+
+    @staticmethod
+    def queue_key(queue_name) -> str:
+        return f"{queue_name}_jobs"
+
+    @staticmethod
+    def counter_key(profile_id, queue_name) -> str:
+        return f"profile_jobs:{profile_id}:{queue_name}"
+
+    def push(self, queue_name, payload: dict, track=True, coalesce=None) -> bool:
+        """Queue a job. With `coalesce`, returns False if that member is already waiting."""
+        track = track and queue_name in COUNTED_QUEUES
+        if coalesce is not None:
+            key, payload = self._coalesced_payload(payload, coalesce)
+            return bool(self._coalesced_push(
+                keys=[
+                    key, COALESCED_COUNTER_KEY, self.queue_key(queue_name),
+                    self.counter_key(payload['profile_id'], queue_name), "active_profiles",
+                ],
+                args=[coalesce, payload['coalesce'][2], COALESCE_STALE_AFTER,
+                      json.dumps(payload), payload['profile_id'], '1' if track else '0'],
+            ))
+        if track:
+            self.redis.incr(self.counter_key(payload['profile_id'], queue_name))
+            self.redis.sadd("active_profiles", payload['profile_id'])
+        self.redis.lpush(self.queue_key(queue_name), json.dumps(payload))
+        return True
+
+    def pop(self, timeout=5) -> Job | None:
+        popped = self.redis.brpop([self.queue_key(q) for q in QUEUE_NAMES], timeout=timeout)
+        if popped is None:
+            return None
+        queue_b, raw = popped
+        raw = _decode(raw)
+        job = Job(queue_name=_decode(queue_b)[:-5], payload=json.loads(raw), raw=raw)
+        self.release(job)
+        return job
+
+    def complete(self, job: Job, pending_key=None, running_key=None) -> Completion | None:
+        """Untrack a finished job; returns None for uncounted queues.
+
+        With `pending_key`, the payload stored there is claimed (read and
+        deleted) once the profile has no counted jobs left, unless
+        `running_key` exists.
+        """
+        if not job.counted:
+            return None
+        pid = job.profile_id
+        return Completion.from_script(self._complete(
+            keys=[
+                self.counter_key(pid, job.queue_name),
+                *(self.counter_key(pid, q) for q in COUNTED_QUEUES),
+                "active_profiles",
+                pending_key or f"{self.counter_key(pid, job.queue_name)}:no_pending",
+                running_key or f"{self.counter_key(pid, job.queue_name)}:no_guard",
+            ],
+            args=[pid],
+        ))
+
+    def requeue(self, job: Job):
+        """Put a job that failed transiently back in its queue (already counted).
+
+        LPUSH onto a BRPOP queue: the job goes behind everything already waiting.
+        """
+        self._restore_coalesced(job)
+        self.redis.lpush(self.queue_key(job.queue_name), job.raw)
+
+    def heartbeat(self):
+        """Nothing to keep alive: a popped list entry is gone from Redis."""
+        return 0
+
+    def reclaim(self):
+        """Nothing to reclaim: a popped list entry is gone from Redis."""
+        return 0, 0
+
+    def profile_job_counts(self, profile_ids, queues=COUNTED_QUEUES) -> dict:
+        profile_ids = list(profile_ids)
+        pipe = self.redis.pipeline(transaction=False)
+        for pid in profile_ids:
+            for queue_name in queues:
+                pipe.get(self.counter_key(pid, queue_name))
+        values = iter(pipe.execute())
+        return {pid: sum(int(next(values) or 0) for _ in queues) for pid in profile_ids}
+
+    def profile_queue_breakdown(self) -> dict:
+        """{profile_id: {queue: count}} for every profile with tracked jobs."""
+        stats = {}
+        for queue_name in COUNTED_QUEUES:
+            for key in self.redis.keys(f"profile_jobs:*:{queue_name}"):
+                profile_id = _decode(key).split(':')[1]
+                stats.setdefault(profile_id, {})[queue_name] = int(self.redis.get(key) or 0)
+        return stats
+
+    def queue_lengths(self) -> dict:
+        return {self.queue_key(q): self.redis.llen(self.queue_key(q)) for q in QUEUE_NAMES}
+
+    def flush_patterns(self) -> list[str]:
+        return [self.queue_key(q) for q in QUEUE_NAMES] + ['profile_jobs:*']
+
+    def stats(self) -> dict:
+        return {'backend': self.name, 'coalesced': self.coalesced_count()}
+
+
+# KEYS: stream, tracking set, active_profiles
+# ARGV: payload, profile_id, track ('1'/'0'), tracking ttl
+STREAM_PUSH_SCRIPT = """
+local id = redis.call('XADD', KEYS[1], '*', 'job', ARGV[1])
+if ARGV[3] == '1' then
+    redis.call('SADD', KEYS[2], id)
+    redis.call('EXPIRE', KEYS[2], tonumber(ARGV[4]))
+    redis.call('SADD', KEYS[3], ARGV[2])
+end
+return id
+"""
+
+# KEYS: stream, tracking set (may be a dummy key for untracked queues)
+# ARGV: group, entry id
+STREAM_ACK_SCRIPT = """
+redis.call('XACK', KEYS[1], ARGV[1], ARGV[2])
+redis.call('XDEL', KEYS[1], ARGV[2])
+redis.call('SREM', KEYS[2], ARGV[2])
+return redis.call('SCARD', KEYS[2])
+"""
+
+# KEYS[1]: stream, KEYS[2]: this job's tracking set,
+# KEYS[3..n-3]: the profile's tracking sets for COUNTED_QUEUES
+# ARGV[2]: group, ARGV[3]: entry id
+STREAM_COMPLETE_SCRIPT = """
+redis.call('XACK', KEYS[1], ARGV[2], ARGV[3])
+redis.call('XDEL', KEYS[1], ARGV[3])
+redis.call('SREM', KEYS[2], ARGV[3])
+local total = 0
+for i = 3, #KEYS - 3 do
+    total = total + redis.call('SCARD', KEYS[i])
+end
+""" + COMPLETE_DECIDE_LUA
+
+# Ack the old entry and add a fresh copy at the tail, moving its tracking id.
+# KEYS: stream, tracking set
+# ARGV: group, old entry id, payload, track ('1'/'0'), tracking ttl
+STREAM_REQUEUE_SCRIPT = """
+redis.call('XACK', KEYS[1], ARGV[1], ARGV[2])
+redis.call('XDEL', KEYS[1], ARGV[2])
+local id = redis.call('XADD', KEYS[1], '*', 'job', ARGV[3])
+if ARGV[4] == '1' then
+    redis.call('SREM', KEYS[2], ARGV[2])
+    redis.call('SADD', KEYS[2], id)
+    redis.call('EXPIRE', KEYS[2], tonumber(ARGV[5]))
+end
+return id
+"""
+
+# KEYS[3]: stream, KEYS[4]: tracking set, KEYS[5]: active_profiles
+# ARGV[4]: payload, ARGV[5]: profile_id, ARGV[6]: track ('1'/'0'), ARGV[7]: tracking ttl
+STREAM_COALESCED_PUSH_SCRIPT = COALESCE_CHECK_LUA + """
+local id = redis.call('XADD', KEYS[3], '*', 'job', ARGV[4])
+if ARGV[6] == '1' then
+    redis.call('SADD', KEYS[4], id)
+    redis.call('EXPIRE', KEYS[4], tonumber(ARGV[7]))
+    redis.call('SADD', KEYS[5], ARGV[5])
+end
+return id
+"""
+
+# KEYS: stream, tracking set, dead-letter stream
+# ARGV: group, entry id, payload, queue name, reason, failed_at, dead-letter maxlen
+STREAM_DEAD_LETTER_SCRIPT = """
+redis.call('XACK', KEYS[1], ARGV[1], ARGV[2])
+redis.call('XDEL', KEYS[1], ARGV[2])
+redis.call('SREM', KEYS[2], ARGV[2])
+return redis.call('XADD', KEYS[3], 'MAXLEN', '~', ARGV[7], '*',
+    'job', ARGV[3], 'queue', ARGV[4], 'reason', ARGV[5], 'failed_at', ARGV[6])
+"""
+
+
+class StreamJobQueue(_Coalescing):
+    """Consumer-group streams with acks, reclaim, capped retries and a dead-letter stream."""
+
+    name = "streams"
+    GROUP = "token_keeper"
+    DEAD_LETTER_KEY = "stream:dead_jobs"
+    TRACKING_TTL = 86400
+
+    def __init__(self, redis, machine_id="default", claim_idle=1800, max_retries=3, dead_letter_maxlen=10000):
+        self.redis = redis
+        self.machine_id = machine_id
+        self.claim_idle = claim_idle
+        self.max_retries = max_retries
+        self.dead_letter_maxlen = dead_letter_maxlen
+        self._push = redis.register_script(STREAM_PUSH_SCRIPT)
+        self._ack = redis.register_script(STREAM_ACK_SCRIPT)
+        self._complete = redis.register_script(STREAM_COMPLETE_SCRIPT)
+        self._requeue = redis.register_script(STREAM_REQUEUE_SCRIPT)
+        self._dead_letter = redis.register_script(STREAM_DEAD_LETTER_SCRIPT)
+        self._init_coalescing(STREAM_COALESCED_PUSH_SCRIPT)
+        # Entries this process's workers hold: {entry_id: (stream, consumer)}.
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+        self._groups_ready = False
+        self.counters = {'requeued': 0, 'reclaimed': 0, 'dead_lettered': 0}
+
+    @staticmethod
+    def stream_key(queue_name) -> str:
+        return f"stream:{queue_name}_jobs"
+
+    @staticmethod
+    def tracking_key(profile_id, queue_name) -> str:
+        return f"profile_job_ids:{profile_id}:{queue_name}"
+
+    def _tracking_key_for(self, job: Job) -> str:
+        # Untracked queues still pass a key so the scripts have a fixed signature.
+        if job.counted:
+            return self.tracking_key(job.profile_id, job.queue_name)
+        return self.tracking_key("untracked", job.queue_name)
+
+    def ensure_groups(self):
+        if self._groups_ready:
+            return
+        for queue_name in QUEUE_NAMES:
+            try:
+                self.redis.xgroup_create(self.stream_key(queue_name), self.GROUP, id="0", mkstream=True)
+            except Exception as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        self._groups_ready = True
+
+    def consumer_name(self) -> str:
+        return f"{self.machine_id}:{threading.current_thread().name}"
+
+    def push(self, queue_name, payload: dict, track=True, coalesce=None) -> bool:
+        """Queue a job. With `coalesce`, returns False if that member is already waiting."""
+        track = track and queue_name in COUNTED_QUEUES
+        if coalesce is not None:
+            key, payload = self._coalesced_payload(payload, coalesce)
+            return self._coalesced_push(
+                keys=[
+                    key, COALESCED_COUNTER_KEY, self.stream_key(queue_name),
+                    self.tracking_key(payload['profile_id'], queue_name), "active_profiles",
+                ],
+                args=[coalesce, payload['coalesce'][2], COALESCE_STALE_AFTER,
+                      json.dumps(payload), payload['profile_id'], '1' if track else '0', self.TRACKING_TTL],
+            ) != 0
+        self._push(
+            keys=[
+                self.stream_key(queue_name),
+                self.tracking_key(payload['profile_id'], queue_name),
+                "active_profiles",
+            ],
+            args=[json.dumps(payload), payload['profile_id'], '1' if track else '0', self.TRACKING_TTL],
+        )
+        return True
+
+    def _job_from_entry(self, stream, entry_id, fields) -> Job:
+        raw = _decode(fields.get(b'job', fields.get('job')))
+        queue_name = _decode(stream)[len("stream:"):-len("_jobs")]
+        return Job(queue_name=queue_name, payload=json.loads(raw), raw=raw, entry_id=_decode(entry_id))
+
+    def pop(self, timeout=5) -> Job | None:
+        try:
+            job = self._pop(timeout)
+        except Exception as e:
+            if "NOGROUP" not in str(e):
+                raise
+            # Streams were flushed (redis_admin --flush-token-keeper); recreate.
+            self._groups_ready = False
+            return None
+        if job is not None:
+            with self._in_flight_lock:
+                self._in_flight[job.entry_id] = (self.stream_key(job.queue_name), self.consumer_name())
+            self.release(job)
+        return job
+
+    def _done(self, job: Job):
+        with self._in_flight_lock:
+            self._in_flight.pop(job.entry_id, None)
+
+    def _pop(self, timeout) -> Job | None:
+        self.ensure_groups()
+        consumer = self.consumer_name()
+        # Priority sweep: one non-blocking read per queue, highest first.
+        for queue_name in QUEUE_NAMES:
+            response = self.redis.xreadgroup(self.GROUP, consumer, {self.stream_key(queue_name): '>'}, count=1)
+            for stream, entries in response or []:
+                for entry_id, fields in entries:
+                    return self._job_from_entry(stream, entry_id, fields)
+
+        # Everything empty: block until any queue gets work. A multi-stream
+        # read can deliver one entry per stream; this worker takes the
+        # highest-priority one and hands the rest straight back (ack + re-add),
+        # so nothing sits in its PEL un-heartbeated while it runs a job. The
+        # streams were empty a moment ago, so re-adding at the tail costs
+        # those entries no real position.
+        response = self.redis.xreadgroup(
+            self.GROUP, consumer, {self.stream_key(q): '>' for q in QUEUE_NAMES},
+            count=1, block=int(timeout * 1000),
+        )
+        jobs = [
+            self._job_from_entry(stream, entry_id, fields)
+            for stream, entries in response or []
+            for entry_id, fields in entries
+        ]
+        if not jobs:
+            return None
+        jobs.sort(key=lambda job: QUEUE_NAMES.index(job.queue_name))
+        for extra in jobs[1:]:
+            self._requeue(
+                keys=[self.stream_key(extra.queue_name), self._tracking_key_for(extra)],
+                args=[self.GROUP, extra.entry_id, extra.raw, '1' if extra.counted else '0', self.TRACKING_TTL],
+            )
+        return jobs[0]
+
+    def complete(self, job: Job, pending_key=None, running_key=None) -> Completion | None:
+        """Ack a finished job; see ListJobQueue.complete for the return value."""
+        self._done(job)
+        if not job.counted:
+            self._ack(
+                keys=[self.stream_key(job.queue_name), self._tracking_key_for(job)],
+                args=[self.GROUP, job.entry_id],
+            )
+            return None
+        pid = job.profile_id
+        tracking_key = self.tracking_key(pid, job.queue_name)
+        return Completion.from_script(self._complete(
+            keys=[
+                self.stream_key(job.queue_name),
+                tracking_key,
+                *(self.tracking_key(pid, q) for q in COUNTED_QUEUES),
+                "active_profiles",
+                pending_key or f"{tracking_key}:no_pending",
+                running_key or f"{tracking_key}:no_guard",
+            ],
+            args=[pid, self.GROUP, job.entry_id],
+        ))
+
+    def requeue(self, job: Job, payload=None):
+        """Ack `job` and add a fresh copy (or `payload`) at the tail of its stream."""
+        self._done(job)
+        self._restore_coalesced(job)
+        new_id = self._requeue(
+            keys=[self.stream_key(job.queue_name), self._tracking_key_for(job)],
+            args=[self.GROUP, job.entry_id, json.dumps(payload or job.payload), '1' if job.counted else '0', self.TRACKING_TTL],
+        )
+        self.counters['requeued'] += 1
+        return _decode(new_id)
+
+    def dead_letter(self, job: Job, reason: str):
+        self._done(job)
+        self._dead_letter(
+            keys=[self.stream_key(job.queue_name), self._tracking_key_for(job), self.DEAD_LETTER_KEY],
+            args=[self.GROUP, job.entry_id, job.raw, job.queue_name, reason, time.time(), self.dead_letter_maxlen],
+        )
+        self.counters['dead_lettered'] += 1
+        logger.error(f"[profile {job.profile_id}] {job.job_type} dead-lettered from {job.queue_name}: {reason}")
+
+    def heartbeat(self):
+        """Reset the idle time of every entry this process's workers are running.
+
+        XCLAIM ... JUSTID with min-idle 0 re-asserts ownership without
+        bumping the delivery count, so `reclaim()` (here or on another
+        machine) never mistakes a slow job for a dead worker's. Call it
+        more often than `claim_idle`. Returns the number of entries touched.
+        """
+        with self._in_flight_lock:
+            held = list(self._in_flight.items())
+        by_owner = {}
+        for entry_id, owner in held:
+            by_owner.setdefault(owner, []).append(entry_id)
+        for (stream, consumer), entry_ids in by_owner.items():
+            self.redis.xclaim(stream, self.GROUP, consumer, 0, entry_ids, justid=True)
+        return len(held)
+
+    def reclaim(self):
+        """Re-queue jobs whose worker went silent; dead-letter the ones out of retries.
+
+        Returns (requeued, dead_lettered).
+        """
+        self.ensure_groups()
+        requeued = dead = 0
+        consumer = f"{self.machine_id}:reclaimer"
+        for queue_name in QUEUE_NAMES:
+            stream = self.stream_key(queue_name)
+            start = "0-0"
+            while True:
+                result = self.redis.xautoclaim(stream, self.GROUP, consumer, int(self.claim_idle * 1000), start_id=start, count=100)
+                start, claimed = result[0], result[1]
+                for entry_id, fields in claimed:
+                    if not fields:
+                        continue  # entry deleted while pending
+                    job = self._job_from_entry(stream, entry_id, fields)
+                    attempts = int(job.payload.get('attempts', 0)) + 1
+                    if attempts > self.max_retries:
+                        self.dead_letter(job, f"stalled {attempts} times (idle > {self.claim_idle}s)")
+                        dead += 1
+                    else:
+                        self.requeue(job, payload={**job.payload, 'attempts': attempts})
+                        requeued += 1
+                if not claimed or _decode(start) in ("0-0", "0"):
+                    break
+        self.counters['reclaimed'] += requeued
+        return requeued, dead
+
+    def profile_job_counts(self, profile_ids, queues=COUNTED_QUEUES) -> dict:
+        profile_ids = list(profile_ids)
+        pipe = self.redis.pipeline(transaction=False)
+        for pid in profile_ids:
+            for queue_name in queues:
+                pipe.scard(self.tracking_key(pid, queue_name))
+        values = iter(pipe.execute())
+        return {pid: sum(int(next(values) or 0) for _ in queues) for pid in profile_ids}
+
+    def profile_queue_breakdown(self) -> dict:
+        stats = {}
+        for queue_name in COUNTED_QUEUES:
+            for key in self.redis.keys(f"profile_job_ids:*:{queue_name}"):
+                profile_id = _decode(key).split(':')[1]
+                stats.setdefault(profile_id, {})[queue_name] = self.redis.scard(key)
+        return stats
+
+    def queue_lengths(self) -> dict:
+        return {self.stream_key(q): self.redis.xlen(self.stream_key(q)) for q in QUEUE_NAMES}
+
+    def flush_patterns(self) -> list[str]:
+        return [self.stream_key(q) for q in QUEUE_NAMES] + ['profile_job_ids:*']
+
+    def stats(self) -> dict:
+        return {
+            'backend': self.name,
+            'dead_letter_length': self.redis.xlen(self.DEAD_LETTER_KEY),
+            'coalesced': self.coalesced_count(),
+            **self.counters,
+        }
+
+
+def build_job_queue(redis=None):
+    redis = redis or redis_client
+    backend = os.getenv("JOB_QUEUE_BACKEND", "list").lower()
+    if backend == "streams":
+        return StreamJobQueue(
+            redis,
+            machine_id=os.getenv("MACHINE_ID", "default"),
+            claim_idle=int(os.getenv("JOB_STREAM_CLAIM_IDLE", 1800)),
+            max_retries=int(os.getenv("JOB_STREAM_MAX_RETRIES", 3)),
+        )
+    if backend != "list":
+        logger.warning(f"Unknown JOB_QUEUE_BACKEND '{backend}', using list")
+    return ListJobQueue(redis)
+
+
+job_queue = build_job_queue()
@@ -5,6 +5,7 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 
 from trophies.models import Badge, Profile, UserBadge
+from trophies.services.badge_bulk_service import BULK_CHUNK_SIZE, evaluate_badges_bulk
 from trophies.services.badge_service import initial_badge_check
 
 logger = logging.getLogger("psn_api")
@@ -24,6 +25,17 @@ class Command(BaseCommand):
             action='store_true',
             help='Preview what badges would be awarded/revoked without making changes.',
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Evaluate profiles in chunks with batched reads/writes (no badge notifications).',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=BULK_CHUNK_SIZE,
+            help=f'Profiles per chunk in --bulk mode (default {BULK_CHUNK_SIZE}).',
+        )
 
     def handle(self, *args, **options):
         username = options.get('username')
@@ -46,6 +58,10 @@ class Command(BaseCommand):
             self.stdout.write(f'Checking badges for {len(profiles)} profiles...\n')
 
         badge_names = dict(Badge.objects.values_list('id', 'name'))
+        if options.get('bulk'):
+            self._handle_bulk(profiles, badge_names, dry_run, options['chunk_size'])
+            return
+
         total_awarded = 0
         total_revoked = 0
         errors = 0
@@ -106,3 +122,32 @@ class Command(BaseCommand):
         self.stdout.write(f'Badges {"would be " if dry_run else ""}revoked: {total_revoked}')
         if errors:
             self.stdout.write(self.style.ERROR(f'Errors: {errors}'))
+
+    def _handle_bulk(self, profiles, badge_names, dry_run, chunk_size):
+        start_time = time.time()
+        usernames = {profile.id: profile.psn_username for profile in profiles}
+        badges = list(Badge.objects.filter(is_live=True))
+
+        result = evaluate_badges_bulk(
+            list(usernames), badges, chunk_size=chunk_size, dry_run=dry_run,
+            on_chunk=lambda done, total: self.stdout.write(f'[{done}/{total}] profiles evaluated'),
+        )
+
+        for profile_id in sorted(result.profiles_changed, key=lambda pid: usernames[pid].lower()):
+            self.stdout.write(f'{usernames[profile_id]}:')
+            for badge_id in result.awarded.get(profile_id, ()):
+                name = badge_names.get(badge_id, f'Badge #{badge_id}')
+                prefix = 'WOULD AWARD' if dry_run else 'AWARDED'
+                self.stdout.write(self.style.SUCCESS(f'  + {prefix}: {name}'))
+            for badge_id in result.revoked.get(profile_id, ()):
+                name = badge_names.get(badge_id, f'Badge #{badge_id}')
+                prefix = 'WOULD REVOKE' if dry_run else 'REVOKED'
+                self.stdout.write(self.style.WARNING(f'  - {prefix}: {name}'))
+
+        duration = time.time() - start_time
+        self.stdout.write(f'\n{"=" * 50}')
+        self.stdout.write(self.style.SUCCESS(f'Done in {duration:.1f}s (bulk)'))
+        self.stdout.write(f'Profiles checked: {result.profiles}')
+        self.stdout.write(f'Badge-profile pairs evaluated: {result.pairs}')
+        self.stdout.write(f'Badges {"would be " if dry_run else ""}awarded: {sum(map(len, result.awarded.values()))}')
+        self.stdout.write(f'Badges {"would be " if dry_run else ""}revoked: {sum(map(len, result.revoked.values()))}')
@@ -1,16 +1,33 @@
 from django.core.management.base import BaseCommand
-from trophies.models import Profile
+from trophies.models import Badge, Profile
+from trophies.services.badge_bulk_service import evaluate_badges_bulk
 from trophies.services.badge_service import initial_badge_check
 
 class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('--username', type=str, required=False)
         parser.add_argument('--notify', action='store_true')
+        parser.add_argument('--bulk', action='store_true', help='Batched evaluation; never notifies.')
 
     def handle(self, *args, **options):
         username = options['username'] if options['username'] else None
         notify = options['notify']
 
+        if options['bulk']:
+            if notify:
+                self.stdout.write(self.style.WARNING('--bulk sends no notifications; ignoring --notify.'))
+            profiles = Profile.objects.all()
+            if username:
+                profiles = profiles.filter(psn_username=username)
+            result = evaluate_badges_bulk(
+                profiles.values_list('id', flat=True), Badge.objects.filter(is_live=True)
+            )
+            self.stdout.write(
+                f'Evaluated {result.pairs} badge-profile pairs for {result.profiles} profiles '
+                f'({len(result.profiles_changed)} changed).'
+            )
+            return
+
         if username:
             profile = Profile.objects.get(psn_username=username)
             initial_badge_check(profile, discord_notify=notify)
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from trophies.util_modules.cache import redis_client
+from trophies.job_queue import QUEUE_NAMES, coalesce_key, job_queue
 import logging
 
 logger = logging.getLogger(__name__)
@@ -40,6 +41,20 @@ class Command(BaseCommand):
             type=int,
             help='Flush dashboard module caches for a specific profile ID.'
         )
+        group.add_argument(
+            '--dashboard-cache-stats',
+            type=int,
+            nargs='?',
+            const=1,
+            help='Report dashboard module cache hit rates per module slug over the last N days (default 1, max 8).'
+        )
+        group.add_argument(
+            '--dashboard-latency',
+            type=int,
+            nargs='?',
+            const=1,
+            help='Report dashboard provider latency histograms per module slug over the last N days (default 1, max 8).'
+        )
         group.add_argument(
             '--flush-concept',
             type=int,
@@ -96,6 +111,10 @@ class Command(BaseCommand):
             self._handle_flush_concept(options['flush_concept'])
         elif options['flush_dashboard']:
             self._handle_flush_dashboard(options['flush_dashboard'])
+        elif options['dashboard_cache_stats'] is not None:
+            self._handle_dashboard_cache_stats(options['dashboard_cache_stats'])
+        elif options['dashboard_latency'] is not None:
+            self._handle_dashboard_latency(options['dashboard_latency'])
         elif options['flush_community']:
             self._handle_flush_community()
         elif options['get_bulk_threshold']:
@@ -176,6 +195,10 @@ class Command(BaseCommand):
                 deleted_count += redis_client.delete(key)
             for key in redis_client.scan_iter(match=stats_pattern):
                 deleted_count += redis_client.delete(key)
+            from trophies.models import Game
+            from trophies.services.trophy_list_service import invalidate_trophy_list_cache
+            for game_id in Game.objects.filter(np_communication_id=np_communication_id).values_list('id', flat=True):
+                invalidate_trophy_list_cache(game_id)
             logger.info(f"Flushed {deleted_count} index-related keys.")
             self.stdout.write(self.style.SUCCESS(f"Flushed {deleted_count} keys for game {np_communication_id} page."))
         except Exception as e:
@@ -185,10 +208,11 @@ class Command(BaseCommand):
     def _handle_flush_concept(self, concept_id: int):
         from trophies.models import Game
 
-        np_ids = list(
+        games = list(
             Game.objects.filter(concept_id=concept_id)
-            .values_list('np_communication_id', flat=True)
+            .values_list('id', 'np_communication_id')
         )
+        np_ids = [np_id for _, np_id in games]
 
         if not np_ids:
             self.stdout.write(self.style.WARNING(f"No games found for concept {concept_id}."))
@@ -213,6 +237,9 @@ class Command(BaseCommand):
                 )
                 for key in redis_client.scan_iter(match=f"{prefix}game:stats:{np_id}:*"):
                     deleted_count += redis_client.delete(key)
+            from trophies.services.trophy_list_service import invalidate_trophy_list_cache
+            for game_id, _ in games:
+                invalidate_trophy_list_cache(game_id)
             logger.info(f"Flushed {deleted_count} keys for concept {concept_id}.")
             self.stdout.write(self.style.SUCCESS(f"Flushed {deleted_count} keys for concept {concept_id}."))
         except Exception as e:
@@ -227,13 +254,12 @@ class Command(BaseCommand):
         try:
             deleted_count = 0
 
-            # Clear job queues
-            queues = ['orchestrator_jobs', 'high_priority_jobs', 'medium_priority_jobs', 'low_priority_jobs', 'bulk_priority_jobs']
-            for queue in queues:
-                deleted_count += redis_client.delete(queue)
+            # Clear job queues (both backends; stream consumer groups are recreated on next pop)
+            for queue in QUEUE_NAMES:
+                deleted_count += redis_client.delete(f"{queue}_jobs", f"stream:{queue}_jobs")
 
-            # Clear profile_jobs:* (all queues), sync locks, orchestrator pending flags, and dedup sets
-            for pattern in ['profile_jobs:*', 'deferred_jobs:*', 'pending_sync_complete:*', 'sync_started_at:*', 'sync_trophies_lock:*', 'shovelware_concept_lock:*', 'sync_orchestrator_pending:*', 'sync_queued_games:*', 'sync_complete_in_progress:*', 'finalize_phase:*']:
+            # Clear per-profile job tracking (all queues), sync locks, orchestrator pending flags, and dedup sets
+            for pattern in ['profile_jobs:*', 'profile_job_ids:*', 'deferred_jobs:*', 'pending_sync_complete:*', 'sync_started_at:*', 'sync_trophies_lock:*', 'shovelware_concept_lock:*', 'sync_orchestrator_pending:*', 'coalesce:*', 'sync_complete_in_progress:*', 'finalize_phase:*']:
                 matching_keys = redis_client.keys(pattern)
                 if matching_keys:
                     deleted_count += redis_client.delete(*matching_keys)
@@ -264,7 +290,7 @@ class Command(BaseCommand):
             profile_jobs_key = f"pending_sync_complete:{profile_id}"
             sync_started_key = f"sync_started_at:{profile_id}"
             orchestrator_key = f"sync_orchestrator_pending:{profile_id}"
-            dedup_key = f"sync_queued_games:{profile_id}"
+            dedup_key = coalesce_key("sync_trophies", profile_id)
             sync_complete_key = f"sync_complete_in_progress:{profile_id}"
             finalize_phase_key = f"finalize_phase:{profile_id}"
             redis_client.delete(lock_key)
@@ -276,10 +302,10 @@ class Command(BaseCommand):
             redis_client.delete(orchestrator_key)
             self.stdout.write(self.style.SUCCESS(f"Orchestrator pending flag successfully flushed!"))
             redis_client.delete(dedup_key)
-            self.stdout.write(self.style.SUCCESS(f"Queued games dedup set successfully flushed!"))
+            self.stdout.write(self.style.SUCCESS(f"Queued games coalescing hash successfully flushed!"))
             redis_client.delete(sync_complete_key)
             self.stdout.write(self.style.SUCCESS(f"Sync complete in-progress flag successfully flushed!"))
-            redis_client.delete(finalize_phase_key)
+            redis_client.delete(finalize_phase_key, f"{finalize_phase_key}:timings")
             self.stdout.write(self.style.SUCCESS(f"Finalize phase tracker successfully flushed!"))
         except Exception as e:
             logger.exception(f"Error during complete lock flush: {e}")
@@ -288,8 +314,8 @@ class Command(BaseCommand):
     def _handle_flush_dashboard(self, profile_id: int):
         try:
             from django.core.cache import cache
-            from trophies.services.dashboard_service import force_flush_dashboard_cache, DASHBOARD_MODULES
-            force_flush_dashboard_cache(profile_id)
+            from trophies.services.dashboard_service import invalidate_dashboard_cache, DASHBOARD_MODULES
+            invalidate_dashboard_cache(profile_id)  # new generation: every module key variant is orphaned
 
             # Also flush premium preview caches (keyed by slug, not profile)
             preview_keys = [f'dashboard:preview:{mod["slug"]}' for mod in DASHBOARD_MODULES if mod.get('requires_premium')]
@@ -302,6 +328,36 @@ class Command(BaseCommand):
             logger.exception(f"Error during dashboard flush: {e}")
             self.stdout.write(self.style.ERROR(f"Error: {e}"))
 
+    def _handle_dashboard_cache_stats(self, days: int):
+        try:
+            from trophies.services.dashboard_service import dashboard_cache_hit_rates
+            rates = dashboard_cache_hit_rates(days)
+            if not rates:
+                self.stdout.write("No dashboard cache lookups recorded.")
+                return
+            self.stdout.write(f"{'Module':<32} {'Hits':>8} {'Misses':>8} {'Hit rate':>9}")
+            for slug, row in rates.items():
+                rate = f"{row['hit_rate']:.1%}" if row['hit_rate'] is not None else '-'
+                self.stdout.write(f"{slug:<32} {row['hits']:>8} {row['misses']:>8} {rate:>9}")
+        except Exception as e:
+            logger.exception(f"Error reading dashboard cache stats: {e}")
+            self.stdout.write(self.style.ERROR(f"Error: {e}"))
+
+    def _handle_dashboard_latency(self, days: int):
+        try:
+            from trophies.services.dashboard_service import dashboard_provider_latency
+            histograms = dashboard_provider_latency(days)
+            if not histograms:
+                self.stdout.write("No dashboard provider runs recorded.")
+                return
+            buckets = list(next(iter(histograms.values())))
+            self.stdout.write(f"{'Module':<32} " + " ".join(f"{b:>8}" for b in buckets))
+            for slug, hist in histograms.items():
+                self.stdout.write(f"{slug:<32} " + " ".join(f"{hist[b]:>8}" for b in buckets))
+        except Exception as e:
+            logger.exception(f"Error reading dashboard provider latency: {e}")
+            self.stdout.write(self.style.ERROR(f"Error: {e}"))
+
     def _handle_flush_community(self):
         if not self._confirm_action("flush Review Hub caches (review recommendations + DLC rating averages)"):
             self.stdout.write(self.style.ERROR("Operation cancelled."))
@@ -354,6 +410,9 @@ class Command(BaseCommand):
     def _handle_move_whale_jobs(self):
         """Scan low_priority_jobs, group by profile, move whale profiles to bulk_priority."""
         import json as json_mod
+        if job_queue.name != "list":
+            self.stdout.write(self.style.WARNING(f"--move-whale-jobs only supports the list job queue backend (active: {job_queue.name})."))
+            return
         try:
             bulk_threshold = int(redis_client.get('sync:bulk_threshold') or 5000)
             self.stdout.write(f"Using bulk threshold: {bulk_threshold}")
@@ -21,11 +21,16 @@ class Command(BaseCommand):
                  'run. Use for bulk re-evaluations so users are not pinged about badges they '
                  'effectively already held.',
         )
+        parser.add_argument(
+            '--bulk', action='store_true',
+            help='Evaluate earners in chunks with batched reads/writes. Implies --no-notifications.',
+        )
 
     def handle(self, *args, **options):
         series_slug = options['series']
         all_series = options['all_series']
-        self.skip_notifications = options['no_notifications']
+        self.bulk = options['bulk']
+        self.skip_notifications = options['no_notifications'] or self.bulk
         if self.skip_notifications:
             self.stdout.write(self.style.WARNING("Notifications SILENCED for this run (--no-notifications)."))
 
@@ -61,6 +66,7 @@ class Command(BaseCommand):
         # Shared with DLC detection -- see trophies/services/badge_refresh_service.py.
         processed, profiles_changed, earners_count, progress_count = refresh_badge_series_awards(
             series_slug, skip_notifications=getattr(self, 'skip_notifications', False),
+            bulk=getattr(self, 'bulk', False),
         )
 
         if processed == 0:
@@ -7,12 +7,21 @@ from trophies.token_keeper import TokenKeeper
 class Command(BaseCommand):
     help = 'Starts the TokenKeeper singleton process for managing PSN API tokens and job queues.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--async', action='store_true', dest='async_fetch',
+            help='Fetch profile_refresh slow-path pages concurrently via the asyncio engine',
+        )
+
     def handle(self, *args, **options):
         token_keeper = TokenKeeper()
         if token_keeper is None:
             self.stdout.write("TokenKeeper already running in another process")
             return
         self.stdout.write("TokenKeeper started - 3 instances live!")
+        if options['async_fetch']:
+            engine = token_keeper.enable_async_fetch()
+            self.stdout.write(f"Async fetch enabled (concurrency={engine.max_concurrency})")
 
         def signal_handler(sig, frame):
             self.stdout.write("Signal received, shutting down TokenKeeper...")
@@ -0,0 +1,67 @@
+# Partial indexes backing keyset pagination of the profile trophy log (ProfileDetailView,
+# _TROPHY_LOG_ORDERINGS). The recent / oldest sorts seek on (profile, COALESCE(earned_date_time,
+# sentinel), id) in one direction each; the sentinel replaces NULLS LAST so the key is never NULL
+# and a plain range condition can drive an index scan. The expressions must match the view's
+# orderings exactly (including the sentinel values in trophies/util_modules/constants.py) or the
+# planner will not use them.
+#
+# Without them a deep page of a whale profile's trophy log ran COUNT(*) plus an OFFSET scan over the
+# profile's whole earned set (up to ~250K rows joined to Trophy and Game) on every infinite-scroll
+# fetch. The rarity / alpha / type sorts order by Trophy columns, which no EarnedTrophy index can
+# cover; they still lose the COUNT and the OFFSET walk.
+#
+# Built with AddIndexConcurrently (+ atomic = False) so CREATE INDEX does not write-lock EarnedTrophy
+# while the sync workers are updating it. Same pattern as 0257 / 0260.
+#
+# NOTE: if a CONCURRENTLY build fails partway, Postgres leaves an INVALID index behind that must be
+# dropped manually before re-running:
+#     DROP INDEX CONCURRENTLY IF EXISTS et_keyset_recent_idx;
+#     DROP INDEX CONCURRENTLY IF EXISTS et_keyset_oldest_idx;
+
+import datetime
+
+import django.db.models.functions.comparison
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("trophies", "0260_profilegame_leaderboard_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="earnedtrophy",
+            index=models.Index(
+                models.F("profile"),
+                models.OrderBy(
+                    django.db.models.functions.comparison.Coalesce(
+                        "earned_date_time",
+                        models.Value(datetime.datetime(1970, 1, 1, 0, 0, tzinfo=datetime.timezone.utc)),
+                    ),
+                    descending=True,
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                condition=models.Q(("earned", True)),
+                name="et_keyset_recent_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="earnedtrophy",
+            index=models.Index(
+                models.F("profile"),
+                django.db.models.functions.comparison.Coalesce(
+                    "earned_date_time",
+                    models.Value(datetime.datetime(9999, 12, 31, 0, 0, tzinfo=datetime.timezone.utc)),
+                ),
+                models.F("id"),
+                condition=models.Q(("earned", True)),
+                name="et_keyset_oldest_idx",
+            ),
+        ),
+    ]
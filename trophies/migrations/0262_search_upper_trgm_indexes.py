@@ -0,0 +1,71 @@
+# Trigram GIN expression indexes for site search (game, trophy, profile and concept names).
+#
+# Every search box on the site filters with __icontains, which Django compiles on Postgres to
+# UPPER("col"::text) LIKE UPPER('%q%'). That expression is not the bare column, so neither the btree
+# indexes nor the plain-column trigram indexes from 0257 can serve it, and each keystroke in the
+# games browse, trophy list, profile search or concept pickers was a sequential scan. A pg_trgm GIN
+# index on UPPER(col) matches the compiled expression exactly, so those existing queries (and the
+# typeahead in trophies/services/search_service.py) become index scans without changing any call
+# site. Roman-numeral variants from expand_numeral_query are OR-ed ILIKEs; each arm is served by the
+# same index (BitmapOr).
+#
+# Built with AddIndexConcurrently (+ atomic = False) so CREATE INDEX does not write-lock Trophy and
+# Game while the sync workers are writing them. pg_trgm is already installed by 0257.
+#
+# NOTE: if a CONCURRENTLY build fails partway, Postgres leaves an INVALID index behind that must be
+# dropped manually before re-running, e.g.:
+#     DROP INDEX CONCURRENTLY IF EXISTS trophy_name_upper_trgm;
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("trophies", "0261_earnedtrophy_keyset_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="concept",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("unified_title"), name="gin_trgm_ops"
+                ),
+                name="concept_title_upper_trgm",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="game",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("title_name"), name="gin_trgm_ops"
+                ),
+                name="game_title_upper_trgm",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="profile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("psn_username"), name="gin_trgm_ops"
+                ),
+                name="profile_username_upper_trgm",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="trophy",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("trophy_name"), name="gin_trgm_ops"
+                ),
+                name="trophy_name_upper_trgm",
+            ),
+        ),
+    ]
@@ -14,6 +14,10 @@ def register_handler(criteria_type):
 @register_handler('manual')
 def handle_manual(profile, milestone, _cache=None):
     """Always return not achieved unless already awarded."""
+    if _cache is not None and '_earned_milestone_ids' in _cache:
+        if milestone.id in _cache['_earned_milestone_ids']:
+            return {'achieved': True, 'progress': milestone.required_value}
+        return {'achieved': False, 'progress': 0}
     try:
         user_milestone = profile.user_milestones.get(milestone=milestone)
         return {'achieved': True, 'progress': milestone.required_value}
@@ -305,13 +309,18 @@ def handle_calendar_months_total(profile, milestone, _cache=None):
     if not challenge:
         return {'achieved': False, 'progress': 0}
 
-    from django.db.models import Count
-    month_counts = dict(
-        CalendarChallengeDay.objects.filter(challenge=challenge, is_filled=True)
-        .values('month')
-        .annotate(count=Count('id'))
-        .values_list('month', 'count')
-    )
+    if _cache is not None and '_calendar_month_counts' in _cache:
+        month_counts = _cache['_calendar_month_counts']
+    else:
+        from django.db.models import Count
+        month_counts = dict(
+            CalendarChallengeDay.objects.filter(challenge=challenge, is_filled=True)
+            .values('month')
+            .annotate(count=Count('id'))
+            .values_list('month', 'count')
+        )
+        if _cache is not None:
+            _cache['_calendar_month_counts'] = month_counts
     completed_months = sum(
         1 for month_num, days_needed in CALENDAR_DAYS_PER_MONTH.items()
         if month_counts.get(month_num, 0) >= days_needed
@@ -326,9 +335,12 @@ def handle_calendar_complete(profile, milestone, _cache=None):
     """Check if the calendar challenge is fully complete (365/365)"""
     from trophies.models import Challenge
 
-    complete = Challenge.objects.filter(
-        profile=profile, challenge_type='calendar', is_complete=True, is_deleted=False
-    ).exists()
+    if _cache is not None and 'calendar_complete' in _cache:
+        complete = _cache['calendar_complete'] > 0
+    else:
+        complete = Challenge.objects.filter(
+            profile=profile, challenge_type='calendar', is_complete=True, is_deleted=False
+        ).exists()
     progress = 1 if complete else 0
     return {'achieved': complete, 'progress': progress}
 
@@ -411,3 +423,106 @@ def handle_review_helpful_count(profile, milestone, _cache=None):
             _cache[cache_key] = current
 
     return {'achieved': current >= target, 'progress': current}
+
+
+# ── Evaluation snapshot ─────────────────────────────────────────────── #
+#
+# check_all_milestones_for_user evaluates every active milestone for a profile.
+# Rather than letting each handler run its own COUNT/SUM on first use, it
+# pre-fills the shared _cache with every metric the requested criteria types
+# read, in one Profile query carrying one correlated subquery per metric (plus
+# two calendar queries when calendar types are involved). Handlers then hit
+# their existing `key in _cache` branch and only compare thresholds.
+
+
+def _subquery_metric(queryset, aggregate):
+    """Correlated scalar subquery: `aggregate` over `queryset` rows of the outer profile."""
+    from django.db.models import OuterRef, Subquery
+
+    return Subquery(
+        queryset.filter(profile=OuterRef('pk'))
+        .order_by()
+        .values('profile')
+        .annotate(value=aggregate)
+        .values('value')[:1]
+    )
+
+
+def _snapshot_metrics():
+    """criteria_type -> (_cache key, subquery expression) for subquery-backed metrics."""
+    from django.db.models import Count, Max, Sum
+    from trophies.models import (
+        Challenge, Checklist, ProfileGamification, Review, UserBadgeProgress, UserConceptRating,
+    )
+
+    challenges = Challenge.objects.filter(is_deleted=False)
+    reviews = Review.objects.filter(is_deleted=False)
+    gamification = ProfileGamification.objects.all()
+    return {
+        'plat_count': ('plat_count', _subquery_metric(ProfileGame.objects.filter(has_plat=True), Count('id'))),
+        'playtime_hours': ('playtime_hours', _subquery_metric(
+            ProfileGame.objects.filter(play_duration__isnull=False), Sum('play_duration'))),
+        'rating_count': ('rating_count', _subquery_metric(UserConceptRating.objects.all(), Count('id'))),
+        'checklist_upvotes': ('checklist_upvotes', _subquery_metric(
+            Checklist.objects.filter(is_deleted=False), Sum('upvote_count'))),
+        'badge_count': ('badge_count', _subquery_metric(gamification, Max('total_badges_earned'))),
+        'unique_badge_count': ('unique_badge_count', _subquery_metric(gamification, Max('unique_badges_earned'))),
+        'stage_count': ('stage_count', _subquery_metric(UserBadgeProgress.objects.all(), Sum('completed_concepts'))),
+        'az_progress': ('az_progress', _subquery_metric(challenges.filter(challenge_type='az'), Sum('completed_count'))),
+        'genre_progress': ('genre_progress', _subquery_metric(
+            challenges.filter(challenge_type='genre'), Sum('completed_count'))),
+        'subgenre_progress': ('subgenre_progress', _subquery_metric(
+            challenges.filter(challenge_type='genre'), Max('platted_subgenre_count'))),
+        'review_count': ('review_count', _subquery_metric(reviews.filter(word_count__gte=150), Count('id'))),
+        'review_helpful_count': ('review_helpful_count', _subquery_metric(reviews, Sum('helpful_count'))),
+        'calendar_complete': ('calendar_complete', _subquery_metric(
+            challenges.filter(challenge_type='calendar', is_complete=True), Count('id'))),
+    }
+
+
+def build_milestone_snapshot(profile, criteria_types):
+    """
+    Compute every metric the handlers for `criteria_types` read, in bulk.
+
+    Returns a dict usable as the handlers' `_cache`. Metrics whose handlers
+    read Profile fields directly (trophy_count, completion_count, linked /
+    premium flags) or per-user rows (subscription_months) are left to the
+    handler.
+    """
+    from django.db.models import Count
+    from trophies.models import CalendarChallengeDay, Challenge, Profile
+
+    criteria_types = set(criteria_types)
+    snapshot = {}
+
+    metrics = {
+        key: expression
+        for ctype, (key, expression) in _snapshot_metrics().items()
+        if ctype in criteria_types
+    }
+    if metrics:
+        row = (
+            Profile.objects.filter(pk=profile.pk)
+            .annotate(**{f'metric_{key}': expression for key, expression in metrics.items()})
+            .values(*(f'metric_{key}' for key in metrics))
+            .first()
+        ) or {}
+        for key in metrics:
+            value = row.get(f'metric_{key}')
+            if key == 'playtime_hours':
+                value = int(value.total_seconds() / 3600) if value else 0
+            snapshot[key] = value or 0
+
+    if criteria_types & (set(MONTH_MAP) | {'calendar_months_total'}):
+        challenge = Challenge.objects.filter(
+            profile=profile, challenge_type='calendar', is_deleted=False
+        ).order_by('-completed_count').first()
+        snapshot['_calendar_challenge'] = challenge
+        snapshot['_calendar_month_counts'] = dict(
+            CalendarChallengeDay.objects.filter(challenge=challenge, is_filled=True)
+            .values('month')
+            .annotate(filled=Count('id'))
+            .values_list('month', 'filled')
+        ) if challenge else {}
+
+    return snapshot
@@ -202,6 +202,40 @@ class ProfileHotbarMixin(View):
         return context
 
 
+class AnonymousPageCacheMixin:
+    """
+    Serve the canonical page to anonymous visitors from the page cache.
+
+    Subclasses set ``page_cache_namespace`` (see util_modules/page_cache.py)
+    and implement ``get_page_cache_owner_id()``, a cheap lookup of the id the
+    namespace is invalidated by (None falls through to the normal render, e.g.
+    for a 404). ``page_cache_hit(owner_id)`` runs when a cached page is
+    served, for side effects of the skipped render such as page view tracking.
+    """
+    page_cache_namespace = None  # e.g. 'game_page'
+
+    def get_page_cache_owner_id(self):
+        raise NotImplementedError
+
+    def page_cache_hit(self, owner_id):
+        pass
+
+    def get(self, request, *args, **kwargs):
+        from functools import partial
+        from trophies.util_modules.page_cache import get_or_render, is_cacheable_request
+
+        render = partial(super().get, request, *args, **kwargs)
+        if not is_cacheable_request(request):
+            return render()
+        owner_id = self.get_page_cache_owner_id()
+        if owner_id is None:
+            return render()
+        return get_or_render(
+            request, self.page_cache_namespace, owner_id, render,
+            on_hit=partial(self.page_cache_hit, owner_id),
+        )
+
+
 class HtmxListMixin:
     """Mixin for ListViews that returns a partial template on HTMX requests.
 
@@ -4,11 +4,11 @@ from django.db import models, DatabaseError, IntegrityError, OperationalError
 from django.utils import timezone
 from users.models import CustomUser
 from django.contrib.postgres.fields import ArrayField
-from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
 from django.db import transaction
-from django.db.models import F, IntegerField, Max, Min, Q
-from django.db.models.functions import Cast, Substr
+from django.db.models import F, IntegerField, Max, Min, Q, Value
+from django.db.models.functions import Cast, Coalesce, Substr, Upper
 import logging
 
 logger = logging.getLogger("psn_api")
@@ -18,6 +18,7 @@ from trophies.util_modules.language import count_unique_game_groups, calculate_t
 from trophies.util_modules.constants import (
     TITLE_STATS_SUPPORTED_PLATFORMS, NA_REGION_CODES, EU_REGION_CODES,
     JP_REGION_CODES, AS_REGION_CODES, KR_REGION_CODES, CN_REGION_CODES,
+    EARNED_DATE_CEILING, EARNED_DATE_FLOOR,
 )
 from trophies.managers import (
     ProfileManager, GameManager, ProfileGameManager,
@@ -186,6 +187,10 @@ class Profile(models.Model):
             models.Index(fields=['country_code'], name='profile_country_code_idx'),
             models.Index(fields=['is_linked', 'sync_tier'], name='profile_linked_tier_idx'),
             models.Index(fields=['is_discord_verified', 'discord_linked_at'], name='profile_discord_idx'),
+            # Trigram GIN on UPPER(): Django's __icontains compiles to
+            # UPPER(col::text) LIKE UPPER('%q%'), so only an index on that exact
+            # expression serves profile search (see services/search_service.py).
+            GinIndex(OpClass(Upper('psn_username'), name='gin_trgm_ops'), name='profile_username_upper_trgm'),
             models.Index(fields=['user_is_premium', 'selected_background']),
         ]
 
@@ -445,9 +450,6 @@ class Profile(models.Model):
         self.sync_progress_value = 0
         self.save(update_fields=['sync_progress_target', 'sync_progress_value'])
         self.refresh_from_db(fields=['sync_progress_target', 'sync_progress_value'])
-        # Clear the queued games dedup set for this sync cycle
-        from trophies.util_modules.cache import redis_client
-        redis_client.delete(f"sync_queued_games:{self.id}")
 
     @property
     def sync_percentage(self):
@@ -559,8 +561,19 @@ class Game(models.Model):
             models.Index(fields=['is_regional'], name='game_regional_idx'),
             models.Index(fields=['has_online_trophies'], name='game_online_trophies_idx'),
             models.Index(fields=['has_buggy_trophies'], name='game_buggy_trophies_idx'),
+            # Trigram GIN on UPPER() for __icontains title search (browse, typeahead).
+            GinIndex(OpClass(Upper('title_name'), name='gin_trgm_ops'), name='game_title_upper_trgm'),
         ]
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Concept as loaded, so the badge topology signal can skip the
+        # (constant) sync saves that don't move the game. Absent on deferred loads.
+        if 'concept_id' in instance.__dict__:
+            instance._loaded_concept_id = instance.concept_id
+        return instance
+
     def save(self, *args, **kwargs):
         if self.title_name:
             self.title_name = clean_game_title(self.title_name)
@@ -976,6 +989,8 @@ class Concept(models.Model):
             # Trigram GIN: serves substring (ILIKE '%q%') title search from the
             # universal nav-search typeahead, which a btree can't (leading wildcard).
             GinIndex(fields=['unified_title'], name='concept_title_trgm', opclasses=['gin_trgm_ops']),
+            # ...and the UPPER() form that __icontains lookups compile to.
+            GinIndex(OpClass(Upper('unified_title'), name='gin_trgm_ops'), name='concept_title_upper_trgm'),
         ]
 
     def save(self, *args, **kwargs):
@@ -1629,6 +1644,8 @@ class Trophy(models.Model):
             models.Index(fields=["earned_count"], name="trophy_earned_count_idx"),
             models.Index(fields=['trophy_earn_rate'], name="trophy_psn_rate_idx"),
             models.Index(fields=['earn_rate'], name='trophy_pp_rate_idx'),
+            # Trigram GIN on UPPER() for __icontains trophy name search.
+            GinIndex(OpClass(Upper('trophy_name'), name='gin_trgm_ops'), name='trophy_name_upper_trgm'),
         ]
     
     def save(self, *args, **kwargs):
@@ -1760,6 +1777,22 @@ class EarnedTrophy(models.Model):
                 condition=Q(earned=True),
                 name='earnedtrophy_timeline_idx'
             ),
+            # Keyset pagination of the profile trophy log (recent / oldest
+            # sorts). Expressions must match ProfileDetailView._TROPHY_LOG_ORDERINGS.
+            models.Index(
+                F('profile'),
+                Coalesce('earned_date_time', Value(EARNED_DATE_FLOOR)).desc(),
+                F('id').desc(),
+                condition=Q(earned=True),
+                name='et_keyset_recent_idx',
+            ),
+            models.Index(
+                F('profile'),
+                Coalesce('earned_date_time', Value(EARNED_DATE_CEILING)),
+                F('id'),
+                condition=Q(earned=True),
+                name='et_keyset_oldest_idx',
+            ),
         ]
 
 class UserTrophySelection(models.Model):
@@ -5,6 +5,7 @@ import time
 from dotenv import load_dotenv
 from .models import Profile, Game
 from trophies.util_modules.cache import redis_client
+from trophies.job_queue import COUNTED_QUEUES, job_queue
 
 load_dotenv()
 logger = logging.getLogger("psn_api")
@@ -14,29 +15,30 @@ class PSNManager:
     
     max_jobs_per_profile = int(os.getenv("MAX_JOBS_PER_PROFILE", 3))
     
-    # Queues that track per-profile job counters for sync completion detection
-    COUNTED_QUEUES = ("low_priority", "medium_priority", "bulk_priority")
+    # Queues that track per-profile jobs for sync completion detection
+    COUNTED_QUEUES = COUNTED_QUEUES
 
     @classmethod
-    def assign_job(cls, job_type: str, args: list, profile_id: int, priority_override: str=None, skip_counter: bool=False):
+    def assign_job(cls, job_type: str, args: list, profile_id: int, priority_override: str=None, skip_counter: bool=False, coalesce: str=None):
         """Assign job to queue, respecting priorities.
 
         Args:
             skip_counter: If True, don't increment the per-profile job counter.
                 Used when re-queuing a failed job that was already counted.
+            coalesce: Dedup member for this profile/job type. If a job with the
+                same member is still waiting in a queue, nothing is queued.
+
+        Returns True if the job was queued, False if it was coalesced.
         """
         queue_name = priority_override or cls._get_queue_for_job(job_type)
-        if queue_name in cls.COUNTED_QUEUES and not skip_counter:
-            redis_client.incr(f"profile_jobs:{profile_id}:{queue_name}")
-            redis_client.sadd("active_profiles", profile_id)
-
-        json_data = json.dumps({
+        queued = job_queue.push(queue_name, {
             'job_type': job_type,
             'args': args,
             'profile_id': profile_id
-        })
-        redis_client.lpush(f"{queue_name}_jobs", json_data)
-        logger.info(f"[profile {profile_id}] queued {job_type} -> {queue_name}")
+        }, track=not skip_counter, coalesce=coalesce)
+        if queued:
+            logger.info(f"[profile {profile_id}] queued {job_type} -> {queue_name}")
+        return queued
 
     @classmethod
     def _get_queue_for_job(cls, job_type):
@@ -128,20 +130,17 @@ class PSNManager:
 
     @classmethod
     def assign_sync_trophies(cls, profile_id: int, np_communication_id: str, platform: str, priority_override: str = None):
-        """Queue a sync_trophies job with per-profile deduplication.
+        """Queue a sync_trophies job, coalescing with a copy still waiting in a queue.
 
-        Uses a Redis set to skip games already queued for this sync cycle.
+        The check and the push are one atomic Redis script; the pending entry
+        is released when a worker picks the job up (see job_queue.py).
         Returns True if the job was queued, False if it was a duplicate.
         """
-        dedup_key = f"sync_queued_games:{profile_id}"
-        if redis_client.sismember(dedup_key, np_communication_id):
-            logger.info(f"sync_trophies for {np_communication_id} already queued for profile {profile_id}, skipping")
-            return False
-        redis_client.sadd(dedup_key, np_communication_id)
-        redis_client.expire(dedup_key, 7200)  # 2 hour TTL as safety net
         args = [np_communication_id, platform]
-        cls.assign_job('sync_trophies', args, profile_id, priority_override=priority_override)
-        return True
+        queued = cls.assign_job('sync_trophies', args, profile_id, priority_override=priority_override, coalesce=np_communication_id)
+        if not queued:
+            logger.info(f"sync_trophies for {np_communication_id} already queued for profile {profile_id}, skipping")
+        return queued
 
     @classmethod
     def sync_profile_game_trophies(cls, profile: Profile, game: Game):
@@ -0,0 +1,336 @@
+"""
+Bulk badge evaluation - Re-evaluate badges for many profiles at once.
+
+`handle_badge` is built for one profile at a time: each call runs its own
+ProfileGame plat/100% lookups and writes UserBadgeProgress / UserBadge rows
+individually, which makes a full-site reconciliation (`check_all_badges`,
+`populate_badges`, `refresh_badge_series --all`) take hours.
+
+`evaluate_badges_bulk` works on chunks of profiles instead. Per chunk it
+loads, keyed by profile_id, the plat/100% game sets and bundle concept sets,
+the earned badges, progress rows and stage completion events (one query
+each), then evaluates every (profile, badge) pair in memory with the same
+stage logic as `handle_badge` (`_get_stage_completion_from_cache` +
+`_completion_outcome` over the cached badge topology). Writes are batched:
+progress via bulk_create / bulk_update, awards via bulk_create.
+
+Bulk writes skip model signals, so this module repeats their effects:
+Badge.earned_count, badge UserTitles, the per-series XP / progress refresh
+for every profile that changed (via bulk_gamification_update /
+defer_profile_update), and the per-series earners leaderboard entries for
+every (profile, series) that gained or lost a badge (update_earner_entries,
+once the chunk has committed). Badge notifications are NOT queued: bulk mode
+is for reconciliation, where users effectively already held what is
+awarded. Revocations are rare and go through `_revoke_badge` (signals
+included, though bulk mode defers their leaderboard work to the same
+earners refresh).
+"""
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from trophies.constants import EVALUATABLE_BADGE_TYPES
+from trophies.services.badge_service import (
+    _award_badge,
+    _completion_outcome,
+    _find_stage_completion_details,
+    _get_stage_completion_from_cache,
+    _revoke_badge,
+)
+
+logger = logging.getLogger("psn_api")
+
+BULK_CHUNK_SIZE = 500
+
+
+@dataclass
+class BulkBadgeResult:
+    """Outcome of a bulk run. awarded / revoked map profile_id -> [badge_id]."""
+    profiles: int = 0
+    pairs: int = 0
+    progress_written: int = 0
+    awarded: dict = field(default_factory=lambda: defaultdict(list))
+    revoked: dict = field(default_factory=lambda: defaultdict(list))
+
+    @property
+    def profiles_changed(self) -> set:
+        return set(self.awarded) | set(self.revoked)
+
+
+def evaluate_badges_bulk(profile_ids, badges, chunk_size=BULK_CHUNK_SIZE, dry_run=False, on_chunk=None):
+    """
+    Evaluate `badges` for every profile in `profile_ids`, chunk by chunk.
+
+    Each profile is only evaluated against badges of series it has a staged
+    game in (the same scoping as initial_badge_check). With dry_run nothing
+    is written; the result still reports what would be awarded/revoked.
+
+    Args:
+        on_chunk: Optional callback(done, total) after each chunk, for progress output.
+
+    Returns:
+        BulkBadgeResult
+    """
+    from trophies.services.badge_topology import get_badge_topology
+
+    badges = sorted(
+        (b for b in badges if b.series_slug and b.badge_type in EVALUATABLE_BADGE_TYPES),
+        key=lambda b: (b.tier, b.id),
+    )
+    profile_ids = list(profile_ids)
+    result = BulkBadgeResult()
+    if not badges or not profile_ids:
+        return result
+
+    topology = get_badge_topology()
+    stage_maps = _stage_maps(badges)
+
+    for start in range(0, len(profile_ids), chunk_size):
+        chunk = profile_ids[start:start + chunk_size]
+        _evaluate_chunk(chunk, badges, topology, stage_maps, result, dry_run)
+        result.profiles += len(chunk)
+        if on_chunk:
+            on_chunk(result.profiles, len(profile_ids))
+
+    return result
+
+
+def _stage_maps(badges):
+    """badge_id -> {stage_number: Stage} of the non-zero stages that apply to its tier."""
+    from trophies.models import Stage
+
+    stages_by_series = defaultdict(list)
+    for stage in Stage.objects.filter(series_slug__in={b.series_slug for b in badges}):
+        stages_by_series[stage.series_slug].append(stage)
+    return {
+        badge.id: {
+            stage.stage_number: stage
+            for stage in stages_by_series[badge.series_slug]
+            if stage.stage_number != 0 and stage.applies_to_tier(badge.tier)
+        }
+        for badge in badges
+    }
+
+
+def _load_profile_contexts(chunk, badges, topology):
+    """Columnar loads for one chunk; returns {profile_id: handle_badge-style context}."""
+    from trophies.models import ProfileGame, UserBadge
+
+    series_slugs = {b.series_slug for b in badges}
+    game_ids = set()
+    bundle_concept_ids = set()
+    for slug in series_slugs:
+        for _, _, stage_game_ids, bundles in topology.stage_data.get(slug, ()):
+            game_ids.update(stage_game_ids)
+            for _, member_ids in bundles:
+                bundle_concept_ids.update(member_ids)
+
+    contexts = {
+        profile_id: {
+            'earned_badge_ids': set(),
+            'badges_by_key': {(b.series_slug, b.tier): b for b in badges},
+            'stage_data': topology.stage_data,
+            'played_game_ids': set(),
+            'plat_game_ids': set(),
+            'complete_game_ids': set(),
+            'fully_earned_concept_ids': set(),
+            'platted_concept_ids': set(),
+        }
+        for profile_id in chunk
+    }
+
+    if game_ids:
+        for profile_id, game_id, has_plat, progress in ProfileGame.objects.filter(
+            profile_id__in=chunk, game_id__in=game_ids
+        ).values_list('profile_id', 'game_id', 'has_plat', 'progress'):
+            ctx = contexts[profile_id]
+            ctx['played_game_ids'].add(game_id)
+            if has_plat:
+                ctx['plat_game_ids'].add(game_id)
+            if progress == 100:
+                ctx['complete_game_ids'].add(game_id)
+
+    if bundle_concept_ids:
+        for profile_id, concept_id, has_plat, progress in ProfileGame.objects.filter(
+            Q(has_plat=True) | Q(progress=100),
+            profile_id__in=chunk, game__concept_id__in=bundle_concept_ids,
+        ).values_list('profile_id', 'game__concept_id', 'has_plat', 'progress'):
+            ctx = contexts[profile_id]
+            if has_plat:
+                ctx['platted_concept_ids'].add(concept_id)
+            if progress == 100:
+                ctx['fully_earned_concept_ids'].add(concept_id)
+
+    for profile_id, badge_id in UserBadge.objects.filter(
+        profile_id__in=chunk, badge__in=badges
+    ).values_list('profile_id', 'badge_id'):
+        contexts[profile_id]['earned_badge_ids'].add(badge_id)
+
+    return contexts
+
+
+def _evaluate_chunk(chunk, badges, topology, stage_maps, result, dry_run):
+    from trophies.models import Profile, StageCompletionEvent, UserBadgeProgress
+    from trophies.services.xp_service import bulk_gamification_update, defer_profile_update
+
+    contexts = _load_profile_contexts(chunk, badges, topology)
+    progress_rows = {
+        (row.profile_id, row.badge_id): row
+        for row in UserBadgeProgress.objects.filter(profile_id__in=chunk, badge__in=badges)
+        .only('id', 'profile_id', 'badge_id', 'completed_concepts')
+    }
+    events = {
+        (profile_id, badge_id, stage_id): event_id
+        for event_id, profile_id, badge_id, stage_id in StageCompletionEvent.objects.filter(
+            profile_id__in=chunk, badge__in=badges
+        ).values_list('id', 'profile_id', 'badge_id', 'stage_id')
+    }
+
+    awards = []          # (profile_id, badge)
+    revokes = []         # (profile_id, badge)
+    new_progress = []
+    changed_progress = []
+    completed_stages = []  # (profile_id, badge, stage)
+    stale_event_ids = []
+    changed_series = defaultdict(set)  # profile_id -> series whose XP inputs changed
+
+    for profile_id in chunk:
+        ctx = contexts[profile_id]
+        profile_series = topology.series_for_games(ctx['played_game_ids'])
+        for badge in badges:
+            if badge.series_slug not in profile_series:
+                continue
+            result.pairs += 1
+            completion = _get_stage_completion_from_cache(badge, ctx)
+            badge_earned, completed_count = _completion_outcome(badge, completion)
+
+            held = badge.id in ctx['earned_badge_ids']
+            if badge_earned and not held:
+                awards.append((profile_id, badge))
+                ctx['earned_badge_ids'].add(badge.id)
+            elif not badge_earned and held:
+                revokes.append((profile_id, badge))
+                ctx['earned_badge_ids'].discard(badge.id)
+
+            row = progress_rows.get((profile_id, badge.id))
+            if row is None:
+                new_progress.append(UserBadgeProgress(
+                    profile_id=profile_id, badge=badge, completed_concepts=completed_count
+                ))
+                changed_series[profile_id].add(badge.series_slug)
+            elif row.completed_concepts != completed_count:
+                row.completed_concepts = completed_count
+                row.last_checked = timezone.now()
+                changed_progress.append(row)
+                changed_series[profile_id].add(badge.series_slug)
+
+            for stage_number, stage in stage_maps[badge.id].items():
+                is_complete = completion.get(stage_number)
+                event_id = events.get((profile_id, badge.id, stage.id))
+                if is_complete and event_id is None:
+                    completed_stages.append((profile_id, badge, stage))
+                elif not is_complete and event_id is not None:
+                    stale_event_ids.append(event_id)
+
+    for profile_id, badge in awards:
+        result.awarded[profile_id].append(badge.id)
+    for profile_id, badge in revokes:
+        result.revoked[profile_id].append(badge.id)
+    result.progress_written += len(new_progress) + len(changed_progress)
+    if dry_run:
+        return
+
+    for profile_id, badge in awards + revokes:
+        changed_series[profile_id].add(badge.series_slug)
+    profiles = Profile.objects.in_bulk(
+        set(changed_series) | {profile_id for profile_id, _, _ in completed_stages}
+    )
+
+    with bulk_gamification_update():
+        with transaction.atomic():
+            UserBadgeProgress.objects.bulk_create(new_progress, batch_size=1000)
+            UserBadgeProgress.objects.bulk_update(
+                changed_progress, ['completed_concepts', 'last_checked'], batch_size=1000
+            )
+            _write_awards(awards, profiles)
+            for profile_id, badge in revokes:
+                _revoke_badge(profiles[profile_id], badge)
+            _write_stage_events(completed_stages, stale_event_ids, profiles, contexts)
+
+        # Signals were bypassed: queue the incremental XP / leaderboard refresh
+        # they would have queued, flushed once when the context exits.
+        for profile_id, series_slugs in changed_series.items():
+            for series_slug in series_slugs:
+                defer_profile_update(profiles[profile_id], series_slug)
+
+    # The earners sets are kept by the UserBadge signals, which bulk_create
+    # skipped (and bulk mode suppresses for the revocations).
+    try:
+        from trophies.services.redis_leaderboard_service import update_earner_entries
+        update_earner_entries(
+            profiles, {(profile_id, badge.series_slug) for profile_id, badge in awards + revokes}
+        )
+    except Exception:
+        logger.exception("Failed to update earner leaderboards after bulk badge writes")
+
+    from trophies.services.dashboard_service import invalidate_dashboard_cache
+    from trophies.util_modules.cache_invalidation import invalidation_batch
+    with invalidation_batch():  # one delete_many for the whole chunk
+        for profile_id in changed_series:
+            invalidate_dashboard_cache(profile_id)
+
+
+def _write_awards(awards, profiles):
+    """bulk_create UserBadges plus what the per-row signals/award path would do."""
+    from trophies.models import Badge, UserBadge, UserTitle
+
+    if not awards:
+        return
+    try:
+        with transaction.atomic():
+            UserBadge.objects.bulk_create(
+                [UserBadge(profile_id=profile_id, badge=badge) for profile_id, badge in awards],
+                batch_size=1000,
+            )
+    except IntegrityError:
+        # Raced with a sync awarding the same badge: fall back to the per-row path.
+        logger.warning("Bulk badge award hit an existing UserBadge; awarding row by row")
+        for profile_id, badge in awards:
+            _award_badge(profiles[profile_id], badge)
+        return
+
+    per_badge = defaultdict(int)
+    for _, badge in awards:
+        per_badge[badge.id] += 1
+    for badge_id, count in per_badge.items():
+        Badge.objects.filter(pk=badge_id).update(earned_count=F('earned_count') + count)
+
+    UserTitle.objects.bulk_create(
+        [
+            UserTitle(profile_id=profile_id, title_id=badge.title_id, source_type='badge', source_id=badge.id)
+            for profile_id, badge in awards if badge.title_id
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    logger.info(f"Bulk-awarded {len(awards)} badges across {len({p for p, _ in awards})} profiles")
+
+
+def _write_stage_events(completed_stages, stale_event_ids, profiles, contexts):
+    from trophies.models import StageCompletionEvent
+
+    if stale_event_ids:
+        StageCompletionEvent.objects.filter(id__in=stale_event_ids).delete()
+    new_events = []
+    for profile_id, badge, stage in completed_stages:
+        concept, completed_at = _find_stage_completion_details(
+            profiles[profile_id], stage, badge, contexts[profile_id]
+        )
+        new_events.append(StageCompletionEvent(
+            profile_id=profile_id, badge=badge, stage=stage, concept=concept, completed_at=completed_at,
+        ))
+    StageCompletionEvent.objects.bulk_create(new_events, batch_size=1000, ignore_conflicts=True)
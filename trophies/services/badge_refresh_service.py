@@ -17,13 +17,17 @@ from trophies.services.badge_service import handle_badge
 logger = logging.getLogger('psn_api')
 
 
-def refresh_badge_series_awards(series_slug, skip_notifications=False):
+def refresh_badge_series_awards(series_slug, skip_notifications=False, bulk=False):
     """Re-evaluate all earners' badges for `series_slug` and rebuild its leaderboards.
 
     `skip_notifications=True` silences ALL earned-badge notifications for this run --
     Discord (the consolidated per-profile batch), on-site, and email -- so a bulk
     re-evaluation doesn't ping users about badges they effectively already held.
 
+    `bulk=True` evaluates the earners in chunks via `evaluate_badges_bulk` (batched
+    reads/writes, much faster for big series). Bulk writes queue no notifications,
+    so it implies `skip_notifications`.
+
     Returns (processed_pairs, profiles_changed, earners_count, progress_count).
     `processed_pairs` is 0 when the series has no badges.
     """
@@ -35,6 +39,11 @@ def refresh_badge_series_awards(series_slug, skip_notifications=False):
         played_games__game__concept__stages__series_slug=series_slug
     ).distinct()
 
+    if bulk:
+        from trophies.services.badge_bulk_service import evaluate_badges_bulk
+        result = evaluate_badges_bulk(profiles.values_list('id', flat=True), badges)
+        return (result.pairs, len(result.profiles_changed), *_rebuild_series_leaderboards(series_slug))
+
     profiles_changed = set()
     created_by_profile = {}  # profile -> [newly-created badges] for the Discord batch
     processed = 0
@@ -73,11 +82,14 @@ def refresh_badge_series_awards(series_slug, skip_notifications=False):
             except Exception:
                 logger.exception("refresh_badge_series_awards: discard notifications for profile %s", profile_id)
 
-    earners_count = progress_count = 0
+    return (processed, len(profiles_changed), *_rebuild_series_leaderboards(series_slug))
+
+
+def _rebuild_series_leaderboards(series_slug):
+    """Rebuild the series' earners + progress leaderboards; returns (earners, progress)."""
     try:
         from trophies.services.redis_leaderboard_service import rebuild_series_leaderboards
-        earners_count, progress_count = rebuild_series_leaderboards(series_slug)
+        return rebuild_series_leaderboards(series_slug)
     except Exception:
         logger.exception("refresh_badge_series_awards: leaderboard rebuild for %s", series_slug)
-
-    return (processed, len(profiles_changed), earners_count, progress_count)
+        return (0, 0)
@@ -10,7 +10,6 @@ This service consolidates all badge-related business logic including:
 import logging
 import time
 from django.db import transaction
-from django.db.models.query import QuerySet
 from django.utils import timezone
 from django.conf import settings
 import requests
@@ -25,6 +24,9 @@ def _build_badge_context(profile, badges):
     """
     Pre-fetch data needed by handle_badge to avoid N+1 queries per badge.
 
+    The stage graph comes from the cached badge topology (badge_topology.py);
+    only the profile-specific sets below hit the database.
+
     Returns a dict with:
         - earned_badge_ids: set of Badge IDs the profile has earned
         - badges_by_key: dict of (series_slug, tier) -> Badge for prerequisite lookups
@@ -36,7 +38,8 @@ def _build_badge_context(profile, badges):
             games is at progress=100 for this profile (used to evaluate ConceptBundle
             satisfaction; a bundle is satisfied when every member concept is in this set)
     """
-    from trophies.models import UserBadge, Stage, ProfileGame
+    from trophies.models import UserBadge, ProfileGame
+    from trophies.services.badge_topology import get_badge_topology
 
     earned_badge_ids = set(
         UserBadge.objects.filter(
@@ -45,36 +48,18 @@ def _build_badge_context(profile, badges):
     )
     badges_by_key = {(b.series_slug, b.tier): b for b in badges}
 
-    # Pre-fetch ALL stage completion data for all relevant series in one pass
+    # Stage graph for all relevant series: series_slug -> [(stage_number, required_tiers, game_ids, bundles)]
     series_slugs = {b.series_slug for b in badges if b.series_slug}
+    topology = get_badge_topology()
+    stage_data = {slug: topology.stage_data[slug] for slug in series_slugs if slug in topology.stage_data}
 
-    all_stages = (
-        Stage.objects
-        .filter(series_slug__in=series_slugs)
-        .prefetch_related('concepts__games', 'concept_bundles__concepts')
-    )
-
-    # Build mapping: series_slug -> [(stage_number, required_tiers, game_ids, bundles)]
-    stage_data = {}
     all_game_ids = set()
     bundle_concept_ids = set()  # all concept ids participating in any bundle (for cache)
-
-    for stage in all_stages:
-        slug = stage.series_slug
-        if slug not in stage_data:
-            stage_data[slug] = []
-        game_ids = set()
-        for concept in stage.concepts.all():
-            for game in concept.games.all():
-                game_ids.add(game.id)
-        bundles = []
-        for bundle in stage.concept_bundles.all():
-            member_ids = frozenset(c.id for c in bundle.concepts.all())
-            if member_ids:
-                bundles.append((bundle.id, member_ids))
+    for stages in stage_data.values():
+        for _, _, game_ids, bundles in stages:
+            all_game_ids.update(game_ids)
+            for _, member_ids in bundles:
                 bundle_concept_ids.update(member_ids)
-        stage_data[slug].append((stage.stage_number, stage.required_tiers, game_ids, bundles))
-        all_game_ids.update(game_ids)
 
     # Two queries: fetch all plat'd and 100%'d game IDs for this profile
     plat_game_ids = set(
@@ -190,6 +175,19 @@ def _get_stage_completion_from_cache(badge, _context):
     return completion
 
 
+def _live_badges_for_games(game_ids):
+    """Live badges of every series with a stage one of `game_ids` can satisfy, by tier."""
+    from trophies.models import Badge
+    from trophies.services.badge_topology import get_badge_topology
+
+    topology = get_badge_topology()
+    badge_ids = topology.live_badge_ids(topology.series_for_games(game_ids))
+    if not badge_ids:
+        return []
+    # Re-check is_live: a series can go dark before the topology is rebuilt.
+    return list(Badge.objects.filter(id__in=badge_ids, is_live=True).order_by('tier'))
+
+
 def check_profile_badges(profile, profilegame_ids, skip_notifications: bool = False):
     """
     Check and award badges for a profile based on recently updated games.
@@ -207,26 +205,20 @@ def check_profile_badges(profile, profilegame_ids, skip_notifications: bool = Fa
     Returns:
         int: Number of badges checked
     """
-    from trophies.models import ProfileGame, Badge, Stage
+    from trophies.models import ProfileGame
     from trophies.discord_utils.discord_notifications import send_badge_earned_notification
 
     start_time = time.time()
 
-    pg_qs: QuerySet[ProfileGame] = ProfileGame.objects.filter(
+    game_ids = list(ProfileGame.objects.filter(
         id__in=profilegame_ids, profile=profile
-    )
+    ).values_list('game_id', flat=True))
 
-    if not pg_qs.exists():
+    if not game_ids:
         logger.debug(f"check_profile_badges: no touched ProfileGames for {profile.psn_username}")
         return 0
 
-    concept_ids = pg_qs.values_list(
-        'game__concept_id', flat=True
-    ).filter(game__concept__isnull=False).distinct()
-
-    stages = Stage.objects.filter(concepts__id__in=concept_ids).distinct()
-    series_slugs = stages.values_list('series_slug', flat=True).distinct()
-    badges = list(Badge.objects.filter(series_slug__in=series_slugs, is_live=True).distinct().order_by('tier'))
+    badges = _live_badges_for_games(game_ids)
 
     # Pre-fetch context to avoid N+1 queries per badge
     badge_ctx = _build_badge_context(profile, badges)
@@ -588,6 +580,23 @@ def _process_badge_award_revoke(profile, badge, badge_earned, prev_badge_earned,
     return badge_created
 
 
+def _completion_outcome(badge, stage_completion_dict):
+    """
+    Turn a stage completion dict into (badge_earned, completed_count).
+
+    Stage 0 is optional/tangential and never counts. Concept-based badges
+    need every other stage; megamix badges need all of them when
+    requires_all, else at least min_required.
+    """
+    completed_count = sum(
+        1 for stage, is_complete in stage_completion_dict.items() if stage != 0 and is_complete
+    )
+    if badge.badge_type == 'megamix' and not badge.requires_all:
+        return completed_count >= badge.min_required, completed_count
+    required_stages = sum(1 for stage in stage_completion_dict if stage != 0)
+    return completed_count >= required_stages, completed_count
+
+
 @transaction.atomic
 def handle_badge(profile, badge, _context=None):
     """
@@ -628,16 +637,7 @@ def handle_badge(profile, badge, _context=None):
             stage_completion_dict = _get_stage_completion_from_cache(badge, _context)
         else:
             stage_completion_dict = badge.get_stage_completion(profile, badge.badge_type)
-        badge_earned = True
-        completed_count = 0
-
-        for stage, is_complete in stage_completion_dict.items():
-            if stage == 0:  # Stage 0 is optional/tangential
-                continue
-            elif not is_complete:
-                badge_earned = False
-                continue
-            completed_count += 1
+        badge_earned, completed_count = _completion_outcome(badge, stage_completion_dict)
 
         # Record stage completion events
         _record_stage_completions(profile, badge, stage_completion_dict, _context)
@@ -656,22 +656,7 @@ def handle_badge(profile, badge, _context=None):
             stage_completion_dict = _get_stage_completion_from_cache(badge, _context)
         else:
             stage_completion_dict = badge.get_stage_completion(profile, badge.badge_type)
-        completed_count = 0
-
-        for stage, is_complete in stage_completion_dict.items():
-            if stage == 0:  # Stage 0 is optional/tangential
-                continue
-            if is_complete:
-                completed_count += 1
-
-        # Determine if badge is earned based on requires_all flag
-        if badge.requires_all:
-            # All non-zero stages must be completed
-            required_stages = sum(1 for stage in stage_completion_dict if stage != 0)
-            badge_earned = completed_count >= required_stages
-        else:
-            # At least min_required stages must be completed
-            badge_earned = completed_count >= badge.min_required
+        badge_earned, completed_count = _completion_outcome(badge, stage_completion_dict)
 
         # Record stage completion events
         _record_stage_completions(profile, badge, stage_completion_dict, _context)
@@ -839,26 +824,20 @@ def initial_badge_check(profile, discord_notify: bool = True):
     Returns:
         int: Number of badges checked
     """
-    from trophies.models import ProfileGame, Badge, Stage
+    from trophies.models import ProfileGame
     from trophies.discord_utils.discord_notifications import send_badge_earned_notification
 
     start_time = time.time()
 
-    pg_qs: QuerySet[ProfileGame] = ProfileGame.objects.filter(
+    game_ids = list(ProfileGame.objects.filter(
         profile=profile
-    )
+    ).values_list('game_id', flat=True))
 
-    if not pg_qs.exists():
+    if not game_ids:
         logger.debug(f"check_profile_badges: no touched ProfileGames for {profile.psn_username}")
         return 0
 
-    concept_ids = pg_qs.values_list(
-        'game__concept_id', flat=True
-    ).filter(game__concept__isnull=False).distinct()
-
-    stages = Stage.objects.filter(concepts__id__in=concept_ids).distinct()
-    series_slugs = stages.values_list('series_slug', flat=True).distinct()
-    badges = list(Badge.objects.filter(series_slug__in=series_slugs, is_live=True).distinct().order_by('tier'))
+    badges = _live_badges_for_games(game_ids)
 
     # Pre-fetch context to avoid N+1 queries per badge
     badge_ctx = _build_badge_context(profile, badges)
@@ -0,0 +1,213 @@
+"""
+Badge topology - Cached stage/series graph for badge evaluation.
+
+Badge evaluation needs the same admin-curated graph on every sync: which
+games satisfy each stage of each series (Stage -> Concept -> Game), which
+ConceptBundles each stage accepts, and which live badges belong to each
+series. `check_profile_badges` used to rebuild that graph per call with
+nested prefetches and several distinct subqueries, although it only
+changes when staff edit badges, stages or concepts.
+
+The graph is built once per version by `build_badge_topology()` (a handful
+of flat values_list queries) into an immutable `BadgeTopology` that also
+indexes game_id -> series for finding the series a sync touched. It is kept
+in two layers:
+
+- process-local: the last topology this process loaded, reused while its
+  version is current (one cache GET per lookup).
+- Django cache (Redis): `badge_topology:version` plus the JSON-serialized
+  topology under `badge_topology:{version}`, so one process builds and the
+  rest load.
+
+Stage, ConceptBundle, Badge and Concept edits (and a Game moving concept)
+call `invalidate_badge_topology()` through signals (trophies/signals.py),
+which moves the version on; the next lookup anywhere rebuilds. The blob
+expires after TOPOLOGY_TTL as a backstop for writes that bypass signals
+(queryset .update(), raw SQL).
+"""
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+logger = logging.getLogger("psn_api")
+
+VERSION_KEY = 'badge_topology:version'
+TOPOLOGY_TTL = 6 * 60 * 60
+
+# Last topology loaded by this process (shared by its threads; replaced, never mutated)
+_local_topology = None
+
+
+@dataclass(frozen=True)
+class BadgeTopology:
+    """
+    Immutable snapshot of the badge graph.
+
+    stage_data: series_slug -> tuple of (stage_number, required_tiers,
+        frozenset[game_id], ((bundle_id, frozenset[concept_id]), ...)),
+        the shape _get_stage_completion_from_cache() consumes.
+    badge_ids: series_slug -> tuple of live Badge ids.
+    game_series: game_id -> frozenset of series whose stages (standalone
+        concepts, not bundles) include the game.
+    stage_concept_ids: every concept attached directly to a stage.
+    game_concepts: game_id -> concept_id for the games of those concepts,
+        so a Game save can tell whether it moved in or out of the graph.
+    """
+    version: int
+    stage_data: dict
+    badge_ids: dict
+    game_series: dict
+    stage_concept_ids: frozenset
+    game_concepts: dict
+
+    def series_for_games(self, game_ids) -> set:
+        """Series with a stage that any of `game_ids` can satisfy."""
+        series = set()
+        for game_id in game_ids:
+            series.update(self.game_series.get(game_id, ()))
+        return series
+
+    def live_badge_ids(self, series_slugs) -> list:
+        return [badge_id for slug in series_slugs for badge_id in self.badge_ids.get(slug, ())]
+
+    def to_dict(self) -> dict:
+        """JSON-safe form for the Django cache (django_redis JSONSerializer)."""
+        return {
+            'version': self.version,
+            'stage_data': {
+                slug: [
+                    [number, list(tiers), sorted(game_ids), [[bundle_id, sorted(members)] for bundle_id, members in bundles]]
+                    for number, tiers, game_ids, bundles in stages
+                ]
+                for slug, stages in self.stage_data.items()
+            },
+            'badge_ids': {slug: list(ids) for slug, ids in self.badge_ids.items()},
+            'stage_concept_ids': sorted(self.stage_concept_ids),
+            'game_concepts': sorted(self.game_concepts.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data) -> 'BadgeTopology':
+        stage_data = {
+            slug: tuple(
+                (number, tuple(tiers), frozenset(game_ids),
+                 tuple((bundle_id, frozenset(members)) for bundle_id, members in bundles))
+                for number, tiers, game_ids, bundles in stages
+            )
+            for slug, stages in data['stage_data'].items()
+        }
+        return cls._indexed(
+            data['version'],
+            stage_data,
+            {slug: tuple(ids) for slug, ids in data['badge_ids'].items()},
+            data['stage_concept_ids'],
+            dict(data['game_concepts']),
+        )
+
+    @classmethod
+    def _indexed(cls, version, stage_data, badge_ids, stage_concept_ids, game_concepts):
+        game_series = defaultdict(set)
+        for slug, stages in stage_data.items():
+            for _, _, game_ids, _ in stages:
+                for game_id in game_ids:
+                    game_series[game_id].add(slug)
+        return cls(
+            version=version,
+            stage_data=stage_data,
+            badge_ids=badge_ids,
+            game_series={game_id: frozenset(slugs) for game_id, slugs in game_series.items()},
+            stage_concept_ids=frozenset(stage_concept_ids),
+            game_concepts=game_concepts,
+        )
+
+
+def build_badge_topology(version=0) -> BadgeTopology:
+    """Build the topology from the database (six flat queries)."""
+    from trophies.models import Badge, ConceptBundle, Game, Stage
+
+    stages = list(Stage.objects.values_list('id', 'series_slug', 'stage_number', 'required_tiers'))
+
+    concepts_by_stage = defaultdict(set)
+    for stage_id, concept_id in Stage.concepts.through.objects.values_list('stage_id', 'concept_id'):
+        concepts_by_stage[stage_id].add(concept_id)
+    stage_concept_ids = set().union(*concepts_by_stage.values()) if concepts_by_stage else set()
+
+    game_concepts = dict(
+        Game.objects.filter(concept_id__in=stage_concept_ids).values_list('id', 'concept_id')
+    ) if stage_concept_ids else {}
+    games_by_concept = defaultdict(set)
+    for game_id, concept_id in game_concepts.items():
+        games_by_concept[concept_id].add(game_id)
+
+    members_by_bundle = defaultdict(set)
+    for bundle_id, concept_id in ConceptBundle.concepts.through.objects.values_list('conceptbundle_id', 'concept_id'):
+        members_by_bundle[bundle_id].add(concept_id)
+    bundles_by_stage = defaultdict(list)
+    for bundle_id, stage_id in ConceptBundle.objects.order_by('id').values_list('id', 'stage_id'):
+        if members_by_bundle.get(bundle_id):
+            bundles_by_stage[stage_id].append((bundle_id, frozenset(members_by_bundle[bundle_id])))
+
+    stage_data = defaultdict(list)
+    for stage_id, slug, number, tiers in stages:
+        game_ids = frozenset(
+            game_id for concept_id in concepts_by_stage.get(stage_id, ()) for game_id in games_by_concept.get(concept_id, ())
+        )
+        stage_data[slug].append((number, tuple(tiers or ()), game_ids, tuple(bundles_by_stage.get(stage_id, ()))))
+
+    badge_ids = defaultdict(list)
+    for badge_id, slug in Badge.objects.filter(is_live=True, series_slug__isnull=False).order_by('id').values_list('id', 'series_slug'):
+        badge_ids[slug].append(badge_id)
+
+    return BadgeTopology._indexed(
+        version,
+        {slug: tuple(entries) for slug, entries in stage_data.items()},
+        {slug: tuple(ids) for slug, ids in badge_ids.items()},
+        stage_concept_ids,
+        game_concepts,
+    )
+
+
+def get_badge_topology() -> BadgeTopology:
+    """Current topology: process-local if its version is current, else cache, else DB."""
+    global _local_topology
+
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(VERSION_KEY, version, timeout=None):
+            version = cache.get(VERSION_KEY, version)
+
+    topology = _local_topology
+    if topology is not None and topology.version == version:
+        return topology
+
+    data = cache.get(_topology_key(version))
+    if data is not None:
+        try:
+            topology = BadgeTopology.from_dict(data)
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Discarding malformed badge topology for version {version}")
+            topology = None
+    else:
+        topology = None
+    if topology is None:
+        topology = build_badge_topology(version)
+        cache.set(_topology_key(version), topology.to_dict(), timeout=TOPOLOGY_TTL)
+
+    _local_topology = topology
+    return topology
+
+
+def invalidate_badge_topology():
+    """Move the topology version on so every process rebuilds on next use."""
+    global _local_topology
+
+    _local_topology = None
+    cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def _topology_key(version):
+    return f'badge_topology:{version}'
@@ -11,10 +11,13 @@ Adding a new module:
 """
 import inspect
 import logging
+import time
 from collections import Counter, defaultdict
 from django.core.cache import cache
 from django.db.models import Count, F, FloatField, ExpressionWrapper, Q
 
+from trophies.util_modules.cache_invalidation import cache_generation, invalidate, register_invalidator
+
 logger = logging.getLogger(__name__)
 
 # Maximum number of modules free users can hide
@@ -27,6 +30,14 @@ SHOWCASE_PROFILE_ID = 3
 # Default cache TTL for lazy-loaded modules (seconds)
 DEFAULT_CACHE_TTL = 600  # 10 minutes
 
+# Server-rendered providers run concurrently on a small per-request pool.
+# A provider still running after its budget (descriptor 'time_budget', else
+# the default) or past the page budget is abandoned and its module falls
+# back to the lazy-load skeleton, so one slow provider cannot hold the page.
+SERVER_PROVIDER_WORKERS = 4
+DEFAULT_PROVIDER_BUDGET = 2.0  # seconds per module
+SERVER_PAGE_BUDGET = 4.0  # seconds for all server modules together
+
 # Valid module sizes and their CSS grid classes
 # Grid: grid-cols-2 (tablet) / lg:grid-cols-4 (desktop) / 2xl:grid-cols-6 (1536px+)
 VALID_SIZES = ('small', 'medium', 'large')
@@ -5867,23 +5878,81 @@ def get_server_module_data(profile, modules):
     advanced_badge_stats, etc.) ran in sequence against their 250K-trophy
     dataset. Phase 0 emptied preview_html in build_dashboard_context but
     left the provider execution in place; this skip closes that gap.
+
+    Providers run concurrently (SERVER_PROVIDER_WORKERS, each on its own DB
+    connection). A module whose provider overruns its budget is switched to
+    load_strategy 'lazy' in place, so the template renders the skeleton and
+    dashboard.js fetches it through the module API like any lazy module.
+    Latencies (and overruns) feed the per-slug provider histogram.
     """
-    data = {}
-    for mod in modules:
-        if mod['load_strategy'] != 'server':
-            continue
-        if mod.get('is_preview'):
-            continue
-        provider_fn = mod['provider']
-        try:
-            data[mod['slug']] = provider_fn(profile)
-        except Exception:
-            logger.exception("Dashboard provider for %s failed for profile %s",
-                             mod['slug'], profile.id)
-            data[mod['slug']] = {'error': True}
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    runnable = [
+        mod for mod in modules
+        if mod['load_strategy'] == 'server' and not mod.get('is_preview')
+    ]
+    data, latencies = {}, {}
+    if not runnable:
+        return data
+
+    started = {}
+    page_deadline = time.monotonic() + SERVER_PAGE_BUDGET
+    executor = ThreadPoolExecutor(
+        max_workers=min(SERVER_PROVIDER_WORKERS, len(runnable)), thread_name_prefix='dashboard',
+    )
+    try:
+        pending = {
+            executor.submit(_run_server_provider, mod, profile, started): mod
+            for mod in runnable
+        }
+        while pending:
+            now = time.monotonic()
+            next_deadline = min(
+                [page_deadline] + [
+                    started[mod['slug']] + mod.get('time_budget', DEFAULT_PROVIDER_BUDGET)
+                    for mod in pending.values() if mod['slug'] in started
+                ]
+            )
+            finished, _ = wait(pending, timeout=max(0, next_deadline - now), return_when=FIRST_COMPLETED)
+            for future in finished:
+                mod = pending.pop(future)
+                slug = mod['slug']
+                try:
+                    data[slug] = future.result()
+                except Exception:
+                    logger.exception("Dashboard provider for %s failed for profile %s",
+                                     slug, profile.id)
+                    data[slug] = {'error': True}
+                latencies[slug] = time.monotonic() - started[slug]
+
+            now = time.monotonic()
+            for future, mod in list(pending.items()):
+                slug = mod['slug']
+                budget = mod.get('time_budget', DEFAULT_PROVIDER_BUDGET)
+                if now >= page_deadline or (slug in started and now - started[slug] >= budget):
+                    del pending[future]
+                    future.cancel()  # no-op if already running; it finishes in the background
+                    mod['load_strategy'] = 'lazy'
+                    latencies[slug] = None
+                    logger.warning("Dashboard provider for %s overran its budget for profile %s; "
+                                   "deferring to lazy load", slug, profile.id)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    _record_module_stats(latencies=latencies)
     return data
 
 
+def _run_server_provider(mod, profile, started):
+    from django.db import connections
+
+    started[mod['slug']] = time.monotonic()
+    try:
+        return mod['provider'](profile)
+    finally:
+        connections.close_all()  # this pool thread's connections only
+
+
 def get_lazy_module_data(profile, slug, size=None, module_settings=None):
     """
     Fetch context for a single lazy-loaded module.
@@ -5903,15 +5972,19 @@ def get_lazy_module_data(profile, slug, size=None, module_settings=None):
     # Build cache key that includes settings so different configs cache separately
     import hashlib
     settings_hash = hashlib.md5(str(sorted(effective.items())).encode()).hexdigest()[:8]
-    cache_key = _module_cache_key(slug, profile.id, settings_hash)
     ttl = mod.get('cache_ttl', DEFAULT_CACHE_TTL)
 
+    lookups = {}
     if ttl > 0:
+        cache_key = _module_cache_key(slug, profile.id, settings_hash)
         cached = cache.get(cache_key)
+        lookups[slug] = cached is not None
         if cached is not None:
+            _record_module_stats(lookups=lookups)
             return cached
 
     provider_fn = mod['provider']
+    start = time.monotonic()
     try:
         if mod.get('_accepts_settings'):
             data = provider_fn(profile, settings=effective)
@@ -5923,12 +5996,12 @@ def get_lazy_module_data(profile, slug, size=None, module_settings=None):
         logger.exception("Dashboard provider for %s failed for profile %s",
                          slug, profile.id)
         return {'error': True}
+    finally:
+        _record_module_stats(lookups=lookups, latencies={slug: time.monotonic() - start})
 
     if ttl > 0:
         try:
             cache.set(cache_key, data, ttl)
-            # Track this key so invalidate_dashboard_cache can delete it directly
-            _track_cache_key(profile.id, cache_key, ttl)
         except Exception:
             logger.debug("Could not cache dashboard module %s (non-serializable data)", slug)
 
@@ -5939,73 +6012,135 @@ def get_lazy_module_data(profile, slug, size=None, module_settings=None):
 # Cache Helpers
 # ---------------------------------------------------------------------------
 
-def _module_cache_key(slug, profile_id, size=None):
-    if size:
-        return f"dashboard:mod:{slug}:{profile_id}:{size}"
-    return f"dashboard:mod:{slug}:{profile_id}"
-
+def _module_cache_key(slug, profile_id, settings_hash):
+    """Module cache key under the profile's current dashboard generation.
 
-def _cache_key_tracker(profile_id):
-    """Key that stores the set of active dashboard cache keys for a profile."""
-    return f"dashboard:active_keys:{profile_id}"
+    invalidate_dashboard_cache() replaces the generation, so every key built
+    before it is orphaned at once and expires on its own TTL. No per-profile
+    key tracking or pattern scans are needed.
+    """
+    generation = cache_generation('dashboard', profile_id)
+    return f"dashboard:mod:{slug}:{profile_id}:g{generation}:{settings_hash}"
 
 
-def _track_cache_key(profile_id, cache_key, ttl):
-    """Register a cache key so invalidate_dashboard_cache can find it."""
-    tracker_key = _cache_key_tracker(profile_id)
-    try:
-        existing = cache.get(tracker_key) or set()
-        existing.add(cache_key)
-        # TTL slightly longer than the longest module cache to outlive all entries
-        cache.set(tracker_key, existing, max(ttl + 60, 3660))
-    except Exception:
-        pass  # Non-critical: worst case, stale cache until natural expiry
+register_invalidator('dashboard', generational=True)
 
 
 def invalidate_dashboard_cache(profile_id):
-    """Delete all dashboard module cache keys for a profile.
+    """Invalidate every dashboard module cache entry for a profile.
 
-    Uses a tracked key set for fast O(1) invalidation. Falls back to
-    bare keys (without settings hash) as a safety net.
+    A single write of a new generation token (see cache_invalidation.py).
+    Inside invalidation_batch() (e.g. _job_sync_complete) repeated calls for
+    the same profile collapse into the batch's single flush.
     Called frequently (every sync, badge check, etc.) so must be fast.
     """
-    tracker_key = _cache_key_tracker(profile_id)
-    tracked_keys = cache.get(tracker_key) or set()
+    invalidate('dashboard', profile_id)
 
-    keys_to_delete = list(tracked_keys)
-    keys_to_delete.append(tracker_key)  # Clear the tracker itself
 
-    # Also include bare keys (without settings hash) as a safety net
-    import hashlib
-    for mod in DASHBOARD_MODULES:
-        if mod.get('cache_ttl', DEFAULT_CACHE_TTL) > 0:
-            slug = mod['slug']
-            keys_to_delete.append(_module_cache_key(slug, profile_id))
-            # Default settings hash (most common variant)
-            defaults = mod.get('default_settings', {})
-            if defaults:
-                settings_hash = hashlib.md5(str(sorted(defaults.items())).encode()).hexdigest()[:8]
-                keys_to_delete.append(_module_cache_key(slug, profile_id, settings_hash))
+# Per-day hashes of dashboard module stats, read by redis_admin:
+#   dashboard:cache_stats:{date}      {slug}:hit / {slug}:miss (lazy-module cache lookups)
+#   dashboard:provider_latency:{date} {slug}:{bucket} (provider run time histogram)
+CACHE_STATS_TTL = 8 * 86400
+
+# Upper bounds (ms) of the latency histogram buckets; slower runs land in
+# 'inf' and abandoned server providers in 'overrun'.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500)
 
-    if keys_to_delete:
-        cache.delete_many(keys_to_delete)
 
+def _cache_stats_key(day):
+    return f"dashboard:cache_stats:{day.isoformat()}"
 
-def force_flush_dashboard_cache(profile_id):
-    """Force-delete ALL dashboard cache keys for a profile using pattern matching.
 
-    Uses Redis SCAN via delete_pattern() per module, which is slower than
-    invalidate_dashboard_cache but guaranteed to find all key variants.
-    Only use from management commands, NOT from hot paths (sync, badge checks).
+def _provider_latency_key(day):
+    return f"dashboard:provider_latency:{day.isoformat()}"
+
+
+def _latency_bucket(seconds):
+    if seconds is None:
+        return 'overrun'
+    ms = seconds * 1000
+    for bound in LATENCY_BUCKETS_MS:
+        if ms <= bound:
+            return f"le{bound}"
+    return 'inf'
+
+
+def _record_module_stats(lookups=None, latencies=None):
+    """Count cache hits/misses ({slug: hit}) and provider latencies ({slug: seconds | None}).
+
+    One pipelined round trip to the per-day stats hashes.
     """
-    tracker_key = _cache_key_tracker(profile_id)
-    cache.delete(tracker_key)
+    if not lookups and not latencies:
+        return
+    from django.utils import timezone
+    from trophies.util_modules.cache import redis_client
 
-    for mod in DASHBOARD_MODULES:
-        if mod.get('cache_ttl', DEFAULT_CACHE_TTL) > 0:
-            slug = mod['slug']
-            cache.delete(_module_cache_key(slug, profile_id))
-            try:
-                cache.delete_pattern(f"dashboard:mod:{slug}:{profile_id}:*")
-            except Exception:
-                pass
+    today = timezone.now().date()
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        if lookups:
+            key = _cache_stats_key(today)
+            for slug, hit in lookups.items():
+                pipe.hincrby(key, f"{slug}:{'hit' if hit else 'miss'}", 1)
+            pipe.expire(key, CACHE_STATS_TTL)
+        if latencies:
+            key = _provider_latency_key(today)
+            for slug, seconds in latencies.items():
+                pipe.hincrby(key, f"{slug}:{_latency_bucket(seconds)}", 1)
+            pipe.expire(key, CACHE_STATS_TTL)
+        pipe.execute()
+    except Exception:
+        pass  # Non-critical: stats only
+
+
+def _read_stats_hashes(key_fn, days):
+    """Yield (slug, field, count) from the last `days` per-day hashes."""
+    from datetime import timedelta
+    from django.utils import timezone
+    from trophies.util_modules.cache import redis_client
+
+    today = timezone.now().date()
+    for offset in range(min(days, CACHE_STATS_TTL // 86400)):
+        raw = redis_client.hgetall(key_fn(today - timedelta(days=offset)))
+        for field, value in raw.items():
+            field = field.decode() if isinstance(field, bytes) else field
+            slug, _, name = field.rpartition(':')
+            yield slug, name, int(value)
+
+
+def dashboard_cache_hit_rates(days=1):
+    """Per-module cache hits and misses over the last `days` days (max 8).
+
+    Returns:
+        dict: {slug: {'hits': int, 'misses': int, 'hit_rate': float | None}},
+        busiest module first.
+    """
+    counts = defaultdict(lambda: {'hits': 0, 'misses': 0})
+    for slug, outcome, value in _read_stats_hashes(_cache_stats_key, days):
+        counts[slug]['hits' if outcome == 'hit' else 'misses'] += value
+
+    for row in counts.values():
+        total = row['hits'] + row['misses']
+        row['hit_rate'] = row['hits'] / total if total else None
+    return dict(sorted(counts.items(), key=lambda item: -(item[1]['hits'] + item[1]['misses'])))
+
+
+def dashboard_provider_latency(days=1):
+    """Per-module provider latency histograms over the last `days` days (max 8).
+
+    Returns:
+        dict: {slug: {bucket: count}} with buckets in LATENCY_BUCKETS_MS order
+        ('le50' ... 'inf', 'overrun'), slowest-heavy modules first (by share
+        of runs over 500ms).
+    """
+    buckets = [f"le{bound}" for bound in LATENCY_BUCKETS_MS] + ['inf', 'overrun']
+    histograms = defaultdict(lambda: dict.fromkeys(buckets, 0))
+    for slug, bucket, value in _read_stats_hashes(_provider_latency_key, days):
+        if bucket in buckets:
+            histograms[slug][bucket] += value
+
+    def slow_share(item):
+        hist = item[1]
+        total = sum(hist.values()) or 1
+        return -sum(count for bucket, count in hist.items() if bucket in ('le1000', 'le2500', 'inf', 'overrun')) / total
+    return dict(sorted(histograms.items(), key=slow_share))
@@ -0,0 +1,96 @@
+"""
+Earn rate service - Deferred refresh of the PP-specific Trophy.earn_rate.
+
+earn_rate is derived (earned_count / Game.played_count). Both inputs are
+kept live by signals, but the ratio itself used to be rewritten inline
+after every sync_trophies job: one UPDATE over every trophy row of the
+game, changed or not, contending with every other profile syncing the
+same title.
+
+Sync now only records the game as dirty (`mark_dirty`, one SADD into
+`earn_rate:dirty_games`). `refresh_dirty_earn_rates` drains that set in
+chunks from the TokenKeeper health loop: per chunk it reads the trophies'
+current earned_count / earn_rate and their game's played_count, and writes
+only the rows whose rate actually changed with a single
+`UPDATE ... FROM (VALUES ...)`. Chunking and the wall-clock budget follow
+`recalc_earn_rates`, which remains the daily drift-correction pass.
+"""
+import logging
+import time
+
+from django.db import connection
+
+from trophies.models import Trophy
+from trophies.services.trophy_list_service import invalidate_trophy_list_cache
+from trophies.util_modules.cache import redis_client
+from trophies.util_modules.cache_invalidation import invalidation_batch
+
+logger = logging.getLogger("psn_api")
+
+DIRTY_GAMES_KEY = "earn_rate:dirty_games"
+
+
+def mark_dirty(game_ids):
+    """Queue games for the next earn_rate refresh."""
+    game_ids = [int(game_id) for game_id in game_ids]
+    if game_ids:
+        redis_client.sadd(DIRTY_GAMES_KEY, *game_ids)
+
+
+def refresh_dirty_earn_rates(chunk_size=200, max_seconds=20):
+    """Drain the dirty-games set. Returns (games_processed, trophies_updated).
+
+    Chunks are popped atomically (SPOP), so concurrent callers on other
+    machines never process the same game twice. A chunk that fails is put
+    back for the next run.
+    """
+    deadline = time.monotonic() + max_seconds
+    games_processed = 0
+    trophies_updated = 0
+    while time.monotonic() < deadline:
+        popped = redis_client.spop(DIRTY_GAMES_KEY, chunk_size)
+        if not popped:
+            break
+        game_ids = sorted(int(game_id) for game_id in popped)
+        try:
+            trophies_updated += _refresh_chunk(game_ids)
+        except Exception:
+            redis_client.sadd(DIRTY_GAMES_KEY, *game_ids)
+            raise
+        games_processed += len(game_ids)
+    return games_processed, trophies_updated
+
+
+def _refresh_chunk(game_ids):
+    """Recompute one chunk of games. One read, at most one UPDATE."""
+    rows = (
+        Trophy.objects.filter(game_id__in=game_ids)
+        .values_list('id', 'game_id', 'earned_count', 'earn_rate', 'game__played_count')
+    )
+    changed = []
+    changed_games = set()
+    for trophy_id, game_id, earned_count, earn_rate, played_count in rows:
+        new_rate = earned_count / played_count if played_count > 0 else 0.0
+        if earn_rate != new_rate:
+            changed.append((trophy_id, new_rate))
+            changed_games.add(game_id)
+    if not changed:
+        return 0
+
+    values = ', '.join(['(%s::bigint, %s::double precision)'] * len(changed))
+    params = [value for row in changed for value in row]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {Trophy._meta.db_table} AS t
+            SET earn_rate = v.earn_rate
+            FROM (VALUES {values}) AS v(id, earn_rate)
+            WHERE t.id = v.id
+            """,
+            params,
+        )
+
+    with invalidation_batch():
+        for game_id in changed_games:
+            invalidate_trophy_list_cache(game_id)
+    return len(changed)
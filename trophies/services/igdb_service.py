@@ -13,6 +13,7 @@ from django.utils.text import slugify
 
 from trophies.models import Company, ConceptCompany, IGDBMatch
 from trophies.util_modules.cache import redis_client
+from trophies.util_modules.rate_limiter import SlidingWindowRateLimiter
 
 logger = logging.getLogger('psn_api')
 
@@ -306,36 +307,18 @@ class IGDBService:
         """Distributed rate limiter using Redis sliding window.
 
         Ensures all workers collectively stay under the IGDB rate limit.
-        Uses a Redis sorted set with timestamps to track requests across
-        all 24 token_keeper workers.
+        Each attempt is one atomic check-and-record script call on a shared
+        sorted set; when the window is full it sleeps until the oldest
+        request ages out rather than polling.
         """
         max_wait = 5.0  # seconds
-        waited = 0.0
-
-        while waited < max_wait:
-            now = time.time()
-            window_start = now - 1.0  # 1-second sliding window
-
-            pipe = redis_client.pipeline()
-            # Remove expired entries
-            pipe.zremrangebyscore(cls.REDIS_RATE_KEY, 0, window_start)
-            # Count requests in current window
-            pipe.zcard(cls.REDIS_RATE_KEY)
-            results = pipe.execute()
-            count = results[1]
-
-            if count < cls.MAX_REQUESTS_PER_SECOND:
-                # Slot available, record this request
-                redis_client.zadd(cls.REDIS_RATE_KEY, {f'{now}:{id(cls)}': now})
-                redis_client.expire(cls.REDIS_RATE_KEY, 5)
-                return
-
-            # No slot available, wait and retry
-            time.sleep(0.1)
-            waited += 0.1
-
-        # Timed out waiting, proceed anyway (better than blocking forever)
-        logger.warning('IGDB rate limiter timed out after %.1fs, proceeding', max_wait)
+        limiter = SlidingWindowRateLimiter(
+            redis_client, cls.REDIS_RATE_KEY,
+            limit=cls.MAX_REQUESTS_PER_SECOND, window_seconds=1.0, ttl=5,
+        )
+        if not limiter.acquire(max_wait).acquired:
+            # Timed out waiting, proceed anyway (better than blocking forever)
+            logger.warning('IGDB rate limiter timed out after %.1fs, proceeding', max_wait)
 
     @classmethod
     def _request(cls, endpoint, query):
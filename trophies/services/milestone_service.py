@@ -9,7 +9,7 @@ This service manages milestone-related business logic including:
 """
 import logging
 from collections import defaultdict
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.db.models import F
 
 from trophies.models import UserTitle
@@ -114,11 +114,12 @@ def check_all_milestones_for_user(profile, criteria_type=None, criteria_types=No
 
     For one-off types: notifies individually since they have at most 1 tier.
 
-    When no type filter is given, groups milestones by criteria_type and
-    processes each group independently so every type gets its own notification.
-
-    Uses a shared _cache dict so handlers only query expensive values once
-    across all tiers of the same criteria_type.
+    Evaluation works from a snapshot: build_milestone_snapshot() computes every
+    metric the selected handlers read in one batched fetch and seeds the shared
+    _cache with it, and existing progress/award rows are loaded up front, so
+    handlers only compare thresholds in memory. Progress, awards, earned_count
+    and titles are then written in bulk; in-app notifications and Discord role
+    grants are sent after the transaction commits.
 
     Args:
         profile: Profile instance to check milestones for
@@ -134,8 +135,8 @@ def check_all_milestones_for_user(profile, criteria_type=None, criteria_types=No
             - notified_user_milestones: List of UserMilestone instances that
               received in-app notifications (highest tier per criteria type).
     """
-    from trophies.models import Milestone
-    from notifications.signals import create_milestone_notification
+    from trophies.models import Milestone, UserMilestone, UserMilestoneProgress
+    from trophies.milestone_handlers import MILESTONE_HANDLERS, build_milestone_snapshot
 
     if criteria_type and criteria_types:
         raise ValueError("Pass criteria_type or criteria_types, not both")
@@ -151,54 +152,138 @@ def check_all_milestones_for_user(profile, criteria_type=None, criteria_types=No
     if exclude_types:
         qs = qs.exclude(criteria_type__in=exclude_types)
 
-    # Shared cache for handler-level value reuse across tiers
-    _cache = {}
-
     # Group milestones by criteria_type and process each independently
     milestones_by_type = defaultdict(list)
     for milestone in qs.order_by('required_value'):
         milestones_by_type[milestone.criteria_type].append(milestone)
 
-    all_awarded = []
-    notified_user_milestones = []
+    milestone_ids = [m.id for ms in milestones_by_type.values() for m in ms]
+    progress_rows = {
+        row.milestone_id: row
+        for row in UserMilestoneProgress.objects.filter(profile=profile, milestone_id__in=milestone_ids)
+    }
+    earned_ids = set(
+        UserMilestone.objects.filter(profile=profile, milestone_id__in=milestone_ids)
+        .values_list('milestone_id', flat=True)
+    )
+
+    # Shared cache for handler-level value reuse, pre-filled from the snapshot
+    _cache = build_milestone_snapshot(profile, milestones_by_type)
+    _cache['_earned_milestone_ids'] = earned_ids
 
+    new_progress = []
+    changed_progress = []
+    achieved = []
+    new_awards_by_type = defaultdict(list)
     for ctype, milestones in milestones_by_type.items():
-        if ctype in ONE_OFF_TYPES:
-            # One-off: notify individually (no spam risk, at most 1 tier)
-            for milestone in milestones:
-                status = check_and_award_milestone(
-                    profile, milestone, _cache=_cache
-                )
-                if status['created']:
-                    all_awarded.append(milestone)
-                    if notify_webapp and status['user_milestone']:
-                        create_milestone_notification(status['user_milestone'])
-                        notified_user_milestones.append(status['user_milestone'])
-        else:
-            # Tiered: check all, notify highest per type
-            new_awards = []
-            new_award_statuses = {}
-            for milestone in milestones:
-                status = check_and_award_milestone(
-                    profile, milestone, _cache=_cache
-                )
-                if status['created']:
-                    new_awards.append(milestone)
-                    new_award_statuses[milestone.id] = status
-            if new_awards:
-                highest = max(new_awards, key=lambda m: m.required_value)
-                if notify_webapp:
-                    um = new_award_statuses[highest.id].get('user_milestone')
-                    if um:
-                        create_milestone_notification(um)
-                        notified_user_milestones.append(um)
-                all_awarded.extend(new_awards)
+        handler = MILESTONE_HANDLERS.get(ctype)
+        if not handler:
+            logger.warning(f"No handler for criteria_type: {ctype}")
+            continue
+        for milestone in milestones:
+            # Skip premium-only milestones for non-premium users
+            if milestone.premium_only and not profile.user_is_premium:
+                continue
+            result = handler(profile, milestone, _cache=_cache)
+
+            row = progress_rows.get(milestone.id)
+            if row is None:
+                new_progress.append(UserMilestoneProgress(
+                    profile=profile, milestone=milestone, progress_value=result['progress']
+                ))
+            elif row.progress_value != result['progress']:
+                row.progress_value = result['progress']
+                changed_progress.append(row)
+
+            if result['achieved']:
+                achieved.append(milestone)
+                if milestone.id not in earned_ids:
+                    new_awards_by_type[ctype].append(milestone)
+
+    new_awards = [m for ms in new_awards_by_type.values() for m in ms]
+    with transaction.atomic():
+        UserMilestoneProgress.objects.bulk_create(new_progress, ignore_conflicts=True)
+        UserMilestoneProgress.objects.bulk_update(changed_progress, ['progress_value'])
+        user_milestones = _bulk_award_milestones(profile, new_awards)
+
+        # Assign Discord roles (idempotent: re-sent on every check so roles come
+        # back if the user leaves/rejoins the server) once the writes commit.
+        if profile.is_discord_verified and profile.discord_id:
+            for milestone in achieved:
+                if milestone.discord_role_id:
+                    transaction.on_commit(
+                        lambda p=profile, r=milestone.discord_role_id: notify_bot_role_earned(p, r)
+                    )
+
+        notified_user_milestones = []
+        for ctype, awarded in new_awards_by_type.items():
+            if ctype in ONE_OFF_TYPES:
+                # One-off: notify individually (no spam risk, at most 1 tier)
+                to_notify = awarded
+            else:
+                # Tiered: notify highest per type
+                to_notify = [max(awarded, key=lambda m: m.required_value)]
+            for milestone in to_notify:
+                um = user_milestones.get(milestone.id)
+                if notify_webapp and um:
+                    notified_user_milestones.append(um)
+        if notified_user_milestones:
+            transaction.on_commit(lambda ums=list(notified_user_milestones): _notify_milestones(ums))
 
     # Invalidate dashboard cache so milestone tracker reflects new progress
     from trophies.services.dashboard_service import invalidate_dashboard_cache
     invalidate_dashboard_cache(profile.id)
 
-    return all_awarded, notified_user_milestones
+    return [m for m in new_awards if m.id in user_milestones], notified_user_milestones
+
+
+def _bulk_award_milestones(profile, milestones):
+    """
+    Create UserMilestones for `milestones` (known to be unearned) in one insert,
+    with their earned_count bumps and titles.
+
+    Returns {milestone_id: UserMilestone}. If a concurrent check awarded one
+    of them first, falls back to get_or_create per milestone.
+    """
+    from trophies.models import Milestone as MilestoneModel, UserMilestone
+
+    if not milestones:
+        return {}
+    try:
+        with transaction.atomic():
+            created = UserMilestone.objects.bulk_create(
+                [UserMilestone(profile=profile, milestone=m) for m in milestones]
+            )
+        newly_awarded = list(milestones)
+        user_milestones = {um.milestone_id: um for um in created}
+    except IntegrityError:
+        newly_awarded, user_milestones = [], {}
+        for milestone in milestones:
+            um, was_created = UserMilestone.objects.get_or_create(profile=profile, milestone=milestone)
+            if was_created:
+                newly_awarded.append(milestone)
+                user_milestones[milestone.id] = um
+
+    for milestone in newly_awarded:
+        MilestoneModel.objects.filter(pk=milestone.pk).update(earned_count=F('earned_count') + 1)
+    UserTitle.objects.bulk_create(
+        [
+            UserTitle(profile=profile, title_id=m.title_id, source_type='milestone', source_id=m.id)
+            for m in newly_awarded if m.title_id
+        ],
+        ignore_conflicts=True,
+    )
+    return user_milestones
+
+
+def _notify_milestones(user_milestones):
+    from notifications.signals import create_milestone_notification
+
+    for um in user_milestones:
+        try:
+            create_milestone_notification(um)
+        except Exception:
+            logger.exception(f"Failed to send milestone notification for UserMilestone {um.pk}")
 
 
 @transaction.atomic
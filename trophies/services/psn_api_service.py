@@ -7,7 +7,7 @@ from django.db import transaction, IntegrityError, OperationalError
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
 from collections import defaultdict
 from django.db.models import Count, Max, Q
-from trophies.models import Profile, Game, ProfileGame, Trophy, EarnedTrophy, Concept, TrophyGroup, Badge
+from trophies.models import Profile, Game, ProfileGame, Trophy, EarnedTrophy, Concept, TrophyGroup, Badge, clean_title_field
 from psnawp_api.models.title_stats import TitleStats
 from psnawp_api.models.trophies import TrophyTitle, TrophyGroupSummary
 from trophies.discord_utils.discord_notifications import notify_new_platinum
@@ -254,6 +254,9 @@ class PsnApiService:
                 'platinum': summary.defined_trophies.platinum
             }
             trophy_group.save()
+
+        from trophies.services.trophy_list_service import invalidate_trophy_list_cache
+        invalidate_trophy_list_cache(game.id)
         return trophy_group, created
     
     @classmethod
@@ -578,6 +581,185 @@ class PsnApiService:
 
         return earned_trophy, created
 
+    # Fields written from PSN trophy data. Shared by the bulk sync path so the
+    # diff and the bulk_update column list can't drift from each other.
+    TROPHY_SYNC_FIELDS = [
+        'trophy_set_version', 'trophy_type', 'trophy_name', 'trophy_detail',
+        'trophy_icon_url', 'trophy_group_id', 'progress_target_value',
+        'reward_name', 'reward_img_url', 'trophy_rarity', 'trophy_earn_rate',
+    ]
+    EARNED_TROPHY_SYNC_FIELDS = [
+        'earned', 'trophy_hidden', 'progress', 'progress_rate',
+        'progressed_date_time', 'earned_date_time', 'user_hidden',
+    ]
+
+    @staticmethod
+    def _trophy_values_from_trophy_data(trophy_data) -> dict:
+        trophy_rarity = getattr(trophy_data, 'trophy_rarity', None) or None
+        trophy_earn_rate = getattr(trophy_data, 'trophy_earn_rate', 0.0) or 0.0
+        return {
+            "trophy_set_version": trophy_data.trophy_set_version,
+            "trophy_type": trophy_data.trophy_type.value,
+            # Trophy.save() normally cleans the name; bulk writes bypass save().
+            "trophy_name": clean_title_field(trophy_data.trophy_name) if trophy_data.trophy_name else trophy_data.trophy_name,
+            "trophy_detail": trophy_data.trophy_detail,
+            "trophy_icon_url": trophy_data.trophy_icon_url,
+            "trophy_group_id": trophy_data.trophy_group_id,
+            "progress_target_value": trophy_data.trophy_progress_target_value,
+            "reward_name": trophy_data.trophy_reward_name,
+            "reward_img_url": trophy_data.trophy_reward_img_url,
+            "trophy_rarity": trophy_rarity.value if trophy_rarity else None,
+            "trophy_earn_rate": trophy_earn_rate,
+        }
+
+    @staticmethod
+    def _earned_values_from_trophy_data(trophy_data) -> dict:
+        return {
+            "earned": trophy_data.earned,
+            "trophy_hidden": trophy_data.trophy_hidden,
+            "progress": trophy_data.progress,
+            "progress_rate": trophy_data.progress_rate,
+            "progressed_date_time": trophy_data.progressed_date_time,
+            "earned_date_time": trophy_data.earned_date_time,
+            "user_hidden": False,  # PSN returned this trophy, so it's not hidden
+        }
+
+    @classmethod
+    def bulk_sync_trophies(cls, profile: Profile, game: Game, trophies_data: list) -> dict:
+        """Set-based sync of one game's trophy list for one profile.
+
+        Replaces the per-row create_or_update_trophy_from_trophy_data /
+        create_or_update_earned_trophy_from_trophy_data loop: existing Trophy
+        and EarnedTrophy rows are prefetched in one query each, diffed in
+        memory, and written with bulk_create(update_conflicts=True) /
+        bulk_update. Only rows whose PSN-sourced values actually changed are
+        rewritten.
+
+        bulk writes don't fire post_save, so the counters the EarnedTrophy
+        signals maintain (Trophy.earned_count, Profile.total_<type>) are
+        applied as aggregated F() updates via apply_earned_trophy_deltas.
+
+        A platinum that is a new earn this sync (created earned, or flipped
+        unearned -> earned) is routed through the per-row path instead, so the
+        Discord / in-app platinum notification logic runs exactly as before.
+        There is at most one per game, so this costs a handful of queries.
+
+        Returns a small summary dict for logging.
+        """
+        from trophies.signals import apply_earned_trophy_deltas
+
+        if not trophies_data:
+            return {'trophies_created': 0, 'trophies_updated': 0, 'earned_created': 0, 'earned_updated': 0}
+
+        now = timezone.now()
+        with transaction.atomic():
+            # --- Trophy rows -------------------------------------------------
+            existing_trophies = {t.trophy_id: t for t in Trophy.objects.filter(game=game)}
+            new_trophies = []
+            changed_trophies = []
+            for trophy_data in trophies_data:
+                values = cls._trophy_values_from_trophy_data(trophy_data)
+                trophy = existing_trophies.get(trophy_data.trophy_id)
+                if trophy is None:
+                    trophy = Trophy(trophy_id=trophy_data.trophy_id, game=game, earned_count=0, earn_rate=0.0, **values)
+                    existing_trophies[trophy_data.trophy_id] = trophy
+                    new_trophies.append(trophy)
+                elif any(getattr(trophy, field) != value for field, value in values.items()):
+                    for field, value in values.items():
+                        setattr(trophy, field, value)
+                    changed_trophies.append(trophy)
+
+            if new_trophies:
+                # update_conflicts guards against a row created between our
+                # prefetch and the insert; Postgres returns pks either way.
+                Trophy.objects.bulk_create(
+                    new_trophies,
+                    update_conflicts=True,
+                    unique_fields=['trophy_id', 'game'],
+                    update_fields=cls.TROPHY_SYNC_FIELDS,
+                )
+            if changed_trophies:
+                changed_trophies.sort(key=lambda t: t.pk)
+                Trophy.objects.bulk_update(changed_trophies, cls.TROPHY_SYNC_FIELDS)
+
+            if any(t.trophy_type == 'platinum' for t in existing_trophies.values()):
+                from trophies.services.shovelware_detection_service import ShovelwareDetectionService
+                ShovelwareDetectionService.evaluate_game(game)
+                # evaluate_game uses queryset .update(); refresh so the
+                # notification checks below see the current shovelware_status.
+                game.refresh_from_db()
+
+            # --- EarnedTrophy rows -------------------------------------------
+            existing_earned = {
+                et.trophy_id: et
+                for et in EarnedTrophy.objects.filter(profile=profile, trophy__game=game)
+            }
+            new_earned = []
+            changed_earned = []
+            platinum_new_earns = []
+            trophy_deltas = {}
+            type_deltas = defaultdict(int)
+            for trophy_data in trophies_data:
+                trophy = existing_trophies[trophy_data.trophy_id]
+                values = cls._earned_values_from_trophy_data(trophy_data)
+                earned_trophy = existing_earned.get(trophy.pk)
+                previous = earned_trophy.earned if earned_trophy is not None else None
+
+                is_new_earn = bool(trophy_data.earned) and not previous
+                if is_new_earn and trophy.trophy_type == 'platinum':
+                    platinum_new_earns.append((trophy, trophy_data))
+                    continue
+
+                if earned_trophy is None:
+                    new_earned.append(EarnedTrophy(profile=profile, trophy=trophy, last_updated=now, **values))
+                elif any(getattr(earned_trophy, field) != value for field, value in values.items()):
+                    for field, value in values.items():
+                        setattr(earned_trophy, field, value)
+                    earned_trophy.last_updated = now
+                    changed_earned.append(earned_trophy)
+                else:
+                    continue
+
+                if is_new_earn:
+                    delta = 1
+                elif previous and not trophy_data.earned:
+                    delta = -1
+                else:
+                    delta = 0
+                if delta:
+                    trophy_deltas[trophy.pk] = delta
+                    type_deltas[trophy.trophy_type] += delta
+
+            if new_earned:
+                EarnedTrophy.objects.bulk_create(
+                    new_earned,
+                    update_conflicts=True,
+                    unique_fields=['profile', 'trophy'],
+                    update_fields=cls.EARNED_TROPHY_SYNC_FIELDS + ['last_updated'],
+                )
+            if changed_earned:
+                changed_earned.sort(key=lambda et: et.pk)
+                EarnedTrophy.objects.bulk_update(
+                    changed_earned, cls.EARNED_TROPHY_SYNC_FIELDS + ['last_updated'],
+                )
+            apply_earned_trophy_deltas(profile.id, trophy_deltas, type_deltas)
+
+            for trophy, trophy_data in platinum_new_earns:
+                cls.create_or_update_earned_trophy_from_trophy_data(profile, trophy, trophy_data)
+
+            if new_trophies or changed_trophies or trophy_deltas or platinum_new_earns:
+                # Retire the game page's cached trophy list once the new rows
+                # are visible; bumping earlier lets a reader re-cache old data.
+                from trophies.services.trophy_list_service import invalidate_trophy_list_cache
+                transaction.on_commit(lambda: invalidate_trophy_list_cache(game.id))
+
+        return {
+            'trophies_created': len(new_trophies),
+            'trophies_updated': len(changed_trophies),
+            'earned_created': len(new_earned) + sum(1 for t, _ in platinum_new_earns if t.pk not in existing_earned),
+            'earned_updated': len(changed_earned) + sum(1 for t, _ in platinum_new_earns if t.pk in existing_earned),
+        }
+
     @classmethod
     def get_db_fingerprint(cls, profile: Profile):
         """Compute the DB-side fingerprint for sync v2.
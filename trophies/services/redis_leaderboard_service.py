@@ -20,10 +20,12 @@ Key patterns (raw Redis, DB 0):
     lb:progress:global:scores - Global progress sorted set
     lb:progress:global:data   - Global progress display data
     lb:meta:last_rebuild      - Rebuild timestamps per leaderboard
+    {scores|data key}:building - Shadow keys a full rebuild fills before swapping in
 """
 import json
 import logging
 import math
+from collections import defaultdict
 
 from django.utils import timezone
 
@@ -31,6 +33,9 @@ from trophies.util_modules.cache import redis_client
 
 logger = logging.getLogger(__name__)
 
+# Entries per pipeline when streaming a full rebuild into its shadow keys
+REBUILD_CHUNK_SIZE = 1000
+
 # Max timestamp for inverting dates (year ~33658, well beyond any real date)
 MAX_TIMESTAMP = 10**12
 
@@ -242,34 +247,55 @@ def _remove_entry(scores_key, data_key, profile_id, pipeline=None):
         pipe.execute()
 
 
-def _rebuild_leaderboard(scores_key, data_key, entries, pipeline=None):
-    """
-    Full rebuild of a leaderboard from a list of (profile_id, score, display_data) tuples.
-
-    Atomically replaces the sorted set and hash contents.
+def _rebuild_leaderboard(scores_key, data_key, entries, chunk_size=REBUILD_CHUNK_SIZE):
     """
-    pipe = pipeline or redis_client.pipeline()
+    Full rebuild of a leaderboard from an iterable of (profile_id, score, display_data) tuples.
 
-    # Clear existing data
-    pipe.delete(scores_key)
-    pipe.delete(data_key)
+    Entries are streamed in chunks of `chunk_size` into `:building` shadow
+    keys, so only one chunk is ever buffered client-side and `entries` can
+    be a generator. The shadow keys are then RENAMEd over the live ones in
+    a single MULTI, so readers see either the old board or the new one,
+    never a cleared or half-filled one.
 
-    # Batch insert
-    if entries:
-        score_mapping = {}
-        for profile_id, score, display_data in entries:
-            member = _member(profile_id)
-            score_mapping[member] = score
-            pipe.hset(data_key, member, json.dumps(display_data))
-
-        if score_mapping:
-            pipe.zadd(scores_key, score_mapping)
+    Returns:
+        int: Number of entries written.
+    """
+    building_scores = f'{scores_key}:building'
+    building_data = f'{data_key}:building'
+    redis_client.delete(building_scores, building_data)
+
+    count = 0
+    for chunk in _chunked(entries, chunk_size):
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zadd(building_scores, {_member(profile_id): score for profile_id, score, _ in chunk})
+        pipe.hset(building_data, mapping={
+            _member(profile_id): json.dumps(display_data) for profile_id, _, display_data in chunk
+        })
+        pipe.execute()
+        count += len(chunk)
 
-    # Record rebuild time
+    pipe = redis_client.pipeline()
+    if count:
+        pipe.rename(building_scores, scores_key)
+        pipe.rename(building_data, data_key)
+    else:
+        # RENAME needs an existing source; an empty board is just deleted.
+        pipe.delete(scores_key, data_key)
     pipe.hset('lb:meta:last_rebuild', scores_key, timezone.now().isoformat())
+    pipe.execute()
+    return count
 
-    if pipeline is None:
-        pipe.execute()
+
+def _chunked(iterable, size):
+    """Yield lists of up to `size` items from `iterable`."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 
 # ---------------------------------------------------------------------------
@@ -345,18 +371,20 @@ def rebuild_xp_leaderboard():
         profile__is_linked=True
     ).select_related('profile')
 
-    entries = []
-    for gamification in queryset.iterator(chunk_size=500):
+    count = _rebuild_leaderboard(_xp_scores_key(), _xp_data_key(), _xp_entries(queryset.iterator(chunk_size=500)))
+    logger.info(f"Rebuilt XP leaderboard with {count} entries")
+    return count
+
+
+def _xp_entries(gamifications):
+    """Stream (profile_id, score, display_data) from ProfileGamification rows."""
+    for gamification in gamifications:
         profile = gamification.profile
         total_xp = gamification.total_badge_xp
         total_badges = gamification.total_badges_earned
         score = compute_xp_score(total_xp, total_badges)
         display_data = _build_xp_display_data(profile, total_xp, total_badges)
-        entries.append((profile.id, score, display_data))
-
-    _rebuild_leaderboard(_xp_scores_key(), _xp_data_key(), entries)
-    logger.info(f"Rebuilt XP leaderboard with {len(entries)} entries")
-    return len(entries)
+        yield profile.id, score, display_data
 
 
 # ---------------------------------------------------------------------------
@@ -438,22 +466,22 @@ def rebuild_earners_leaderboard(series_slug):
         )
     ).filter(row_number=1)
 
-    entries = []
-    for earner in earners:
-        profile = earner.profile
-        tier = earner.badge.tier
-        earned_at = earner.earned_at
-        score = compute_earner_score(tier, earned_at)
-        display_data = _build_earner_display_data(profile, tier, earned_at)
-        entries.append((profile.id, score, display_data))
-
-    _rebuild_leaderboard(
+    def entries():
+        for earner in earners.iterator(chunk_size=500):
+            profile = earner.profile
+            tier = earner.badge.tier
+            earned_at = earner.earned_at
+            score = compute_earner_score(tier, earned_at)
+            display_data = _build_earner_display_data(profile, tier, earned_at)
+            yield profile.id, score, display_data
+
+    count = _rebuild_leaderboard(
         _earners_scores_key(series_slug),
         _earners_data_key(series_slug),
-        entries
+        entries()
     )
-    logger.info(f"Rebuilt earners leaderboard for {series_slug} with {len(entries)} entries")
-    return len(entries)
+    logger.info(f"Rebuilt earners leaderboard for {series_slug} with {count} entries")
+    return count
 
 
 # ---------------------------------------------------------------------------
@@ -469,14 +497,20 @@ def compute_progress_score(plats, golds, silvers, bronzes):
     return plats * 10**9 + golds * 10**6 + silvers * 10**3 + bronzes
 
 
-def _build_progress_display_data(profile, plats, golds, silvers, bronzes, last_earned_date):
-    """Build display data dict for a progress leaderboard entry."""
+def _build_progress_display_data(profile, plats, golds, silvers, bronzes, last_earned_date, displayed_title=None):
+    """Build display data dict for a progress leaderboard entry.
+
+    Pass `displayed_title` ('' for none) when building many entries for one
+    profile to skip the per-entry title query.
+    """
+    if displayed_title is None:
+        displayed_title = profile.displayed_title() or ''
     return {
         'psn_username': profile.display_psn_username,
         'avatar_url': profile.avatar_url or '',
         'flag': profile.flag or '',
         'is_premium': profile.user_is_premium,
-        'displayed_title': profile.displayed_title() or '',
+        'displayed_title': displayed_title,
         'trophy_totals': {
             'plats': plats,
             'golds': golds,
@@ -487,19 +521,22 @@ def _build_progress_display_data(profile, plats, golds, silvers, bronzes, last_e
     }
 
 
-def update_progress_entry(slug, profile, plats, golds, silvers, bronzes, last_earned_date, pipeline=None):
+def update_progress_entry(slug, profile, plats, golds, silvers, bronzes, last_earned_date, pipeline=None, displayed_title=None):
     """
     Update a profile's progress leaderboard position.
 
     Args:
         slug: Series slug, or None for global progress leaderboard.
+        displayed_title: Pre-fetched title ('' for none); see _build_progress_display_data.
     """
     score = compute_progress_score(plats, golds, silvers, bronzes)
     if score <= 0:
         _remove_entry(_progress_scores_key(slug), _progress_data_key(slug), profile.id, pipeline=pipeline)
         return
 
-    display_data = _build_progress_display_data(profile, plats, golds, silvers, bronzes, last_earned_date)
+    display_data = _build_progress_display_data(
+        profile, plats, golds, silvers, bronzes, last_earned_date, displayed_title=displayed_title
+    )
     _update_entry(
         _progress_scores_key(slug),
         _progress_data_key(slug),
@@ -522,88 +559,80 @@ def get_progress_count(slug):
     return _get_count(_progress_scores_key(slug))
 
 
-def compute_profile_progress_for_series(profile, series_slug):
+def compute_profile_progress(profile):
     """
-    Compute a single profile's trophy counts for a specific badge series.
-
-    Used for incremental updates at sync-complete time. Scoped to one profile
-    so it uses FK indexes and is fast.
+    Compute a profile's trophy counts for every badge series it plays into,
+    plus the global (all badge games) totals, in one pass.
+
+    Two queries regardless of series count: the distinct (game, series_slug)
+    pairs for the profile's played badge games, and the profile's earned
+    trophies in those games aggregated per game. Per-series and global totals
+    are then summed in Python over distinct games, so a game reachable
+    through several stages of one series (or several series) is counted
+    once per total, matching the old per-series `trophy__game__in` queries.
+
+    The game -> series mapping is read live through Game -> Concept -> Stage
+    rather than from a precomputed mapping table or materialized view. Stage
+    membership is edited by hand and must be visible immediately, and a
+    second copy of it would need its own refresh and invalidation path. The
+    live join is restricted to the profile's played games, so it stays
+    small. Totals are summed in Python rather than grouped per series in SQL
+    because a game in several stages of a series would be counted once per
+    stage by a join-and-GROUP BY.
 
     Returns:
-        tuple: (plats, golds, silvers, bronzes, last_earned_date) or None if no trophies
+        tuple: ({series_slug: counts or None}, global counts or None), where
+        counts is (plats, golds, silvers, bronzes, last_earned_date). Series
+        the profile plays but has no earned trophies in map to None.
     """
     from trophies.models import EarnedTrophy, Game
-
-    games = Game.objects.filter(
-        concept__stages__series_slug=series_slug
-    ).distinct()
-
-    trophies = EarnedTrophy.objects.filter(
-        profile=profile,
-        trophy__game__in=games,
-        earned=True
-    )
-
-    if not trophies.exists():
-        return None
-
     from django.db.models import Count, Q, Max
 
-    counts = trophies.aggregate(
-        plats=Count('id', filter=Q(trophy__trophy_type='platinum')),
-        golds=Count('id', filter=Q(trophy__trophy_type='gold')),
-        silvers=Count('id', filter=Q(trophy__trophy_type='silver')),
-        bronzes=Count('id', filter=Q(trophy__trophy_type='bronze')),
-        last_earned=Max('earned_date_time'),
-    )
-
-    return (
-        counts['plats'],
-        counts['golds'],
-        counts['silvers'],
-        counts['bronzes'],
-        counts['last_earned'],
-    )
-
-
-def compute_profile_progress_global(profile):
-    """
-    Compute a single profile's trophy counts across all badge-related games.
-
-    Returns:
-        tuple: (plats, golds, silvers, bronzes, last_earned_date) or None if no trophies
-    """
-    from trophies.models import EarnedTrophy, Game
-
-    games = Game.objects.filter(
-        concept__stages__isnull=False
-    ).distinct()
-
-    trophies = EarnedTrophy.objects.filter(
-        profile=profile,
-        trophy__game__in=games,
-        earned=True
+    series_by_game = defaultdict(set)
+    for game_id, slug in (
+        Game.objects.filter(played_by__profile=profile, concept__stages__isnull=False)
+        .values_list('id', 'concept__stages__series_slug')
+        .distinct()
+    ):
+        series_by_game[game_id].add(slug)
+
+    if not series_by_game:
+        return {}, None
+
+    per_game = (
+        EarnedTrophy.objects.filter(profile=profile, earned=True, trophy__game_id__in=list(series_by_game))
+        .values('trophy__game_id')
+        .annotate(
+            plats=Count('id', filter=Q(trophy__trophy_type='platinum')),
+            golds=Count('id', filter=Q(trophy__trophy_type='gold')),
+            silvers=Count('id', filter=Q(trophy__trophy_type='silver')),
+            bronzes=Count('id', filter=Q(trophy__trophy_type='bronze')),
+            last_earned=Max('earned_date_time'),
+        )
     )
 
-    if not trophies.exists():
-        return None
+    series_totals = {slug: None for slugs in series_by_game.values() for slug in slugs}
+    global_total = None
+    for row in per_game:
+        counts = (row['plats'], row['golds'], row['silvers'], row['bronzes'], row['last_earned'])
+        global_total = _add_progress(global_total, counts)
+        for slug in series_by_game[row['trophy__game_id']]:
+            series_totals[slug] = _add_progress(series_totals[slug], counts)
 
-    from django.db.models import Count, Q, Max
+    return series_totals, global_total
 
-    counts = trophies.aggregate(
-        plats=Count('id', filter=Q(trophy__trophy_type='platinum')),
-        golds=Count('id', filter=Q(trophy__trophy_type='gold')),
-        silvers=Count('id', filter=Q(trophy__trophy_type='silver')),
-        bronzes=Count('id', filter=Q(trophy__trophy_type='bronze')),
-        last_earned=Max('earned_date_time'),
-    )
 
+def _add_progress(total, counts):
+    """Sum two (plats, golds, silvers, bronzes, last_earned) tuples; total may be None."""
+    if total is None:
+        return counts
+    dates = [d for d in (total[4], counts[4]) if d is not None]
     return (
-        counts['plats'],
-        counts['golds'],
-        counts['silvers'],
-        counts['bronzes'],
-        counts['last_earned'],
+        total[0] + counts[0],
+        total[1] + counts[1],
+        total[2] + counts[2],
+        total[3] + counts[3],
+        max(dates) if dates else None,
     )
 
 
@@ -643,42 +672,71 @@ def update_earner_leaderboards_for_profile(profile):
     logger.debug(f"Updated earner leaderboards for {profile.display_psn_username} across {len(best_per_series)} series")
 
 
+def update_earner_entries(profiles, pairs):
+    """
+    Update earner leaderboard entries for specific (profile_id, series_slug) pairs.
+
+    For bulk badge writes (badge_bulk_service), which bypass the UserBadge
+    signals that normally keep the earners sets current. One query finds the
+    highest remaining tier per pair; pairs left with no badge are removed.
+
+    Args:
+        profiles: {profile_id: Profile} covering every profile in `pairs`.
+        pairs: Iterable of (profile_id, series_slug).
+    """
+    from trophies.models import UserBadge
+
+    pairs = {(profile_id, slug) for profile_id, slug in pairs if profiles[profile_id].is_linked}
+    if not pairs:
+        return
+
+    best = {}
+    for profile_id, slug, tier, earned_at in UserBadge.objects.filter(
+        profile_id__in={profile_id for profile_id, _ in pairs},
+        badge__series_slug__in={slug for _, slug in pairs},
+    ).order_by('profile_id', 'badge__series_slug', '-badge__tier', 'earned_at').values_list(
+        'profile_id', 'badge__series_slug', 'badge__tier', 'earned_at'
+    ):
+        if (profile_id, slug) in pairs:
+            best.setdefault((profile_id, slug), (tier, earned_at))
+
+    pipe = redis_client.pipeline()
+    for profile_id, slug in pairs:
+        if (profile_id, slug) in best:
+            tier, earned_at = best[(profile_id, slug)]
+            update_earner_entry(slug, profiles[profile_id], tier, earned_at, pipeline=pipe)
+        else:
+            remove_earner_entry(slug, profile_id, pipeline=pipe)
+    pipe.execute()
+
+
 def update_progress_leaderboards_for_profile(profile):
     """
     Recompute and update progress leaderboard entries for a profile across all
     series they participate in, plus the global leaderboard.
 
     Called at sync-complete time after bulk_gamification_update() exits.
+    Counts come from one pass (compute_profile_progress) and every write
+    goes through a single pipeline.
     """
-    from trophies.models import Stage
-
-    # Find all series this profile might have progress in
-    series_slugs = list(
-        Stage.objects.filter(
-            concepts__games__played_by__profile=profile
-        ).values_list('series_slug', flat=True).distinct()
-    )
+    series_totals, global_total = compute_profile_progress(profile)
+    displayed_title = profile.displayed_title() or ''
 
     pipe = redis_client.pipeline()
 
-    for slug in series_slugs:
-        result = compute_profile_progress_for_series(profile, slug)
+    # Global progress rides along as slug=None
+    for slug, result in [*series_totals.items(), (None, global_total)]:
         if result:
             plats, golds, silvers, bronzes, last_earned = result
-            update_progress_entry(slug, profile, plats, golds, silvers, bronzes, last_earned, pipeline=pipe)
+            update_progress_entry(
+                slug, profile, plats, golds, silvers, bronzes, last_earned,
+                pipeline=pipe, displayed_title=displayed_title,
+            )
         else:
             _remove_entry(_progress_scores_key(slug), _progress_data_key(slug), profile.id, pipeline=pipe)
 
-    # Global progress
-    global_result = compute_profile_progress_global(profile)
-    if global_result:
-        plats, golds, silvers, bronzes, last_earned = global_result
-        update_progress_entry(None, profile, plats, golds, silvers, bronzes, last_earned, pipeline=pipe)
-    else:
-        _remove_entry(_progress_scores_key(None), _progress_data_key(None), profile.id, pipeline=pipe)
-
     pipe.execute()
-    logger.debug(f"Updated progress leaderboards for {profile.display_psn_username} across {len(series_slugs)} series")
+    logger.debug(f"Updated progress leaderboards for {profile.display_psn_username} across {len(series_totals)} series")
 
 
 def rebuild_progress_leaderboard(series_slug):
@@ -717,23 +775,25 @@ def rebuild_progress_leaderboard(series_slug):
         max_earn_date=Max('earned_trophy_entries__earned_date_time', filter=game_filter)
     ).only('id', 'display_psn_username', 'flag', 'avatar_url', 'user_is_premium')
 
-    entries = []
-    for p in profiles:
+    count = _rebuild_leaderboard(
+        _progress_scores_key(series_slug),
+        _progress_data_key(series_slug),
+        _progress_entries(profiles)
+    )
+    logger.info(f"Rebuilt progress leaderboard for {series_slug} with {count} entries")
+    return count
+
+
+def _progress_entries(profiles):
+    """Stream (profile_id, score, display_data) for a count-annotated Profile queryset."""
+    for p in profiles.iterator(chunk_size=500):
         score = compute_progress_score(p.plats, p.golds, p.silvers, p.bronzes)
         if score <= 0:
             continue
         display_data = _build_progress_display_data(
             p, p.plats, p.golds, p.silvers, p.bronzes, p.max_earn_date
         )
-        entries.append((p.id, score, display_data))
-
-    _rebuild_leaderboard(
-        _progress_scores_key(series_slug),
-        _progress_data_key(series_slug),
-        entries
-    )
-    logger.info(f"Rebuilt progress leaderboard for {series_slug} with {len(entries)} entries")
-    return len(entries)
+        yield p.id, score, display_data
 
 
 def rebuild_global_progress_leaderboard():
@@ -766,23 +826,13 @@ def rebuild_global_progress_leaderboard():
         max_earn_date=Max('earned_trophy_entries__earned_date_time', filter=game_filter)
     ).only('id', 'display_psn_username', 'flag', 'avatar_url', 'user_is_premium')
 
-    entries = []
-    for p in profiles:
-        score = compute_progress_score(p.plats, p.golds, p.silvers, p.bronzes)
-        if score <= 0:
-            continue
-        display_data = _build_progress_display_data(
-            p, p.plats, p.golds, p.silvers, p.bronzes, p.max_earn_date
-        )
-        entries.append((p.id, score, display_data))
-
-    _rebuild_leaderboard(
+    count = _rebuild_leaderboard(
         _progress_scores_key(None),
         _progress_data_key(None),
-        entries
+        _progress_entries(profiles)
     )
-    logger.info(f"Rebuilt global progress leaderboard with {len(entries)} entries")
-    return len(entries)
+    logger.info(f"Rebuilt global progress leaderboard with {count} entries")
+    return count
 
 
 # ---------------------------------------------------------------------------
@@ -910,35 +960,27 @@ def rebuild_country_xp_leaderboard(country_code):
         profile__country_code=country_code,
     ).select_related('profile')
 
-    entries = []
-    for gamification in queryset.iterator(chunk_size=500):
-        profile = gamification.profile
-        total_xp = gamification.total_badge_xp
-        total_badges = gamification.total_badges_earned
-        score = compute_xp_score(total_xp, total_badges)
-        display_data = _build_xp_display_data(profile, total_xp, total_badges)
-        entries.append((profile.id, score, display_data))
-
-    _rebuild_leaderboard(
+    count = _rebuild_leaderboard(
         _country_xp_scores_key(country_code),
         _country_xp_data_key(country_code),
-        entries
+        _xp_entries(queryset.iterator(chunk_size=500))
     )
-    logger.info(f"Rebuilt country XP leaderboard for {country_code} with {len(entries)} entries")
-    return len(entries)
+    logger.info(f"Rebuilt country XP leaderboard for {country_code} with {count} entries")
+    return count
 
 
 def rebuild_country_xp_leaderboards():
     """
     Full rebuild of all country XP leaderboards from ProfileGamification.
 
-    Groups profiles by country_code and rebuilds each country's sorted set.
-    Also rebuilds the country index SET.
+    Walks ProfileGamification once, ordered by country_code, streaming each
+    country's run of rows into its own sorted set. Also rebuilds the country
+    index SET.
 
     Returns:
         dict: {country_code: entry_count}
     """
-    from collections import defaultdict
+    from itertools import groupby
     from trophies.models import ProfileGamification
 
     queryset = ProfileGamification.objects.filter(
@@ -947,37 +989,24 @@ def rebuild_country_xp_leaderboards():
         profile__country_code__isnull=False,
     ).exclude(
         profile__country_code=''
-    ).select_related('profile')
-
-    # Group entries by country
-    country_entries = defaultdict(list)
-    for gamification in queryset.iterator(chunk_size=500):
-        profile = gamification.profile
-        cc = profile.country_code
-        total_xp = gamification.total_badge_xp
-        total_badges = gamification.total_badges_earned
-        score = compute_xp_score(total_xp, total_badges)
-        display_data = _build_xp_display_data(profile, total_xp, total_badges)
-        country_entries[cc].append((profile.id, score, display_data))
+    ).select_related('profile').order_by('profile__country_code')
 
     results = {}
-    pipe = redis_client.pipeline()
+    rows = queryset.iterator(chunk_size=500)
+    for cc, group in groupby(rows, key=lambda gamification: gamification.profile.country_code):
+        results[cc] = _rebuild_leaderboard(
+            _country_xp_scores_key(cc),
+            _country_xp_data_key(cc),
+            _xp_entries(group)
+        )
 
     # Rebuild index: clear and repopulate
+    pipe = redis_client.pipeline()
     pipe.delete(_country_xp_index_key())
-    for cc in country_entries:
-        pipe.sadd(_country_xp_index_key(), cc)
+    if results:
+        pipe.sadd(_country_xp_index_key(), *results)
     pipe.execute()
 
-    # Rebuild each country's leaderboard
-    for cc, entries in country_entries.items():
-        _rebuild_leaderboard(
-            _country_xp_scores_key(cc),
-            _country_xp_data_key(cc),
-            entries
-        )
-        results[cc] = len(entries)
-
     logger.info(
         f"Rebuilt country XP leaderboards: {len(results)} countries, "
         f"{sum(results.values())} total entries"
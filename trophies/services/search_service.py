@@ -0,0 +1,156 @@
+"""
+Search service - Index-served, ranked name search for games, trophies, profiles and concepts.
+
+Matching stays `__icontains`, which Django compiles to
+`UPPER(col::text) LIKE UPPER('%q%')`; migration 0262 adds a pg_trgm GIN
+index on exactly that expression for Game.title_name, Trophy.trophy_name,
+Profile.psn_username and Concept.unified_title, so the site's existing
+search boxes and this service are index scans instead of sequential scans.
+
+Roman-numeral variants ("Final Fantasy 15" / "Final Fantasy XV") are folded
+in at query time: `contains_any()` ORs one ILIKE per expand_numeral_query()
+variant, and each arm is served by the same index.
+
+Ranking (`rank_by_name()`): names that start with the query first, then
+pg_trgm word similarity to the query, then the caller's popularity order.
+Below SIMILARITY_MIN_LENGTH characters trigram similarity is meaningless
+and matching sets are huge, so short queries rank by prefix and popularity
+only, letting Postgres walk the popularity index.
+
+`suggest()` feeds the typeahead endpoint (api/search_views.py). Its payload
+is JSON-safe and cached briefly per normalized query.
+"""
+import hashlib
+import logging
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.cache import cache
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+from django.urls import reverse
+
+from trophies.util_modules.roman_numerals import expand_numeral_query
+
+logger = logging.getLogger("psn_api")
+
+SEARCH_MIN_LENGTH = 2
+SIMILARITY_MIN_LENGTH = 3
+SUGGEST_LIMIT = 5
+SUGGEST_CACHE_TTL = 60
+
+
+def contains_any(field, query):
+    """Q matching `field` against the query or any of its numeral variants."""
+    q_filter = Q()
+    for variant in expand_numeral_query(query):
+        q_filter |= Q(**{f'{field}__icontains': variant})
+    return q_filter
+
+
+def rank_by_name(queryset, field, query, *popularity):
+    """
+    Order a name-filtered queryset by relevance to `query`.
+
+    Args:
+        queryset: Queryset already filtered with contains_any(field, query).
+        field: The name field searched.
+        query: The user's query.
+        *popularity: Trailing order_by() terms used as the tie-breaker.
+    """
+    variants = expand_numeral_query(query)
+    queryset = queryset.annotate(_search_prefix=Case(
+        *[When(**{f'{field}__istartswith': v}, then=Value(1)) for v in variants],
+        default=Value(0),
+        output_field=IntegerField(),
+    ))
+    if len(query) < SIMILARITY_MIN_LENGTH:
+        return queryset.order_by('-_search_prefix', *popularity)
+
+    similarities = [TrigramWordSimilarity(v, field) for v in variants]
+    queryset = queryset.annotate(
+        _search_rank=similarities[0] if len(similarities) == 1 else Greatest(*similarities),
+    )
+    return queryset.order_by('-_search_prefix', '-_search_rank', *popularity)
+
+
+def search_games(query, limit=SUGGEST_LIMIT):
+    from trophies.models import Game
+
+    qs = Game.objects.filter(contains_any('title_name', query)).select_related(
+        'concept', 'concept__igdb_match',
+    ).defer('concept__igdb_match__raw_response')
+    return list(rank_by_name(qs, 'title_name', query, '-played_count', 'id')[:limit])
+
+
+def search_trophies(query, limit=SUGGEST_LIMIT):
+    from trophies.models import Trophy
+
+    qs = Trophy.objects.filter(contains_any('trophy_name', query)).select_related('game')
+    return list(rank_by_name(qs, 'trophy_name', query, '-earned_count', 'id')[:limit])
+
+
+def search_profiles(query, limit=SUGGEST_LIMIT):
+    from trophies.models import Profile
+
+    # Usernames have no numerals worth expanding, but contains_any is harmless.
+    qs = Profile.objects.filter(contains_any('psn_username', query))
+    return list(rank_by_name(qs, 'psn_username', query, '-total_trophies', 'id')[:limit])
+
+
+def search_concepts(query, limit=SUGGEST_LIMIT):
+    from trophies.models import Concept
+
+    qs = Concept.objects.filter(contains_any('unified_title', query))
+    return list(rank_by_name(qs, 'unified_title', query, 'unified_title', 'id')[:limit])
+
+
+def _suggest_cache_key(query):
+    return f"search:suggest:{hashlib.sha1(query.encode()).hexdigest()[:16]}"
+
+
+def suggest(query, limit=SUGGEST_LIMIT):
+    """
+    Typeahead payload for the site search bar.
+
+    Returns:
+        dict: {'games': [...], 'trophies': [...], 'profiles': [...]}, each
+        a list of small JSON-safe dicts with a display label and URL. Empty
+        lists for queries shorter than SEARCH_MIN_LENGTH.
+    """
+    query = ' '.join(query.split()).lower()
+    if len(query) < SEARCH_MIN_LENGTH:
+        return {'games': [], 'trophies': [], 'profiles': []}
+
+    cache_key = _suggest_cache_key(f'{limit}:{query}')
+    payload = cache.get(cache_key)
+    if payload is not None:
+        return payload
+
+    payload = {
+        'games': [
+            {
+                'title': game.title_name,
+                'platforms': game.title_platform or [],
+                'image_url': game.display_image_url,
+                'url': reverse('game_detail', kwargs={'np_communication_id': game.np_communication_id}),
+            } for game in search_games(query, limit)
+        ],
+        'trophies': [
+            {
+                'name': trophy.trophy_name,
+                'type': trophy.trophy_type,
+                'game': trophy.game.title_name,
+                'icon_url': trophy.trophy_icon_url,
+                'url': reverse('game_detail', kwargs={'np_communication_id': trophy.game.np_communication_id}),
+            } for trophy in search_trophies(query, limit)
+        ],
+        'profiles': [
+            {
+                'username': profile.display_psn_username or profile.psn_username,
+                'avatar_url': profile.avatar_url or '',
+                'url': reverse('profile_detail', kwargs={'psn_username': profile.psn_username}),
+            } for profile in search_profiles(query, limit)
+        ],
+    }
+    cache.set(cache_key, payload, SUGGEST_CACHE_TTL)
+    return payload
@@ -15,6 +15,8 @@ from django.db.models import Avg, Count, F, Max, Min, Q, Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from trophies.util_modules.cache_invalidation import invalidate, register_invalidator
+
 logger = logging.getLogger(__name__)
 
 STATS_CACHE_TTL = 14400  # 4 hours
@@ -181,11 +183,19 @@ def get_premium_stats(profile, exclude_shovelware=False, exclude_hidden=False):
     return data
 
 
+def _stats_cache_keys(profile_ids):
+    return [
+        f'stats_page:{profile_id}:{sw}:{hid}'
+        for profile_id in profile_ids for sw in (0, 1) for hid in (0, 1)
+    ]
+
+
+register_invalidator('stats', _stats_cache_keys)
+
+
 def invalidate_stats_cache(profile_id):
     """Clear all cached stats combos. Called after sync completion."""
-    for sw in (0, 1):
-        for hid in (0, 1):
-            cache.delete(f'stats_page:{profile_id}:{sw}:{hid}')
+    invalidate('stats', profile_id)
 
 
 # ---------------------------------------------------------------------------
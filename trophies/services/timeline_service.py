@@ -11,6 +11,8 @@ import logging
 from django.core.cache import cache
 from django.db.models import Min
 
+from trophies.util_modules.cache_invalidation import invalidate, register_invalidator
+
 logger = logging.getLogger("psn_api")
 
 
@@ -310,6 +312,13 @@ def get_cached_timeline_events(profile):
     return events
 
 
+def _timeline_cache_keys(profile_ids):
+    return [f"profile:timeline:{profile_id}" for profile_id in profile_ids]
+
+
+register_invalidator('timeline', _timeline_cache_keys)
+
+
 def invalidate_timeline_cache(profile_id):
     """Delete cached timeline for a profile (call after sync completion)."""
-    cache.delete(f"profile:timeline:{profile_id}")
+    invalidate('timeline', profile_id)
@@ -0,0 +1,200 @@
+"""
+Trophy list service - Cached, pre-serialized trophy list per game.
+
+GameDetailView used to load every Trophy of the game on each request,
+serialize it to dicts, compute the PP rarity tier per row, then filter and
+sort in Python. That data only changes when a sync (or an earn-rate
+refresh) touches the game, so it is built once per game version:
+
+    {
+        'trophies': [trophy dict, ...],           # trophy_id order
+        'orders': {sort_key: [index, ...]},       # one per SORT_KEYS entry
+        'by_group': {trophy_group_id: [index, ...]},
+        'by_type': {trophy_type: [index, ...]},
+        'by_rarity': {psn rarity bracket: [index, ...]},
+        'groups': {trophy_group_id: {name, icon, defined_trophies}},
+    }
+
+and cached under `game:trophies:{game_id}:g{generation}`, where the
+generation is the game's `game_trophies` token on the invalidation bus
+(trophies/util_modules/cache_invalidation.py). Writers call
+`invalidate_trophy_list_cache(game_id)`; the old entry is simply never read
+again. A request only applies the viewer's earned map on top
+(`select_trophies`).
+
+Every structure is JSON-safe (string keys, lists of ints) to match the
+production cache serializer.
+"""
+import logging
+
+from django.core.cache import cache
+
+from trophies.util_modules.cache_invalidation import cache_generation, invalidate, register_invalidator
+
+logger = logging.getLogger("psn_api")
+
+TROPHY_LIST_TTL = 6 * 3600  # backstop; versions normally change first
+
+TYPE_ORDER = {'platinum': 0, 'gold': 1, 'silver': 2, 'bronze': 3}
+
+# Precomputed sort orders, keyed by GameDetailForm sort value. Python's sort
+# is stable, so filtering a precomputed order gives the same result as
+# sorting the filtered list.
+SORT_KEYS = {
+    'psn_rarity': lambda t: t['trophy_earn_rate'],
+    'pp_rarity': lambda t: t['earn_rate'],
+    'alpha': lambda t: t['trophy_name'].lower(),
+    'earned_count': lambda t: (-t['earned_count'], t['trophy_name'].lower()),
+    'earned_count_inv': lambda t: (t['earned_count'], t['trophy_name'].lower()),
+    'type': lambda t: (TYPE_ORDER.get(t['trophy_type'], 4), t['trophy_name'].lower()),
+}
+
+
+register_invalidator('game_trophies', generational=True)
+
+
+def invalidate_trophy_list_cache(game_id):
+    """
+    Retire the cached trophy list for a game (call after its trophies change).
+
+    The anonymous game page embeds the list, so its page cache goes too.
+    """
+    from trophies.util_modules.page_cache import invalidate_page_cache
+
+    invalidate('game_trophies', game_id)
+    invalidate_page_cache('game_page', game_id)
+
+
+def psn_rarity_bracket(rate):
+    """PSN rarity bracket used by the game page's rarity filter."""
+    if rate <= 1:
+        return 'ultra_rare'
+    elif rate <= 5:
+        return 'very_rare'
+    elif rate <= 25:
+        return 'rare'
+    return 'common'
+
+
+def _cache_key(game_id):
+    return f"game:trophies:{game_id}:g{cache_generation('game_trophies', game_id)}"
+
+
+def get_trophy_list(game_id):
+    """Return the cached trophy list structure for a game, building it on a miss."""
+    cache_key = _cache_key(game_id)
+    trophy_list = cache.get(cache_key)
+    if trophy_list is None:
+        trophy_list = build_trophy_list(game_id)
+        cache.set(cache_key, trophy_list, TROPHY_LIST_TTL)
+    return trophy_list
+
+
+def build_trophy_list(game_id):
+    """Build the trophy list structure for a game (two queries)."""
+    from trophies.models import Trophy, TrophyGroup
+
+    trophies = [
+        {
+            'trophy_id': t.trophy_id,
+            'trophy_type': t.trophy_type,
+            'trophy_name': t.trophy_name,
+            'trophy_detail': t.trophy_detail,
+            'trophy_icon_url': t.trophy_icon_url,
+            'trophy_group_id': t.trophy_group_id,
+            'progress_target_value': t.progress_target_value,
+            'trophy_rarity': t.trophy_rarity,
+            'trophy_earn_rate': t.trophy_earn_rate,
+            'earned_count': t.earned_count,
+            'earn_rate': t.earn_rate,
+            'pp_rarity': t.get_pp_rarity_tier(),
+        } for t in Trophy.objects.filter(game_id=game_id).order_by('trophy_id')
+    ]
+
+    indexes = range(len(trophies))
+    by_group, by_type, by_rarity = {}, {}, {}
+    for i, trophy in enumerate(trophies):
+        by_group.setdefault(trophy['trophy_group_id'], []).append(i)
+        by_type.setdefault(trophy['trophy_type'], []).append(i)
+        by_rarity.setdefault(psn_rarity_bracket(trophy['trophy_earn_rate']), []).append(i)
+
+    return {
+        'trophies': trophies,
+        'orders': {
+            sort_key: sorted(indexes, key=lambda i, fn=fn: fn(trophies[i]))
+            for sort_key, fn in SORT_KEYS.items()
+        },
+        'by_group': by_group,
+        'by_type': by_type,
+        'by_rarity': by_rarity,
+        'groups': {
+            g.trophy_group_id: {
+                'trophy_group_name': g.trophy_group_name,
+                'trophy_group_icon_url': g.trophy_group_icon_url,
+                'defined_trophies': g.defined_trophies,
+            } for g in TrophyGroup.objects.filter(game_id=game_id)
+        },
+    }
+
+
+def select_trophies(trophy_list, profile_earned=None, earned=None, sort=None,
+                    trophy_types=None, rarity_brackets=None, dlc_filter=None):
+    """
+    Apply the game page filters and sort to a cached trophy list.
+
+    Args mirror GameDetailForm.cleaned_data. Only the viewer-specific parts
+    (earned / unearned filter, earned_date sort) look at `profile_earned`;
+    everything else is index lookups into the precomputed structure.
+
+    Returns:
+        list: trophy dicts in display order.
+    """
+    trophies = trophy_list['trophies']
+    profile_earned = profile_earned or {}
+
+    order = trophy_list['orders'].get(sort) or range(len(trophies))
+
+    allowed = None
+
+    def narrow(index_lists):
+        nonlocal allowed
+        selected = {i for indexes in index_lists for i in indexes}
+        allowed = selected if allowed is None else allowed & selected
+
+    if trophy_types:
+        narrow(trophy_list['by_type'].get(t, ()) for t in trophy_types)
+    if rarity_brackets:
+        narrow(trophy_list['by_rarity'].get(b, ()) for b in rarity_brackets)
+    if dlc_filter == 'base':
+        narrow([trophy_list['by_group'].get('default', ())])
+    elif dlc_filter == 'dlc':
+        narrow(indexes for gid, indexes in trophy_list['by_group'].items() if gid != 'default')
+
+    selected = [trophies[i] for i in order if allowed is None or i in allowed]
+
+    if profile_earned and earned in ('earned', 'unearned'):
+        want = earned == 'earned'
+        selected = [
+            t for t in selected
+            if bool(profile_earned.get(t['trophy_id'], {}).get('earned', False)) == want
+        ]
+
+    if sort == 'earned_date':
+        from datetime import datetime
+        from django.utils import timezone
+
+        floor = timezone.make_aware(datetime.min)
+
+        def earned_at(t):
+            return profile_earned.get(t['trophy_id'], {}).get('earned_date_time')
+        selected.sort(key=lambda t: (earned_at(t) is None, earned_at(t) or floor))
+
+    return selected
+
+
+def group_trophies(trophies):
+    """Partition display-ordered trophies by group: default first, then by group id."""
+    grouped = {}
+    for trophy in trophies:
+        grouped.setdefault(trophy.get('trophy_group_id', 'default'), []).append(trophy)
+    return {gid: grouped[gid] for gid in sorted(grouped, key=lambda x: (x != 'default', x))}
@@ -30,6 +30,9 @@ TIER_XP_MAP = {
 # Thread-local storage for bulk update context
 _bulk_update_context = threading.local()
 
+# defer_profile_update() default: the change can't be pinned to one series
+FULL_RECALC = object()
+
 
 def get_tier_xp(tier: int) -> int:
     """
@@ -154,8 +157,53 @@ def calculate_total_xp(profile) -> tuple[int, dict, int, int]:
     return total_xp, series_xp, total_badges, len(earned_series)
 
 
+def calculate_incremental_xp(profile, old_series_xp: dict, series_slugs) -> tuple[int, dict, int, int]:
+    """
+    Recalculate badge XP for a profile when only `series_slugs` changed.
+
+    Recomputes those series' entries from their own UserBadgeProgress and
+    UserBadge rows and keeps every other entry of `old_series_xp` as stored.
+    Badge counts come from a single aggregate, so series-less badges (which
+    add the flat bonus to the total but belong to no series) are covered
+    whatever slug changed. Same return shape as calculate_total_xp(), and
+    equal to it whenever `old_series_xp` was current before the change.
+
+    Args:
+        profile: Profile instance
+        old_series_xp: The profile's stored series_badge_xp
+        series_slugs: Series whose progress or earned badges changed
+    """
+    from django.db.models import Count, Q
+    from trophies.models import UserBadgeProgress, UserBadge
+
+    slugs = {slug for slug in series_slugs if slug}
+    series_xp = {slug: xp for slug, xp in old_series_xp.items() if slug not in slugs}
+
+    if slugs:
+        for series_slug, tier, completed in UserBadgeProgress.objects.filter(
+            profile=profile, badge__series_slug__in=slugs
+        ).values_list('badge__series_slug', 'badge__tier', 'completed_concepts'):
+            series_xp[series_slug] = series_xp.get(series_slug, 0) + completed * get_tier_xp(tier)
+
+        for row in UserBadge.objects.filter(
+            profile=profile, badge__series_slug__in=slugs
+        ).values('badge__series_slug').annotate(earned=Count('id')):
+            series_slug = row['badge__series_slug']
+            series_xp[series_slug] = series_xp.get(series_slug, 0) + row['earned'] * BADGE_TIER_XP
+
+    has_series = Q(badge__series_slug__isnull=False) & ~Q(badge__series_slug='')
+    counts = UserBadge.objects.filter(profile=profile).aggregate(
+        total=Count('id'),
+        unique=Count('badge__series_slug', filter=has_series, distinct=True),
+        unslugged=Count('id', filter=~has_series),
+    )
+
+    total_xp = sum(series_xp.values()) + counts['unslugged'] * BADGE_TIER_XP
+    return total_xp, series_xp, counts['total'], counts['unique']
+
+
 @transaction.atomic
-def update_profile_gamification(profile) -> 'ProfileGamification':
+def update_profile_gamification(profile, series_slugs=None) -> 'ProfileGamification':
     """
     Update or create ProfileGamification with recalculated XP values.
 
@@ -164,22 +212,27 @@ def update_profile_gamification(profile) -> 'ProfileGamification':
 
     Args:
         profile: Profile instance
+        series_slugs: Series that changed since the stored values were
+            computed. When given and a record exists, only those series are
+            recalculated (calculate_incremental_xp); None recalculates
+            everything, which is what periodic reconciliation uses.
 
     Returns:
         ProfileGamification: Updated gamification record
     """
     from trophies.models import ProfileGamification
 
-    total_xp, series_xp, total_badges, unique_badges = calculate_total_xp(profile)
+    # Lock the row: an incremental update builds on the stored series XP,
+    # and the old values feed the community XP deltas below.
+    existing = ProfileGamification.objects.select_for_update().filter(profile=profile).first()
+    old_series_xp = existing.series_badge_xp if existing and existing.series_badge_xp else {}
 
-    # Read old series XP before overwriting (for community XP delta calculation)
-    old_series_xp = {}
-    try:
-        existing = ProfileGamification.objects.filter(profile=profile).values_list('series_badge_xp', flat=True).first()
-        if existing:
-            old_series_xp = existing
-    except Exception:
-        pass
+    if existing is not None and series_slugs is not None:
+        total_xp, series_xp, total_badges, unique_badges = calculate_incremental_xp(
+            profile, old_series_xp, series_slugs
+        )
+    else:
+        total_xp, series_xp, total_badges, unique_badges = calculate_total_xp(profile)
 
     gamification, created = ProfileGamification.objects.update_or_create(
         profile=profile,
@@ -335,7 +388,8 @@ def bulk_gamification_update():
 
     When multiple badge updates occur in quick succession (e.g., during sync),
     this prevents N separate gamification recalculations. Instead, affected
-    profiles are collected and updated once when the context exits.
+    profiles are collected and updated once when the context exits, along
+    with the series that changed so only those are recalculated.
 
     Usage:
         with bulk_gamification_update():
@@ -348,6 +402,7 @@ def bulk_gamification_update():
 
     _bulk_update_context.active = True
     _bulk_update_context.profiles = set()
+    _bulk_update_context.changed_series = {}
     _bulk_update_context.pipeline = _redis_client.pipeline()
 
     try:
@@ -358,12 +413,14 @@ def bulk_gamification_update():
         # Update all affected profiles once
         profiles_to_update = _bulk_update_context.profiles
         _bulk_update_context.profiles = set()
+        changed_series = _bulk_update_context.changed_series
+        _bulk_update_context.changed_series = {}
         pipeline = _bulk_update_context.pipeline
         _bulk_update_context.pipeline = None
 
         for profile in profiles_to_update:
             try:
-                update_profile_gamification(profile)
+                update_profile_gamification(profile, series_slugs=changed_series.get(profile.pk))
             except Exception as e:
                 logger.error(f"Failed to update gamification for {profile.psn_username}: {e}")
 
@@ -392,12 +449,19 @@ def is_bulk_update_active() -> bool:
     return getattr(_bulk_update_context, 'active', False)
 
 
-def defer_profile_update(profile):
+def defer_profile_update(profile, series_slug=FULL_RECALC):
     """
     Mark profile for deferred update during bulk operation.
 
     Called by signal handlers when bulk context is active.
-    The profile will be updated once the bulk context exits.
+    The profile will be updated once the bulk context exits, recalculating
+    only the series passed across its deferrals. Omitting `series_slug`
+    forces a full recalculation for the profile.
     """
     if hasattr(_bulk_update_context, 'profiles'):
         _bulk_update_context.profiles.add(profile)
+        changed = _bulk_update_context.changed_series
+        if series_slug is FULL_RECALC:
+            changed[profile.pk] = None
+        elif changed.get(profile.pk, set()) is not None:
+            changed.setdefault(profile.pk, set()).add(series_slug)
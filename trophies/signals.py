@@ -2,7 +2,7 @@ import logging
 from django.db.models.signals import post_save, post_delete, m2m_changed, pre_save
 from django.dispatch import receiver
 from django.db.models import F
-from trophies.models import UserBadge, UserBadgeProgress, Stage, ConceptBundle, Profile, EarnedTrophy, ProfileGame
+from trophies.models import UserBadge, UserBadgeProgress, Stage, ConceptBundle, Profile, EarnedTrophy, ProfileGame, Badge, Concept, Game
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +23,9 @@ logger = logging.getLogger(__name__)
 #   without a SELECT (the existing pre_save handler that tracks this is
 #   suppressed during sync for performance — see trophies/sync_utils.py).
 # - bulk_create / bulk_update do not fire these signals (Django default).
-#   The cron compensates for any rows touched that way.
+#   The set-based sync path (PsnApiService.bulk_sync_trophies) applies the
+#   same deltas itself via apply_earned_trophy_deltas() below; the cron
+#   compensates for any other rows touched that way.
 # ──────────────────────────────────────────────────────────────────────
 
 
@@ -189,6 +191,39 @@ def update_profile_type_counts_on_delete(sender, instance, **kwargs):
     )
 
 
+def apply_earned_trophy_deltas(profile_id, trophy_deltas, type_deltas):
+    """Bulk counterpart of the EarnedTrophy counter signals above.
+
+    `trophy_deltas` maps Trophy pk -> +1/-1 (earned flips seen by a bulk
+    write), `type_deltas` maps trophy type -> net change in earned count for
+    the profile. Issues at most two Trophy UPDATEs (one per direction) and a
+    single Profile UPDATE instead of one of each per row. Decrements clamp at
+    zero, matching the `__gt=0` guards on the per-row handlers.
+    """
+    from django.db.models import Value
+    from django.db.models.functions import Greatest
+    from trophies.models import Trophy
+
+    gained = sorted(pk for pk, delta in trophy_deltas.items() if delta > 0)
+    lost = sorted(pk for pk, delta in trophy_deltas.items() if delta < 0)
+    if gained:
+        Trophy.objects.filter(pk__in=gained).update(
+            earned_count=F('earned_count') + 1
+        )
+    if lost:
+        Trophy.objects.filter(pk__in=lost, earned_count__gt=0).update(
+            earned_count=F('earned_count') - 1
+        )
+
+    profile_updates = {}
+    for trophy_type, delta in type_deltas.items():
+        type_field = _TROPHY_TYPE_TO_PROFILE_FIELD.get(trophy_type)
+        if type_field and delta:
+            profile_updates[type_field] = Greatest(F(type_field) + delta, Value(0))
+    if profile_updates:
+        Profile.objects.filter(pk=profile_id).update(**profile_updates)
+
+
 # ──────────────────────────────────────────────────────────────────────
 # Profile premium transitions: keep profile showcases in sync with premium
 # tier. Runs for every path that changes user_is_premium (subscription
@@ -254,13 +289,15 @@ def update_gamification_on_progress(sender, instance, created, **kwargs):
         defer_profile_update
     )
 
+    series_slug = instance.badge.series_slug
+
     # Defer update if bulk operation is active
     if is_bulk_update_active():
-        defer_profile_update(instance.profile)
+        defer_profile_update(instance.profile, series_slug)
         return
 
     try:
-        update_profile_gamification(instance.profile)
+        update_profile_gamification(instance.profile, series_slugs=[series_slug])
         logger.debug(
             f"Updated gamification for {instance.profile.psn_username} "
             f"after progress update on {instance.badge.name}"
@@ -286,13 +323,15 @@ def update_gamification_on_badge_earned(sender, instance, created, **kwargs):
         defer_profile_update
     )
 
+    series_slug = instance.badge.series_slug
+
     # Defer update if bulk operation is active
     if is_bulk_update_active():
-        defer_profile_update(instance.profile)
+        defer_profile_update(instance.profile, series_slug)
         return
 
     try:
-        update_profile_gamification(instance.profile)
+        update_profile_gamification(instance.profile, series_slugs=[series_slug])
         logger.info(
             f"Updated gamification for {instance.profile.psn_username} "
             f"after earning {instance.badge.name}"
@@ -301,7 +340,7 @@ def update_gamification_on_badge_earned(sender, instance, created, **kwargs):
         logger.exception(f"Failed to update gamification after badge earned: {e}")
 
     # Update earners leaderboard sorted set
-    _update_earner_leaderboard_on_badge_change(instance.profile, instance.badge.series_slug)
+    _update_earner_leaderboard_on_badge_change(instance.profile, series_slug)
 
 
 @receiver(post_delete, sender=UserBadge, dispatch_uid="update_gamification_on_badge_revoked")
@@ -323,13 +362,15 @@ def update_gamification_on_badge_revoked(sender, instance, **kwargs):
     if not ProfileGamification.objects.filter(profile_id=instance.profile_id).exists():
         return
 
+    series_slug = instance.badge.series_slug
+
     # Defer update if bulk operation is active
     if is_bulk_update_active():
-        defer_profile_update(instance.profile)
+        defer_profile_update(instance.profile, series_slug)
         return
 
     try:
-        update_profile_gamification(instance.profile)
+        update_profile_gamification(instance.profile, series_slugs=[series_slug])
         logger.info(
             f"Updated gamification for {instance.profile.psn_username} "
             f"after revoking {instance.badge.name}"
@@ -341,7 +382,7 @@ def update_gamification_on_badge_revoked(sender, instance, **kwargs):
         )
 
     # Update earners leaderboard sorted set
-    _update_earner_leaderboard_on_badge_change(instance.profile, instance.badge.series_slug)
+    _update_earner_leaderboard_on_badge_change(instance.profile, series_slug)
 
 
 def _update_earner_leaderboard_on_badge_change(profile, series_slug):
@@ -431,4 +472,79 @@ def auto_populate_stage_icon_from_bundle(sender, instance, action, **kwargs):
     try:
         _refresh_stage_icon(instance.stage)
     except Exception:
-        logger.exception(f"Failed to refresh stage_icon from bundle {instance}")
\ No newline at end of file
+        logger.exception(f"Failed to refresh stage_icon from bundle {instance}")
+
+# --- Badge topology invalidation ---
+#
+# badge_topology.py caches the Stage -> Concept -> Game graph, bundles and
+# live badge ids per series. Anything that can change that graph moves its
+# version on. Invalidation runs immediately (this process, this transaction)
+# and again on commit, so a concurrent rebuild that read pre-commit rows
+# can't outlive the change.
+
+def _invalidate_badge_topology():
+    from django.db import transaction
+    from trophies.services.badge_topology import invalidate_badge_topology
+
+    try:
+        invalidate_badge_topology()
+        transaction.on_commit(invalidate_badge_topology)
+    except Exception:
+        logger.exception("Failed to invalidate badge topology")
+
+
+@receiver(post_save, sender=Stage, dispatch_uid="badge_topology_stage_saved")
+@receiver(post_delete, sender=Stage, dispatch_uid="badge_topology_stage_deleted")
+@receiver(post_save, sender=ConceptBundle, dispatch_uid="badge_topology_bundle_saved")
+@receiver(post_delete, sender=ConceptBundle, dispatch_uid="badge_topology_bundle_deleted")
+@receiver(post_save, sender=Badge, dispatch_uid="badge_topology_badge_saved")
+@receiver(post_delete, sender=Badge, dispatch_uid="badge_topology_badge_deleted")
+@receiver(post_delete, sender=Concept, dispatch_uid="badge_topology_concept_deleted")
+def invalidate_badge_topology_on_change(sender, instance, **kwargs):
+    """Stage/bundle/badge edits, and concept deletes (absorb), reshape the graph."""
+    if sender is Stage and kwargs.get('update_fields') == frozenset({'stage_icon'}):
+        return  # auto_populate_stage_icon's own save
+    _invalidate_badge_topology()
+
+
+@receiver(m2m_changed, sender=Stage.concepts.through, dispatch_uid="badge_topology_stage_concepts")
+@receiver(m2m_changed, sender=ConceptBundle.concepts.through, dispatch_uid="badge_topology_bundle_concepts")
+def invalidate_badge_topology_on_membership(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _invalidate_badge_topology()
+
+
+_UNKNOWN = object()
+
+
+@receiver(post_save, sender=Game, dispatch_uid="badge_topology_game_concept")
+def invalidate_badge_topology_on_game_concept(sender, instance, created, update_fields=None, **kwargs):
+    """A game joining or leaving a staged concept changes that stage's game set.
+
+    Sync saves Game rows constantly, so the topology is only consulted when
+    `concept_id` actually moved: against the value Game.from_db loaded, or
+    for a new game that starts out in a concept. Instances not loaded from
+    the DB (no baseline) fall back to checking the topology.
+
+    Concept post_save needs no receiver: a concept's own fields aren't part
+    of the topology. Membership changes arrive through Stage/ConceptBundle
+    m2m signals and Game.concept moves (this receiver), and absorb, which
+    re-points games with queryset updates, ends in a Concept delete that
+    invalidates above.
+    """
+    if update_fields is not None and 'concept' not in update_fields:
+        return
+    loaded = None if created else getattr(instance, '_loaded_concept_id', _UNKNOWN)
+    instance._loaded_concept_id = instance.concept_id
+    if loaded == instance.concept_id:
+        return
+    from trophies.services.badge_topology import get_badge_topology
+
+    try:
+        topology = get_badge_topology()
+    except Exception:
+        logger.exception("Failed to load badge topology")
+        return
+    staged_concept = instance.concept_id if instance.concept_id in topology.stage_concept_ids else None
+    if topology.game_concepts.get(instance.id) != staged_concept:
+        _invalidate_badge_topology()
@@ -19,13 +19,20 @@ from psnawp_api.core.request_builder import RequestBuilder as BaseRequestBuilder
 from psnawp_api.core.authenticator import Authenticator as BaseAuthenticator
 from psnawp_api.core.psnawp_exceptions import PSNAWPForbiddenError, PSNAWPServerError
 from psnawp_api.models.trophies.trophy_constants import PlatformType
+from psnawp_api.models.user import User
 from requests import HTTPError
 from requests.exceptions import ConnectionError, Timeout
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, wait_fixed
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from .models import Profile, Game, Concept, TitleID, TrophyGroup, ProfileGame, EarnedTrophy, ScoutAccount
 from .services.psn_api_service import PsnApiService
 from .psn_manager import PSNManager
+from .token_scheduler import TokenScheduler
+from .async_fetch import AsyncFetchEngine
+from .job_queue import COUNTED_QUEUES, job_queue
+from .user_cache import UserHandle, UserHandleCache
 from trophies.util_modules.cache import redis_client, log_api_call
+from trophies.util_modules.api_audit import audit_buffer, resolve_egress_ip
+from trophies.util_modules.rate_limiter import SlidingWindowRateLimiter
 from trophies.util_modules.constants import TITLE_ID_BLACKLIST, TITLE_STATS_SUPPORTED_PLATFORMS
 from trophies.util_modules.language import detect_asian_language
 from trophies.util_modules.region import detect_region_from_details
@@ -33,6 +40,7 @@ from trophies.services.profile_stats_service import update_profile_games, update
 from trophies.services.badge_service import check_profile_badges
 from trophies.services.milestone_service import check_all_milestones_for_user
 from trophies.services.concept_anchor_service import try_anchor_new_game
+from trophies.services.earn_rate_service import mark_dirty as mark_earn_rate_dirty, refresh_dirty_earn_rates
 
 logger = logging.getLogger("psn_api")
 
@@ -112,7 +120,6 @@ class TokenInstance:
     instance_id: int
     token: str
     client: ProxiedPSNAWP
-    user_cache: dict = None
     access_expiry: datetime = None
     refresh_expiry: datetime = None
     last_health: float = time.time()
@@ -125,8 +132,6 @@ class TokenInstance:
     job_start_time: float = 0  # Track when current job started for stuck detection
 
     def __post_init__(self):
-        if self.user_cache is None:
-            self.user_cache = {}
         if self.access_expiry is None or self.refresh_expiry is None:
             self.update_expiry_times()
     
@@ -150,22 +155,6 @@ class TokenInstance:
         if self.refresh_expiry:
             return (self.refresh_expiry - datetime.now()).total_seconds()
         return -1
-        
-    def cleanup_cache(self, ttl_minutes=5):
-        """Remove cache entries older than ttl_minutes."""
-        now = datetime.now()
-        expired = [
-            key for key, entry in self.user_cache.items()
-            if now - entry['timestamp'] > timedelta(minutes=ttl_minutes)
-        ]
-        for key in expired:
-            del self.user_cache[key]
-        # Periodic cache sweep is mostly noise when nothing was expired. Only
-        # surface it at INFO when we actually evicted entries.
-        if expired:
-            logger.info(f"Cleaned {len(expired)} expired users from instance {self.group_id}-{self.instance_id}")
-        else:
-            logger.debug(f"No expired users to clean from instance {self.group_id}-{self.instance_id}")
 
 class TokenKeeper:
     """Singleton: Maintains 3 live PSNAWP instances and handles API requests via pub/sub."""
@@ -204,6 +193,14 @@ class TokenKeeper:
             logger.warning("PROXY_IPS count doesn't match TOKEN_GROUPS - using available proxies")
 
         self.group_instances = {}
+        self._scheduler = TokenScheduler(redis_client, self.machine_id, self.window_seconds)
+        self._user_cache = UserHandleCache(
+            redis_client,
+            max_size=int(os.getenv("USER_CACHE_SIZE", 5000)),
+            ttl=int(os.getenv("USER_CACHE_TTL", 600)),
+        )
+        self._rate_limiters = {}  # token -> SlidingWindowRateLimiter
+        self._async_engine = None  # AsyncFetchEngine, set by enable_async_fetch()
         
         self._health_thread = None
         self._stats_thread = None
@@ -245,7 +242,13 @@ class TokenKeeper:
                 stats_with_id = {
                     "machine_id": self.machine_id,
                     "instances": stats,
+                    "audit": audit_buffer.stats(),
+                    "token_wait": self._scheduler.wait_stats(),
+                    "user_cache": self._user_cache.stats(),
+                    "job_queue": job_queue.stats(),
                 }
+                if self._async_engine is not None:
+                    stats_with_id["async_fetch"] = self._async_engine.stats()
                 redis_client.publish(f"token_keeper_stats:{self.machine_id}", json.dumps(stats_with_id))
                 redis_client.set(f"token_keeper_latest_stats:{self.machine_id}", json.dumps(stats_with_id), ex=60)
             except Exception as e:
@@ -254,6 +257,10 @@ class TokenKeeper:
     def _cleanup(self):
         """Clean up Redis stat on process exit."""
         logger.info("Cleaning up TokenKeeper Redis state")
+        try:
+            audit_buffer.flush()
+        except Exception as e:
+            logger.warning(f"Failed to flush API audit buffer during cleanup: {e}")
         running_key = f"token_keeper:running:{self.machine_id}"
         redis_client.delete(running_key)
         for group_id, group in self.group_instances.items():
@@ -456,13 +463,18 @@ class TokenKeeper:
             redis_client.set(f"token_keeper:running:{self.machine_id}", "1", ex=3600)
             # Check for stuck instances on every health loop iteration
             self._check_stuck_instances()
+            self._reclaim_stalled_jobs()
             # Check for stuck syncing profiles on every health loop iteration
             self._check_stuck_syncing_profiles()
             self._check_high_sync_volume()
             self._check_psn_outage()
+            self._refresh_dirty_earn_rates()
             for group_id, group in self.group_instances.items():
                 for instance_id, inst in group['instances'].items():
                     self._check_and_refresh(inst)
+            expired = self._user_cache.prune()
+            if expired:
+                logger.debug(f"Pruned {expired} expired user handles")
 
     def initialize_groups(self):
         """Create groups of 3 live PSNAWP clients."""
@@ -479,7 +491,6 @@ class TokenKeeper:
                         instance_id=i,
                         token=token,
                         client=client,
-                        user_cache={},
                         proxy_url=proxy,
                         group_id=group_id,
                         last_health=time.time()
@@ -489,26 +500,19 @@ class TokenKeeper:
                         instance_id=i,
                         token=token,
                         client=None,
-                        user_cache={},
                         proxy_url=proxy,
                         group_id=group_id,
                         last_health=0
                     )
                     logger.warning(f"Failed to init client for instance {i} | {token}")
-                try:
-                    session = requests.Session()
-                    if inst.proxy_url:
-                        session.proxies = {'http': inst.proxy_url, 'https': inst.proxy_url}
-                    ip_response = session.get('https://api.ipify.org', timeout=2)
-                    inst.outbound_ip = ip_response.text
-                    logger.info(f"Group {group_id} Instance {inst.instance_id} using IP: {inst.outbound_ip}")
-                except Exception as e:
-                    logger.warning(f"Failed to fetch IP for group {group_id} instance {inst.instance_id}: {e}")
-                    inst.outbound_ip = 'Unknown'
+                # All instances in a group share the proxy, so this resolves
+                # once per group and hits the cache for the other two.
+                inst.outbound_ip = resolve_egress_ip(inst.proxy_url)
+                logger.info(f"Group {group_id} Instance {inst.instance_id} using IP: {inst.outbound_ip}")
                 instances[i] = inst
                 redis_client.set(f"token_keeper:instance:{self.machine_id}:{group_id}:{i}:token", token)
                 logger.info(f"Group {group_id} Instance {i} initialized with live client")
-                log_api_call("client_init", token, None, 200, time.time() - start_time)
+                log_api_call("client_init", token, None, 200, time.time() - start_time, ip_used=inst.outbound_ip, calls_remaining=self._calls_remaining(token))
             self.group_instances[group_id] = {'instances': instances, 'proxy': proxy}
 
     def _is_healthy(self, inst : TokenInstance) -> bool:
@@ -530,27 +534,17 @@ class TokenKeeper:
                 start = time.time()
                 inst.client = ProxiedPSNAWP(inst.token, inst.proxy_url)
                 inst.client.user(online_id='PlatPursuit') # Generates refresh tokens, etc.
-                inst.user_cache = {}
                 inst.update_expiry_times()
                 inst.last_refresh = time.time()
                 self._record_call(inst.token)
                 # Log API call separately - DB errors here shouldn't mark instance unhealthy
                 try:
-                    log_api_call("keeper_refresh", inst.token, None, 200, time.time() - start)
+                    log_api_call("keeper_refresh", inst.token, None, 200, time.time() - start, ip_used=inst.outbound_ip, calls_remaining=self._calls_remaining(inst.token))
                 except Exception as log_err:
                     logger.warning(f"Failed to log API call for instance {inst.instance_id}: {log_err}")
                 logger.info(f"Instance {inst.instance_id} refreshed proactively")
-                try:
-                    session = requests.Session()
-                    if inst.proxy_url:
-                        session.proxies = {'http': inst.proxy_url, 'https': inst.proxy_url}
-                    ip_response = session.get('https://api.ipify.org', timeout=2)
-                    inst.outbound_ip = ip_response.text
-                    logger.info(f"Instance {inst.instance_id} using IP: {inst.outbound_ip}")
-                except Exception as e:
-                    logger.warning(f"Failed to fetch IP for instance {inst.instance_id}: {e}")
-                    inst.outbound_ip = 'Unknown'
-            inst.cleanup_cache()
+                inst.outbound_ip = resolve_egress_ip(inst.proxy_url)
+                logger.info(f"Instance {inst.instance_id} using IP: {inst.outbound_ip}")
         except OperationalError as db_err:
             # Database lock errors are transient - don't mark instance unhealthy
             err_msg = str(db_err).lower()
@@ -562,12 +556,16 @@ class TokenKeeper:
             inst.last_error = f"{datetime.now().isoformat()} Refresh error: {str(e)}"
             inst.last_health = 0
         else:
+            was_parked = inst.last_health == 0
             inst.last_health = time.time()
+            if was_parked:
+                self._scheduler.notify_all()
 
     # Job Assignment & Handling
 
     def _job_worker_loop(self):
         while not self._shutdown_requested:
+            job = None
             profile_id = None
             queue_name = None
             job_start = None
@@ -575,12 +573,13 @@ class TokenKeeper:
             args = None
             requeued = False
             try:
-                queue_b, job_json = redis_client.brpop(['orchestrator_jobs', 'high_priority_jobs', 'medium_priority_jobs', 'low_priority_jobs', 'bulk_priority_jobs'])
-                queue_name = queue_b.decode()[:-5] # remove '_jobs'
-                job_data = json.loads(job_json)
-                job_type = job_data['job_type']
-                args = job_data['args']
-                profile_id = job_data['profile_id']
+                job = job_queue.pop(timeout=5)
+                if job is None:
+                    continue
+                queue_name = job.queue_name
+                job_type = job.job_type
+                args = job.args
+                profile_id = job.profile_id
                 job_start = time.time()
                 logger.info(f"[profile {profile_id}] {job_type} START queue={queue_name}")
 
@@ -633,11 +632,9 @@ class TokenKeeper:
                     )
                     self._record_db_lock_error()
                     time.sleep(delay)
-                    if job_type and args is not None and profile_id and queue_name:
-                        PSNManager.assign_job(
-                            job_type, args=args, profile_id=profile_id,
-                            priority_override=queue_name, skip_counter=True
-                        )
+                    if job is not None:
+                        # Already counted: the requeue keeps its per-profile tracking.
+                        job_queue.requeue(job)
                         requeued = True
 
                     # Block until DB is back before popping more jobs
@@ -662,55 +659,83 @@ class TokenKeeper:
                 # Reset any instances stuck in busy state for too long
                 self._check_stuck_instances()
             finally:
-                if profile_id and queue_name not in ('high_priority', 'orchestrator') and not requeued:
-                    self._complete_job(profile_id, queue_name)
+                if job is not None and not requeued:
+                    self._complete_job(job)
                 # Django's CONN_MAX_AGE (600s) handles stale connection recycling
                 # automatically. Avoid closing here: each close() forces a new
                 # TCP+TLS handshake on the next query, which is expensive at
                 # scale (24 workers = dozens of TLS handshakes/sec on the DB).
                 pass
 
-    @retry(stop=stop_after_attempt(5), wait=wait_fixed(0.2))
-    def _complete_job(self, profile_id, queue_name):
-        """Handle finished job, check for deferred."""
-        if queue_name in ('low_priority', 'medium_priority', 'bulk_priority'):
+    def _complete_job(self, job):
+        """Handle finished job, trigger the pending sync_complete once the profile has no jobs left.
 
-            counter_key = f"profile_jobs:{profile_id}:{queue_name}"
-
-            try:
-                redis_client.decr(counter_key)
-                current_jobs = int(redis_client.get(f"profile_jobs:{profile_id}:{queue_name}") or 0)
-                if current_jobs <= 0:
-                    redis_client.delete(f"profile_jobs:{profile_id}:{queue_name}")
-                    redis_client.srem("active_profiles", profile_id)
-
-                current_jobs = self._get_current_jobs_for_profile(profile_id)
-                pending_key = f"pending_sync_complete:{profile_id}"
-                if current_jobs <= 0 and redis_client.exists(pending_key):
-                    # Don't trigger sync_complete if one is already running for this profile
-                    sync_complete_key = f"sync_complete_in_progress:{profile_id}"
-                    if redis_client.get(sync_complete_key):
-                        logger.info(f"[profile {profile_id}] sync_complete already in progress; pending data preserved")
-                    else:
-                        raw_pending = redis_client.get(pending_key)
-                        try:
-                            pending_data = json.loads(raw_pending)
-                            if not isinstance(pending_data, dict):
-                                raise ValueError("Pending data is not a dictionary")
-                            args = [pending_data['touched_profilegame_ids'], pending_data['queue_name']]
-                            PSNManager.assign_job('sync_complete', args, profile_id, priority_override=pending_data['queue_name'])
-                            redis_client.delete(pending_key)
-                            logger.debug(f"[profile {profile_id}] pending sync_complete triggered")
-                        except (json.JSONDecodeError, ValueError, KeyError) as parse_err:
-                            logger.error(f"[profile {profile_id}] pending_sync_complete parse failed: {parse_err}")
-            except Exception as e:
-                logger.error(f"Error in _complete_job for profile {profile_id}: {e}")
+        Untracking, the remaining-jobs total and claiming the pending payload
+        are one Redis script (`job_queue.complete`), so two workers finishing
+        a profile's last jobs can't both trigger it. Not retried: the
+        script's decrement isn't idempotent.
+        """
+        profile_id = job.profile_id
+        try:
+            completion = job_queue.complete(
+                job,
+                pending_key=f"pending_sync_complete:{profile_id}",
+                running_key=f"sync_complete_in_progress:{profile_id}",
+            )
+        except Exception as e:
+            logger.error(f"Error in _complete_job for profile {profile_id}: {e}")
+            return
+        if completion is None or completion.remaining > 0:
+            return
+        if completion.sync_complete_running:
+            logger.info(f"[profile {profile_id}] sync_complete already in progress; pending data preserved")
+            return
+        if completion.pending is None:
+            return
+        try:
+            pending_data = json.loads(completion.pending)
+            if not isinstance(pending_data, dict):
+                raise ValueError("Pending data is not a dictionary")
+            args = [pending_data['touched_profilegame_ids'], pending_data['queue_name']]
+        except (json.JSONDecodeError, ValueError, KeyError) as parse_err:
+            logger.error(f"[profile {profile_id}] pending_sync_complete parse failed: {parse_err}")
+            return
+        try:
+            PSNManager.assign_job('sync_complete', args, profile_id, priority_override=pending_data['queue_name'])
+            logger.debug(f"[profile {profile_id}] pending sync_complete triggered")
+        except Exception as e:
+            # The script already claimed the payload; put it back for the stuck-sync check.
+            logger.error(f"[profile {profile_id}] queueing pending sync_complete failed: {e}")
+            redis_client.set(f"pending_sync_complete:{profile_id}", completion.pending, ex=21600)
 
     def _get_current_jobs_for_profile(self, profile_id):
-        total = 0
-        for queue in ['low_priority', 'medium_priority', 'bulk_priority']:
-            total += int(redis_client.get(f"profile_jobs:{profile_id}:{queue}") or 0)
-        return total
+        return job_queue.profile_job_counts([profile_id], COUNTED_QUEUES)[profile_id]
+
+    def _reclaim_stalled_jobs(self):
+        """Re-queue jobs whose worker died mid-job (streams backend; no-op for lists).
+
+        Heartbeats this process's running jobs first, so a job that is just
+        slow is never reclaimed out from under its worker.
+        """
+        try:
+            job_queue.heartbeat()
+        except Exception as e:
+            logger.error(f"Error heartbeating in-flight jobs: {e}")
+        try:
+            requeued, dead = job_queue.reclaim()
+            if requeued or dead:
+                logger.warning(f"Reclaimed stalled jobs: requeued={requeued} dead_lettered={dead}")
+        except Exception as e:
+            logger.error(f"Error reclaiming stalled jobs: {e}")
+
+    def _refresh_dirty_earn_rates(self):
+        """Recompute Trophy.earn_rate for games synced since the last cycle."""
+        try:
+            games, trophies = refresh_dirty_earn_rates()
+            if games:
+                logger.info(f"Refreshed earn rates: games={games} trophies_updated={trophies}")
+        except Exception as e:
+            logger.error(f"Error refreshing earn rates: {e}")
 
     def _check_stuck_instances(self):
         """Reset any token instances that have been stuck in busy state for too long."""
@@ -808,16 +833,8 @@ class TokenKeeper:
 
             heavy_count = 0
             if pids:
-                pipe = redis_client.pipeline(transaction=False)
-                for pid in pids:
-                    pipe.get(f"profile_jobs:{pid}:low_priority")
-                    pipe.get(f"profile_jobs:{pid}:medium_priority")
-                results = pipe.execute()
-
-                for i in range(0, len(results), 2):
-                    total = int(results[i] or 0) + int(results[i + 1] or 0)
-                    if total >= JOB_THRESHOLD:
-                        heavy_count += 1
+                totals = job_queue.profile_job_counts(pids, ('low_priority', 'medium_priority'))
+                heavy_count = sum(1 for total in totals.values() if total >= JOB_THRESHOLD)
 
             existing = redis_client.get(REDIS_KEY)
             is_currently_active = existing is not None
@@ -943,15 +960,7 @@ class TokenKeeper:
             # short-circuit due to the outage flag).
             # Note: we don't formally acquire the instance (no is_busy/lock),
             # so no release needed. This is a quick, non-blocking probe.
-            lookup_key = test_profile.account_id
-            if lookup_key not in instance.user_cache:
-                instance.user_cache[lookup_key] = {
-                    "user": instance.client.user(
-                        account_id=test_profile.account_id
-                    ),
-                    "timestamp": datetime.now(),
-                }
-            user = instance.user_cache[lookup_key]['user']
+            user = self._resolve_user(instance, test_profile)
             user.trophy_summary()
             # Second endpoint: catches partial outages where trophy_summary
             # is healthy but the heavier title-list service is degraded.
@@ -963,59 +972,39 @@ class TokenKeeper:
             logger.debug(f"PSN probe failed: {e}")
             return False
 
-    def _get_instance_for_job(self, job_type: str) -> TokenInstance:
-        """Selects best instance for job with atomic acquisition using Redis locks."""
+    def _resolve_user(self, instance: TokenInstance, profile: Profile) -> User:
+        """psnawp User for `profile` bound to `instance`; init_user only on a cache miss."""
+        lookup_key = profile.account_id if profile.account_id else profile.psn_username
+        handle = self._user_cache.get(lookup_key)
+        if handle is not None:
+            return User(instance.client.authenticator, handle.online_id, handle.account_id)
+
         start = time.time()
-        while time.time() - start < self.token_wait_interval:
-            instance_scores = {}
-            for group_id, group in self.group_instances.items():
-                for inst_id, inst in group['instances'].items():
-                    if not inst.is_busy and self._is_healthy(inst) and not inst.last_health == 0:
-                        key = (group_id, inst_id)
-                        instance_scores[key] = self._get_calls_in_window(inst.token)
-
-            if instance_scores:
-                # Sort by score to try best instances first
-                sorted_instances = sorted(instance_scores.items(), key=lambda x: x[1])
-
-                for (group_id, inst_id), _ in sorted_instances:
-                    lock_key = f"instance_lock:{self.machine_id}:{group_id}:{inst_id}"
-
-                    # Atomic acquisition with Redis lock (expires in 5 min as safety net)
-                    acquired = redis_client.set(lock_key, "1", nx=True, ex=300)
-
-                    if acquired:
-                        inst = self.group_instances[group_id]['instances'][inst_id]
-                        # Double-check after acquiring lock
-                        if not inst.is_busy:
-                            inst.is_busy = True
-                            inst.job_start_time = time.time()
-                            return inst
-                        else:
-                            # Another thread got it, release lock
-                            redis_client.delete(lock_key)
+        user = instance.client.user(account_id=profile.account_id) if profile.account_id else instance.client.user(online_id=profile.psn_username)
+        self._record_call(instance.token)
+        log_api_call('init_user', instance.token, profile.id, 200, time.time() - start, ip_used=instance.outbound_ip, calls_remaining=self._calls_remaining(instance.token))
+        self._user_cache.put(UserHandle(account_id=user.account_id, online_id=user.online_id), *{lookup_key, user.account_id})
+        return user
 
-            logger.info("Waiting for token...")
-            time.sleep(0.1)
-        logger.error(f"No token available for job type '{job_type}' after {self.token_wait_interval}s.")
-        raise RuntimeError(f"No token instance available for job type '{job_type}' after {self.token_wait_interval}s timeout")
+    def _all_instances(self) -> list[TokenInstance]:
+        return [inst for group in self.group_instances.values() for inst in group['instances'].values()]
+
+    def _get_instance_for_job(self, job_type: str) -> TokenInstance:
+        """Blocks until the least-loaded healthy instance is free, then locks it."""
+        inst = self._scheduler.acquire(self._all_instances(), job_type, self.token_wait_interval)
+        if inst is None:
+            logger.error(f"No token available for job type '{job_type}' after {self.token_wait_interval}s.")
+            raise RuntimeError(f"No token instance available for job type '{job_type}' after {self.token_wait_interval}s timeout")
+        return inst
 
     def _release_instance(self, instance: TokenInstance):
-        """Safely release a token instance and its Redis lock."""
+        """Safely release a token instance and its Redis lock, waking one waiting worker."""
         if instance is None:
             return
         try:
-            group_id = instance.group_id
-            if group_id is not None:
-                lock_key = f"instance_lock:{self.machine_id}:{group_id}:{instance.instance_id}"
-                redis_client.delete(lock_key)
-            instance.is_busy = False
-            instance.job_start_time = 0
+            self._scheduler.release(instance)
         except Exception as e:
             logger.error(f"Error releasing instance {instance.instance_id}: {e}")
-            # Still try to mark as not busy even if Redis fails
-            instance.is_busy = False
-            instance.job_start_time = 0
 
     @retry(
         retry=retry_if_exception_type((ConnectionError, Timeout)),
@@ -1030,22 +1019,14 @@ class TokenKeeper:
             raise PSNOutageError("PSN API is currently unavailable (circuit breaker open)")
 
         start_time = time.time()
+        call_member = None
         try:
             # game_title / game_details operate on instance.client directly and
             # don't need a User object, so skip the init_user warm-up for those.
             if endpoint not in ("game_title", "game_details"):
-                lookup_key = profile.account_id if profile.account_id else profile.psn_username
-                if lookup_key not in instance.user_cache:
-                    start = time.time()
-                    instance.user_cache[lookup_key] = {
-                        "user": (instance.client.user(account_id=profile.account_id) if profile.account_id else instance.client.user(online_id=profile.psn_username)),
-                        "timestamp": datetime.now()
-                    }
-                    self._record_call(instance.token)
-                    log_api_call('init_user', instance.token, profile.id, 200, time.time() - start)
-                user = instance.user_cache[lookup_key]['user']
+                user = self._resolve_user(instance, profile)
 
-            self._record_call(instance.token)
+            call_member = self._record_call(instance.token)
             if endpoint == "get_profile_legacy":
                 data = user.get_profile_legacy()
             elif endpoint == "get_region":
@@ -1064,6 +1045,12 @@ class TokenKeeper:
                 data = (titles, iterator._total_item_count)
             elif endpoint == "title_stats":
                 data = list(user.title_stats(**kwargs))
+            elif endpoint == "title_stats_with_count":
+                # Async slow path: page 1 of title_stats plus totalItemCount so
+                # the remaining pages can be fetched concurrently.
+                iterator = user.title_stats(**kwargs)
+                stats_page = list(iterator)
+                data = (stats_page, iterator._total_item_count)
             elif endpoint == "trophies":
                 if "include_progress" in kwargs:
                     self._record_call(instance.token)
@@ -1091,7 +1078,7 @@ class TokenKeeper:
             else:
                 raise ValueError(f"Unknown endpoint: {endpoint}")
             
-            log_api_call(endpoint, instance.token, profile.id if profile else None, 200, time.time() - start_time)
+            log_api_call(endpoint, instance.token, profile.id if profile else None, 200, time.time() - start_time, ip_used=instance.outbound_ip, calls_remaining=self._calls_remaining(instance.token))
             if endpoint not in ['get_profile_legacy', 'get_region']:
                 profile.set_history_public_flag(True)
             return data
@@ -1100,13 +1087,13 @@ class TokenKeeper:
                 profile.set_history_public_flag(False)
                 PSNManager.handle_privacy_error(profile)
                 logger.warning(f"Privacy error for profile {profile.id}.")
-            log_api_call(endpoint, instance.token, profile.id if profile else None, 500, time.time() - start_time, str(e))
-            self._rollback_call(instance.token)
+            log_api_call(endpoint, instance.token, profile.id if profile else None, 500, time.time() - start_time, str(e), ip_used=instance.outbound_ip, calls_remaining=self._calls_remaining(instance.token))
+            self._rollback_call(instance.token, call_member)
             raise
         except HTTPError as e:
             status_code = e.response.status_code if hasattr(e, 'response') and e.response is not None else 0
-            log_api_call(endpoint, instance.token, profile.id if profile else None, status_code, time.time() - start_time, str(e))
-            self._rollback_call(instance.token)
+            log_api_call(endpoint, instance.token, profile.id if profile else None, status_code, time.time() - start_time, str(e), ip_used=instance.outbound_ip, calls_remaining=self._calls_remaining(instance.token))
+            self._rollback_call(instance.token, call_member)
             if status_code in (502, 503, 504):
                 self._record_psn_5xx(status_code)
                 raise PSNOutageError(
@@ -1118,14 +1105,14 @@ class TokenKeeper:
             # Extract status code from message if possible (e.g., "Error 503 - ...")
             match = re.search(r'(\d{3})', str(e))
             status_code = int(match.group(1)) if match else 503
-            log_api_call(endpoint, instance.token, profile.id if profile else None, status_code, time.time() - start_time, str(e))
-            self._rollback_call(instance.token)
+            log_api_call(endpoint, instance.token, profile.id if profile else None, status_code, time.time() - start_time, str(e), ip_used=instance.outbound_ip, calls_remaining=self._calls_remaining(instance.token))
+            self._rollback_call(instance.token, call_member)
             self._record_psn_5xx(status_code)
             raise PSNOutageError(
                 f"PSN service unavailable ({status_code})"
             ) from e
         except Exception as e:
-            log_api_call(endpoint, instance.token, profile.id if profile else None, 500, time.time() - start_time, str(e))
+            log_api_call(endpoint, instance.token, profile.id if profile else None, 500, time.time() - start_time, str(e), ip_used=instance.outbound_ip, calls_remaining=self._calls_remaining(instance.token))
             instance.last_error = f"{datetime.now().isoformat()} Error: {str(e)}"
             raise
         finally:
@@ -1133,31 +1120,41 @@ class TokenKeeper:
             self._release_instance(instance)
 
 
-    def _get_calls_in_window(self, token : str) -> int:
-        """Count API calls in rolling window."""
-        now = time.time()
-        redis_client.zremrangebyscore(f"token:{token}:{self.machine_id}:timestamps", 0, now - self.window_seconds)
-        return redis_client.zcard(f"token:{token}:{self.machine_id}:timestamps")
-    
+    def _rate_limiter(self, token : str) -> SlidingWindowRateLimiter:
+        limiter = self._rate_limiters.get(token)
+        if limiter is None:
+            limiter = self._rate_limiters.setdefault(token, SlidingWindowRateLimiter(
+                redis_client, self._scheduler.window_key(token),
+                limit=self.max_calls_per_window, window_seconds=self.window_seconds,
+            ))
+        return limiter
+
     def _record_call(self, token : str) -> str:
-        """Record API call timestamp. Returns the member key for potential rollback."""
-        now = time.time()
-        member = str(now)
-        redis_client.zadd(f"token:{token}:{self.machine_id}:timestamps", {member: now})
-        return member
-
-    def _rollback_call(self, token : str):
-        """Rollback the most recent API call counter entry."""
-        key = f"token:{token}:{self.machine_id}:timestamps"
-        # Remove the highest-scored (most recent) entry
-        redis_client.zpopmax(key, count=1)
-    
+        """Record API call timestamp. Returns the member key for potential rollback.
+
+        The per-token window is a soft limit (instance selection balances on
+        it), so the call is recorded even when the window is full.
+        """
+        return self._rate_limiter(token).record().member
+
+    def _calls_remaining(self, token : str) -> int | None:
+        """Token's window budget as of its last recorded call, for the audit log."""
+        limiter = self._rate_limiters.get(token)
+        if limiter is None or limiter.last_count is None:
+            return None
+        return max(0, self.max_calls_per_window - limiter.last_count)
+
+    def _rollback_call(self, token : str, member : str | None):
+        """Remove the window entry recorded for a failed call."""
+        self._rate_limiter(token).rollback(member)
+
     def _handle_rate_limit(self, instance : TokenInstance):
         """Handle token rate limiting (429 error)."""
         logger.warning(f"Rate limit hit for instance {instance.instance_id}. Parking for 60s.")
         instance.last_health = 0
         time.sleep(60)
         instance.last_health = time.time()
+        self._scheduler.notify_all()
 
     # PSN returns sparse metadata for Asia-only titles when queried with the default
     # US/en-US storefront (the title doesn't exist in that storefront). Retrying the
@@ -1243,6 +1240,10 @@ class TokenKeeper:
         # "Verifying...", "Updating stats...", etc. instead of just "Finalizing..."
         # for the entire post-sync window.
         finalize_phase_key = f"finalize_phase:{profile_id}"
+        # Per-stage timings of the post-sync DAG (stage -> seconds), read by
+        # ProfileSyncStatusView alongside finalize_phase. Left to expire after
+        # the run so the last run's breakdown stays inspectable.
+        finalize_timings_key = f"{finalize_phase_key}:timings"
 
         def _set_phase(phase: str):
             redis_client.set(finalize_phase_key, phase, ex=1800)
@@ -1478,79 +1479,111 @@ class TokenKeeper:
                     profile.add_to_sync_target(queued_count)
                     return
 
-            _set_phase('stats_badges')
-            profile.update_plats()
-            PsnApiService.update_profilegame_stats(touched_profilegame_ids)
-            check_profile_badges(profile, touched_profilegame_ids)
+            # Post-sync stages as a small DAG on a bounded thread pool (each
+            # stage gets its own DB connection). Stats first (has_plat and
+            # friends feed everything else), then badges -> milestones
+            # alongside the three challenge checks. run_stages() returns once
+            # every stage has finished -- the join before the final step.
+            # finalize_phase follows the earliest unfinished stage; per-stage
+            # timings land in the companion hash for the sync status view.
+            from trophies.util_modules.cache_invalidation import invalidation_batch
+            from trophies.util_modules.stage_runner import Stage, run_stages
+            from trophies.milestone_constants import ALL_CALENDAR_TYPES, ALL_GENRE_TYPES
+            from trophies.services.challenge_service import check_az_challenge_progress, check_calendar_challenge_progress, check_genre_challenge_progress
+
+            redis_client.delete(finalize_timings_key)
 
-            # Mark Contract (job XP) tiers as REACHED for the games touched this sync.
-            # Detection only -- no XP is granted here; the user banks it later by ACCEPTING
-            # the Contract. Wrapped so a failure never breaks the sync.
-            try:
-                from trophies.models import ProfileGame
-                from trophies.services.contract_service import check_profile_contracts
-                touched_concept_ids = [
-                    cid for cid in ProfileGame.objects
-                    .filter(id__in=touched_profilegame_ids)
-                    .values_list('game__concept_id', flat=True).distinct()
-                    if cid
-                ]
-                check_profile_contracts(profile, touched_concept_ids)
-            except Exception:
-                logger.exception(f"[profile {profile_id}] sync_complete contract detection failed")
+            def _record_timing(stage_name: str, seconds: float):
+                redis_client.hset(finalize_timings_key, stage_name, f"{seconds:.2f}")
+                redis_client.expire(finalize_timings_key, 1800)
 
-            # Create consolidated badge notifications
-            try:
-                from notifications.services.deferred_notification_service import DeferredNotificationService
-                DeferredNotificationService.create_badge_notifications(profile_id, profile=profile)
-            except Exception as e:
-                logger.error(f"[profile {profile_id}] sync_complete badge notification failed: {e}", exc_info=True)
-            _set_phase('milestones')
-            from trophies.milestone_constants import ALL_CALENDAR_TYPES, ALL_GENRE_TYPES
-            # Challenge-specific types are excluded here because they're checked
-            # separately by their respective check_*_challenge_progress() functions below
-            check_all_milestones_for_user(profile, exclude_types=ALL_CALENDAR_TYPES | {'az_progress'} | ALL_GENRE_TYPES)
+            def _stats():
+                profile.update_plats()
+                PsnApiService.update_profilegame_stats(touched_profilegame_ids)
 
-            _set_phase('challenges')
-            # Check A-Z challenge progress
-            from trophies.services.challenge_service import check_az_challenge_progress, check_calendar_challenge_progress, check_genre_challenge_progress
-            try:
-                check_az_challenge_progress(profile)
-            except Exception:
-                logger.exception(f"Failed to check A-Z challenge progress for profile {profile_id}")
+            def _badges():
+                check_profile_badges(profile, touched_profilegame_ids)
 
-            # Check Calendar challenge progress
-            try:
-                check_calendar_challenge_progress(profile)
-            except Exception:
-                logger.exception(f"Failed to check calendar challenge progress for profile {profile_id}")
+                # Mark Contract (job XP) tiers as REACHED for the games touched this sync.
+                # Detection only -- no XP is granted here; the user banks it later by ACCEPTING
+                # the Contract. Wrapped so a failure never breaks the sync.
+                try:
+                    from trophies.models import ProfileGame
+                    from trophies.services.contract_service import check_profile_contracts
+                    touched_concept_ids = [
+                        cid for cid in ProfileGame.objects
+                        .filter(id__in=touched_profilegame_ids)
+                        .values_list('game__concept_id', flat=True).distinct()
+                        if cid
+                    ]
+                    check_profile_contracts(profile, touched_concept_ids)
+                except Exception:
+                    logger.exception(f"[profile {profile_id}] sync_complete contract detection failed")
 
-            # Check Genre challenge progress
-            try:
-                check_genre_challenge_progress(profile)
-            except Exception:
-                logger.exception(f"Failed to check genre challenge progress for profile {profile_id}")
+                # Create consolidated badge notifications
+                try:
+                    from notifications.services.deferred_notification_service import DeferredNotificationService
+                    DeferredNotificationService.create_badge_notifications(profile_id, profile=profile)
+                except Exception as e:
+                    logger.error(f"[profile {profile_id}] sync_complete badge notification failed: {e}", exc_info=True)
+
+            def _milestones():
+                # Challenge-specific types are excluded here because they're checked
+                # separately by their respective check_*_challenge_progress() stages
+                check_all_milestones_for_user(profile, exclude_types=ALL_CALENDAR_TYPES | {'az_progress'} | ALL_GENRE_TYPES)
+
+            def _challenge(check, label):
+                def run():
+                    try:
+                        check(profile)
+                    except Exception:
+                        logger.exception(f"Failed to check {label} challenge progress for profile {profile_id}")
+                return run
+
+            # Every invalidate_*_cache call from here on (each stage, plus the
+            # finishing step) lands in one batch and is flushed as a single
+            # delete_many when the block exits.
+            with invalidation_batch():
+                timings = run_stages(
+                    [
+                        Stage('stats', _stats, phase='stats_badges'),
+                        Stage('badges', _badges, after=('stats',), phase='stats_badges'),
+                        Stage('milestones', _milestones, after=('badges',), phase='milestones'),
+                        Stage('az_challenge', _challenge(check_az_challenge_progress, 'A-Z'), after=('stats',), phase='challenges'),
+                        Stage('calendar_challenge', _challenge(check_calendar_challenge_progress, 'calendar'), after=('stats',), phase='challenges'),
+                        Stage('genre_challenge', _challenge(check_genre_challenge_progress, 'genre'), after=('stats',), phase='challenges'),
+                    ],
+                    on_phase=_set_phase,
+                    on_timing=_record_timing,
+                )
+                logger.info(
+                    f"[profile {profile_id}] sync_complete stages "
+                    + " ".join(f"{name}={seconds:.1f}s" for name, seconds in timings.items())
+                )
 
-            _set_phase('finishing')
-            # Refresh denormalized stats from authoritative post-sync state.
-            # Both updaters honor profile.hide_hiddens, so totals stay
-            # consistent even when the user toggles that setting between syncs.
-            update_profile_games(profile)
-            update_profile_trophy_counts(profile)
-            profile.set_sync_status('synced')
+                _set_phase('finishing')
+                # Refresh denormalized stats from authoritative post-sync state.
+                # Both updaters honor profile.hide_hiddens, so totals stay
+                # consistent even when the user toggles that setting between syncs.
+                update_profile_games(profile)
+                update_profile_trophy_counts(profile)
+                profile.set_sync_status('synced')
 
-            from trophies.services.timeline_service import invalidate_timeline_cache
-            invalidate_timeline_cache(profile_id)
+                from trophies.services.timeline_service import invalidate_timeline_cache
+                invalidate_timeline_cache(profile_id)
 
-            from trophies.services.stats_service import invalidate_stats_cache
-            invalidate_stats_cache(profile_id)
+                from trophies.services.stats_service import invalidate_stats_cache
+                invalidate_stats_cache(profile_id)
 
-            # Bulletproof dashboard invalidation: badge_service has its own hook
-            # but it can early-return on no-op syncs. Invalidating here guarantees
-            # every full sync refreshes all dashboard modules regardless of which
-            # sub-services ran.
-            from trophies.services.dashboard_service import invalidate_dashboard_cache
-            invalidate_dashboard_cache(profile_id)
+                # Bulletproof dashboard invalidation: badge_service has its own hook
+                # but it can early-return on no-op syncs. Invalidating here guarantees
+                # every full sync refreshes all dashboard modules regardless of which
+                # sub-services ran.
+                from trophies.services.dashboard_service import invalidate_dashboard_cache
+                invalidate_dashboard_cache(profile_id)
+
+                from trophies.util_modules.page_cache import invalidate_page_cache
+                invalidate_page_cache('profile_page', profile_id)
 
             # Re-render forum signature if enabled (SVG only: fast, no Playwright)
             try:
@@ -1759,7 +1792,6 @@ class TokenKeeper:
             logger.info(
                 f"[profile {profile_id}] sync_trophies skip duplicate game={np_communication_id}"
             )
-            redis_client.srem(f"sync_queued_games:{profile_id}", np_communication_id)
             profile.increment_sync_progress(value=2)
             return
 
@@ -1767,7 +1799,6 @@ class TokenKeeper:
             self._do_sync_trophies(profile, game, np_communication_id, platform)
         finally:
             redis_client.delete(lock_key)
-            redis_client.srem(f"sync_queued_games:{profile_id}", np_communication_id)
 
     def _do_sync_trophies(self, profile, game, np_communication_id: str, platform: str):
         """Execute the actual trophy sync work. Called under a per-game Redis lock."""
@@ -1775,19 +1806,18 @@ class TokenKeeper:
 
         logger.debug(f"[profile {profile.id}] sync_trophies fetch game={np_communication_id} platform={platform}")
         trophies = self._execute_api_call(self._get_instance_for_job(job_type), profile, 'trophies', np_communication_id=np_communication_id, platform=PlatformType(platform), include_progress=True, trophy_group_id='all', page_size=500)
-        # Process in batches to avoid long-running transactions that block other DB operations.
-        # Suppress the EarnedTrophy pre_save signal during sync: the signal fires a SELECT per
+        # Set-based write: prefetch this game's Trophy / EarnedTrophy rows, diff in
+        # memory, bulk upsert only what changed, and apply the counter deltas the
+        # post_save signals would have made as aggregated F() updates. One short
+        # transaction instead of ~2 round trips (plus signal queries) per trophy.
+        # The suppressor still matters for the per-row platinum path inside
+        # bulk_sync_trophies: the EarnedTrophy pre_save signal fires a SELECT per
         # save to track earned state, but during sync notifications are handled by
         # DeferredNotificationService and earned-flip detection is in create_or_update_earned_trophy_from_trophy_data.
         from trophies.sync_utils import sync_signal_suppressor
-        batch_size = 50
         with sync_signal_suppressor():
-            for i in range(0, len(trophies), batch_size):
-                batch = trophies[i:i + batch_size]
-                with transaction.atomic():
-                    for trophy_data in batch:
-                        trophy, _ = PsnApiService.create_or_update_trophy_from_trophy_data(game, trophy_data)
-                        PsnApiService.create_or_update_earned_trophy_from_trophy_data(profile, trophy, trophy_data)
+            summary = PsnApiService.bulk_sync_trophies(profile, game, trophies)
+        logger.debug(f"[profile {profile.id}] sync_trophies write game={np_communication_id} {summary}")
         # Diagnostic: compare what the trophies API returned vs what the
         # health check will see in the DB. Helps identify persistent mismatches
         # where trophy_titles reports a different count than the trophies endpoint.
@@ -1802,24 +1832,13 @@ class TokenKeeper:
                 f"API total trophies: {len(trophies)}"
             )
 
-        # Refresh Trophy.earn_rate for this game's trophies. Trophy.earned_count
-        # and Game.played_count are maintained incrementally by the EarnedTrophy
-        # and ProfileGame post_save signals, but earn_rate is a derived value
-        # (earned_count / played_count) and was historically only refreshed by
-        # the daily recalc_earn_rates cron. That left brand-new games stuck at
-        # 0% earn rate until the next cron run. Doing one targeted UPDATE here
-        # per game costs almost nothing and keeps PP-specific rarity live.
-        # The daily cron remains the source of truth for cross-game drift.
-        from trophies.models import Trophy
-        played_count = (
-            Game.objects.filter(pk=game.id)
-            .values_list('played_count', flat=True)
-            .first()
-        ) or 0
-        if played_count > 0:
-            Trophy.objects.filter(game_id=game.id).update(
-                earn_rate=F('earned_count') * 1.0 / played_count
-            )
+        # Trophy.earned_count and Game.played_count are maintained by signals,
+        # but earn_rate (earned_count / played_count) is derived. Rather than
+        # rewriting every trophy row of the game here, mark it dirty: the
+        # health loop recomputes dirty games in batches and only writes rows
+        # whose rate changed (earn_rate_service). The daily recalc_earn_rates
+        # cron remains the source of truth for cross-game drift.
+        mark_earn_rate_dirty([game.id])
 
         profile.increment_sync_progress(value=2)
 
@@ -2358,6 +2377,13 @@ class TokenKeeper:
                 limit=offset + page_size, offset=offset, page_size=page_size,
             )
             trophy_titles.extend(result)
+        elif len(remaining_offsets) > 1 and self._async_engine is not None:
+            pages = self._fetch_all_async(profile, job_type, 'trophy_titles', [
+                dict(limit=offset + page_size, offset=offset, page_size=page_size)
+                for offset in remaining_offsets
+            ])
+            for page in pages:
+                trophy_titles.extend(page)
         elif len(remaining_offsets) > 1:
             from concurrent.futures import ThreadPoolExecutor
             max_workers = min(3, len(remaining_offsets))
@@ -2634,31 +2660,43 @@ class TokenKeeper:
         """
         job_type = 'profile_refresh'
         page_size = 20
-        offset = 0
-        title_stats_to_be_updated = []
-        end_found = False
-        is_full = True
-
-        while not end_found and is_full:
-            page = self._execute_api_call(
-                self._get_instance_for_job(job_type), profile, 'title_stats',
-                limit=offset + page_size, offset=offset, page_size=page_size,
+
+        if self._async_engine is not None:
+            title_stats_to_be_updated = self._collect_title_stats_async(
+                profile, job_type, last_sync, full_walk, page_size,
             )
-            is_full = len(page) == page_size
-            for stats in page:
-                if not full_walk and stats.last_played_date_time <= last_sync:
-                    end_found = True
-                    break
-                title_stats_to_be_updated.append(stats)
-            offset += page_size
+        else:
+            offset = 0
+            title_stats_to_be_updated = []
+            end_found = False
+            is_full = True
+            while not end_found and is_full:
+                page = self._execute_api_call(
+                    self._get_instance_for_job(job_type), profile, 'title_stats',
+                    limit=offset + page_size, offset=offset, page_size=page_size,
+                )
+                is_full = len(page) == page_size
+                for stats in page:
+                    if not full_walk and stats.last_played_date_time <= last_sync:
+                        end_found = True
+                        break
+                    title_stats_to_be_updated.append(stats)
+                offset += page_size
 
         # Apply the playtime data and collect title_ids that didn't match a
-        # known game/concept for the resolution pipeline.
-        remaining_title_stats = []
-        for stats in title_stats_to_be_updated:
-            found = PsnApiService.update_profile_game_with_title_stats(profile, stats)
-            if not found and stats.title_id not in TITLE_ID_BLACKLIST:
-                remaining_title_stats.append(stats)
+        # known game/concept for the resolution pipeline. Each update touches
+        # a single ProfileGame, so in async mode they run on the DB pool.
+        def _apply_title_stats(stats):
+            return stats, PsnApiService.update_profile_game_with_title_stats(profile, stats)
+
+        if self._async_engine is not None:
+            applied = self._async_engine.db_map(_apply_title_stats, title_stats_to_be_updated)
+        else:
+            applied = map(_apply_title_stats, title_stats_to_be_updated)
+        remaining_title_stats = [
+            stats for stats, found in applied
+            if not found and stats.title_id not in TITLE_ID_BLACKLIST
+        ]
 
         if not remaining_title_stats:
             logger.info(
@@ -2675,16 +2713,26 @@ class TokenKeeper:
         # concept resolver runs downstream.
         stats_by_title_id = {stats.title_id: stats for stats in remaining_title_stats}
         chunk_size = 5
+        title_id_chunks = [
+            [t.title_id for t in remaining_title_stats[chunk_start:chunk_start + chunk_size]]
+            for chunk_start in range(0, len(remaining_title_stats), chunk_size)
+        ]
         trophy_titles_for_title = []
-        for chunk_start in range(0, len(remaining_title_stats), chunk_size):
-            chunk = remaining_title_stats[chunk_start:chunk_start + chunk_size]
-            title_ids = [t.title_id for t in chunk]
-            logger.debug(f"trophy_titles_for_title call ids={title_ids}")
-            result = self._execute_api_call(
-                self._get_instance_for_job(job_type), profile,
-                'trophy_titles_for_title', title_ids=title_ids,
+        if self._async_engine is not None:
+            results = self._fetch_all_async(
+                profile, job_type, 'trophy_titles_for_title',
+                [dict(title_ids=title_ids) for title_ids in title_id_chunks],
             )
-            trophy_titles_for_title.extend(result)
+            for result in results:
+                trophy_titles_for_title.extend(result)
+        else:
+            for title_ids in title_id_chunks:
+                logger.debug(f"trophy_titles_for_title call ids={title_ids}")
+                result = self._execute_api_call(
+                    self._get_instance_for_job(job_type), profile,
+                    'trophy_titles_for_title', title_ids=title_ids,
+                )
+                trophy_titles_for_title.extend(result)
 
         jobs_queued = 0
         playtime_repopulated = 0
@@ -2718,9 +2766,80 @@ class TokenKeeper:
         )
         return jobs_queued
 
+    # Async fetch mode (start_token_keeper --async)
+
+    def enable_async_fetch(self) -> AsyncFetchEngine:
+        """Route slow-path PSN fetches through the asyncio engine."""
+        if self._async_engine is None:
+            engine = AsyncFetchEngine(
+                max_concurrency=int(os.getenv("ASYNC_FETCH_CONCURRENCY", 6)),
+                db_workers=int(os.getenv("ASYNC_DB_WORKERS", 4)),
+            )
+            engine.start()
+            self._async_engine = engine
+            logger.info(
+                f"Async fetch enabled (concurrency={engine.max_concurrency}, db_workers={engine.db_workers})"
+            )
+        return self._async_engine
+
+    def _async_concurrency(self) -> int:
+        """In-flight cap for one profile's fan-out: instances with window headroom."""
+        live = [inst for inst in self._all_instances() if inst.client is not None and inst.last_health != 0]
+        counts = self._scheduler.window_counts([inst.token for inst in live])
+        with_headroom = sum(1 for count in counts if count < self.max_calls_per_window)
+        return max(1, min(self._async_engine.max_concurrency, with_headroom))
+
+    def _fetch_all_async(self, profile, job_type, endpoint, kwargs_list) -> list:
+        """Run one `_execute_api_call` per kwargs dict concurrently, results in order."""
+        def _fetch(kwargs):
+            return self._execute_api_call(self._get_instance_for_job(job_type), profile, endpoint, **kwargs)
+        return self._async_engine.fetch_all(_fetch, kwargs_list, concurrency=self._async_concurrency())
+
+    def _collect_title_stats_async(self, profile, job_type, last_sync, full_walk, page_size) -> list:
+        """Async counterpart of the title_stats pagination loop in `_walk_title_stats`.
+
+        Page 1 carries totalItemCount, so the remaining offsets are known up
+        front. Full walks fetch them all concurrently. Follow-up walks usually
+        stop within the first few pages, so they fan out one concurrency-sized
+        window at a time to avoid spending calls past the early-exit point.
+        """
+        entries = []
+
+        def _take(page) -> bool:
+            """Append entries; True once pagination should stop."""
+            for stats in page:
+                if not full_walk and stats.last_played_date_time <= last_sync:
+                    return True
+                entries.append(stats)
+            return len(page) < page_size
+
+        first_page, total_item_count = self._execute_api_call(
+            self._get_instance_for_job(job_type), profile, 'title_stats_with_count',
+            limit=page_size, offset=0, page_size=page_size,
+        )
+        if _take(first_page):
+            return entries
+
+        offsets = list(range(page_size, total_item_count, page_size))
+        window = len(offsets) if full_walk else self._async_concurrency()
+        for start in range(0, len(offsets), max(1, window)):
+            pages = self._fetch_all_async(profile, job_type, 'title_stats', [
+                dict(limit=offset + page_size, offset=offset, page_size=page_size)
+                for offset in offsets[start:start + window]
+            ])
+            for page in pages:
+                if _take(page):
+                    return entries
+        return entries
+
     @property
     def stats(self) -> Dict:
         stats = {}
+        live = [inst for inst in self._all_instances() if inst.client is not None]
+        calls_in_window = dict(zip(
+            [(inst.group_id, inst.instance_id) for inst in live],
+            self._scheduler.window_counts([inst.token for inst in live]),
+        ))
         for group_id, group in self.group_instances.items():
             for inst_id, inst in group['instances'].items():
                 key = f"{group_id}-{inst_id}"
@@ -2745,7 +2864,7 @@ class TokenKeeper:
                     "group_id": group_id,
                     "busy": inst.is_busy,
                     "healthy": time.time() - inst.last_health < self.health_interval,
-                    "calls_in_window": self._get_calls_in_window(inst.token),
+                    "calls_in_window": calls_in_window.get((group_id, inst_id), 0),
                     "access_token_expiry_in": inst.get_access_expiry_in_seconds(),
                     "refresh_token_expiry_in": inst.get_refresh_expiry_in_seconds(),
                     "token_scopes": auth.token_response.get("scope", "unknown") if auth.token_response else "none",
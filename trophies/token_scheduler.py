@@ -0,0 +1,143 @@
+"""
+Event-driven token instance scheduler for TokenKeeper.
+
+Worker threads used to poll for a free instance every 0.1s, and each pass
+issued a ZREMRANGEBYSCORE + ZCARD per instance plus a SET NX attempt. With
+two dozen workers queued behind a handful of tokens that was hundreds of
+Redis commands per second spent doing nothing.
+
+TokenScheduler instead parks waiting workers on a condition variable.
+`release()` wakes one waiter as soon as an instance frees up, and each
+acquisition attempt reads every candidate's rolling-window count with a
+single Lua script call (`rate_limiter.window_counts`), then locks the
+least-loaded one. Instances are process-local (the instance lock keys are
+scoped by machine id), so an in-process condition is sufficient; waiters
+still re-check once per `recheck_interval` to pick up health transitions
+and expired locks that no release signals.
+
+Acquisition wait times are tracked per job type and published under the
+`token_wait` key of the TokenKeeper stats snapshot.
+"""
+import logging
+import threading
+import time
+
+from trophies.util_modules.rate_limiter import window_counts
+
+logger = logging.getLogger("psn_api")
+
+
+class TokenScheduler:
+    """Hands out the least-loaded idle instance, blocking until one frees up."""
+
+    def __init__(self, redis, machine_id, window_seconds, lock_ttl=300, recheck_interval=1.0):
+        self.redis = redis
+        self.machine_id = machine_id
+        self.window_seconds = window_seconds
+        self.lock_ttl = lock_ttl
+        self.recheck_interval = recheck_interval
+        self._available = threading.Condition()
+        # {job_type: {acquired, timeouts, total_wait_ms, max_wait_ms}}
+        self._wait_stats = {}
+        self._waiting = 0
+
+    def window_key(self, token) -> str:
+        return f"token:{token}:{self.machine_id}:timestamps"
+
+    def lock_key(self, inst) -> str:
+        return f"instance_lock:{self.machine_id}:{inst.group_id}:{inst.instance_id}"
+
+    def window_counts(self, tokens) -> list[int]:
+        """Rolling-window call counts for `tokens`, pruned and read in one script call."""
+        return window_counts(self.redis, [self.window_key(t) for t in tokens], self.window_seconds)
+
+    @staticmethod
+    def is_available(inst) -> bool:
+        return not inst.is_busy and inst.client is not None and inst.last_health != 0
+
+    def acquire(self, instances, job_type: str, timeout: float):
+        """Return a locked, busy-marked instance, or None after `timeout` seconds.
+
+        `instances` is the full pool; ineligible (busy, unhealthy, parked)
+        instances are filtered out on every attempt.
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        with self._available:
+            self._waiting += 1
+            try:
+                while True:
+                    inst = self._try_acquire(instances)
+                    if inst is not None:
+                        self._record_wait(job_type, time.monotonic() - start)
+                        return inst
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._record_wait(job_type, time.monotonic() - start, timed_out=True)
+                        return None
+                    self._available.wait(timeout=min(remaining, self.recheck_interval))
+            finally:
+                self._waiting -= 1
+
+    def _try_acquire(self, instances):
+        candidates = [inst for inst in instances if self.is_available(inst)]
+        if not candidates:
+            return None
+        try:
+            counts = self.window_counts([inst.token for inst in candidates])
+        except Exception as e:
+            logger.warning(f"Window count script failed, falling back to pool order: {e}")
+            counts = [0] * len(candidates)
+
+        for _, inst in sorted(zip(counts, candidates), key=lambda pair: pair[0]):
+            # Redis lock (expires as a safety net) guards against a stale
+            # holder from a previous run; the in-memory flag is the fast path.
+            if not self.redis.set(self.lock_key(inst), "1", nx=True, ex=self.lock_ttl):
+                continue
+            if inst.is_busy:
+                self.redis.delete(self.lock_key(inst))
+                continue
+            inst.is_busy = True
+            inst.job_start_time = time.time()
+            return inst
+        return None
+
+    def release(self, inst):
+        """Unlock `inst`, mark it idle and wake one waiting worker."""
+        try:
+            if inst.group_id is not None:
+                self.redis.delete(self.lock_key(inst))
+        finally:
+            # Still mark as not busy even if Redis fails
+            inst.is_busy = False
+            inst.job_start_time = 0
+            with self._available:
+                self._available.notify()
+
+    def notify_all(self):
+        """Wake every waiter, e.g. after instances are restored to health."""
+        with self._available:
+            self._available.notify_all()
+
+    def _record_wait(self, job_type, waited, timed_out=False):
+        entry = self._wait_stats.setdefault(
+            job_type, {'acquired': 0, 'timeouts': 0, 'total_wait_ms': 0.0, 'max_wait_ms': 0.0}
+        )
+        waited_ms = waited * 1000
+        if timed_out:
+            entry['timeouts'] += 1
+        else:
+            entry['acquired'] += 1
+            entry['total_wait_ms'] += waited_ms
+        entry['max_wait_ms'] = max(entry['max_wait_ms'], waited_ms)
+
+    def wait_stats(self) -> dict:
+        with self._available:
+            by_job_type = {
+                job_type: {
+                    **entry,
+                    'avg_wait_ms': round(entry['total_wait_ms'] / entry['acquired'], 2) if entry['acquired'] else 0.0,
+                }
+                for job_type, entry in self._wait_stats.items()
+            }
+            return {'waiting': self._waiting, 'by_job_type': by_job_type}
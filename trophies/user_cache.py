@@ -0,0 +1,130 @@
+"""
+Shared PSN user-handle cache for TokenKeeper.
+
+Resolving a profile to a psnawp `User` costs a PSN call (`init_user`):
+`client.user(account_id=...)` fetches the profile to learn the online id,
+`client.user(online_id=...)` fetches the legacy profile to learn the
+account id. Each TokenInstance used to keep its own dict of `User`
+objects, so a profile warmed up separately on every token, and nothing
+survived a restart.
+
+A `User` is just (authenticator, online_id, account_id). This cache keeps
+the resolved (account_id, online_id) pair instead, which is token
+independent: a hit rebinds it to whichever instance is running the job
+with no PSN call. Entries live in a size-bounded in-process LRU with a
+TTL, shared by every instance, and are written through to Redis
+(`psn_user_handle:{lookup}`, same TTL) so other machines and the next
+process start skip the lookup too. The TTL bounds how long a renamed
+account keeps resolving to its old online id.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+logger = logging.getLogger("psn_api")
+
+
+@dataclass(frozen=True)
+class UserHandle:
+    account_id: str
+    online_id: str
+
+
+class UserHandleCache:
+    """LRU + TTL cache of resolved PSN users, persisted to Redis."""
+
+    KEY_PREFIX = "psn_user_handle"
+
+    def __init__(self, redis, max_size=5000, ttl=600):
+        self.redis = redis
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # lookup -> (UserHandle, expires_at)
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'redis_hits': 0, 'misses': 0, 'evictions': 0}
+
+    def redis_key(self, lookup) -> str:
+        return f"{self.KEY_PREFIX}:{lookup}"
+
+    def get(self, lookup) -> UserHandle | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(lookup)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(lookup)
+                    self.counters['hits'] += 1
+                    return entry[0]
+                del self._entries[lookup]
+
+        handle = self._load(lookup)
+        with self._lock:
+            if handle is None:
+                self.counters['misses'] += 1
+                return None
+            self.counters['redis_hits'] += 1
+            self._store_local(lookup, handle, now)
+        return handle
+
+    def _load(self, lookup) -> UserHandle | None:
+        try:
+            raw = self.redis.get(self.redis_key(lookup))
+        except Exception as e:
+            logger.warning(f"User handle cache read failed for {lookup}: {e}")
+            return None
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+            return UserHandle(account_id=data['account_id'], online_id=data['online_id'])
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+    def put(self, handle: UserHandle, *lookups):
+        """Cache `handle` under each lookup key (account id and/or online id)."""
+        payload = json.dumps({'account_id': handle.account_id, 'online_id': handle.online_id})
+        now = time.time()
+        with self._lock:
+            for lookup in lookups:
+                self._store_local(lookup, handle, now)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for lookup in lookups:
+                pipe.set(self.redis_key(lookup), payload, ex=self.ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"User handle cache write failed for {lookups}: {e}")
+
+    def _store_local(self, lookup, handle, now):
+        self._entries[lookup] = (handle, now + self.ttl)
+        self._entries.move_to_end(lookup)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.counters['evictions'] += 1
+
+    def invalidate(self, *lookups):
+        with self._lock:
+            for lookup in lookups:
+                self._entries.pop(lookup, None)
+        try:
+            self.redis.delete(*(self.redis_key(lookup) for lookup in lookups))
+        except Exception as e:
+            logger.warning(f"User handle cache delete failed for {lookups}: {e}")
+
+    def prune(self) -> int:
+        """Drop expired in-process entries; returns how many were removed."""
+        now = time.time()
+        with self._lock:
+            expired = [lookup for lookup, (_, expires_at) in self._entries.items() if expires_at <= now]
+            for lookup in expired:
+                del self._entries[lookup]
+        return len(expired)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.counters['hits'] + self.counters['redis_hits'] + self.counters['misses']
+            hit_rate = (self.counters['hits'] + self.counters['redis_hits']) / lookups if lookups else 0.0
+            return {**self.counters, 'size': len(self._entries), 'max_size': self.max_size, 'hit_rate': round(hit_rate, 3)}
@@ -0,0 +1,233 @@
+"""
+Asynchronous PSN API audit logging.
+
+`log_api_call` runs on every PSN call TokenKeeper makes, while a worker is
+holding a token. Writing the APIAuditLog row inline (plus an FK probe and an
+egress-IP lookup) put two DB round trips and an HTTP request on that hot path,
+so a slow ipify response stalled the worker and its token with it.
+
+Instead, calls are appended to a bounded in-process buffer and a daemon
+flusher writes them with `bulk_create` every `flush_batch` records or every
+`flush_interval` seconds, whichever comes first. Profile ids are validated in
+one batched query per flush, and the egress IP is resolved once per proxy and
+cached. The buffer is flushed on interpreter shutdown via atexit.
+"""
+import atexit
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+
+import requests
+from django.db import IntegrityError, close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+# Egress IP cache: {proxy_url or None: (ip, resolved_at)}. One lookup per
+# proxy (i.e. per token group) instead of one per API call.
+_egress_ip_cache = {}
+_egress_ip_lock = threading.Lock()
+EGRESS_IP_TTL = 3600
+
+
+def resolve_egress_ip(proxy_url=None, max_age=EGRESS_IP_TTL):
+    """Return the public IP traffic through `proxy_url` leaves from, cached.
+
+    Failures are not cached, so a transient ipify outage is retried on the
+    next lookup; callers get 'Unknown' in the meantime.
+    """
+    now = time.time()
+    with _egress_ip_lock:
+        cached = _egress_ip_cache.get(proxy_url)
+        if cached and now - cached[1] < max_age:
+            return cached[0]
+
+    try:
+        session = requests.Session()
+        if proxy_url:
+            session.proxies = {'http': proxy_url, 'https': proxy_url}
+        ip = session.get('https://api.ipify.org', timeout=2).text
+    except Exception as e:
+        logger.warning(f"Failed to resolve egress IP (proxy={'yes' if proxy_url else 'no'}): {e}")
+        return 'Unknown'
+
+    with _egress_ip_lock:
+        _egress_ip_cache[proxy_url] = (ip, now)
+    return ip
+
+
+class APIAuditBuffer:
+    """Bounded buffer of pending APIAuditLog rows with a background flusher.
+
+    `record()` never blocks: when the buffer is full the entry is dropped and
+    counted, so a struggling database degrades audit coverage rather than
+    token throughput.
+    """
+
+    def __init__(self, max_size=5000, flush_batch=200, flush_interval=5.0):
+        self.max_size = max_size
+        self.flush_batch = flush_batch
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_size)
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._atexit_registered = False
+        self.counters = {
+            'enqueued': 0,
+            'dropped': 0,
+            'flushed': 0,
+            'flush_errors': 0,
+            'profiles_nulled': 0,
+        }
+
+    def record(self, **entry) -> bool:
+        """Queue one audit entry. Returns False if it was dropped (buffer full)."""
+        self.ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.counters['dropped'] += 1
+            if self.counters['dropped'] % 1000 == 1:
+                logger.warning(
+                    f"API audit buffer full ({self.max_size}); "
+                    f"dropped {self.counters['dropped']} entries so far"
+                )
+            return False
+        self.counters['enqueued'] += 1
+        if self._queue.qsize() >= self.flush_batch:
+            self._wake.set()
+        return True
+
+    def ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="api-audit-flusher")
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.shutdown)
+                self._atexit_registered = True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            try:
+                # Long-lived thread: recycle stale connections like a request would.
+                close_old_connections()
+                self.flush()
+            except Exception as e:
+                logger.error(f"API audit flush loop error: {e}")
+
+    def shutdown(self, timeout=10):
+        """Stop the flusher and write whatever is still buffered."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self.flush()
+
+    def _drain(self):
+        entries = []
+        while True:
+            try:
+                entries.append(self._queue.get_nowait())
+            except queue.Empty:
+                return entries
+
+    def flush(self) -> int:
+        """Write all buffered entries in bulk. Returns the number written."""
+        with self._flush_lock:
+            entries = self._drain()
+            if not entries:
+                return 0
+            written = 0
+            for start in range(0, len(entries), self.flush_batch):
+                written += self._write(entries[start:start + self.flush_batch])
+            return written
+
+    def _write(self, entries) -> int:
+        from trophies.models import APIAuditLog, Profile
+        from trophies.util_modules.cache import redis_client
+
+        # One batched FK check instead of an exists() per call.
+        profile_ids = {e['profile_id'] for e in entries if e.get('profile_id') is not None}
+        valid_ids = set(
+            Profile.objects.filter(id__in=profile_ids).values_list('id', flat=True)
+        ) if profile_ids else set()
+        self.counters['profiles_nulled'] += sum(
+            1 for e in entries if e.get('profile_id') is not None and e['profile_id'] not in valid_ids
+        )
+
+        # calls_remaining is captured at call time by the caller. Only entries
+        # without it fall back to the token's window now (one pipelined ZCARD
+        # per such token), which reflects the end of the batch, not the call.
+        machine_id = os.getenv("MACHINE_ID", "default")
+        max_calls = int(os.getenv("MAX_CALLS_PER_WINDOW", 300))
+        tokens = list({e['token'] for e in entries if e.get('calls_remaining') is None})
+        calls_by_token = {}
+        if tokens:
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                for token in tokens:
+                    pipe.zcard(f"token:{token}:{machine_id}:timestamps")
+                calls_by_token = dict(zip(tokens, pipe.execute()))
+            except Exception as e:
+                logger.warning(f"API audit calls_remaining lookup failed: {e}")
+
+        rows = [
+            APIAuditLog(
+                token_id=hashlib.sha256(e['token'].encode()).hexdigest()[:64],
+                ip_used=e.get('ip_used') or resolve_egress_ip(),
+                endpoint=e['endpoint'],
+                profile_id=e['profile_id'] if e.get('profile_id') in valid_ids else None,
+                status_code=e['status_code'],
+                response_time=e['response_time'],
+                error_message=e.get('error_message') or "",
+                calls_remaining=(
+                    e['calls_remaining'] if e.get('calls_remaining') is not None
+                    else max(0, max_calls - int(calls_by_token.get(e['token']) or 0))
+                ),
+            )
+            for e in entries
+        ]
+
+        try:
+            APIAuditLog.objects.bulk_create(rows)
+        except IntegrityError:
+            # A profile was deleted between the batched check and the insert.
+            # Keep the audit rows, drop the FK.
+            for row in rows:
+                row.profile_id = None
+            try:
+                APIAuditLog.objects.bulk_create(rows)
+            except Exception as e:
+                self.counters['flush_errors'] += 1
+                logger.error(f"Failed to write {len(rows)} API audit logs: {e}")
+                return 0
+        except Exception as e:
+            self.counters['flush_errors'] += 1
+            logger.error(f"Failed to write {len(rows)} API audit logs: {e}")
+            return 0
+
+        self.counters['flushed'] += len(rows)
+        return len(rows)
+
+    def stats(self) -> dict:
+        return {**self.counters, 'pending': self._queue.qsize(), 'capacity': self.max_size}
+
+
+audit_buffer = APIAuditBuffer(
+    max_size=int(os.getenv("API_AUDIT_BUFFER_SIZE", 5000)),
+    flush_batch=int(os.getenv("API_AUDIT_FLUSH_BATCH", 200)),
+    flush_interval=float(os.getenv("API_AUDIT_FLUSH_INTERVAL", 5)),
+)
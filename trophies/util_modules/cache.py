@@ -4,11 +4,7 @@ Cache utilities - Redis client and caching helpers.
 Provides Redis client configuration and utility functions for caching.
 """
 import os
-import logging
 import redis
-import hashlib
-import requests
-from django.db import IntegrityError
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -35,57 +31,33 @@ def get_redis_client():
 redis_client = get_redis_client()
 
 
-def log_api_call(endpoint, token, profile_id, status_code, response_time, error_message=""):
+def log_api_call(endpoint, token, profile_id, status_code, response_time, error_message="", ip_used=None, calls_remaining=None):
     """
-    Log API call details to APIAuditLog for monitoring and rate limiting.
+    Record a PSN API call to APIAuditLog for monitoring and rate limiting.
 
-    This function records details about PSN API calls including timing,
-    status, errors, and remaining rate limit capacity.
+    Non-blocking: the entry goes onto the in-process audit buffer and is
+    written in bulk by a background flusher (see util_modules/api_audit.py),
+    so nothing here touches the database or the network on the token hot path.
 
     Args:
         endpoint: API endpoint that was called
         token: Authentication token used (will be hashed)
-        profile_id: PSN profile ID involved in the call (None if profile doesn't exist)
+        profile_id: PSN profile ID involved in the call (nulled at flush time if the profile no longer exists)
         status_code: HTTP status code from response
-        response_time: Request duration in milliseconds
+        response_time: Request duration in seconds
         error_message: Error message if call failed (default: "")
+        ip_used: Egress IP the call went out on; resolved (cached) at flush time when omitted
+        calls_remaining: Token's window budget when the call was made; read from Redis at flush time when omitted
     """
-    from trophies.models import APIAuditLog, Profile
+    from trophies.util_modules.api_audit import audit_buffer
 
-    # Validate profile_id exists in database before creating the log entry
-    # This prevents foreign key constraint violations
-    validated_profile_id = None
-    if profile_id is not None:
-        if Profile.objects.filter(id=profile_id).exists():
-            validated_profile_id = profile_id
-
-    logger = logging.getLogger(__name__)
-    log_kwargs = dict(
-        token_id=hashlib.sha256(token.encode()).hexdigest()[:64],
-        ip_used=(
-            requests.get("https://api.ipify.org", timeout=5).text
-            if not error_message
-            else "unknown"
-        ),
+    audit_buffer.record(
         endpoint=endpoint,
-        profile_id=validated_profile_id,
+        token=token,
+        profile_id=profile_id,
         status_code=status_code,
         response_time=response_time,
         error_message=error_message,
-        calls_remaining=max(
-            0, 300 - int(redis_client.zcard(f"token:{token}:timestamps") or 0)
-        ),
+        ip_used=ip_used,
+        calls_remaining=calls_remaining,
     )
-
-    try:
-        APIAuditLog.objects.create(**log_kwargs)
-    except IntegrityError:
-        # Race condition: profile was deleted between exists() check and create()
-        # Retry without the profile FK to preserve the audit log entry
-        log_kwargs['profile_id'] = None
-        try:
-            APIAuditLog.objects.create(**log_kwargs)
-        except Exception as e:
-            logger.error(f"Failed to create API audit log: {e}")
-    except Exception as e:
-        logger.error(f"Failed to create API audit log: {e}")
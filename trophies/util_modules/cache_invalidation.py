@@ -0,0 +1,157 @@
+"""
+Cache invalidation bus - Coalesce per-owner cache invalidations.
+
+Services that own a cache scoped to one object (usually a profile:
+`dashboard`, `stats`, `timeline`; also a game: `game_trophies`) register a
+tag here together with a function that lists the cache keys behind that
+tag for a set of owner ids. Their public `invalidate_*_cache(owner_id)`
+helpers then call `invalidate(tag, owner_id)` instead of deleting keys
+themselves.
+
+Outside a batch that flushes immediately, so standalone callers (views, API
+endpoints) behave exactly as before. Inside `invalidation_batch()` the
+(tag, owner_id) pairs are collected and deduped, and leaving the outermost
+batch resolves every key and removes them with a single `delete_many`. One
+sync (stats, badges, milestones, challenges and the finishing step all
+invalidating the dashboard) therefore costs one round trip instead of one per
+caller.
+
+Tags registered with `generational=True` have no key list. Invalidating them
+replaces the owner's generation token (`cache_generation()`), and readers
+embed that token in their keys, so stale entries are simply never read again
+and expire on their own TTL. No tracked key set is needed.
+
+The active batch lives in a ContextVar rather than a threading.local so that
+stage_runner can hand it to its pool threads: post-sync stages running in
+parallel all feed the batch opened by `_job_sync_complete`.
+"""
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+logger = logging.getLogger("psn_api")
+
+# tag -> callable(owner_ids) returning the cache keys to delete, or None
+# for generational tags.
+_INVALIDATORS = {}
+
+_active_batch = contextvars.ContextVar('cache_invalidation_batch', default=None)
+
+
+class _Batch:
+    """Pending (tag, owner_id) pairs; shared by every thread in the batch."""
+
+    def __init__(self):
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    def add(self, tag, owner_id):
+        with self.lock:
+            self.pending.add((tag, owner_id))
+
+    def drain(self):
+        with self.lock:
+            pending, self.pending = self.pending, set()
+        return pending
+
+
+def register_invalidator(tag, keys_for=None, generational=False):
+    """
+    Register a cache tag.
+
+    Args:
+        tag: Name used with invalidate().
+        keys_for: callable(owner_ids) -> iterable of cache keys to delete.
+            Receives every owner queued for the tag in one flush, so it can
+            batch any lookups it needs.
+        generational: True to invalidate by bumping the generation token
+            instead of deleting keys (keys_for is then unused).
+    """
+    if not generational and keys_for is None:
+        raise ValueError(f"Invalidator {tag!r} needs keys_for unless it is generational")
+    _INVALIDATORS[tag] = None if generational else keys_for
+
+
+def _generation_key(tag, owner_id):
+    return f"cache_gen:{tag}:{owner_id}"
+
+
+def cache_generation(tag, owner_id):
+    """
+    Current generation token for a generational tag.
+
+    Seeds a token on first use (and after eviction) with add(), so two
+    readers racing on an empty key agree on the winner's value.
+    """
+    key = _generation_key(tag, owner_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key) or 0
+    return generation
+
+
+def invalidate(tag, owner_id):
+    """Invalidate `tag` for one owner now, or at the end of the active batch."""
+    if tag not in _INVALIDATORS:
+        raise KeyError(f"Unknown cache invalidation tag {tag!r}")
+    batch = _active_batch.get()
+    if batch is not None:
+        batch.add(tag, owner_id)
+    else:
+        _flush({(tag, owner_id)})
+
+
+@contextmanager
+def invalidation_batch():
+    """
+    Collect invalidations for a unit of work and flush them once on exit.
+
+    Nested batches join the outermost one. The flush also runs when the
+    block raises: whatever was written before the error is still live.
+    """
+    if _active_batch.get() is not None:
+        yield
+        return
+    batch = _Batch()
+    token = _active_batch.set(batch)
+    try:
+        yield
+    finally:
+        _active_batch.reset(token)
+        _flush(batch.drain())
+
+
+def _flush(pending):
+    if not pending:
+        return
+
+    by_tag = {}
+    for tag, owner_id in pending:
+        by_tag.setdefault(tag, set()).add(owner_id)
+
+    keys_to_delete, new_generations = [], {}
+    for tag, owner_ids in by_tag.items():
+        keys_for = _INVALIDATORS[tag]
+        if keys_for is None:
+            token = time.time_ns()
+            for owner_id in owner_ids:
+                new_generations[_generation_key(tag, owner_id)] = token
+            continue
+        try:
+            keys_to_delete.extend(keys_for(sorted(owner_ids)))
+        except Exception:
+            logger.exception(f"Failed to resolve cache keys for tag {tag!r}")
+
+    try:
+        if keys_to_delete:
+            cache.delete_many(list(dict.fromkeys(keys_to_delete)))
+        if new_generations:
+            cache.set_many(new_generations, None)
+    except Exception:
+        # Non-critical: worst case, stale cache until natural expiry.
+        logger.exception("Cache invalidation flush failed")
@@ -4,6 +4,7 @@ Constants and configuration values for the trophies app.
 This module centralizes all magic numbers, platform lists, region codes,
 and other constants used throughout the application.
 """
+from datetime import datetime, timezone
 
 # Platform definitions
 MODERN_PLATFORMS = ['PS5', 'PS4']
@@ -36,6 +37,13 @@ def platform_display_rank(title_platform):
         default=_PLATFORM_DISPLAY_FALLBACK,
     )
 
+# Sentinels substituted for a NULL EarnedTrophy.earned_date_time in keyset
+# orderings, so undated trophies sort last both ways without a nullable key.
+# Index expressions in migration 0261 embed these values; changing them
+# needs a new migration.
+EARNED_DATE_FLOOR = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EARNED_DATE_CEILING = datetime(9999, 12, 31, tzinfo=timezone.utc)
+
 # Title ID blacklist - Games with known issues or duplicates
 TITLE_ID_BLACKLIST = [
     'CUSA05214_00', 'CUSA01015_00', 'CUSA00129_00', 'CUSA00131_00',
@@ -0,0 +1,178 @@
+"""
+Keyset pagination - Seek-based paging with opaque cursors.
+
+Offset pagination costs a COUNT(*) plus an OFFSET scan that grows with page
+depth; on a whale profile (hundreds of thousands of earned trophies, joined
+to Trophy and Game) the deep pages of the trophy log were the slowest
+queries the profile page ran. A keyset page instead remembers the sort key
+of its last row and asks for rows strictly after it:
+
+    WHERE k0 <= :v0 AND (k0 < :v0 OR (k0 = :v0 AND k1 < :v1) OR ...)
+    ORDER BY k0 DESC, k1 DESC ... LIMIT per_page + 1
+
+so every page costs the same. The leading redundant bound on k0 is what an
+index range scan can use; the OR expansion only filters ties.
+
+Orderings are lists of (expression, descending). The last key must make the
+order total (the pk), and every key must be NOT NULL: wrap nullable columns
+in Coalesce with a sentinel that sorts where NULLS LAST would put them.
+
+Cursors are signed (django.core.signing) so they are opaque to clients and
+can't be forged into arbitrary filters; each is bound to a caller-chosen
+ordering name so a cursor from one sort is rejected by another.
+"""
+import json
+import logging
+from datetime import datetime
+
+from django.core import signing
+from django.db.models import F, Q
+
+logger = logging.getLogger("psn_api")
+
+CURSOR_SALT = 'keyset-cursor'
+
+# Below this planner estimate an exact COUNT is cheap enough to just run.
+APPROXIMATE_COUNT_EXACT_BELOW = 1000
+
+
+class InvalidCursor(Exception):
+    """Raised when a cursor is malformed, tampered with, or for another ordering."""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(ordering_name, values):
+    """Opaque, signed cursor for the row whose sort key is `values`."""
+    return signing.dumps(
+        {'o': ordering_name, 'v': [_encode_value(v) for v in values]},
+        salt=CURSOR_SALT, compress=True,
+    )
+
+
+def decode_cursor(ordering_name, cursor):
+    """Sort key values from a cursor produced by encode_cursor()."""
+    try:
+        payload = signing.loads(cursor, salt=CURSOR_SALT)
+        if payload['o'] != ordering_name:
+            raise InvalidCursor(f"Cursor is for ordering {payload['o']!r}")
+        return [_decode_value(v) for v in payload['v']]
+    except (signing.BadSignature, KeyError, TypeError, ValueError) as e:
+        raise InvalidCursor(str(e)) from e
+
+
+def _seek_filter(names, directions, values):
+    """Rows strictly after `values` in the given ordering."""
+    after = None
+    ties = Q()
+    for name, descending, value in zip(names, directions, values):
+        step = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+        after = (ties & step) if after is None else after | (ties & step)
+        ties &= Q(**{name: value})
+    bound = Q(**{f"{names[0]}__{'lte' if directions[0] else 'gte'}": values[0]})
+    return bound & after
+
+
+def approximate_count(queryset, exact_below=APPROXIMATE_COUNT_EXACT_BELOW):
+    """
+    Row count for display without a full COUNT over large results.
+
+    Uses the Postgres planner's row estimate for the query; when that is
+    small the exact count is cheap and is returned instead.
+
+    Returns:
+        tuple: (count, is_estimate)
+    """
+    try:
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+    except Exception:
+        logger.debug("Planner row estimate unavailable; counting exactly", exc_info=True)
+        return queryset.count(), False
+    if estimate < exact_below:
+        return queryset.count(), False
+    return estimate, True
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset; iterable like a Django Page."""
+
+    def __init__(self, object_list, next_cursor, count=None, count_is_estimate=False):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.count = count
+        self.count_is_estimate = count_is_estimate
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def keyset_paginate(queryset, ordering_name, ordering, per_page, cursor=None, count=None):
+    """
+    Fetch one page of `queryset` after `cursor`.
+
+    Args:
+        queryset: Unordered queryset to page through.
+        ordering_name: Name the cursor is bound to (e.g. the sort value).
+        ordering: list of (expression or field name, descending). Must be
+            total and NOT NULL (see module docstring).
+        per_page: Rows per page.
+        cursor: Cursor from a previous page's `next_cursor`, or None for the
+            first page.
+        count: None for no count, 'approximate' for approximate_count(), or
+            'exact' for a real COUNT.
+
+    Returns:
+        KeysetPage
+
+    Raises:
+        InvalidCursor: if the cursor does not decode for this ordering.
+    """
+    names = [f'_keyset_{i}' for i in range(len(ordering))]
+    directions = [descending for _, descending in ordering]
+    queryset = queryset.annotate(**{
+        name: F(expr) if isinstance(expr, str) else expr
+        for name, (expr, _) in zip(names, ordering)
+    })
+
+    page_count, count_is_estimate = None, False
+    if count == 'approximate':
+        page_count, count_is_estimate = approximate_count(queryset)
+    elif count == 'exact':
+        page_count = queryset.count()
+
+    if cursor:
+        values = decode_cursor(ordering_name, cursor)
+        if len(values) != len(names):
+            raise InvalidCursor("Cursor does not match the ordering")
+        queryset = queryset.filter(_seek_filter(names, directions, values))
+
+    queryset = queryset.order_by(*[
+        F(name).desc() if descending else F(name).asc()
+        for name, descending in zip(names, directions)
+    ])
+    rows = list(queryset[:per_page + 1])
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(ordering_name, [getattr(last, name) for name in names])
+    return KeysetPage(rows, next_cursor, page_count, count_is_estimate)
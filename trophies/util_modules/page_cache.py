@@ -0,0 +1,185 @@
+"""
+Page cache - Whole-page cache for anonymous views of canonical pages.
+
+Anonymous traffic (search engines, shared links, bots that get past the bot
+filter) hits the canonical game and profile pages with no query string and
+no per-viewer state, so every visitor gets the same HTML. Those renders are
+the most expensive on the site; this module stores the finished HTML and
+serves it back to later anonymous visitors.
+
+    page:{namespace}:{owner_id}:{variant}
+        {'html', 'status', 'content_type', 'generation', 'built_at'}
+
+- namespace is a generational tag on the invalidation bus
+  (`game_page`, `profile_page`); writers call `invalidate_page_cache()`.
+- The generation is stored *inside* the entry rather than in the key, so a
+  retired entry is still readable for stale-while-revalidate: it is served
+  while one request (the winner of a `cache.add` rebuild lock) re-renders.
+  An entry is fresh while its generation is current and it is younger than
+  PAGE_CACHE_FRESH; stale entries are served for up to PAGE_CACHE_STALE.
+- variant hashes everything outside the view that changes the HTML for an
+  anonymous visitor: the path and the site-wide banner flags read by the
+  high_sync_volume / psn_outage context processors (one MGET). Other site
+  banners (fundraiser, art reveal) ride on the fresh window.
+- CSRF tokens are swapped for a placeholder before storing and the viewer's
+  own token is put back on the way out, which also sets their CSRF cookie.
+
+Only plain anonymous GETs are eligible (see `is_cacheable_request`); the
+response is stored only when it is a 200 that set no cookies besides CSRF
+and queued no messages. Values are JSON-safe for the production serializer.
+"""
+import hashlib
+import logging
+import re
+import time
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import patch_vary_headers
+
+from trophies.util_modules.cache_invalidation import cache_generation, invalidate, register_invalidator
+
+logger = logging.getLogger("psn_api")
+
+PAGE_CACHE_FRESH = 5 * 60
+PAGE_CACHE_STALE = 60 * 60
+REBUILD_LOCK_TTL = 30
+
+PAGE_CACHE_NAMESPACES = ('game_page', 'profile_page')
+
+# Raw Redis keys read by site-wide context processors; their values change
+# the rendered banner, so they are part of the variant.
+SITE_FLAG_KEYS = ('site:high_sync_volume', 'site:psn_outage')
+
+CSRF_PLACEHOLDER = '__page_cache_csrf__'
+_CSRF_TOKEN_RE = re.compile(
+    r'name="csrfmiddlewaretoken" value="([^"]+)"|name="csrf-token" content="([^"]+)"'
+)
+
+for _namespace in PAGE_CACHE_NAMESPACES:
+    register_invalidator(_namespace, generational=True)
+
+
+def invalidate_page_cache(namespace, owner_id):
+    """Retire the cached anonymous page(s) for one game or profile."""
+    invalidate(namespace, owner_id)
+
+
+def is_cacheable_request(request):
+    """True for a plain anonymous GET of a canonical page."""
+    if request.method != 'GET' or request.META.get('QUERY_STRING'):
+        return False
+    if request.user.is_authenticated:
+        return False
+    if getattr(request, 'htmx', False) or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return False
+    # Pending flash messages are rendered into (and consumed by) the page.
+    return len(get_messages(request)) == 0
+
+
+def _variant(request):
+    """Hash of the path and site flag values, or None when Redis is unavailable."""
+    from trophies.util_modules.cache import redis_client
+
+    try:
+        flags = redis_client.mget(SITE_FLAG_KEYS)
+    except Exception:
+        logger.debug("Page cache skipped: site flags unavailable", exc_info=True)
+        return None
+    digest = hashlib.sha1(request.path.encode())
+    for value in flags:
+        digest.update(b'\0' + (value or b''))
+    return digest.hexdigest()[:16]
+
+
+def page_cache_key(namespace, owner_id, variant):
+    return f"page:{namespace}:{owner_id}:{variant}"
+
+
+def strip_csrf(html):
+    """Replace every CSRF token rendered into the page with a placeholder."""
+    tokens = {a or b for a, b in _CSRF_TOKEN_RE.findall(html)}
+    for token in tokens:
+        html = html.replace(token, CSRF_PLACEHOLDER)
+    return html
+
+
+def _response_from_entry(entry, request, state):
+    response = HttpResponse(
+        entry['html'].replace(CSRF_PLACEHOLDER, get_token(request)),
+        status=entry['status'],
+        content_type=entry['content_type'],
+    )
+    patch_vary_headers(response, ('Cookie',))
+    response['X-Page-Cache'] = state
+    return response
+
+
+def _store(key, response, request, generation):
+    """Cache a freshly rendered response when it is safe to share."""
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    if response.status_code != 200 or response.streaming:
+        return
+    if set(response.cookies) - {settings.CSRF_COOKIE_NAME}:
+        return
+    if len(get_messages(request)):
+        return
+    entry = {
+        'html': strip_csrf(response.content.decode(response.charset)),
+        'status': response.status_code,
+        'content_type': response['Content-Type'],
+        'generation': generation,
+        'built_at': time.time(),
+    }
+    try:
+        cache.set(key, entry, PAGE_CACHE_STALE)
+    except Exception:
+        logger.exception(f"Failed to store page cache entry {key}")
+
+
+def get_or_render(request, namespace, owner_id, render, on_hit=None):
+    """
+    Serve a cached anonymous page, or render and cache it.
+
+    Args:
+        request: The anonymous GET (already checked with is_cacheable_request).
+        namespace: Page cache namespace (a generational invalidation tag).
+        owner_id: Game or profile id the page belongs to.
+        render: Zero-argument callable returning the view's response.
+        on_hit: Optional callable run when a cached page is served, for
+            side effects the skipped render would have had (page views).
+
+    Returns:
+        HttpResponse
+    """
+    variant = _variant(request)
+    if variant is None:
+        return render()
+
+    key = page_cache_key(namespace, owner_id, variant)
+    generation = cache_generation(namespace, owner_id)
+    entry = cache.get(key)
+
+    rebuild_lock = None
+    if entry is not None:
+        fresh = entry['generation'] == generation and time.time() - entry['built_at'] < PAGE_CACHE_FRESH
+        if not fresh:
+            rebuild_lock = f"{key}:rebuild"
+        if fresh or not cache.add(rebuild_lock, 1, REBUILD_LOCK_TTL):
+            if on_hit is not None:
+                on_hit()
+            return _response_from_entry(entry, request, 'hit' if fresh else 'stale')
+
+    try:
+        response = render()
+        _store(key, response, request, generation)
+    finally:
+        if rebuild_lock:
+            cache.delete(rebuild_lock)
+    patch_vary_headers(response, ('Cookie',))
+    response['X-Page-Cache'] = 'miss'
+    return response
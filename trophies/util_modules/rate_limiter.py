@@ -0,0 +1,145 @@
+"""
+Atomic Redis sliding-window rate limiter.
+
+Both PSN tokens (`token:{token}:{machine_id}:timestamps`) and IGDB
+(`igdb_rate_limit`) track recent calls in a sorted set of timestamps. The
+prune / count / record steps used to be separate commands: 2-4 round trips
+per call, with a check-then-act race between workers, and a rollback that
+popped the newest entry even when it belonged to another thread.
+
+Here check-and-record is a single Lua script (one EVALSHA round trip). Every
+recorded call gets a unique member id so rollback removes exactly that call,
+and a denied reservation reports how long until the oldest entry ages out of
+the window, so callers sleep once instead of polling.
+"""
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+# KEYS[1]: window sorted set
+# ARGV: now, window_seconds, limit, member, ttl_ms, force ('1' records even
+# when the window is full; used by soft limits that only balance load).
+# Returns {acquired, count_after, retry_after_ms}.
+ACQUIRE_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+if count < limit or ARGV[6] == '1' then
+    redis.call('ZADD', key, now, ARGV[4])
+    local ttl = tonumber(ARGV[5])
+    if ttl > 0 then
+        redis.call('PEXPIRE', key, ttl)
+    end
+    return {1, count + 1, 0}
+end
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+local retry_ms = math.ceil((tonumber(oldest[2]) + window - now) * 1000)
+if retry_ms < 0 then
+    retry_ms = 0
+end
+return {0, count, retry_ms}
+"""
+
+# Prunes and counts every sorted set in KEYS in one round trip.
+# ARGV[1] is the window cutoff (now - window_seconds).
+WINDOW_COUNTS_SCRIPT = """
+local cutoff = tonumber(ARGV[1])
+local counts = {}
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', cutoff)
+    counts[i] = redis.call('ZCARD', key)
+end
+return counts
+"""
+
+
+@dataclass(frozen=True)
+class Reservation:
+    """Outcome of one check-and-record attempt."""
+    acquired: bool
+    member: str | None
+    count: int
+    retry_after: float  # seconds until a slot frees up (0 when acquired)
+
+
+def window_counts(redis, keys, window_seconds) -> list[int]:
+    """Prune and count several windows in a single script call."""
+    if not keys:
+        return []
+    script = redis.register_script(WINDOW_COUNTS_SCRIPT)
+    counts = script(keys=list(keys), args=[time.time() - window_seconds])
+    return [int(c) for c in counts]
+
+
+class SlidingWindowRateLimiter:
+    """At most `limit` calls per `window_seconds` on one Redis sorted set."""
+
+    def __init__(self, redis, key, limit, window_seconds, ttl=None):
+        self.redis = redis
+        self.key = key
+        self.limit = limit
+        self.window_seconds = window_seconds
+        # Key expiry: defaults to the window so idle limiters clean themselves up.
+        self.ttl = window_seconds if ttl is None else ttl
+        self._acquire_script = redis.register_script(ACQUIRE_SCRIPT)
+        # Window count reported by the most recent acquire/record on this
+        # limiter (None until the first call). Free: the script returns it.
+        self.last_count = None
+
+    @staticmethod
+    def new_member(now) -> str:
+        return f"{now:.6f}:{uuid.uuid4().hex[:12]}"
+
+    def _run(self, force, member=None) -> Reservation:
+        now = time.time()
+        member = member or self.new_member(now)
+        acquired, count, retry_ms = self._acquire_script(
+            keys=[self.key],
+            args=[now, self.window_seconds, self.limit, member, int(self.ttl * 1000), '1' if force else '0'],
+        )
+        self.last_count = int(count)
+        return Reservation(
+            acquired=bool(acquired),
+            member=member if acquired else None,
+            count=int(count),
+            retry_after=int(retry_ms) / 1000,
+        )
+
+    def try_acquire(self, member=None) -> Reservation:
+        """Record a call if the window has room; otherwise report the wait."""
+        return self._run(force=False, member=member)
+
+    def record(self, member=None) -> Reservation:
+        """Record a call unconditionally (soft limit). Always acquired."""
+        return self._run(force=True, member=member)
+
+    def acquire(self, max_wait) -> Reservation:
+        """Block until a slot is reserved or `max_wait` seconds pass.
+
+        Sleeps for the script-reported wait rather than polling. Returns the
+        last (denied) reservation on timeout; callers decide whether to proceed.
+        """
+        deadline = time.monotonic() + max_wait
+        while True:
+            reservation = self.try_acquire()
+            remaining = deadline - time.monotonic()
+            if reservation.acquired or remaining <= 0:
+                return reservation
+            time.sleep(min(max(reservation.retry_after, 0.01), remaining))
+
+    def rollback(self, member) -> bool:
+        """Remove exactly the call recorded as `member`."""
+        if not member:
+            return False
+        return bool(self.redis.zrem(self.key, member))
+
+    def count(self) -> int:
+        """Calls currently in the window (prunes expired entries)."""
+        return window_counts(self.redis, [self.key], self.window_seconds)[0]
@@ -0,0 +1,145 @@
+"""
+Stage runner - Run a small DAG of post-processing stages on a bounded thread pool.
+
+Used by `_job_sync_complete` (token_keeper.py) so independent post-sync work
+(badges -> milestones, and the A-Z / calendar / genre challenge checks) runs
+concurrently instead of serially holding one orchestrator worker.
+
+Each stage runs on a pool thread once every stage it depends on has finished
+successfully. Django gives every thread its own DB connection; the runner
+closes the pool thread's connections after each stage so they are not left
+idle until CONN_MAX_AGE. Stages run in a copy of the caller's context, so
+context-scoped state such as an open invalidation_batch() (see
+cache_invalidation.py) reaches them. `run_stages` returns only after every stage has
+finished or been skipped (the join before the caller's final step).
+
+A failing stage does not cancel stages already running. Its dependents are
+skipped, and the first failure (in declaration order) is re-raised once
+everything has settled, so callers keep their existing error handling.
+"""
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from django.db import connections
+
+logger = logging.getLogger("psn_api")
+
+DEFAULT_MAX_WORKERS = 3
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One unit of work.
+
+    name: unique within a run; used for timings and `after` references.
+    fn: zero-argument callable.
+    after: names of stages that must finish successfully first.
+    phase: UI phase string reported through `on_phase` while this stage is
+        the earliest unfinished one (defaults to `name`).
+    """
+    name: str
+    fn: Callable[[], object]
+    after: tuple = field(default_factory=tuple)
+    phase: Optional[str] = None
+
+
+def _validate(stages):
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names: {names}")
+    known = set()
+    for stage in stages:
+        missing = set(stage.after) - set(names)
+        if missing:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown stage(s) {sorted(missing)}")
+        # Requiring dependencies to be declared first rules out cycles.
+        if not set(stage.after) <= known:
+            raise ValueError(f"Stage {stage.name!r} must be declared after {sorted(set(stage.after) - known)}")
+        known.add(stage.name)
+
+
+def _timed(stage):
+    start = time.monotonic()
+    try:
+        stage.fn()
+    finally:
+        connections.close_all()
+    return time.monotonic() - start
+
+
+def run_stages(stages, max_workers=DEFAULT_MAX_WORKERS, on_phase=None, on_timing=None):
+    """
+    Run `stages` respecting their `after` dependencies, at most `max_workers` at a time.
+
+    Args:
+        stages: list of Stage, each declared after its dependencies.
+        on_phase: optional callback(phase) whenever the earliest unfinished
+            stage changes, so a single progress string moves forward in
+            declaration order even though stages overlap.
+        on_timing: optional callback(name, seconds) as each stage finishes.
+
+    Returns:
+        dict: {stage name: seconds} for every stage that ran successfully.
+
+    Raises:
+        The first stage exception (in declaration order), after all running
+        stages have finished.
+    """
+    stages = list(stages)
+    _validate(stages)
+
+    pending = {stage.name: stage for stage in stages}
+    done, failed = set(), {}
+    timings = {}
+    last_phase = None
+
+    def report_phase():
+        nonlocal last_phase
+        for stage in stages:
+            if stage.name not in done and stage.name not in failed:
+                phase = stage.phase or stage.name
+                if phase != last_phase and on_phase:
+                    on_phase(phase)
+                last_phase = phase
+                return
+
+    def submit_ready(executor, running):
+        for name, stage in list(pending.items()):
+            if any(dep in failed for dep in stage.after):
+                del pending[name]
+                failed[name] = None  # skipped: a dependency failed
+                logger.warning(f"Skipping stage {name}: dependency failed")
+            elif all(dep in done for dep in stage.after):
+                del pending[name]
+                running[executor.submit(contextvars.copy_context().run, _timed, stage)] = stage
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='stage') as executor:
+        running = {}
+        submit_ready(executor, running)
+        report_phase()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    failed[stage.name] = e
+                    logger.error(f"Stage {stage.name} failed: {e}")
+                    continue
+                done.add(stage.name)
+                timings[stage.name] = seconds
+                if on_timing:
+                    on_timing(stage.name, seconds)
+            submit_ready(executor, running)
+            report_phase()
+
+    for stage in stages:
+        if failed.get(stage.name) is not None:
+            raise failed[stage.name]
+    return timings
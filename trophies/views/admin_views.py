@@ -26,6 +26,7 @@ from ..models import (
 from ..forms import BadgeCreationForm
 from ..services.review_service import ReviewService
 from trophies.util_modules.cache import redis_client
+from trophies.job_queue import job_queue
 
 logger = logging.getLogger("psn_api")
 
@@ -79,28 +80,14 @@ class TokenMonitoringView(StaffRequiredMixin, TemplateView):
         return aggregated
 
     def get_queue_stats(self):
-        queues = ['orchestrator_jobs', 'high_priority_jobs', 'medium_priority_jobs', 'low_priority_jobs', 'bulk_priority_jobs']
-        stats = {}
-        for queue in queues:
-            try:
-                length = redis_client.llen(queue)
-                stats[queue] = length
-            except Exception as e:
-                logger.error(f"Error fetching length for queue {queue}: {e}")
-                stats[queue] = 'Error'
-        return stats
+        try:
+            return job_queue.queue_lengths()
+        except Exception as e:
+            logger.error(f"Error fetching queue lengths: {e}")
+            return {}
 
     def get_profile_queue_stats(self):
-        stats = {}
-        queues = ['low_priority', 'medium_priority', 'bulk_priority']
-        for queue in queues:
-            keys = redis_client.keys(f"profile_jobs:*:{queue}")
-            for key in keys:
-                profile_id = key.decode().split(':')[1]
-                count = int(redis_client.get(key) or 0)
-                if profile_id not in stats:
-                    stats[profile_id] = {}
-                stats[profile_id][queue] = count
+        stats = job_queue.profile_queue_breakdown()
         for profile_id in stats:
             stats[profile_id]['total'] = sum(stats[profile_id].values())
         return stats
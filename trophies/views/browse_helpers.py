@@ -131,12 +131,8 @@ def apply_game_browse_filters(qs, form, sort_val=''):
     # --- Text search ---
     query = form.cleaned_data.get('query')
     if query:
-        from trophies.util_modules.roman_numerals import expand_numeral_query
-        query_variants = expand_numeral_query(query)
-        q_filter = Q()
-        for variant in query_variants:
-            q_filter |= Q(title_name__icontains=variant)
-        qs = qs.filter(q_filter)
+        from trophies.services.search_service import contains_any
+        qs = qs.filter(contains_any('title_name', query))
 
     # --- Platform / Region / Letter ---
     platforms = form.cleaned_data.get('platform')
@@ -17,7 +17,7 @@ from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views import View
 from django.views.generic import ListView, DetailView
 from urllib.parse import urlencode
-from trophies.mixins import ProfileHotbarMixin, HtmxListMixin
+from trophies.mixins import AnonymousPageCacheMixin, ProfileHotbarMixin, HtmxListMixin
 from ..constants import CACHE_TIMEOUT_IMAGES
 from ..models import Game, Trophy, Profile, EarnedTrophy, ProfileGame, TrophyGroup, Badge, Concept, FeaturedGuide, Stage, UserConceptRating, ConceptFranchise
 from ..forms import GameSearchForm, GameDetailForm, GuideSearchForm
@@ -205,7 +205,7 @@ class RandomGameView(View):
 
 
 @method_decorator(ensure_csrf_cookie, name='dispatch')
-class GameDetailView(ProfileHotbarMixin, DetailView):
+class GameDetailView(AnonymousPageCacheMixin, ProfileHotbarMixin, DetailView):
     """
     Display detailed game information including trophies, statistics, and user progress.
 
@@ -217,6 +217,15 @@ class GameDetailView(ProfileHotbarMixin, DetailView):
     slug_field = 'np_communication_id'
     slug_url_kwarg = 'np_communication_id'
     context_object_name = 'game'
+    page_cache_namespace = 'game_page'
+
+    def get_page_cache_owner_id(self):
+        return Game.objects.filter(
+            np_communication_id=self.kwargs['np_communication_id'],
+        ).values_list('id', flat=True).first()
+
+    def page_cache_hit(self, owner_id):
+        track_page_view('game', owner_id, self.request)
 
     def dispatch(self, request, *args, **kwargs):
         # Profile-scoped variants (/games/<np>/<username>/) require auth. They
@@ -563,6 +572,10 @@ class GameDetailView(ProfileHotbarMixin, DetailView):
         """
         Build trophy data with groups, filtering, and sorting.
 
+        The game's trophy list, sort orders and group/type/rarity partitions
+        come pre-serialized from trophy_list_service (cached per game version,
+        bumped by sync); only the viewer's earned map is applied here.
+
         Args:
             game: Game instance
             form: GameDetailForm with filtering/sorting options
@@ -571,112 +584,31 @@ class GameDetailView(ProfileHotbarMixin, DetailView):
         Returns:
             tuple: (full_trophies list, trophy_groups dict, grouped_trophies dict, has_trophies bool)
         """
-        has_trophies = Trophy.objects.filter(game=game).exists()
-        if not has_trophies:
-            return [], {}, {}, False
+        from trophies.services.trophy_list_service import get_trophy_list, group_trophies, select_trophies
 
         try:
-            # Get all trophies
-            trophies_qs = Trophy.objects.filter(game=game).order_by('trophy_id')
-            full_trophies = [
-                {
-                    'trophy_id': t.trophy_id,
-                    'trophy_type': t.trophy_type,
-                    'trophy_name': t.trophy_name,
-                    'trophy_detail': t.trophy_detail,
-                    'trophy_icon_url': t.trophy_icon_url,
-                    'trophy_group_id': t.trophy_group_id,
-                    'progress_target_value': t.progress_target_value,
-                    'trophy_rarity': t.trophy_rarity,
-                    'trophy_earn_rate': t.trophy_earn_rate,
-                    'earned_count': t.earned_count,
-                    'earn_rate': t.earn_rate,
-                    'pp_rarity': t.get_pp_rarity_tier()
-                } for t in trophies_qs
-            ]
-        except Exception as e:
+            trophy_list = get_trophy_list(game.id)
+        except Exception:
             logger.exception(f"Game trophies query failed for {game.np_communication_id}")
-            full_trophies = []
+            return [], {}, {}, Trophy.objects.filter(game=game).exists()
 
-        # Apply filtering and sorting
-        if form.is_valid():
-            earned_key = form.cleaned_data['earned']
-            if profile_earned:
-                if earned_key == 'unearned':
-                    full_trophies = [t for t in full_trophies if not profile_earned.get(t['trophy_id'], {}).get('earned', False)]
-                elif earned_key == 'earned':
-                    full_trophies = [t for t in full_trophies if profile_earned.get(t['trophy_id'], {}).get('earned', False)]
-
-            # Trophy type filter
-            trophy_type_filter = form.cleaned_data.get('trophy_type')
-            if trophy_type_filter:
-                full_trophies = [t for t in full_trophies if t['trophy_type'] in trophy_type_filter]
-
-            # Rarity bracket filter (PSN rarity tiers)
-            rarity_filter = form.cleaned_data.get('rarity_bracket')
-            if rarity_filter:
-                def _matches_rarity(rate, brackets):
-                    if rate <= 1:
-                        return 'ultra_rare' in brackets
-                    elif rate <= 5:
-                        return 'very_rare' in brackets
-                    elif rate <= 25:
-                        return 'rare' in brackets
-                    else:
-                        return 'common' in brackets
-                full_trophies = [t for t in full_trophies if _matches_rarity(t['trophy_earn_rate'], rarity_filter)]
-
-            # DLC / Base game filter
-            dlc_filter = form.cleaned_data.get('dlc_filter')
-            if dlc_filter == 'base':
-                full_trophies = [t for t in full_trophies if t['trophy_group_id'] == 'default']
-            elif dlc_filter == 'dlc':
-                full_trophies = [t for t in full_trophies if t['trophy_group_id'] != 'default']
-
-            sort_key = form.cleaned_data['sort']
-            if sort_key == 'earned_date':
-                full_trophies.sort(
-                    key=lambda t: (
-                        profile_earned.get(t['trophy_id'], {}).get('earned_date_time') is None,
-                        profile_earned.get(t['trophy_id'], {}).get('earned_date_time') or timezone.make_aware(datetime.min)
-                    )
-                )
-            elif sort_key == 'psn_rarity':
-                full_trophies.sort(key=lambda t: t['trophy_earn_rate'], reverse=False)
-            elif sort_key == 'pp_rarity':
-                full_trophies.sort(key=lambda t: t['earn_rate'], reverse=False)
-            elif sort_key == 'alpha':
-                full_trophies.sort(key=lambda t: t['trophy_name'].lower())
-            elif sort_key == 'earned_count':
-                full_trophies.sort(key=lambda t: (-t['earned_count'], t['trophy_name'].lower()))
-            elif sort_key == 'earned_count_inv':
-                full_trophies.sort(key=lambda t: (t['earned_count'], t['trophy_name'].lower()))
-            elif sort_key == 'type':
-                type_order = {'platinum': 0, 'gold': 1, 'silver': 2, 'bronze': 3}
-                full_trophies.sort(key=lambda t: (type_order.get(t['trophy_type'], 4), t['trophy_name'].lower()))
-
-        # Get trophy groups (cheap indexed FK query, not worth caching)
-        trophy_groups = {
-            g.trophy_group_id: {
-                'trophy_group_name': g.trophy_group_name,
-                'trophy_group_icon_url': g.trophy_group_icon_url,
-                'defined_trophies': g.defined_trophies,
-            } for g in TrophyGroup.objects.filter(game=game)
-        }
-
-        # Group trophies
-        grouped_trophies = {}
-        for trophy in full_trophies:
-            group_id = trophy.get('trophy_group_id', 'default')
-            if group_id not in grouped_trophies:
-                grouped_trophies[group_id] = []
-            grouped_trophies[group_id].append(trophy)
+        if not trophy_list['trophies']:
+            return [], {}, {}, False
 
-        # Sort groups (default first, then alphabetically)
-        sorted_groups = sorted(grouped_trophies.keys(), key=lambda x: (x != 'default', x))
-        sorted_grouped = {gid: grouped_trophies[gid] for gid in sorted_groups}
+        if form.is_valid():
+            full_trophies = select_trophies(
+                trophy_list,
+                profile_earned,
+                earned=form.cleaned_data['earned'],
+                sort=form.cleaned_data['sort'],
+                trophy_types=form.cleaned_data.get('trophy_type'),
+                rarity_brackets=form.cleaned_data.get('rarity_bracket'),
+                dlc_filter=form.cleaned_data.get('dlc_filter'),
+            )
+        else:
+            full_trophies = trophy_list['trophies']
 
-        return full_trophies, trophy_groups, sorted_grouped, has_trophies
+        return full_trophies, trophy_list['groups'], group_trophies(full_trophies), True
 
     def _build_concept_context(self, game):
         """
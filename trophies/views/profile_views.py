@@ -20,6 +20,8 @@ from django_ratelimit.decorators import ratelimit
 from urllib.parse import urlencode
 
 from trophies.util_modules.cache import redis_client
+from trophies.util_modules.constants import EARNED_DATE_CEILING, EARNED_DATE_FLOOR
+from trophies.util_modules.keyset import InvalidCursor, KeysetPage, keyset_paginate
 from ..forms import (
     ProfileSearchForm,
     ProfileGamesForm,
@@ -41,7 +43,7 @@ from ..models import (
     Trophy,
     UserConceptRating,
 )
-from trophies.mixins import ProfileHotbarMixin, HtmxListMixin
+from trophies.mixins import AnonymousPageCacheMixin, ProfileHotbarMixin, HtmxListMixin
 from .browse_helpers import annotate_community_ratings
 from trophies.psn_manager import PSNManager
 
@@ -163,7 +165,7 @@ class ProfilesListView(HtmxListMixin, ProfileHotbarMixin, ListView):
         return context
 
 
-class ProfileDetailView(ProfileHotbarMixin, DetailView):
+class ProfileDetailView(AnonymousPageCacheMixin, ProfileHotbarMixin, DetailView):
     """
     Display profile detail page with tabbed interface for games, trophies, and badges.
 
@@ -175,6 +177,15 @@ class ProfileDetailView(ProfileHotbarMixin, DetailView):
     slug_field = 'psn_username'
     slug_url_kwarg = 'psn_username'
     context_object_name = 'profile'
+    page_cache_namespace = 'profile_page'
+
+    def get_page_cache_owner_id(self):
+        return Profile.objects.filter(
+            psn_username=self.kwargs[self.slug_url_kwarg].lower(),
+        ).values_list('id', flat=True).first()
+
+    def page_cache_hit(self, owner_id):
+        track_page_view('profile', owner_id, self.request)
 
     def get_object(self, queryset=None):
         psn_username = self.kwargs[self.slug_url_kwarg].lower()
@@ -518,6 +529,35 @@ class ProfileDetailView(ProfileHotbarMixin, DetailView):
         context['selected_themes'] = self.request.GET.getlist('themes')
         return context
 
+    # Trophy log sort orders for keyset pagination: (expression, descending).
+    # Each ends in the pk so the order is total, and nullable earn dates are
+    # coalesced to a sentinel that sorts where NULLS LAST would put them (the
+    # partial indexes et_keyset_recent_idx / et_keyset_oldest_idx use the
+    # same expressions).
+    _EARNED_RECENT = Coalesce('earned_date_time', Value(EARNED_DATE_FLOOR))
+    _EARNED_OLDEST = Coalesce('earned_date_time', Value(EARNED_DATE_CEILING))
+    _TROPHY_LOG_ORDERINGS = {
+        'recent': [(_EARNED_RECENT, True), ('id', True)],
+        'oldest': [(_EARNED_OLDEST, False), ('id', False)],
+        'alpha': [(Lower('trophy__trophy_name'), False), ('id', False)],
+        'rarest_psn': [('trophy__trophy_earn_rate', False), (_EARNED_RECENT, True), ('id', True)],
+        'common_psn': [('trophy__trophy_earn_rate', True), (_EARNED_RECENT, True), ('id', True)],
+        'rarest_pp': [('trophy__earn_rate', False), (_EARNED_RECENT, True), ('id', True)],
+        'common_pp': [('trophy__earn_rate', True), (_EARNED_RECENT, True), ('id', True)],
+        'type': [
+            (Case(
+                When(trophy__trophy_type='platinum', then=Value(0)),
+                When(trophy__trophy_type='gold', then=Value(1)),
+                When(trophy__trophy_type='silver', then=Value(2)),
+                When(trophy__trophy_type='bronze', then=Value(3)),
+                default=Value(4),
+                output_field=IntegerField(),
+            ), False),
+            (Lower('trophy__trophy_name'), False),
+            ('id', False),
+        ],
+    }
+
     def _build_trophies_tab_context(self, profile, per_page, page_number):
         """
         Build context for trophies tab with filtering and pagination.
@@ -525,10 +565,12 @@ class ProfileDetailView(ProfileHotbarMixin, DetailView):
         Args:
             profile: Profile instance
             per_page: Items per page
-            page_number: Current page number
+            page_number: Legacy `?page=N`. The trophy log pages by `cursor`;
+                page > 1 without one (old links, stale scrollers) gets an empty
+                page rather than page 1 again
 
         Returns:
-            dict: Context with trophy_log and form
+            dict: Context with trophy_log (a KeysetPage) and form
         """
         form = ProfileTrophiesForm(self.request.GET)
         context = {'profile_games': []}
@@ -571,60 +613,26 @@ class ProfileDetailView(ProfileHotbarMixin, DetailView):
         if rarity_max < 100:
             trophies_qs = trophies_qs.filter(trophy__trophy_earn_rate__lte=float(rarity_max))
 
-        # Sort
-        if sort_val == 'oldest':
-            trophies_qs = trophies_qs.order_by(
-                F('earned_date_time').asc(nulls_last=True),
-            )
-        elif sort_val == 'alpha':
-            trophies_qs = trophies_qs.order_by(
-                Lower('trophy__trophy_name'),
-            )
-        elif sort_val == 'rarest_psn':
-            trophies_qs = trophies_qs.order_by(
-                'trophy__trophy_earn_rate',
-                F('earned_date_time').desc(nulls_last=True),
-            )
-        elif sort_val == 'common_psn':
-            trophies_qs = trophies_qs.order_by(
-                '-trophy__trophy_earn_rate',
-                F('earned_date_time').desc(nulls_last=True),
-            )
-        elif sort_val == 'rarest_pp':
-            trophies_qs = trophies_qs.order_by(
-                'trophy__earn_rate',
-                F('earned_date_time').desc(nulls_last=True),
-            )
-        elif sort_val == 'common_pp':
-            trophies_qs = trophies_qs.order_by(
-                '-trophy__earn_rate',
-                F('earned_date_time').desc(nulls_last=True),
-            )
-        elif sort_val == 'type':
-            trophies_qs = trophies_qs.annotate(
-                _type_order=Case(
-                    When(trophy__trophy_type='platinum', then=Value(0)),
-                    When(trophy__trophy_type='gold', then=Value(1)),
-                    When(trophy__trophy_type='silver', then=Value(2)),
-                    When(trophy__trophy_type='bronze', then=Value(3)),
-                    default=Value(4),
-                    output_field=IntegerField(),
-                ),
-            ).order_by(
-                '_type_order',
-                Lower('trophy__trophy_name'),
-            )
-        else:  # 'recent' (default)
-            trophies_qs = trophies_qs.order_by(
-                F('earned_date_time').desc(nulls_last=True),
+        # Keyset pagination: the infinite scroller passes back the previous
+        # page's cursor, so deep pages cost the same as the first and nothing
+        # counts the whole join. The first page shows an approximate total.
+        ordering = self._TROPHY_LOG_ORDERINGS.get(sort_val) or self._TROPHY_LOG_ORDERINGS['recent']
+        cursor = self.request.GET.get('cursor')
+        try:
+            legacy_page = int(page_number)
+        except (TypeError, ValueError):
+            legacy_page = 1
+        if not cursor and legacy_page > 1:
+            context['trophy_log'] = KeysetPage([], None)
+            context['form'] = form
+            return context
+        try:
+            trophy_page_obj = keyset_paginate(
+                trophies_qs, sort_val or 'recent', ordering, per_page,
+                cursor=cursor, count=None if cursor else 'approximate',
             )
-
-        # Paginate
-        trophy_paginator = Paginator(trophies_qs, per_page)
-        if int(page_number) > trophy_paginator.num_pages:
-            trophy_page_obj = []
-        else:
-            trophy_page_obj = trophy_paginator.get_page(page_number)
+        except InvalidCursor:
+            trophy_page_obj = KeysetPage([], None)
 
         context['trophy_log'] = trophy_page_obj
         context['form'] = form
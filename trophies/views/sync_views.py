@@ -104,6 +104,14 @@ class ProfileSyncStatusView(LoginRequiredMixin, View):
                 phase_raw = redis_client.get(f'finalize_phase:{profile.id}')
                 if phase_raw:
                     data['finalize_phase'] = phase_raw.decode() if isinstance(phase_raw, bytes) else phase_raw
+                # Seconds per finished post-sync stage (badges, milestones,
+                # challenges, ...), written as each stage of the DAG completes.
+                timings = redis_client.hgetall(f'finalize_phase:{profile.id}:timings')
+                if timings:
+                    data['finalize_timings'] = {
+                        (k.decode() if isinstance(k, bytes) else k): float(v)
+                        for k, v in timings.items()
+                    }
             else:
                 # Queue position is only meaningful before finalization. Skip
                 # the Redis pipeline lookup once we're past 100% to avoid the